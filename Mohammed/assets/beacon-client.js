@@ -22,6 +22,41 @@
     return data;
   }
 
+  async function apiStream(path, options, onEvent) {
+    const response = await fetch(`${API_BASE}${path}`, {
+      headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+      ...options,
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`${response.status} ${await response.text()}`);
+    }
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let final = null;
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary = buffer.indexOf("\n\n");
+      while (boundary !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf("\n\n");
+        let event = "message";
+        let data = "";
+        block.split("\n").forEach((line) => {
+          if (line.startsWith("event: ")) event = line.slice(7);
+          else if (line.startsWith("data: ")) data += line.slice(6);
+        });
+        const parsed = data ? JSON.parse(data) : {};
+        if (event === "final") final = parsed;
+        onEvent(event, parsed);
+      }
+    }
+    return final;
+  }
+
   function pageName() {
     const parts = window.location.pathname.split("/");
     return parts[parts.length - 1] || "";
@@ -419,6 +454,7 @@
       bubble.style.color = "#0f172a";
       history.appendChild(bubble);
       history.scrollTop = history.scrollHeight;
+      return bubble;
     }
 
     async function send() {
@@ -426,18 +462,29 @@
       if (!message) return;
       input.value = "";
       appendMessage("You", message);
+      const bubble = appendMessage("Beacon", "...");
+      let streamed = "";
       try {
-        const payload = await api("/assistant/chat", {
-          method: "POST",
-          body: JSON.stringify({
-            conversation_id: conversationId,
-            message,
-            context_page: "dashboard",
-          }),
-        });
-        appendMessage("Beacon", payload.reply || "No response");
+        const payload = await apiStream(
+          "/assistant/chat/stream",
+          {
+            method: "POST",
+            body: JSON.stringify({
+              conversation_id: conversationId,
+              message,
+              context_page: "dashboard",
+            }),
+          },
+          (event, data) => {
+            if (event !== "token") return;
+            streamed += data.text || "";
+            bubble.textContent = `Beacon: ${streamed}`;
+            history.scrollTop = history.scrollHeight;
+          }
+        );
+        bubble.textContent = `Beacon: ${(payload && payload.reply) || streamed || "No response"}`;
       } catch (err) {
-        appendMessage("Beacon", `Error: ${err.message}`);
+        bubble.textContent = `Beacon: Error: ${err.message}`;
       }
     }
 
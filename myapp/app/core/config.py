@@ -1,6 +1,6 @@
 import os
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -8,6 +8,29 @@ from dotenv import load_dotenv
 
 
 VALID_ENVIRONMENTS = {"development", "test", "staging", "production"}
+STORAGE_BACKENDS = {"mongo", "sqlite"}
+DEFAULT_LLM_CACHE_SITES = [
+    "socratic.integrity",
+    "socratic.career",
+    "documents.summary",
+    "documents.highlights",
+]
+DEFAULT_LLM_LATENCY_BUDGETS_MS = {
+    "llm.rate": 8000,
+    "socratic.question": 5000,
+    "socratic.evaluate": 8000,
+    "socratic.career": 12000,
+    "assistant": 8000,
+}
+DEFAULT_LLM_PROMPT_TOKEN_BUDGETS = {
+    "assistant": 2500,
+    "socratic.question": 3000,
+    "socratic.evaluate": 3000,
+    "socratic.career": 3000,
+    "documents.summary": 2500,
+    "documents.highlights": 2500,
+    "jobs": 4000,
+}
 MONGO_SCHEMES = {"mongodb", "mongodb+srv"}
 DB_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
 
@@ -35,6 +58,57 @@ class Settings:
     default_user_id: str = "demo-user"
     schedule_timezone: str = "Europe/London"
     max_upload_mb: int = 20
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 0
+    mongo_max_idle_time_ms: int = 300000
+    mongo_wait_queue_timeout_ms: int = 10000
+    mongo_bulk_batch_size: int = 500
+    mongo_index_sync_on_startup: bool = True
+    user_id_backfill_on_startup: bool = True
+    storage_backend: str = "mongo"
+    sqlite_path: Path = Path("data/beacon.sqlite3")
+    repo_cache_enabled: bool = False
+    repo_cache_ttl_seconds: int = 5
+    repo_cache_max_entries: int = 256
+    task_archive_after_days: int = 30
+    job_archive_after_days: int = 14
+    conversation_archive_after_days: int = 90
+    archive_batch_size: int = 500
+    archive_max_batches: int = 20
+    llm_max_concurrency: int = 8
+    llm_site_concurrency: int = 4
+    llm_timeout_seconds: int = 30
+    llm_max_retries: int = 2
+    llm_retry_base_ms: int = 250
+    llm_coalesce_enabled: bool = True
+    scheduler_score_memo_size: int = 5000
+    llm_rate_batch_window_ms: int = 0
+    llm_rate_batch_max_tasks: int = 50
+    llm_rate_batch_max_requests: int = 16
+    heuristic_urgency_weight: int = 55
+    heuristic_module_weight: int = 35
+    heuristic_effort_weight: int = 10
+    llm_cache_enabled: bool = True
+    llm_cache_sites: list[str] = field(default_factory=lambda: list(DEFAULT_LLM_CACHE_SITES))
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 512
+    llm_cache_max_mb: int = 16
+    llm_cache_store_max_entries: int = 20000
+    llm_latency_budgets_ms: dict[str, int] = field(
+        default_factory=lambda: dict(DEFAULT_LLM_LATENCY_BUDGETS_MS)
+    )
+    llm_breaker_enabled: bool = True
+    llm_breaker_window: int = 20
+    llm_breaker_min_calls: int = 10
+    llm_breaker_failure_percent: int = 50
+    llm_breaker_slow_ms: int = 10000
+    llm_breaker_open_seconds: int = 30
+    llm_breaker_half_open_probes: int = 1
+    llm_prompt_token_budgets: dict[str, int] = field(
+        default_factory=lambda: dict(DEFAULT_LLM_PROMPT_TOKEN_BUDGETS)
+    )
+    llm_prompt_default_tokens: int = 6000
+    gemini_base_url: str = ""
 
     def dependency_status(self) -> dict[str, bool]:
         return {
@@ -58,6 +132,22 @@ def _parse_origins(value: str | None) -> list[str]:
     return items or ["*"]
 
 
+def _parse_list(value: str | None, default: list[str]) -> list[str]:
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _parse_budgets(value: str | None, default: dict[str, int]) -> dict[str, int]:
+    # "site=number" pairs; listed sites replace the defaults, unlisted ones keep them.
+    budgets = dict(default)
+    for item in (value or "").split(","):
+        site, _, raw = item.partition("=")
+        if site.strip() and raw.strip():
+            budgets[site.strip()] = _parse_int(raw, default=0)
+    return budgets
+
+
 def _parse_int(value: str | None, default: int) -> int:
     if value is None:
         return default
@@ -95,6 +185,14 @@ def _validate_settings(settings: Settings) -> None:
         errors.append("DOCS_DB_NAME and DB_NAME must be different databases")
     if not settings.allowed_origins:
         errors.append("ALLOWED_ORIGINS cannot be empty")
+    if settings.storage_backend not in STORAGE_BACKENDS:
+        errors.append("STORAGE_BACKEND must be one of: mongo, sqlite")
+    if settings.storage_backend == "sqlite" and settings.sqlite_path.suffix.lower() not in {
+        ".db",
+        ".sqlite",
+        ".sqlite3",
+    }:
+        errors.append("SQLITE_PATH must point to a .db, .sqlite or .sqlite3 file")
     if settings.mongo_uri:
         parsed = urlparse(settings.mongo_uri)
         if parsed.scheme not in MONGO_SCHEMES:
@@ -111,6 +209,103 @@ def _validate_settings(settings: Settings) -> None:
         errors.append("SCHEDULE_TIMEZONE cannot be blank")
     if int(settings.max_upload_mb) <= 0:
         errors.append("MAX_UPLOAD_MB must be greater than zero")
+    if int(settings.mongo_max_pool_size) <= 0:
+        errors.append("MONGO_MAX_POOL_SIZE must be greater than zero")
+    if int(settings.mongo_min_pool_size) < 0:
+        errors.append("MONGO_MIN_POOL_SIZE cannot be negative")
+    if int(settings.mongo_min_pool_size) > int(settings.mongo_max_pool_size):
+        errors.append("MONGO_MIN_POOL_SIZE cannot exceed MONGO_MAX_POOL_SIZE")
+    if int(settings.mongo_max_idle_time_ms) < 0:
+        errors.append("MONGO_MAX_IDLE_TIME_MS cannot be negative")
+    if int(settings.mongo_wait_queue_timeout_ms) < 0:
+        errors.append("MONGO_WAIT_QUEUE_TIMEOUT_MS cannot be negative")
+    if int(settings.mongo_bulk_batch_size) <= 0:
+        errors.append("MONGO_BULK_BATCH_SIZE must be greater than zero")
+    if int(settings.repo_cache_ttl_seconds) < 0:
+        errors.append("REPO_CACHE_TTL_SECONDS cannot be negative")
+    if int(settings.repo_cache_max_entries) <= 0:
+        errors.append("REPO_CACHE_MAX_ENTRIES must be greater than zero")
+    for name, value in (
+        ("TASK_ARCHIVE_AFTER_DAYS", settings.task_archive_after_days),
+        ("JOB_ARCHIVE_AFTER_DAYS", settings.job_archive_after_days),
+        ("CONVERSATION_ARCHIVE_AFTER_DAYS", settings.conversation_archive_after_days),
+    ):
+        if int(value) < 0:
+            errors.append(f"{name} cannot be negative")
+    if int(settings.archive_batch_size) <= 0:
+        errors.append("ARCHIVE_BATCH_SIZE must be greater than zero")
+    if int(settings.archive_max_batches) <= 0:
+        errors.append("ARCHIVE_MAX_BATCHES must be greater than zero")
+    if int(settings.llm_max_concurrency) <= 0:
+        errors.append("LLM_MAX_CONCURRENCY must be greater than zero")
+    if int(settings.llm_site_concurrency) <= 0:
+        errors.append("LLM_SITE_CONCURRENCY must be greater than zero")
+    if int(settings.llm_site_concurrency) > int(settings.llm_max_concurrency):
+        errors.append("LLM_SITE_CONCURRENCY cannot exceed LLM_MAX_CONCURRENCY")
+    if int(settings.llm_timeout_seconds) <= 0:
+        errors.append("LLM_TIMEOUT_SECONDS must be greater than zero")
+    if int(settings.llm_max_retries) < 0:
+        errors.append("LLM_MAX_RETRIES cannot be negative")
+    if int(settings.llm_retry_base_ms) < 0:
+        errors.append("LLM_RETRY_BASE_MS cannot be negative")
+    if int(settings.scheduler_score_memo_size) < 0:
+        errors.append("SCHEDULER_SCORE_MEMO_SIZE cannot be negative")
+    if int(settings.llm_rate_batch_window_ms) < 0:
+        errors.append("LLM_RATE_BATCH_WINDOW_MS cannot be negative")
+    if int(settings.llm_rate_batch_max_tasks) <= 0:
+        errors.append("LLM_RATE_BATCH_MAX_TASKS must be greater than zero")
+    if int(settings.llm_rate_batch_max_requests) <= 0:
+        errors.append("LLM_RATE_BATCH_MAX_REQUESTS must be greater than zero")
+    heuristic_weights = (
+        int(settings.heuristic_urgency_weight),
+        int(settings.heuristic_module_weight),
+        int(settings.heuristic_effort_weight),
+    )
+    if min(heuristic_weights) < 0:
+        errors.append("HEURISTIC_*_WEIGHT values cannot be negative")
+    elif sum(heuristic_weights) == 0:
+        errors.append("At least one HEURISTIC_*_WEIGHT must be greater than zero")
+    if int(settings.llm_cache_ttl_seconds) < 0:
+        errors.append("LLM_CACHE_TTL_SECONDS cannot be negative")
+    if int(settings.llm_cache_max_entries) <= 0:
+        errors.append("LLM_CACHE_MAX_ENTRIES must be greater than zero")
+    if int(settings.llm_cache_max_mb) <= 0:
+        errors.append("LLM_CACHE_MAX_MB must be greater than zero")
+    if int(settings.llm_cache_store_max_entries) < 0:
+        errors.append("LLM_CACHE_STORE_MAX_ENTRIES cannot be negative")
+    invalid_budgets = sorted(
+        site for site, budget in settings.llm_latency_budgets_ms.items() if int(budget) <= 0
+    )
+    if invalid_budgets:
+        errors.append(
+            "LLM_LATENCY_BUDGETS_MS must be positive milliseconds for: "
+            + ", ".join(invalid_budgets)
+        )
+    invalid_prompt_budgets = sorted(
+        site for site, budget in settings.llm_prompt_token_budgets.items() if int(budget) <= 0
+    )
+    if invalid_prompt_budgets:
+        errors.append(
+            "LLM_PROMPT_TOKEN_BUDGETS must be positive token counts for: "
+            + ", ".join(invalid_prompt_budgets)
+        )
+    base_url_scheme = urlparse(settings.gemini_base_url).scheme
+    if settings.gemini_base_url and base_url_scheme not in {"http", "https"}:
+        errors.append("GEMINI_BASE_URL must be an http(s) URL")
+    if int(settings.llm_prompt_default_tokens) <= 0:
+        errors.append("LLM_PROMPT_DEFAULT_TOKENS must be greater than zero")
+    if int(settings.llm_breaker_window) <= 0:
+        errors.append("LLM_BREAKER_WINDOW must be greater than zero")
+    if not 1 <= int(settings.llm_breaker_min_calls) <= int(settings.llm_breaker_window):
+        errors.append("LLM_BREAKER_MIN_CALLS must be between 1 and LLM_BREAKER_WINDOW")
+    if not 1 <= int(settings.llm_breaker_failure_percent) <= 100:
+        errors.append("LLM_BREAKER_FAILURE_PERCENT must be between 1 and 100")
+    if int(settings.llm_breaker_slow_ms) < 0:
+        errors.append("LLM_BREAKER_SLOW_MS cannot be negative")
+    if int(settings.llm_breaker_open_seconds) < 0:
+        errors.append("LLM_BREAKER_OPEN_SECONDS cannot be negative")
+    if int(settings.llm_breaker_half_open_probes) <= 0:
+        errors.append("LLM_BREAKER_HALF_OPEN_PROBES must be greater than zero")
 
     if errors:
         raise SettingsValidationError("; ".join(errors))
@@ -118,7 +313,7 @@ def _validate_settings(settings: Settings) -> None:
 
 def validate_startup_dependencies(settings: Settings) -> None:
     missing: list[str] = []
-    if not settings.mongo_uri.strip():
+    if settings.storage_backend == "mongo" and not settings.mongo_uri.strip():
         missing.append("MONGO_URI")
     if not settings.gemini_api_key.strip():
         missing.append("GEMINI_API_KEY")
@@ -146,6 +341,7 @@ def get_settings() -> Settings:
         app_version=os.getenv("APP_VERSION", "0.1.0"),
         environment=os.getenv("APP_ENV", "development"),
         gemini_api_key=os.getenv("GEMINI_API_KEY", ""),
+        gemini_base_url=os.getenv("GEMINI_BASE_URL", "").strip(),
         eleven_labs_api_key=os.getenv("ELEVEN_LABS_API_KEY", ""),
         mongo_uri=os.getenv("MONGO_URI", ""),
         db_name=jobs_db_name,
@@ -157,6 +353,76 @@ def get_settings() -> Settings:
         default_user_id=os.getenv("DEFAULT_USER_ID", "demo-user"),
         schedule_timezone=os.getenv("SCHEDULE_TIMEZONE", "Europe/London"),
         max_upload_mb=_parse_int(os.getenv("MAX_UPLOAD_MB"), default=20),
+        mongo_max_pool_size=_parse_int(os.getenv("MONGO_MAX_POOL_SIZE"), default=100),
+        mongo_min_pool_size=_parse_int(os.getenv("MONGO_MIN_POOL_SIZE"), default=0),
+        mongo_max_idle_time_ms=_parse_int(os.getenv("MONGO_MAX_IDLE_TIME_MS"), default=300000),
+        mongo_wait_queue_timeout_ms=_parse_int(
+            os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS"), default=10000
+        ),
+        mongo_bulk_batch_size=_parse_int(os.getenv("MONGO_BULK_BATCH_SIZE"), default=500),
+        mongo_index_sync_on_startup=_parse_bool(
+            os.getenv("MONGO_INDEX_SYNC_ON_STARTUP"), default=True
+        ),
+        user_id_backfill_on_startup=_parse_bool(
+            os.getenv("USER_ID_BACKFILL_ON_STARTUP"), default=True
+        ),
+        storage_backend=os.getenv("STORAGE_BACKEND", "mongo").strip().lower(),
+        sqlite_path=Path(os.getenv("SQLITE_PATH", str(myapp_root / "data" / "beacon.sqlite3"))),
+        repo_cache_enabled=_parse_bool(os.getenv("REPO_CACHE_ENABLED"), default=False),
+        repo_cache_ttl_seconds=_parse_int(os.getenv("REPO_CACHE_TTL_SECONDS"), default=5),
+        repo_cache_max_entries=_parse_int(os.getenv("REPO_CACHE_MAX_ENTRIES"), default=256),
+        task_archive_after_days=_parse_int(os.getenv("TASK_ARCHIVE_AFTER_DAYS"), default=30),
+        job_archive_after_days=_parse_int(os.getenv("JOB_ARCHIVE_AFTER_DAYS"), default=14),
+        conversation_archive_after_days=_parse_int(
+            os.getenv("CONVERSATION_ARCHIVE_AFTER_DAYS"), default=90
+        ),
+        archive_batch_size=_parse_int(os.getenv("ARCHIVE_BATCH_SIZE"), default=500),
+        archive_max_batches=_parse_int(os.getenv("ARCHIVE_MAX_BATCHES"), default=20),
+        llm_max_concurrency=_parse_int(os.getenv("LLM_MAX_CONCURRENCY"), default=8),
+        llm_site_concurrency=_parse_int(os.getenv("LLM_SITE_CONCURRENCY"), default=4),
+        llm_timeout_seconds=_parse_int(os.getenv("LLM_TIMEOUT_SECONDS"), default=30),
+        llm_max_retries=_parse_int(os.getenv("LLM_MAX_RETRIES"), default=2),
+        llm_retry_base_ms=_parse_int(os.getenv("LLM_RETRY_BASE_MS"), default=250),
+        llm_coalesce_enabled=_parse_bool(os.getenv("LLM_COALESCE_ENABLED"), default=True),
+        scheduler_score_memo_size=_parse_int(
+            os.getenv("SCHEDULER_SCORE_MEMO_SIZE"), default=5000
+        ),
+        llm_rate_batch_window_ms=_parse_int(os.getenv("LLM_RATE_BATCH_WINDOW_MS"), default=0),
+        llm_rate_batch_max_tasks=_parse_int(os.getenv("LLM_RATE_BATCH_MAX_TASKS"), default=50),
+        llm_rate_batch_max_requests=_parse_int(
+            os.getenv("LLM_RATE_BATCH_MAX_REQUESTS"), default=16
+        ),
+        heuristic_urgency_weight=_parse_int(os.getenv("HEURISTIC_URGENCY_WEIGHT"), default=55),
+        heuristic_module_weight=_parse_int(os.getenv("HEURISTIC_MODULE_WEIGHT"), default=35),
+        heuristic_effort_weight=_parse_int(os.getenv("HEURISTIC_EFFORT_WEIGHT"), default=10),
+        llm_cache_enabled=_parse_bool(os.getenv("LLM_CACHE_ENABLED"), default=True),
+        llm_cache_sites=_parse_list(os.getenv("LLM_CACHE_SITES"), DEFAULT_LLM_CACHE_SITES),
+        llm_cache_ttl_seconds=_parse_int(os.getenv("LLM_CACHE_TTL_SECONDS"), default=86400),
+        llm_cache_max_entries=_parse_int(os.getenv("LLM_CACHE_MAX_ENTRIES"), default=512),
+        llm_cache_max_mb=_parse_int(os.getenv("LLM_CACHE_MAX_MB"), default=16),
+        llm_cache_store_max_entries=_parse_int(
+            os.getenv("LLM_CACHE_STORE_MAX_ENTRIES"), default=20000
+        ),
+        llm_latency_budgets_ms=_parse_budgets(
+            os.getenv("LLM_LATENCY_BUDGETS_MS"), DEFAULT_LLM_LATENCY_BUDGETS_MS
+        ),
+        llm_breaker_enabled=_parse_bool(os.getenv("LLM_BREAKER_ENABLED"), default=True),
+        llm_breaker_window=_parse_int(os.getenv("LLM_BREAKER_WINDOW"), default=20),
+        llm_breaker_min_calls=_parse_int(os.getenv("LLM_BREAKER_MIN_CALLS"), default=10),
+        llm_breaker_failure_percent=_parse_int(
+            os.getenv("LLM_BREAKER_FAILURE_PERCENT"), default=50
+        ),
+        llm_breaker_slow_ms=_parse_int(os.getenv("LLM_BREAKER_SLOW_MS"), default=10000),
+        llm_breaker_open_seconds=_parse_int(os.getenv("LLM_BREAKER_OPEN_SECONDS"), default=30),
+        llm_breaker_half_open_probes=_parse_int(
+            os.getenv("LLM_BREAKER_HALF_OPEN_PROBES"), default=1
+        ),
+        llm_prompt_token_budgets=_parse_budgets(
+            os.getenv("LLM_PROMPT_TOKEN_BUDGETS"), DEFAULT_LLM_PROMPT_TOKEN_BUDGETS
+        ),
+        llm_prompt_default_tokens=_parse_int(
+            os.getenv("LLM_PROMPT_DEFAULT_TOKENS"), default=6000
+        ),
         allowed_origins=_parse_origins(os.getenv("ALLOWED_ORIGINS")),
         ui_html_path=Path(os.getenv("UI_HTML_PATH", str(ui_default))),
     )
@@ -1,15 +1,63 @@
 from functools import lru_cache
 
 from app.core.config import Settings, get_settings
-from app.models.persistence.assistant_repo import AssistantConversationRepository
-from app.models.persistence.calendar_event_repo import CalendarEventRepository
-from app.models.persistence.document_repo import DocumentRepository
-from app.models.persistence.job_repo import JobRepository
-from app.models.persistence.task_repo import TaskRepository
+from app.models.persistence.archive import (
+    ArchivePolicy,
+    ArchiveRepository,
+    default_archive_policies,
+)
+from app.models.persistence.assistant_repo import (
+    AssistantConversationRepository,
+    AsyncAssistantConversationRepository,
+)
+from app.models.persistence.async_db import AsyncMongoClientRegistry, ThreadedAsyncRepository
+from app.models.persistence.cache import (
+    EVENT_READ_METHODS,
+    EVENT_WRITE_METHODS,
+    JOB_READ_METHODS,
+    JOB_WRITE_METHODS,
+    TASK_READ_METHODS,
+    TASK_WRITE_METHODS,
+    CachedRepository,
+    RepositoryCacheRegistry,
+)
+from app.models.persistence.calendar_event_repo import (
+    AsyncCalendarEventRepository,
+    CalendarEventRepository,
+)
+from app.models.persistence.db import MongoClientRegistry
+from app.models.persistence.document_repo import AsyncDocumentRepository, DocumentRepository
+from app.models.persistence.indexes import IndexManager
+from app.models.persistence.job_repo import AsyncJobRepository, JobRepository
+from app.models.persistence.llm_cache_repo import LLMCacheRepository
+from app.models.persistence.migrations import (
+    IsoDateMigration,
+    SqliteIsoDateMigration,
+    SqliteUserIdBackfill,
+    UserIdBackfill,
+)
+from app.models.persistence.sqlite_db import SqliteCollection, SqliteDatabase
+from app.models.persistence.sqlite_repos import (
+    SqliteArchiveRepository,
+    SqliteAssistantConversationRepository,
+    SqliteCalendarEventRepository,
+    SqliteDocumentRepository,
+    SqliteJobRepository,
+    SqliteLLMCacheRepository,
+    SqliteTaskRepository,
+)
+from app.models.persistence.task_repo import AsyncTaskRepository, TaskRepository
+from app.services.archive_service import ArchiveService
 from app.services.assistant_service import AssistantService
 from app.services.document_service import DocumentService
 from app.services.job_discovery_service import JobDiscoveryService
+from app.services.llm.circuit_breaker import CircuitBreaker
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.heuristic_scorer import HeuristicScorer, HeuristicWeights
+from app.services.llm.prompt_budget import PromptBudget
 from app.services.llm.provider_gemini import GeminiProvider
+from app.services.llm.response_cache import LLMResponseCache
+from app.services.llm.score_memo import TaskScoreMemo
 from app.services.scheduler import SchedulerService
 from app.services.socratic.agent import SocraticAgentService
 from app.services.socratic.voice import ElevenLabsVoiceService
@@ -21,65 +69,449 @@ def get_cached_settings() -> Settings:
     return get_settings()
 
 
+@lru_cache(maxsize=1)
+def get_mongo_client_registry() -> MongoClientRegistry:
+    settings = get_cached_settings()
+    return MongoClientRegistry(
+        max_pool_size=settings.mongo_max_pool_size,
+        min_pool_size=settings.mongo_min_pool_size,
+        max_idle_time_ms=settings.mongo_max_idle_time_ms,
+        wait_queue_timeout_ms=settings.mongo_wait_queue_timeout_ms,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_sqlite_database() -> SqliteDatabase:
+    return SqliteDatabase(get_cached_settings().sqlite_path)
+
+
+def _use_sqlite() -> bool:
+    return get_cached_settings().storage_backend == "sqlite"
+
+
+_ARCHIVE_DB_NAMES = {
+    "tasks": lambda settings: settings.tasks_db_name,
+    "jobs": lambda settings: settings.db_name,
+    "assistant_conversations": lambda settings: settings.docs_db_name,
+}
+_ARCHIVE_SQLITE_KEYS = {
+    "tasks": ("user_id", "task_id"),
+    "jobs": ("user_id", "job_id"),
+    "assistant_conversations": "message_id",
+}
+# Archives whose hot collection is read through a CachedRepository namespace.
+_CACHED_ARCHIVES = ("tasks", "jobs")
+
+
+_DATE_COLLECTIONS = {
+    "jobs": (
+        lambda settings: settings.db_name,
+        ("user_id", "job_id"),
+        JobRepository.DATE_FIELDS,
+    ),
+    "tasks": (
+        lambda settings: settings.tasks_db_name,
+        ("user_id", "task_id"),
+        TaskRepository.DATE_FIELDS,
+    ),
+    "calendar_events": (
+        lambda settings: settings.tasks_db_name,
+        ("user_id", "event_id"),
+        CalendarEventRepository.DATE_FIELDS,
+    ),
+    "documents": (
+        lambda settings: settings.docs_db_name,
+        "doc_id",
+        DocumentRepository.DATE_FIELDS,
+    ),
+    "assistant_conversations": (
+        lambda settings: settings.docs_db_name,
+        "message_id",
+        AssistantConversationRepository.DATE_FIELDS,
+    ),
+}
+
+
+@lru_cache(maxsize=1)
+def get_archive_policies() -> dict[str, ArchivePolicy]:
+    settings = get_cached_settings()
+    return default_archive_policies(
+        task_days=settings.task_archive_after_days,
+        job_days=settings.job_archive_after_days,
+        conversation_days=settings.conversation_archive_after_days,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_index_manager() -> IndexManager:
+    settings = get_cached_settings()
+    manager = IndexManager(
+        mongo_uri=settings.mongo_uri,
+        client_registry=get_mongo_client_registry(),
+    )
+    manager.register(
+        settings.db_name, "jobs", JobRepository.INDEXES, JobRepository.RETIRED_INDEXES
+    )
+    manager.register(
+        settings.tasks_db_name, "tasks", TaskRepository.INDEXES, TaskRepository.RETIRED_INDEXES
+    )
+    manager.register(
+        settings.tasks_db_name,
+        "calendar_events",
+        CalendarEventRepository.INDEXES,
+        CalendarEventRepository.RETIRED_INDEXES,
+    )
+    manager.register(settings.docs_db_name, "documents", DocumentRepository.INDEXES)
+    manager.register(
+        settings.docs_db_name, "assistant_conversations", AssistantConversationRepository.INDEXES
+    )
+    manager.register(settings.docs_db_name, "llm_cache", LLMCacheRepository.INDEXES)
+    for name, policy in get_archive_policies().items():
+        manager.register(
+            _ARCHIVE_DB_NAMES[name](settings), policy.archive_name, policy.archive_indexes()
+        )
+    return manager
+
+
+@lru_cache(maxsize=1)
+def get_repo_cache_registry() -> RepositoryCacheRegistry:
+    settings = get_cached_settings()
+    return RepositoryCacheRegistry(
+        ttl_seconds=settings.repo_cache_ttl_seconds,
+        max_entries=settings.repo_cache_max_entries,
+    )
+
+
+def _with_repo_cache(name: str, repo, read_methods: set[str], write_methods: set[str]):
+    if not get_cached_settings().repo_cache_enabled:
+        return repo
+    return CachedRepository(
+        repo,
+        cache=get_repo_cache_registry().cache(name),
+        read_methods=read_methods,
+        write_methods=write_methods,
+    )
+
+
 @lru_cache(maxsize=1)
 def get_job_repo() -> JobRepository:
     settings = get_cached_settings()
-    return JobRepository(mongo_uri=settings.mongo_uri, db_name=settings.db_name)
+    if _use_sqlite():
+        repo = SqliteJobRepository(
+            get_sqlite_database(),
+            bulk_batch_size=settings.mongo_bulk_batch_size,
+        )
+        return _with_repo_cache("jobs", repo, JOB_READ_METHODS, JOB_WRITE_METHODS)
+    repo = JobRepository(
+        mongo_uri=settings.mongo_uri,
+        db_name=settings.db_name,
+        client_registry=get_mongo_client_registry(),
+        bulk_batch_size=settings.mongo_bulk_batch_size,
+    )
+    return _with_repo_cache("jobs", repo, JOB_READ_METHODS, JOB_WRITE_METHODS)
 
 
 @lru_cache(maxsize=1)
 def get_task_repo() -> TaskRepository:
     settings = get_cached_settings()
-    return TaskRepository(mongo_uri=settings.mongo_uri, db_name=settings.tasks_db_name)
+    if _use_sqlite():
+        repo = SqliteTaskRepository(
+            get_sqlite_database(),
+            bulk_batch_size=settings.mongo_bulk_batch_size,
+        )
+        return _with_repo_cache("tasks", repo, TASK_READ_METHODS, TASK_WRITE_METHODS)
+    repo = TaskRepository(
+        mongo_uri=settings.mongo_uri,
+        db_name=settings.tasks_db_name,
+        client_registry=get_mongo_client_registry(),
+        bulk_batch_size=settings.mongo_bulk_batch_size,
+    )
+    return _with_repo_cache("tasks", repo, TASK_READ_METHODS, TASK_WRITE_METHODS)
 
 
 @lru_cache(maxsize=1)
 def get_calendar_event_repo() -> CalendarEventRepository:
     settings = get_cached_settings()
-    return CalendarEventRepository(
+    if _use_sqlite():
+        repo = SqliteCalendarEventRepository(
+            get_sqlite_database(),
+            bulk_batch_size=settings.mongo_bulk_batch_size,
+        )
+        return _with_repo_cache("calendar_events", repo, EVENT_READ_METHODS, EVENT_WRITE_METHODS)
+    repo = CalendarEventRepository(
         mongo_uri=settings.mongo_uri,
         db_name=settings.tasks_db_name,
+        client_registry=get_mongo_client_registry(),
+        bulk_batch_size=settings.mongo_bulk_batch_size,
     )
+    return _with_repo_cache("calendar_events", repo, EVENT_READ_METHODS, EVENT_WRITE_METHODS)
 
 
 @lru_cache(maxsize=1)
 def get_document_repo() -> DocumentRepository:
     settings = get_cached_settings()
+    if _use_sqlite():
+        return SqliteDocumentRepository(get_sqlite_database())
     return DocumentRepository(
         mongo_uri=settings.mongo_uri,
         db_name=settings.docs_db_name,
+        client_registry=get_mongo_client_registry(),
     )
 
 
 @lru_cache(maxsize=1)
 def get_assistant_repo() -> AssistantConversationRepository:
     settings = get_cached_settings()
+    if _use_sqlite():
+        return SqliteAssistantConversationRepository(get_sqlite_database())
     return AssistantConversationRepository(
         mongo_uri=settings.mongo_uri,
         db_name=settings.docs_db_name,
+        client_registry=get_mongo_client_registry(),
     )
 
 
+@lru_cache(maxsize=1)
+def get_async_mongo_client_registry() -> AsyncMongoClientRegistry:
+    settings = get_cached_settings()
+    return AsyncMongoClientRegistry(
+        max_pool_size=settings.mongo_max_pool_size,
+        min_pool_size=settings.mongo_min_pool_size,
+        max_idle_time_ms=settings.mongo_max_idle_time_ms,
+        wait_queue_timeout_ms=settings.mongo_wait_queue_timeout_ms,
+    )
+
 
-def get_llm_provider() -> GeminiProvider:
+@lru_cache(maxsize=1)
+def get_async_job_repo() -> AsyncJobRepository:
+    if _use_sqlite():
+        return ThreadedAsyncRepository(get_job_repo())
     settings = get_cached_settings()
-    return GeminiProvider(
-        model=settings.llm_model,
+    return AsyncJobRepository(
+        mongo_uri=settings.mongo_uri,
+        db_name=settings.db_name,
+        client_registry=get_async_mongo_client_registry(),
+        bulk_batch_size=settings.mongo_bulk_batch_size,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_task_repo() -> AsyncTaskRepository:
+    if _use_sqlite():
+        return ThreadedAsyncRepository(get_task_repo())
+    settings = get_cached_settings()
+    return AsyncTaskRepository(
+        mongo_uri=settings.mongo_uri,
+        db_name=settings.tasks_db_name,
+        client_registry=get_async_mongo_client_registry(),
+        bulk_batch_size=settings.mongo_bulk_batch_size,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_calendar_event_repo() -> AsyncCalendarEventRepository:
+    if _use_sqlite():
+        return ThreadedAsyncRepository(get_calendar_event_repo())
+    settings = get_cached_settings()
+    return AsyncCalendarEventRepository(
+        mongo_uri=settings.mongo_uri,
+        db_name=settings.tasks_db_name,
+        client_registry=get_async_mongo_client_registry(),
+        bulk_batch_size=settings.mongo_bulk_batch_size,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_document_repo() -> AsyncDocumentRepository:
+    if _use_sqlite():
+        return ThreadedAsyncRepository(get_document_repo())
+    settings = get_cached_settings()
+    return AsyncDocumentRepository(
+        mongo_uri=settings.mongo_uri,
+        db_name=settings.docs_db_name,
+        client_registry=get_async_mongo_client_registry(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_assistant_repo() -> AsyncAssistantConversationRepository:
+    if _use_sqlite():
+        return ThreadedAsyncRepository(get_assistant_repo())
+    settings = get_cached_settings()
+    return AsyncAssistantConversationRepository(
+        mongo_uri=settings.mongo_uri,
+        db_name=settings.docs_db_name,
+        client_registry=get_async_mongo_client_registry(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_archive_service() -> ArchiveService:
+    settings = get_cached_settings()
+    repos = {}
+    for name, policy in get_archive_policies().items():
+        if _use_sqlite():
+            repos[name] = SqliteArchiveRepository(
+                get_sqlite_database(), policy, _ARCHIVE_SQLITE_KEYS[name]
+            )
+        else:
+            repos[name] = ArchiveRepository(
+                mongo_uri=settings.mongo_uri,
+                db_name=_ARCHIVE_DB_NAMES[name](settings),
+                policy=policy,
+                client_registry=get_mongo_client_registry(),
+            )
+    caches = {}
+    if settings.repo_cache_enabled:
+        registry = get_repo_cache_registry()
+        caches = {name: registry.cache(name) for name in _CACHED_ARCHIVES if name in repos}
+    return ArchiveService(
+        repos,
+        batch_size=settings.archive_batch_size,
+        max_batches=settings.archive_max_batches,
+        caches=caches,
+    )
+
+
+def get_date_migrations() -> dict[str, IsoDateMigration | SqliteIsoDateMigration]:
+    settings = get_cached_settings()
+    targets = dict(_DATE_COLLECTIONS)
+    for name, policy in get_archive_policies().items():
+        targets[policy.archive_name] = (
+            _ARCHIVE_DB_NAMES[name],
+            _ARCHIVE_SQLITE_KEYS[name],
+            (*policy.date_fields, "archived_at"),
+        )
+
+    migrations: dict[str, IsoDateMigration | SqliteIsoDateMigration] = {}
+    for name, (db_name, sqlite_key, fields) in targets.items():
+        if _use_sqlite():
+            migrations[name] = SqliteIsoDateMigration(
+                SqliteCollection(get_sqlite_database(), name, sqlite_key), fields
+            )
+        else:
+            migrations[name] = IsoDateMigration(
+                mongo_uri=settings.mongo_uri,
+                db_name=db_name(settings),
+                collection_name=name,
+                fields=fields,
+                client_registry=get_mongo_client_registry(),
+            )
+    return migrations
+
+
+def get_user_id_backfills() -> dict[str, UserIdBackfill | SqliteUserIdBackfill]:
+    settings = get_cached_settings()
+    backfills: dict[str, UserIdBackfill | SqliteUserIdBackfill] = {}
+    for name in ("tasks", "jobs", "calendar_events"):
+        db_name, sqlite_key, _ = _DATE_COLLECTIONS[name]
+        if _use_sqlite():
+            backfills[name] = SqliteUserIdBackfill(
+                SqliteCollection(get_sqlite_database(), name, sqlite_key),
+                settings.default_user_id,
+            )
+        else:
+            backfills[name] = UserIdBackfill(
+                mongo_uri=settings.mongo_uri,
+                db_name=db_name(settings),
+                collection_name=name,
+                user_id=settings.default_user_id,
+                client_registry=get_mongo_client_registry(),
+            )
+    return backfills
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache_repo() -> LLMCacheRepository:
+    settings = get_cached_settings()
+    if _use_sqlite():
+        return SqliteLLMCacheRepository(get_sqlite_database())
+    return LLMCacheRepository(
+        mongo_uri=settings.mongo_uri,
+        db_name=settings.docs_db_name,
+        client_registry=get_mongo_client_registry(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_llm_response_cache() -> LLMResponseCache:
+    settings = get_cached_settings()
+    return LLMResponseCache(
+        store=get_llm_cache_repo() if settings.llm_cache_store_max_entries > 0 else None,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+        max_entries=settings.llm_cache_max_entries,
+        max_bytes=settings.llm_cache_max_mb * 1024 * 1024,
+        store_max_entries=settings.llm_cache_store_max_entries,
+    )
+
+
+def build_llm_gateway(settings: Settings, cache: LLMResponseCache | None = None) -> LLMGateway:
+    return LLMGateway(
         api_key=settings.gemini_api_key,
         enable_live=settings.enable_live_llm,
+        base_url=settings.gemini_base_url,
+        max_concurrency=settings.llm_max_concurrency,
+        per_site_concurrency=settings.llm_site_concurrency,
+        timeout_seconds=settings.llm_timeout_seconds,
+        max_retries=settings.llm_max_retries,
+        backoff_base_seconds=settings.llm_retry_base_ms / 1000,
+        cache=cache,
+        cache_sites=settings.llm_cache_sites,
+        coalesce=settings.llm_coalesce_enabled,
+        latency_budgets={
+            site: budget_ms / 1000 for site, budget_ms in settings.llm_latency_budgets_ms.items()
+        },
+        breaker=(
+            CircuitBreaker(
+                window=settings.llm_breaker_window,
+                min_calls=settings.llm_breaker_min_calls,
+                failure_ratio=settings.llm_breaker_failure_percent / 100,
+                open_seconds=settings.llm_breaker_open_seconds,
+                half_open_probes=settings.llm_breaker_half_open_probes,
+            )
+            if settings.llm_breaker_enabled
+            else None
+        ),
+        slow_call_seconds=settings.llm_breaker_slow_ms / 1000 or None,
+        prompt_budget=PromptBudget(
+            budgets=settings.llm_prompt_token_budgets,
+            default_tokens=settings.llm_prompt_default_tokens,
+        ),
     )
 
 
 @lru_cache(maxsize=1)
-def get_socratic_agent() -> SocraticAgentService:
+def get_llm_gateway() -> LLMGateway:
+    settings = get_cached_settings()
+    cache = get_llm_response_cache() if settings.llm_cache_enabled else None
+    return build_llm_gateway(settings, cache=cache)
+
+
+@lru_cache(maxsize=1)
+def get_llm_provider() -> GeminiProvider:
     settings = get_cached_settings()
-    return SocraticAgentService(
+    return GeminiProvider(
         model=settings.llm_model,
-        api_key=settings.gemini_api_key,
-        enable_live=settings.enable_live_llm,
+        gateway=get_llm_gateway(),
+        batch_window_ms=settings.llm_rate_batch_window_ms,
+        max_batch_tasks=settings.llm_rate_batch_max_tasks,
+        max_batch_requests=settings.llm_rate_batch_max_requests,
+        heuristic=HeuristicScorer(
+            HeuristicWeights(
+                urgency=settings.heuristic_urgency_weight / 100,
+                module=settings.heuristic_module_weight / 100,
+                effort=settings.heuristic_effort_weight / 100,
+            )
+        ),
     )
 
 
+@lru_cache(maxsize=1)
+def get_socratic_agent() -> SocraticAgentService:
+    settings = get_cached_settings()
+    return SocraticAgentService(model=settings.llm_model, gateway=get_llm_gateway())
+
+
 @lru_cache(maxsize=1)
 def get_voice_service() -> ElevenLabsVoiceService:
     settings = get_cached_settings()
@@ -94,6 +526,14 @@ def get_scheduler_service() -> SchedulerService:
         event_repo=get_calendar_event_repo(),
         llm_provider=get_llm_provider(),
         schedule_timezone=settings.schedule_timezone,
+        async_event_repo=get_async_calendar_event_repo(),
+        async_task_repo=get_async_task_repo(),
+        default_user_id=settings.default_user_id,
+        score_memo=(
+            TaskScoreMemo(max_entries=settings.scheduler_score_memo_size)
+            if settings.scheduler_score_memo_size > 0
+            else None
+        ),
     )
 
 
@@ -102,11 +542,13 @@ def get_document_service() -> DocumentService:
     settings = get_cached_settings()
     return DocumentService(
         document_repo=get_document_repo(),
+        async_document_repo=get_async_document_repo(),
         default_user_id=settings.default_user_id,
         max_upload_mb=settings.max_upload_mb,
         model=settings.llm_model,
         api_key=settings.gemini_api_key,
         enable_live=settings.enable_live_llm,
+        gateway=get_llm_gateway(),
     )
 
 
@@ -120,6 +562,8 @@ def get_assistant_service() -> AssistantService:
         conversation_repo=get_assistant_repo(),
         job_repo=get_job_repo(),
         task_repo=get_task_repo(),
+        gateway=get_llm_gateway(),
+        default_user_id=settings.default_user_id,
     )
 
 
@@ -128,10 +572,13 @@ def get_job_discovery_service() -> JobDiscoveryService:
     settings = get_cached_settings()
     return JobDiscoveryService(
         job_repo=get_job_repo(),
+        async_job_repo=get_async_job_repo(),
         model=settings.llm_model,
         gemini_api_key=settings.gemini_api_key,
         enable_live=settings.enable_live_llm,
         serpapi_key=settings.serpapi_key,
+        default_user_id=settings.default_user_id,
+        gateway=get_llm_gateway(),
     )
 
 
@@ -141,4 +588,5 @@ def get_workflow_pipeline() -> WorkflowPipeline:
         job_repo=get_job_repo(),
         task_repo=get_task_repo(),
         llm_provider=get_llm_provider(),
+        default_user_id=get_cached_settings().default_user_id,
     )
@@ -1,3 +1,5 @@
+import asyncio
+import threading
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -11,6 +13,14 @@ from app.core.config import (
     get_settings,
     validate_startup_dependencies,
 )
+from app.core.dependencies import (
+    get_async_mongo_client_registry,
+    get_index_manager,
+    get_llm_gateway,
+    get_mongo_client_registry,
+    get_sqlite_database,
+    get_user_id_backfills,
+)
 from app.core.exceptions import register_exception_handlers
 from app.core.logging import configure_logging, get_logger
 from app.view.v1.router import router as v1_router
@@ -25,6 +35,47 @@ except SettingsValidationError as exc:
 configure_logging()
 
 
+# Shutdown waits this long for a running index build before closing the Mongo clients.
+_INDEX_SYNC_SHUTDOWN_SECONDS = 30.0
+
+
+def _sync_indexes(stop: threading.Event) -> None:
+    try:
+        plans = get_index_manager().apply(allow_rebuild=False, stop=stop)
+    except Exception as exc:
+        logger.warning("Background index sync failed: %s", exc)
+        return
+    for plan in plans:
+        if plan.create or plan.drop:
+            logger.info("Synced indexes %s", plan.summary())
+        if plan.rebuild:
+            logger.warning(
+                "Index definitions changed for %s.%s; run scripts/apply_indexes.py --rebuild",
+                plan.db_name,
+                plan.collection_name,
+            )
+
+
+def _backfill_user_ids() -> None:
+    for name, backfill in get_user_id_backfills().items():
+        result = backfill.run()
+        if result["converted"]:
+            logger.info(
+                "Assigned %s legacy %s rows to the default user", result["converted"], name
+            )
+        if result["skipped"]:
+            logger.warning(
+                "%s legacy %s rows clash with an existing (user_id, id) row and stay unassigned",
+                result["skipped"],
+                name,
+            )
+
+
+def _drop_retired_indexes() -> None:
+    for collection, names in get_index_manager().drop_retired().items():
+        logger.info("Dropped retired indexes on %s: %s", collection, names)
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     try:
@@ -32,7 +83,37 @@ async def lifespan(_: FastAPI):
         logger.info("Startup dependency checks passed")
     except SettingsValidationError as exc:
         raise RuntimeError(f"Startup dependency checks failed: {exc}") from exc
+    sync_indexes = settings.storage_backend == "mongo" and settings.mongo_index_sync_on_startup
+    # Rows written before user partitioning are assigned first, then the old global unique
+    # indexes that reject (user_id, id) upserts go; both before any scoped request is served.
+    try:
+        if settings.user_id_backfill_on_startup:
+            await asyncio.to_thread(_backfill_user_ids)
+        if sync_indexes:
+            await asyncio.to_thread(_drop_retired_indexes)
+    except Exception as exc:
+        raise RuntimeError(f"User scoping migration failed: {exc}") from exc
+    index_task = None
+    index_stop = threading.Event()
+    if sync_indexes:
+        index_task = asyncio.create_task(asyncio.to_thread(_sync_indexes, index_stop))
     yield
+    get_llm_gateway().close()
+    close_sync_clients = True
+    if index_task is not None:
+        # Cancelling the task would not stop its worker thread, and closing the clients
+        # under a running create_indexes/drop_index breaks it; let it finish instead.
+        index_stop.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(index_task), _INDEX_SYNC_SHUTDOWN_SECONDS)
+        except TimeoutError:
+            logger.warning("Index sync still running at shutdown; leaving its Mongo client open")
+            close_sync_clients = False
+    if close_sync_clients:
+        get_mongo_client_registry().close_all()
+    await get_async_mongo_client_registry().aclose_all()
+    if settings.storage_backend == "sqlite":
+        get_sqlite_database().close_all()
 
 
 app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime
+
+from app.utils.time import as_utc
 
 
 @dataclass
@@ -6,7 +9,7 @@ class Job:
     id: str
     title: str
     module: str
-    due_at: str | None
+    due_at: datetime | None
     module_weight_percent: int
     estimated_hours: int
     notes: str = ""
@@ -14,4 +17,9 @@ class Job:
     location: str | None = None
     source_url: str | None = None
     match_score: int | None = None
-    discovered_at: str | None = None
+    discovered_at: datetime | None = None
+    user_id: str = ""
+
+    def __post_init__(self) -> None:
+        self.due_at = as_utc(self.due_at)
+        self.discovered_at = as_utc(self.discovered_at)
@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime
+
+from app.utils.time import as_utc, to_iso_z
 
 
 @dataclass
@@ -9,13 +12,14 @@ class Task:
     deadline: str = ""
     priority: int = 1
     module: str | None = None
-    due_at: str | None = None
+    due_at: datetime | None = None
     priority_score: int | None = None
     module_weight_percent: int = 0
     estimated_hours: int = 0
     priority_band: str = "low"
     completed: bool = False
     notes: str = ""
+    user_id: str = ""
 
     def __post_init__(self) -> None:
         if self.module and not self.subject:
@@ -23,10 +27,9 @@ class Task:
         if self.subject and not self.module:
             self.module = self.subject
 
+        self.due_at = as_utc(self.due_at or self.deadline)
         if self.due_at and not self.deadline:
-            self.deadline = self.due_at
-        if self.deadline and not self.due_at:
-            self.due_at = self.deadline
+            self.deadline = to_iso_z(self.due_at)
 
         if self.priority_score is None:
             self.priority_score = int(self.priority)
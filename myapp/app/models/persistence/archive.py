@@ -0,0 +1,163 @@
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from pymongo import ReplaceOne
+
+from app.models.persistence.assistant_repo import _ConversationDocuments
+from app.models.persistence.db import MongoClientRegistry, MongoDB, find_page
+from app.models.persistence.job_repo import _JobDocuments
+from app.models.persistence.task_repo import _TaskDocuments
+from app.utils.time import utc_now
+
+
+@dataclass(frozen=True)
+class ArchivePolicy:
+    name: str
+    id_field: str
+    scope_field: str
+    age_field: str
+    max_age_days: int
+    match: dict = field(default_factory=dict)
+    date_fields: tuple[str, ...] = ()
+
+    @property
+    def archive_name(self) -> str:
+        return f"{self.name}_archive"
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age_days > 0
+
+    def cutoff(self, now: datetime | None = None) -> datetime:
+        moment = (now or datetime.now(UTC)) - timedelta(days=self.max_age_days)
+        return moment.astimezone(UTC)
+
+    def archive_indexes(self) -> list[dict]:
+        return [
+            {
+                "keys": [(self.scope_field, 1), ("archived_at", -1), (self.id_field, -1)],
+                "options": {"name": f"idx_{self.scope_field}_archived_at_{self.id_field}_desc"},
+            },
+            {"keys": [("archived_at", 1)], "options": {"name": "idx_archived_at_asc"}},
+        ]
+
+
+def default_archive_policies(
+    task_days: int = 30,
+    job_days: int = 14,
+    conversation_days: int = 90,
+) -> dict[str, ArchivePolicy]:
+    return {
+        "tasks": ArchivePolicy(
+            name="tasks",
+            id_field="task_id",
+            scope_field="user_id",
+            age_field="updated_at",
+            max_age_days=task_days,
+            match={"completed": True},
+            date_fields=_TaskDocuments.DATE_FIELDS,
+        ),
+        "jobs": ArchivePolicy(
+            name="jobs",
+            id_field="job_id",
+            scope_field="user_id",
+            age_field="due_at",
+            max_age_days=job_days,
+            date_fields=_JobDocuments.DATE_FIELDS,
+        ),
+        "assistant_conversations": ArchivePolicy(
+            name="assistant_conversations",
+            id_field="message_id",
+            scope_field="conversation_id",
+            age_field="created_at",
+            max_age_days=conversation_days,
+            date_fields=_ConversationDocuments.DATE_FIELDS,
+        ),
+    }
+
+
+class ArchiveRepository:
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        policy: ArchivePolicy,
+        mongodb: MongoDB | None = None,
+        collection=None,
+        archive_collection=None,
+        client_registry: MongoClientRegistry | None = None,
+    ) -> None:
+        self.policy = policy
+        self.mongodb = mongodb or MongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=policy.name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+        self.archive_collection = (
+            self.mongodb.database[policy.archive_name]
+            if archive_collection is None
+            else archive_collection
+        )
+
+    def _aged_query(self, now: datetime | None = None) -> dict:
+        # A date bound only matches date values, so rows with a missing age field (or a
+        # legacy string the date migration has not reached yet) stay in the hot tier.
+        return {**self.policy.match, self.policy.age_field: {"$lt": self.policy.cutoff(now)}}
+
+    def archive_batch(self, batch_size: int = 500, now: datetime | None = None) -> int:
+        query = self._aged_query(now)
+        rows = list(
+            self.collection.find(query)
+            .sort([(self.policy.age_field, 1), ("_id", 1)])
+            .limit(max(1, int(batch_size)))
+        )
+        if not rows:
+            return 0
+
+        archived_at = utc_now()
+        # Copy first and delete second: a crash in between leaves a duplicate that the
+        # next run overwrites, never a lost document.
+        self.archive_collection.bulk_write(
+            [
+                ReplaceOne({"_id": row["_id"]}, {**row, "archived_at": archived_at}, upsert=True)
+                for row in rows
+            ],
+            ordered=False,
+        )
+        deleted = self.collection.delete_many(
+            {"_id": {"$in": [row["_id"] for row in rows]}, **query}
+        )
+        return int(deleted.deleted_count)
+
+    def archive(
+        self,
+        batch_size: int = 500,
+        max_batches: int = 20,
+        now: datetime | None = None,
+    ) -> int:
+        if not self.policy.enabled:
+            return 0
+        moved = 0
+        for _ in range(max(1, int(max_batches))):
+            count = self.archive_batch(batch_size=batch_size, now=now)
+            moved += count
+            if count < batch_size:
+                break
+        return moved
+
+    def page_archived(
+        self,
+        scope: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return find_page(
+            self.archive_collection,
+            query={self.policy.scope_field: scope},
+            sort_field="archived_at",
+            id_field=self.policy.id_field,
+            limit=limit,
+            cursor=cursor,
+        )
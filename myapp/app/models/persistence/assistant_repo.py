@@ -1,15 +1,49 @@
-from app.models.persistence.db import MongoDB
+from datetime import datetime
+
+from app.models.persistence.async_db import (
+    AsyncMongoClientRegistry,
+    AsyncMongoDB,
+    async_find_page,
+)
+from app.models.persistence.db import MongoClientRegistry, MongoDB, find_page
 from app.utils.hashing import sha256_text
-from app.utils.time import utc_now_iso
+from app.utils.time import as_utc, utc_now
 
 
-class AssistantConversationRepository:
-    _INDEXES = [
+class _ConversationDocuments:
+    INDEXES = [
         {"keys": [("message_id", 1)], "options": {"unique": True, "name": "uq_message_id"}},
         {"keys": [("conversation_id", 1)], "options": {"name": "idx_conversation_id_asc"}},
         {"keys": [("created_at", 1)], "options": {"name": "idx_created_at_asc"}},
+        {
+            "keys": [("conversation_id", 1), ("created_at", -1), ("message_id", -1)],
+            "options": {"name": "idx_conversation_created_at_message_id_desc"},
+        },
     ]
+    DATE_FIELDS = ("created_at",)
 
+    def build_message(
+        self,
+        conversation_id: str,
+        role: str,
+        text: str,
+        context_page: str,
+        created_at: datetime | str | None = None,
+    ) -> dict:
+        created = as_utc(created_at) or utc_now()
+        return {
+            "message_id": sha256_text(
+                f"{conversation_id}|{role}|{text}|{created.isoformat()}"
+            )[:24],
+            "conversation_id": conversation_id,
+            "role": role,
+            "text": text,
+            "context_page": context_page,
+            "created_at": created,
+        }
+
+
+class AssistantConversationRepository(_ConversationDocuments):
     def __init__(
         self,
         mongo_uri: str,
@@ -17,17 +51,15 @@ class AssistantConversationRepository:
         mongodb: MongoDB | None = None,
         collection_name: str = "assistant_conversations",
         collection=None,
+        client_registry: MongoClientRegistry | None = None,
     ) -> None:
         self.mongodb = mongodb or MongoDB(
             mongo_uri=mongo_uri,
             db_name=db_name,
             collection_name=collection_name,
+            client_registry=client_registry,
         )
-        if collection is None:
-            self.mongodb.ensure_indexes(self._INDEXES)
-            self.collection = self.mongodb.collection
-        else:
-            self.collection = collection
+        self.collection = self.mongodb.collection if collection is None else collection
 
     def add_message(
         self,
@@ -36,26 +68,98 @@ class AssistantConversationRepository:
         text: str,
         context_page: str,
     ) -> str:
-        now_iso = utc_now_iso()
-        message_id = sha256_text(f"{conversation_id}|{role}|{text}|{now_iso}")[:24]
-        self.collection.insert_one(
-            {
-                "message_id": message_id,
-                "conversation_id": conversation_id,
-                "role": role,
-                "text": text,
-                "context_page": context_page,
-                "created_at": now_iso,
-            }
+        row = self.build_message(conversation_id, role, text, context_page)
+        self.collection.insert_one(row)
+        return row["message_id"]
+
+    def append_turn(self, messages: list[dict]) -> list[str]:
+        if not messages:
+            return []
+        self.collection.insert_many([dict(row) for row in messages], ordered=True)
+        return [row["message_id"] for row in messages]
+
+    def page_messages(
+        self,
+        conversation_id: str,
+        limit: int = 12,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        rows, next_cursor = find_page(
+            self.collection,
+            query={"conversation_id": conversation_id},
+            sort_field="created_at",
+            id_field="message_id",
+            limit=limit,
+            cursor=cursor,
+        )
+        rows.reverse()
+        return rows, next_cursor
+
+    def list_messages(
+        self,
+        conversation_id: str,
+        limit: int = 12,
+        cursor: str | None = None,
+    ) -> list[dict]:
+        return self.page_messages(conversation_id, limit=limit, cursor=cursor)[0]
+
+
+class AsyncAssistantConversationRepository(_ConversationDocuments):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        mongodb: AsyncMongoDB | None = None,
+        collection_name: str = "assistant_conversations",
+        collection=None,
+        client_registry: AsyncMongoClientRegistry | None = None,
+    ) -> None:
+        self.mongodb = mongodb or AsyncMongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
         )
-        return message_id
+        self.collection = self.mongodb.collection if collection is None else collection
 
-    def list_messages(self, conversation_id: str, limit: int = 12) -> list[dict]:
-        cursor = (
-            self.collection.find({"conversation_id": conversation_id}, {"_id": 0})
-            .sort("created_at", -1)
-            .limit(max(1, int(limit)))
+    async def add_message(
+        self,
+        conversation_id: str,
+        role: str,
+        text: str,
+        context_page: str,
+    ) -> str:
+        row = self.build_message(conversation_id, role, text, context_page)
+        await self.collection.insert_one(row)
+        return row["message_id"]
+
+    async def append_turn(self, messages: list[dict]) -> list[str]:
+        if not messages:
+            return []
+        await self.collection.insert_many([dict(row) for row in messages], ordered=True)
+        return [row["message_id"] for row in messages]
+
+    async def page_messages(
+        self,
+        conversation_id: str,
+        limit: int = 12,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        rows, next_cursor = await async_find_page(
+            self.collection,
+            query={"conversation_id": conversation_id},
+            sort_field="created_at",
+            id_field="message_id",
+            limit=limit,
+            cursor=cursor,
         )
-        rows = list(cursor)
         rows.reverse()
-        return rows
+        return rows, next_cursor
+
+    async def list_messages(
+        self,
+        conversation_id: str,
+        limit: int = 12,
+        cursor: str | None = None,
+    ) -> list[dict]:
+        return (await self.page_messages(conversation_id, limit=limit, cursor=cursor))[0]
@@ -0,0 +1,90 @@
+import asyncio
+
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import BulkWriteError
+
+from app.models.persistence.db import (
+    BulkUpsertResult,
+    _PooledClientRegistry,
+    bulk_batches,
+    page_query,
+)
+
+
+class AsyncMongoClientRegistry(_PooledClientRegistry):
+    # Not a MongoClientRegistry: its clients must be closed with ``await aclose_all()``.
+    client_class = AsyncMongoClient
+
+    async def aclose_all(self) -> None:
+        for client in self._take_clients():
+            await client.close()
+
+
+default_async_client_registry = AsyncMongoClientRegistry()
+
+
+class ThreadedAsyncRepository:
+    def __init__(self, repo) -> None:
+        self._repo = repo
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._repo, name)
+        if not callable(attr):
+            return attr
+
+        async def call_in_thread(*args, **kwargs):
+            return await asyncio.to_thread(attr, *args, **kwargs)
+
+        return call_in_thread
+
+
+async def async_bulk_upsert(
+    collection, operations: list, batch_size: int = 500
+) -> BulkUpsertResult:
+    result = BulkUpsertResult()
+    for batch in bulk_batches(operations, batch_size):
+        try:
+            result.add(await collection.bulk_write(batch, ordered=False))
+        except BulkWriteError as exc:
+            result.add_failure(exc)
+            raise
+    return result
+
+
+async def async_find_page(
+    collection,
+    query: dict,
+    sort_field: str,
+    id_field: str,
+    limit: int,
+    cursor: str | None = None,
+    direction: int = -1,
+    projection: dict | None = None,
+) -> tuple[list[dict], str | None]:
+    page = page_query(query, sort_field, id_field, limit, cursor, direction, projection)
+    rows = await (
+        collection.find(page.filter, page.projection)
+        .sort(page.sort)
+        .limit(page.fetch)
+        .to_list()
+    )
+    return page.split(rows)
+
+
+class AsyncMongoDB:
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        collection_name: str,
+        client_registry: AsyncMongoClientRegistry | None = None,
+    ) -> None:
+        registry = client_registry or default_async_client_registry
+        self.client = registry.get(mongo_uri)
+        self.database: AsyncDatabase = self.client[db_name]
+        self.collection: AsyncCollection = self.database[collection_name]
+
+    async def ping(self) -> None:
+        await self.client.admin.command("ping")
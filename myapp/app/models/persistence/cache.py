@@ -0,0 +1,138 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class RepositoryCache:
+    def __init__(
+        self,
+        ttl_seconds: float = 5.0,
+        max_entries: int = 256,
+        clock=time.monotonic,
+    ) -> None:
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get_or_load(self, key: tuple, loader):
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            generation = self._generation
+
+        value = loader()
+        with self._lock:
+            # A write that landed while we were loading makes this value stale; skip caching it.
+            if generation == self._generation and self.ttl_seconds > 0:
+                self._entries[key] = (now + self.ttl_seconds, copy.deepcopy(value))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries,
+            }
+
+
+class RepositoryCacheRegistry:
+    def __init__(self, ttl_seconds: float = 5.0, max_entries: int = 256) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._caches: dict[str, RepositoryCache] = {}
+        self._lock = threading.Lock()
+
+    def cache(self, name: str) -> RepositoryCache:
+        with self._lock:
+            cache = self._caches.get(name)
+            if cache is None:
+                cache = RepositoryCache(ttl_seconds=self.ttl_seconds, max_entries=self.max_entries)
+                self._caches[name] = cache
+            return cache
+
+    def stats(self) -> dict:
+        with self._lock:
+            caches = dict(self._caches)
+        return {name: cache.stats() for name, cache in caches.items()}
+
+
+class CachedRepository:
+    def __init__(
+        self,
+        repo,
+        cache: RepositoryCache,
+        read_methods: set[str],
+        write_methods: set[str],
+    ) -> None:
+        self._repo = repo
+        self._cache = cache
+        self._read_methods = set(read_methods)
+        self._write_methods = set(write_methods)
+
+    @property
+    def cache(self) -> RepositoryCache:
+        return self._cache
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._repo, name)
+        if name in self._read_methods:
+            def cached_read(*args, **kwargs):
+                key = (name, args, tuple(sorted(kwargs.items())))
+                return self._cache.get_or_load(key, lambda: attr(*args, **kwargs))
+
+            return cached_read
+        if name in self._write_methods:
+            def invalidating_write(*args, **kwargs):
+                try:
+                    return attr(*args, **kwargs)
+                finally:
+                    self._cache.invalidate()
+
+            return invalidating_write
+        return attr
+
+
+JOB_READ_METHODS = {"list_jobs", "page_jobs", "list_job_fields", "page_job_fields"}
+JOB_WRITE_METHODS = {"upsert_jobs", "bulk_upsert_jobs", "replace_jobs"}
+TASK_READ_METHODS = {
+    "list_tasks",
+    "page_tasks",
+    "get_task",
+    "list_task_fields",
+    "page_task_fields",
+}
+TASK_WRITE_METHODS = {"upsert_tasks", "bulk_upsert_tasks", "replace_tasks", "patch_task"}
+EVENT_READ_METHODS = {"list_events", "page_events"}
+EVENT_WRITE_METHODS = {"upsert_events", "bulk_upsert_events", "replace_events", "sync_events"}
@@ -1,14 +1,202 @@
-from app.models.persistence.db import MongoDB
-from app.utils.time import utc_now_iso
+import json
+from datetime import datetime
 
+from pymongo import DeleteMany, UpdateOne
 
-class CalendarEventRepository:
-    _INDEXES = [
-        {"keys": [("event_id", 1)], "options": {"unique": True, "name": "uq_event_id"}},
+from app.models.persistence.async_db import (
+    AsyncMongoClientRegistry,
+    AsyncMongoDB,
+    async_bulk_upsert,
+    async_find_page,
+)
+from app.models.persistence.db import (
+    BulkUpsertResult,
+    MongoClientRegistry,
+    MongoDB,
+    bulk_upsert,
+    dedupe_last,
+    find_page,
+    user_scope,
+)
+from app.utils.hashing import sha256_text
+from app.utils.time import as_utc, utc_now
+
+
+class _CalendarEventDocuments:
+    INDEXES = [
+        {
+            "keys": [("user_id", 1), ("event_id", 1)],
+            "options": {"unique": True, "name": "uq_user_event_id"},
+        },
+        {"keys": [("event_id", 1)], "options": {"name": "idx_event_id_asc"}},
         {"keys": [("start_at", 1)], "options": {"name": "idx_start_at_asc"}},
         {"keys": [("task_id", 1)], "options": {"name": "idx_task_id_asc"}},
+        {
+            "keys": [("start_at", 1), ("event_id", 1)],
+            "options": {"name": "idx_start_at_event_id_asc"},
+        },
+        {
+            "keys": [("user_id", 1), ("start_at", 1), ("event_id", 1)],
+            "options": {"name": "idx_user_start_at_event_id_asc"},
+        },
     ]
+    RETIRED_INDEXES = ["uq_event_id"]
+    DATE_FIELDS = ("start_at", "end_at", "created_at", "updated_at")
+    _UNHASHED_FIELDS = {"_id", "content_hash", "created_at", "updated_at"}
+    _STORED_PROJECTION = {"_id": 0, "user_id": 1, "event_id": 1, "content_hash": 1}
+
+    def _content_hash(self, event: dict) -> str:
+        content = {
+            key: value for key, value in event.items() if key not in self._UNHASHED_FIELDS
+        }
+        return sha256_text(json.dumps(content, sort_keys=True, default=str))
+
+    @staticmethod
+    def _event_key(event: dict) -> tuple[str, str]:
+        return event.get("user_id") or "", event["event_id"]
+
+    @staticmethod
+    def _bound(value: datetime | str | None, name: str) -> datetime | None:
+        if value is None or value == "":
+            return None
+        parsed = as_utc(value)
+        if parsed is None:
+            raise ValueError(f"Invalid {name}: {value}")
+        return parsed
+
+    def _range_query(
+        self,
+        start_at: datetime | str | None,
+        end_at: datetime | str | None,
+        user_id: str | None = None,
+    ) -> dict:
+        query: dict = user_scope(user_id)
+        lower, upper = self._bound(start_at, "start_at"), self._bound(end_at, "end_at")
+        if lower or upper:
+            range_query: dict = {}
+            if lower:
+                range_query["$gte"] = lower
+            if upper:
+                range_query["$lte"] = upper
+            query["start_at"] = range_query
+        return query
 
+    def _normalize_dates(self, event: dict) -> dict:
+        for field in ("start_at", "end_at"):
+            if isinstance(event.get(field), str):
+                event[field] = as_utc(event[field])
+        return event
+
+    def _stamp_user(self, events: list[dict], user_id: str | None) -> list[dict]:
+        if user_id is None:
+            return [
+                self._normalize_dates({**event, "user_id": event.get("user_id") or ""})
+                for event in events
+            ]
+        return [self._normalize_dates({**event, "user_id": user_id}) for event in events]
+
+    def _stored_hashes(self, rows) -> dict[tuple[str, str], str | None]:
+        return {self._event_key(row): row.get("content_hash") for row in rows}
+
+    def _diff_events(
+        self,
+        events: list[dict],
+        stored: dict[tuple[str, str], str | None],
+        user_id: str | None = None,
+    ) -> tuple[list[dict], list[dict], list[tuple[str, str]], dict]:
+        now = utc_now()
+        incoming = dedupe_last(self._stamp_user(events, user_id), key=self._event_key)
+
+        inserts: list[dict] = []
+        updates: list[dict] = []
+        for event in incoming:
+            doc = {
+                key: value for key, value in event.items() if key not in self._UNHASHED_FIELDS
+            }
+            doc["content_hash"] = self._content_hash(event)
+            doc["updated_at"] = now
+            key = self._event_key(event)
+            if key not in stored:
+                inserts.append({**doc, "created_at": now})
+            elif stored[key] != doc["content_hash"]:
+                updates.append(doc)
+
+        incoming_keys = {self._event_key(event) for event in incoming}
+        stale_keys = [key for key in stored if key not in incoming_keys]
+        return inserts, updates, stale_keys, {
+            "inserted": len(inserts),
+            "updated": len(updates),
+            "deleted": len(stale_keys),
+            "unchanged": len(incoming) - len(inserts) - len(updates),
+        }
+
+    @staticmethod
+    def _split_created_at(doc: dict) -> tuple[dict, dict]:
+        fields = dict(doc)
+        return fields, {"created_at": fields.pop("created_at")}
+
+    def _diff_operations(
+        self,
+        events: list[dict],
+        stored: dict[tuple[str, str], str | None],
+        user_id: str | None = None,
+    ) -> tuple[list, dict]:
+        inserts, updates, stale_keys, result = self._diff_events(events, stored, user_id)
+        # New events are upserts, not inserts: a concurrent sync for the same user may
+        # have written them since the stored hashes were read, and a duplicate-key error
+        # would abort the ordered bulk before its updates and deletes.
+        operations: list = []
+        for doc in inserts:
+            fields, on_insert = self._split_created_at(doc)
+            operations.append(
+                UpdateOne(
+                    {"user_id": doc["user_id"], "event_id": doc["event_id"]},
+                    {"$set": fields, "$setOnInsert": on_insert},
+                    upsert=True,
+                )
+            )
+        operations.extend(
+            UpdateOne({"user_id": doc["user_id"], "event_id": doc["event_id"]}, {"$set": doc})
+            for doc in updates
+        )
+        stale_by_user: dict[str, list[str]] = {}
+        for owner, event_id in stale_keys:
+            stale_by_user.setdefault(owner, []).append(event_id)
+        operations.extend(
+            DeleteMany({"user_id": owner, "event_id": {"$in": event_ids}})
+            for owner, event_ids in stale_by_user.items()
+        )
+        return operations, result
+
+    def _stamp_full_replace(self, events: list[dict], user_id: str | None = None) -> list[dict]:
+        now = utc_now()
+        events = self._stamp_user(events, user_id)
+        for event in events:
+            event["content_hash"] = self._content_hash(event)
+            event.setdefault("created_at", now)
+            event["updated_at"] = now
+        return events
+
+    def _upsert_operations(self, events: list[dict]) -> list[UpdateOne]:
+        now = utc_now()
+        operations = []
+        for event in dedupe_last(self._stamp_user(events, None), key=self._event_key):
+            event["content_hash"] = self._content_hash(event)
+            event["updated_at"] = now
+            operations.append(
+                UpdateOne(
+                    {"user_id": event["user_id"], "event_id": event["event_id"]},
+                    {
+                        "$set": event,
+                        "$setOnInsert": {"created_at": now},
+                    },
+                    upsert=True,
+                )
+            )
+        return operations
+
+
+class CalendarEventRepository(_CalendarEventDocuments):
     def __init__(
         self,
         mongo_uri: str,
@@ -16,65 +204,162 @@ class CalendarEventRepository:
         mongodb: MongoDB | None = None,
         collection_name: str = "calendar_events",
         collection=None,
+        client_registry: MongoClientRegistry | None = None,
+        bulk_batch_size: int = 500,
     ) -> None:
+        self.bulk_batch_size = max(1, int(bulk_batch_size))
         self.mongodb = mongodb or MongoDB(
             mongo_uri=mongo_uri,
             db_name=db_name,
             collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+
+    def page_events(
+        self,
+        start_at: datetime | str | None = None,
+        end_at: datetime | str | None = None,
+        limit: int = 500,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return find_page(
+            self.collection,
+            query=self._range_query(start_at, end_at, user_id),
+            sort_field="start_at",
+            id_field="event_id",
+            limit=limit,
+            cursor=cursor,
+            direction=1,
         )
-        if collection is None:
-            self.mongodb.ensure_indexes(self._INDEXES)
-            self.collection = self.mongodb.collection
-        else:
-            self.collection = collection
 
     def list_events(
         self,
-        start_at: str | None = None,
-        end_at: str | None = None,
+        start_at: datetime | str | None = None,
+        end_at: datetime | str | None = None,
         limit: int = 500,
+        cursor: str | None = None,
+        user_id: str | None = None,
     ) -> list[dict]:
-        query: dict = {}
-        if start_at or end_at:
-            range_query: dict = {}
-            if start_at:
-                range_query["$gte"] = start_at
-            if end_at:
-                range_query["$lte"] = end_at
-            query["start_at"] = range_query
+        return self.page_events(
+            start_at=start_at, end_at=end_at, limit=limit, cursor=cursor, user_id=user_id
+        )[0]
 
-        cursor = (
-            self.collection.find(query, {"_id": 0})
-            .sort("start_at", 1)
-            .limit(max(1, int(limit)))
-        )
-        return list(cursor)
+    def sync_events(self, events: list[dict], user_id: str | None = None) -> dict:
+        rows = self.collection.find(user_scope(user_id), self._STORED_PROJECTION)
+        operations, result = self._diff_operations(events, self._stored_hashes(rows), user_id)
+        if operations:
+            self.collection.bulk_write(operations, ordered=True)
+        return result
+
+    def replace_events(
+        self, events: list[dict], mode: str = "diff", user_id: str | None = None
+    ) -> int:
+        if mode == "diff":
+            result = self.sync_events(events, user_id=user_id)
+            return result["inserted"] + result["updated"] + result["deleted"]
 
-    def replace_events(self, events: list[dict]) -> int:
-        self.collection.delete_many({})
+        self.collection.delete_many(user_scope(user_id))
         if not events:
             return 0
 
-        now_iso = utc_now_iso()
-        for event in events:
-            event.setdefault("created_at", now_iso)
-            event["updated_at"] = now_iso
-        self.collection.insert_many(events)
+        self.collection.insert_many(self._stamp_full_replace(events, user_id))
         return len(events)
 
+    def bulk_upsert_events(self, events: list[dict]) -> BulkUpsertResult:
+        if not events:
+            return BulkUpsertResult()
+        return bulk_upsert(
+            self.collection,
+            self._upsert_operations(events),
+            batch_size=self.bulk_batch_size,
+        )
+
     def upsert_events(self, events: list[dict]) -> int:
+        return self.bulk_upsert_events(events).affected
+
+
+class AsyncCalendarEventRepository(_CalendarEventDocuments):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        mongodb: AsyncMongoDB | None = None,
+        collection_name: str = "calendar_events",
+        collection=None,
+        client_registry: AsyncMongoClientRegistry | None = None,
+        bulk_batch_size: int = 500,
+    ) -> None:
+        self.bulk_batch_size = max(1, int(bulk_batch_size))
+        self.mongodb = mongodb or AsyncMongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+
+    async def page_events(
+        self,
+        start_at: datetime | str | None = None,
+        end_at: datetime | str | None = None,
+        limit: int = 500,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return await async_find_page(
+            self.collection,
+            query=self._range_query(start_at, end_at, user_id),
+            sort_field="start_at",
+            id_field="event_id",
+            limit=limit,
+            cursor=cursor,
+            direction=1,
+        )
+
+    async def list_events(
+        self,
+        start_at: datetime | str | None = None,
+        end_at: datetime | str | None = None,
+        limit: int = 500,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> list[dict]:
+        page = await self.page_events(
+            start_at=start_at, end_at=end_at, limit=limit, cursor=cursor, user_id=user_id
+        )
+        return page[0]
+
+    async def sync_events(self, events: list[dict], user_id: str | None = None) -> dict:
+        rows = await self.collection.find(user_scope(user_id), self._STORED_PROJECTION).to_list()
+        operations, result = self._diff_operations(events, self._stored_hashes(rows), user_id)
+        if operations:
+            await self.collection.bulk_write(operations, ordered=True)
+        return result
+
+    async def replace_events(
+        self, events: list[dict], mode: str = "diff", user_id: str | None = None
+    ) -> int:
+        if mode == "diff":
+            result = await self.sync_events(events, user_id=user_id)
+            return result["inserted"] + result["updated"] + result["deleted"]
+
+        await self.collection.delete_many(user_scope(user_id))
         if not events:
             return 0
 
-        now_iso = utc_now_iso()
-        for event in events:
-            event["updated_at"] = now_iso
-            self.collection.update_one(
-                {"event_id": event["event_id"]},
-                {
-                    "$set": event,
-                    "$setOnInsert": {"created_at": now_iso},
-                },
-                upsert=True,
-            )
+        await self.collection.insert_many(self._stamp_full_replace(events, user_id))
         return len(events)
+
+    async def bulk_upsert_events(self, events: list[dict]) -> BulkUpsertResult:
+        if not events:
+            return BulkUpsertResult()
+        return await async_bulk_upsert(
+            self.collection,
+            self._upsert_operations(events),
+            batch_size=self.bulk_batch_size,
+        )
+
+    async def upsert_events(self, events: list[dict]) -> int:
+        return (await self.bulk_upsert_events(events)).affected
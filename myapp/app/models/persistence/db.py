@@ -1,9 +1,306 @@
+import threading
+from collections.abc import Iterator, Sequence
 from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC
+
 import certifi
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
 from pymongo import MongoClient
 from pymongo.collection import Collection
 from pymongo.database import Database
-from pymongo.errors import OperationFailure
+from pymongo.errors import BulkWriteError
+from pymongo.monitoring import ConnectionPoolListener
+
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+class PoolWaitListener(ConnectionPoolListener):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._failures = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._open_connections = 0
+
+    def _record_wait(self, duration: float | None, failed: bool) -> None:
+        wait_ms = max(0.0, float(duration or 0.0) * 1000.0)
+        with self._lock:
+            if failed:
+                self._failures += 1
+            else:
+                self._checkouts += 1
+            self._total_wait_ms += wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            attempts = self._checkouts + self._failures
+            return {
+                "checkouts": self._checkouts,
+                "checkout_failures": self._failures,
+                "avg_wait_ms": round(self._total_wait_ms / attempts, 3) if attempts else 0.0,
+                "max_wait_ms": round(self._max_wait_ms, 3),
+                "open_connections": self._open_connections,
+            }
+
+    def connection_checked_out(self, event) -> None:
+        self._record_wait(getattr(event, "duration", None), failed=False)
+
+    def connection_check_out_failed(self, event) -> None:
+        self._record_wait(getattr(event, "duration", None), failed=True)
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self._open_connections += 1
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self._open_connections = max(0, self._open_connections - 1)
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_checked_in(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+
+class _PooledClientRegistry:
+    """One pooled client per URI; subclasses pick the driver and own closing."""
+
+    client_class: type = MongoClient
+
+    def __init__(
+        self,
+        max_pool_size: int = 100,
+        min_pool_size: int = 0,
+        max_idle_time_ms: int | None = None,
+        wait_queue_timeout_ms: int | None = None,
+    ) -> None:
+        self.max_pool_size = max(1, int(max_pool_size))
+        self.min_pool_size = max(0, min(int(min_pool_size), self.max_pool_size))
+        self.max_idle_time_ms = max_idle_time_ms
+        self.wait_queue_timeout_ms = wait_queue_timeout_ms
+        self._clients: dict = {}
+        self._listeners: dict[str, PoolWaitListener] = {}
+        self._lock = threading.Lock()
+
+    def _client_options(self) -> dict:
+        # tz_aware makes BSON dates come back as aware UTC datetimes, matching what we write.
+        options: dict = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "tz_aware": True,
+            "tzinfo": UTC,
+        }
+        if self.max_idle_time_ms:
+            options["maxIdleTimeMS"] = int(self.max_idle_time_ms)
+        if self.wait_queue_timeout_ms:
+            options["waitQueueTimeoutMS"] = int(self.wait_queue_timeout_ms)
+        return options
+
+    def get(self, mongo_uri: str):
+        client = self._clients.get(mongo_uri)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(mongo_uri)
+            if client is None:
+                listener = PoolWaitListener()
+                client = self.client_class(
+                    mongo_uri,
+                    tlsCAFile=certifi.where(),
+                    event_listeners=[listener],
+                    **self._client_options(),
+                )
+                self._clients[mongo_uri] = client
+                self._listeners[mongo_uri] = listener
+            return client
+
+    def stats(self) -> dict:
+        with self._lock:
+            listeners = list(self._listeners.values())
+        return {
+            "clients": len(listeners),
+            "max_pool_size": self.max_pool_size,
+            "min_pool_size": self.min_pool_size,
+            "max_idle_time_ms": self.max_idle_time_ms,
+            "wait_queue_timeout_ms": self.wait_queue_timeout_ms,
+            "pools": [listener.stats() for listener in listeners],
+        }
+
+    def _take_clients(self) -> list:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._listeners.clear()
+        return clients
+
+
+class MongoClientRegistry(_PooledClientRegistry):
+    def close_all(self) -> None:
+        for client in self._take_clients():
+            client.close()
+
+
+default_client_registry = MongoClientRegistry()
+
+
+@dataclass
+class BulkUpsertResult:
+    inserted: int = 0
+    matched: int = 0
+    modified: int = 0
+
+    @property
+    def affected(self) -> int:
+        return self.inserted + self.matched
+
+    def add(self, write) -> None:
+        self.inserted += int(write.upserted_count) + int(write.inserted_count)
+        self.matched += int(write.matched_count)
+        self.modified += int(write.modified_count)
+
+    def add_failure(self, exc: BulkWriteError) -> None:
+        # An unordered batch keeps going past a failed write, so the error's details
+        # still count what landed. The totals so far travel on the error as it re-raises.
+        details = exc.details or {}
+        self.inserted += int(details.get("nUpserted", 0)) + int(details.get("nInserted", 0))
+        self.matched += int(details.get("nMatched", 0))
+        self.modified += int(details.get("nModified", 0))
+        exc.upsert_result = self
+
+
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument, tz_aware=True, tzinfo=UTC)
+
+
+def raw_view(collection):
+    # RawBSONDocument keeps the wire bytes and only decodes them when a field is read,
+    # so rows that are skipped or only partly used never pay for a full dict decode.
+    with_options = getattr(collection, "with_options", None)
+    if not callable(with_options):
+        return collection
+    return with_options(codec_options=RAW_CODEC_OPTIONS)
+
+
+def field_projection(fields: Sequence[str], *required: str) -> dict:
+    projection = {"_id": 0}
+    projection.update((field, 1) for field in (*required, *fields))
+    return projection
+
+
+def user_scope(user_id: str | None) -> dict:
+    return {} if user_id is None else {"user_id": user_id}
+
+
+def dedupe_last(rows: list, key) -> list:
+    # Unordered upserts of the same key in one batch can race on the unique index,
+    # so keep only the last write per key (what sequential update_one would leave).
+    latest: dict = {}
+    for row in rows:
+        latest[key(row)] = row
+    return list(latest.values())
+
+
+def bulk_batches(operations: list, batch_size: int) -> Iterator[list]:
+    size = max(1, int(batch_size))
+    for start in range(0, len(operations), size):
+        yield operations[start : start + size]
+
+
+def bulk_upsert(collection, operations: list, batch_size: int = 500) -> BulkUpsertResult:
+    result = BulkUpsertResult()
+    for batch in bulk_batches(operations, batch_size):
+        try:
+            result.add(collection.bulk_write(batch, ordered=False))
+        except BulkWriteError as exc:
+            result.add_failure(exc)
+            raise
+    return result
+
+
+@dataclass(frozen=True)
+class PageQuery:
+    """The find arguments for one keyset page and how to cut the rows it returns.
+
+    `find_page` and `async_find_page` differ only in how they run the find.
+    """
+
+    filter: dict
+    projection: dict
+    sort: list[tuple[str, int]]
+    size: int
+    sort_field: str
+    id_field: str
+
+    @property
+    def fetch(self) -> int:
+        # One extra row tells us whether another page follows.
+        return self.size + 1
+
+    def split(self, rows: list) -> tuple[list, str | None]:
+        if len(rows) <= self.size:
+            return rows, None
+        last = rows[self.size - 1]
+        next_cursor = encode_cursor(last.get(self.sort_field), str(last.get(self.id_field, "")))
+        return rows[: self.size], next_cursor
+
+
+def page_query(
+    query: dict,
+    sort_field: str,
+    id_field: str,
+    limit: int,
+    cursor: str | None = None,
+    direction: int = -1,
+    projection: dict | None = None,
+) -> PageQuery:
+    after = keyset_filter(sort_field, id_field, decode_cursor(cursor), direction=direction)
+    if query and after:
+        query = {"$and": [query, after]}
+    else:
+        query = query or after
+    return PageQuery(
+        filter=query,
+        projection=projection or {"_id": 0},
+        sort=[(sort_field, direction), (id_field, direction)],
+        size=max(1, int(limit)),
+        sort_field=sort_field,
+        id_field=id_field,
+    )
+
+
+def find_page(
+    collection,
+    query: dict,
+    sort_field: str,
+    id_field: str,
+    limit: int,
+    cursor: str | None = None,
+    direction: int = -1,
+    projection: dict | None = None,
+) -> tuple[list[dict], str | None]:
+    page = page_query(query, sort_field, id_field, limit, cursor, direction, projection)
+    rows = list(collection.find(page.filter, page.projection).sort(page.sort).limit(page.fetch))
+    return page.split(rows)
 
 
 class MongoDB:
@@ -12,36 +309,12 @@ class MongoDB:
         mongo_uri: str,
         db_name: str,
         collection_name: str,
+        client_registry: MongoClientRegistry | None = None,
     ) -> None:
-        self.client = MongoClient(mongo_uri, tlsCAFile=certifi.where())
+        registry = client_registry or default_client_registry
+        self.client = registry.get(mongo_uri)
         self.database: Database = self.client[db_name]
         self.collection: Collection = self.database[collection_name]
-        self._indexes_ready = False
-
-    def ensure_indexes(self, indexes: list[dict]) -> None:
-        if self._indexes_ready:
-            return
-        for spec in indexes:
-            keys = spec.get("keys", [])
-            options = spec.get("options", {})
-            if not keys:
-                continue
-            index_name = options.get("name")
-            try:
-                self.collection.create_index(keys, **options)
-            except OperationFailure as exc:
-                # Handle stale index definitions with the same name but different keys.
-                if exc.code == 86 and index_name:
-                    existing = self.collection.index_information().get(index_name)
-                    if existing:
-                        existing_keys = list(existing.get("key", []))
-                        requested_keys = list(keys)
-                        if existing_keys != requested_keys:
-                            self.collection.drop_index(index_name)
-                            self.collection.create_index(keys, **options)
-                            continue
-                raise
-        self._indexes_ready = True
 
     def ping(self) -> None:
         self.client.admin.command("ping")
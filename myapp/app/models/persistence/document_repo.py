@@ -1,19 +1,59 @@
 from bson import ObjectId
-from gridfs import GridFS
+from gridfs import AsyncGridFS, GridFS
 
-from app.models.persistence.db import MongoDB
-from app.utils.time import utc_now_iso
+from app.models.persistence.async_db import (
+    AsyncMongoClientRegistry,
+    AsyncMongoDB,
+    async_find_page,
+)
+from app.models.persistence.db import MongoClientRegistry, MongoDB, find_page
+from app.utils.time import utc_now
 
 
-class DocumentRepository:
-    _INDEXES = [
+class _DocumentDocuments:
+    INDEXES = [
         {"keys": [("doc_id", 1)], "options": {"unique": True, "name": "uq_doc_id"}},
         {"keys": [("user_id", 1)], "options": {"name": "idx_user_id_asc"}},
         {"keys": [("report_type", 1)], "options": {"name": "idx_report_type_asc"}},
         {"keys": [("module", 1)], "options": {"name": "idx_module_asc"}},
         {"keys": [("created_at", 1)], "options": {"name": "idx_created_at_asc"}},
+        {
+            "keys": [("user_id", 1), ("doc_type", 1), ("created_at", -1), ("doc_id", -1)],
+            "options": {"name": "idx_user_doc_type_created_at_doc_id_desc"},
+        },
     ]
 
+    _SUMMARY_PROJECTION = {
+        "_id": 0,
+        "doc_id": 1,
+        "doc_type": 1,
+        "user_id": 1,
+        "title": 1,
+        "filename": 1,
+        "content_type": 1,
+        "file_id": 1,
+        "module": 1,
+        "report_type": 1,
+        "pages": 1,
+        "summary": 1,
+        "highlights": 1,
+        "created_at": 1,
+        "updated_at": 1,
+    }
+    _TEXT_PROJECTION = {"_id": 0, "doc_id": 1, "extracted_text": 1}
+    DATE_FIELDS = ("created_at", "updated_at")
+
+    def _to_row(self, metadata: dict, file_id: object) -> dict:
+        now = utc_now()
+        return {
+            **metadata,
+            "file_id": str(file_id),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+class DocumentRepository(_DocumentDocuments):
     def __init__(
         self,
         mongo_uri: str,
@@ -21,51 +61,130 @@ class DocumentRepository:
         mongodb: MongoDB | None = None,
         collection_name: str = "documents",
         collection=None,
+        client_registry: MongoClientRegistry | None = None,
     ) -> None:
         self.mongodb = mongodb or MongoDB(
             mongo_uri=mongo_uri,
             db_name=db_name,
             collection_name=collection_name,
+            client_registry=client_registry,
         )
-        if collection is None:
-            self.mongodb.ensure_indexes(self._INDEXES)
-            self.collection = self.mongodb.collection
-        else:
-            self.collection = collection
+        self.collection = self.mongodb.collection if collection is None else collection
 
         self.fs = GridFS(self.mongodb.database)
 
     def create_document(self, metadata: dict, file_bytes: bytes) -> dict:
-        now_iso = utc_now_iso()
         file_id = self.fs.put(
             file_bytes,
             filename=metadata["filename"],
             content_type=metadata.get("content_type", "application/pdf"),
             metadata={"doc_id": metadata["doc_id"]},
         )
-        row = {
-            **metadata,
-            "file_id": str(file_id),
-            "created_at": now_iso,
-            "updated_at": now_iso,
-        }
+        row = self._to_row(metadata, file_id)
         self.collection.insert_one(row)
         return row
 
-    def list_documents(self, doc_type: str, user_id: str, limit: int = 200) -> list[dict]:
-        cursor = (
-            self.collection.find(
-                {"doc_type": doc_type, "user_id": user_id},
-                {"_id": 0},
-            )
-            .sort("created_at", -1)
-            .limit(max(1, int(limit)))
+    def page_documents(
+        self,
+        doc_type: str,
+        user_id: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return find_page(
+            self.collection,
+            query={"doc_type": doc_type, "user_id": user_id},
+            sort_field="created_at",
+            id_field="doc_id",
+            limit=limit,
+            cursor=cursor,
+            projection=self._SUMMARY_PROJECTION,
         )
-        return list(cursor)
+
+    def list_documents(
+        self,
+        doc_type: str,
+        user_id: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> list[dict]:
+        return self.page_documents(doc_type, user_id, limit=limit, cursor=cursor)[0]
 
     def get_document(self, doc_id: str) -> dict | None:
         return self.collection.find_one({"doc_id": doc_id}, {"_id": 0})
 
+    def get_document_text(self, doc_id: str) -> str | None:
+        row = self.collection.find_one({"doc_id": doc_id}, self._TEXT_PROJECTION)
+        return str(row.get("extracted_text") or "") if row else None
+
     def read_file_bytes(self, file_id: str) -> bytes:
         grid_out = self.fs.get(ObjectId(file_id))
         return grid_out.read()
+
+
+class AsyncDocumentRepository(_DocumentDocuments):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        mongodb: AsyncMongoDB | None = None,
+        collection_name: str = "documents",
+        collection=None,
+        client_registry: AsyncMongoClientRegistry | None = None,
+    ) -> None:
+        self.mongodb = mongodb or AsyncMongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+        self.fs = AsyncGridFS(self.mongodb.database)
+
+    async def create_document(self, metadata: dict, file_bytes: bytes) -> dict:
+        file_id = await self.fs.put(
+            file_bytes,
+            filename=metadata["filename"],
+            content_type=metadata.get("content_type", "application/pdf"),
+            metadata={"doc_id": metadata["doc_id"]},
+        )
+        row = self._to_row(metadata, file_id)
+        await self.collection.insert_one(row)
+        return row
+
+    async def page_documents(
+        self,
+        doc_type: str,
+        user_id: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return await async_find_page(
+            self.collection,
+            query={"doc_type": doc_type, "user_id": user_id},
+            sort_field="created_at",
+            id_field="doc_id",
+            limit=limit,
+            cursor=cursor,
+            projection=self._SUMMARY_PROJECTION,
+        )
+
+    async def list_documents(
+        self,
+        doc_type: str,
+        user_id: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> list[dict]:
+        return (await self.page_documents(doc_type, user_id, limit=limit, cursor=cursor))[0]
+
+    async def get_document(self, doc_id: str) -> dict | None:
+        return await self.collection.find_one({"doc_id": doc_id}, {"_id": 0})
+
+    async def get_document_text(self, doc_id: str) -> str | None:
+        row = await self.collection.find_one({"doc_id": doc_id}, self._TEXT_PROJECTION)
+        return str(row.get("extracted_text") or "") if row else None
+
+    async def read_file_bytes(self, file_id: str) -> bytes:
+        grid_out = await self.fs.get(ObjectId(file_id))
+        return await grid_out.read()
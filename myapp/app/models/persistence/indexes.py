@@ -0,0 +1,165 @@
+import threading
+from dataclasses import dataclass, field
+
+from pymongo import IndexModel
+
+from app.models.persistence.db import MongoClientRegistry, default_client_registry
+
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+
+@dataclass
+class IndexTarget:
+    db_name: str
+    collection_name: str
+    indexes: list[dict]
+    retired: list[str] = field(default_factory=list)
+
+
+@dataclass
+class IndexPlan:
+    db_name: str
+    collection_name: str
+    create: list[dict] = field(default_factory=list)
+    rebuild: list[dict] = field(default_factory=list)
+    satisfied: list[str] = field(default_factory=list)
+    drop: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.create or self.rebuild or self.drop)
+
+    def summary(self) -> dict:
+        return {
+            "collection": f"{self.db_name}.{self.collection_name}",
+            "create": [spec["options"]["name"] for spec in self.create],
+            "rebuild": [spec["options"]["name"] for spec in self.rebuild],
+            "satisfied": list(self.satisfied),
+            "drop": list(self.drop),
+        }
+
+
+def _key_list(keys) -> list[tuple[str, object]]:
+    items = keys.items() if hasattr(keys, "items") else keys
+    return [(str(name), direction) for name, direction in items]
+
+
+def _same_options(existing: dict, options: dict) -> bool:
+    return all(existing.get(option) == options.get(option) for option in _COMPARED_OPTIONS)
+
+
+def diff_indexes(
+    existing: list[dict], declared: list[dict]
+) -> tuple[list[dict], list[dict], list[str]]:
+    by_name = {row.get("name"): row for row in existing}
+    by_keys = {tuple(_key_list(row.get("key", {}))): row for row in existing}
+
+    create: list[dict] = []
+    rebuild: list[dict] = []
+    satisfied: list[str] = []
+    for spec in declared:
+        keys = _key_list(spec.get("keys", []))
+        options = spec.get("options", {})
+        name = options.get("name")
+        if not keys or not name:
+            continue
+
+        current = by_name.get(name)
+        if current is None:
+            other = by_keys.get(tuple(keys))
+            if other is None:
+                create.append(spec)
+            elif _same_options(other, options):
+                # Same index under another name already serves the query; creating it
+                # again would fail with IndexOptionsConflict.
+                satisfied.append(name)
+            else:
+                # Same keys but e.g. no TTL or uniqueness: the declared options were never
+                # applied, so the other index has to be replaced.
+                rebuild.append({**spec, "replaces": other.get("name")})
+            continue
+
+        same_keys = _key_list(current.get("key", {})) == keys
+        if same_keys and _same_options(current, options):
+            satisfied.append(name)
+        else:
+            rebuild.append(spec)
+    return create, rebuild, satisfied
+
+
+class IndexManager:
+    def __init__(self, mongo_uri: str, client_registry: MongoClientRegistry | None = None) -> None:
+        self.mongo_uri = mongo_uri
+        self.client_registry = client_registry or default_client_registry
+        self.targets: list[IndexTarget] = []
+
+    def register(
+        self,
+        db_name: str,
+        collection_name: str,
+        indexes: list[dict],
+        retired: list[str] | None = None,
+    ) -> None:
+        self.targets.append(
+            IndexTarget(db_name, collection_name, list(indexes), list(retired or []))
+        )
+
+    def _collection(self, target: IndexTarget):
+        client = self.client_registry.get(self.mongo_uri)
+        return client[target.db_name][target.collection_name]
+
+    def plan(self) -> list[IndexPlan]:
+        plans: list[IndexPlan] = []
+        for target in self.targets:
+            existing = list(self._collection(target).list_indexes())
+            # Retired indexes are dropped, so they cannot satisfy a declared key pattern.
+            drop = [row["name"] for row in existing if row.get("name") in target.retired]
+            current = [row for row in existing if row.get("name") not in drop]
+            create, rebuild, satisfied = diff_indexes(current, target.indexes)
+            plans.append(
+                IndexPlan(
+                    target.db_name, target.collection_name, create, rebuild, satisfied, drop
+                )
+            )
+        return plans
+
+    def drop_retired(self) -> dict[str, list[str]]:
+        dropped: dict[str, list[str]] = {}
+        for target in self.targets:
+            if not target.retired:
+                continue
+            collection = self._collection(target)
+            names = [
+                row["name"]
+                for row in collection.list_indexes()
+                if row.get("name") in target.retired
+            ]
+            for name in names:
+                collection.drop_index(name)
+            if names:
+                dropped[f"{target.db_name}.{target.collection_name}"] = names
+        return dropped
+
+    def apply(
+        self, allow_rebuild: bool = False, stop: threading.Event | None = None
+    ) -> list[IndexPlan]:
+        # ``stop`` is checked between collections; a running index build is not interrupted.
+        plans = self.plan()
+        for target, plan in zip(self.targets, plans):
+            if stop is not None and stop.is_set():
+                break
+            if not plan.changed:
+                continue
+            collection = self._collection(target)
+            for name in plan.drop:
+                collection.drop_index(name)
+            pending = list(plan.create)
+            if allow_rebuild:
+                for spec in plan.rebuild:
+                    collection.drop_index(spec.get("replaces") or spec["options"]["name"])
+                pending.extend(plan.rebuild)
+            if pending:
+                collection.create_indexes(
+                    [IndexModel(spec["keys"], **spec.get("options", {})) for spec in pending]
+                )
+        return plans
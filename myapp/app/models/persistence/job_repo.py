@@ -1,42 +1,63 @@
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+
+from pymongo import UpdateOne
+
 from app.models.domain.job import Job
-from app.models.persistence.db import MongoDB
-from app.utils.time import utc_now_iso
+from app.models.persistence.async_db import (
+    AsyncMongoClientRegistry,
+    AsyncMongoDB,
+    async_bulk_upsert,
+    async_find_page,
+)
+from app.models.persistence.db import (
+    BulkUpsertResult,
+    MongoClientRegistry,
+    MongoDB,
+    bulk_upsert,
+    dedupe_last,
+    field_projection,
+    find_page,
+    raw_view,
+    user_scope,
+)
+from app.utils.time import utc_now
 
 
-class JobRepository:
-    _INDEXES = [
-        {"keys": [("job_id", 1)], "options": {"unique": True, "name": "uq_job_id"}},
+class _JobDocuments:
+    INDEXES = [
+        {
+            "keys": [("user_id", 1), ("job_id", 1)],
+            "options": {"unique": True, "name": "uq_user_job_id"},
+        },
+        {"keys": [("job_id", 1)], "options": {"name": "idx_job_id_asc"}},
         {
-            "keys": [("source_url", 1)],
-            "options": {"unique": True, "sparse": True, "name": "uq_source_url_sparse"},
+            "keys": [("user_id", 1), ("source_url", 1)],
+            "options": {
+                "unique": True,
+                "partialFilterExpression": {"source_url": {"$type": "string"}},
+                "name": "uq_user_source_url",
+            },
         },
         {"keys": [("discovered_at", 1)], "options": {"name": "idx_discovered_at_asc"}},
         {"keys": [("created_at", 1)], "options": {"name": "idx_created_at_asc"}},
         {"keys": [("updated_at", 1)], "options": {"name": "idx_updated_at_asc"}},
+        {
+            "keys": [("created_at", -1), ("job_id", -1)],
+            "options": {"name": "idx_created_at_job_id_desc"},
+        },
+        {
+            "keys": [("user_id", 1), ("created_at", -1), ("job_id", -1)],
+            "options": {"name": "idx_user_created_at_job_id_desc"},
+        },
     ]
+    RETIRED_INDEXES = ["uq_job_id", "uq_source_url_sparse"]
+    DATE_FIELDS = ("due_at", "discovered_at", "created_at", "updated_at")
 
-    def __init__(
-        self,
-        mongo_uri: str,
-        db_name: str,
-        mongodb: MongoDB | None = None,
-        collection_name: str = "jobs",
-        collection=None,
-    ) -> None:
-        self.mongodb = mongodb or MongoDB(
-            mongo_uri=mongo_uri,
-            db_name=db_name,
-            collection_name=collection_name,
-        )
-        if collection is None:
-            self.mongodb.ensure_indexes(self._INDEXES)
-            self.collection = self.mongodb.collection
-        else:
-            self.collection = collection
-
-    def _to_doc(self, job: Job, now_iso: str) -> dict:
+    def _to_doc(self, job: Job, now: datetime) -> dict:
         return {
             "job_id": job.id,
+            "user_id": job.user_id,
             "title": job.title,
             "module": job.module,
             "due_at": job.due_at,
@@ -47,8 +68,8 @@ class JobRepository:
             "location": job.location,
             "source_url": job.source_url,
             "match_score": job.match_score,
-            "discovered_at": job.discovered_at or now_iso,
-            "updated_at": now_iso,
+            "discovered_at": job.discovered_at or now,
+            "updated_at": now,
         }
 
     def _to_job(self, row: dict) -> Job:
@@ -65,31 +86,193 @@ class JobRepository:
             source_url=row.get("source_url"),
             match_score=row.get("match_score"),
             discovered_at=row.get("discovered_at"),
+            user_id=row.get("user_id") or "",
         )
 
-    def list_jobs(self, limit: int = 200) -> list[Job]:
-        cursor = (
-            self.collection.find({}, {"_id": 0})
-            .sort("created_at", -1)
-            .limit(max(1, int(limit)))
-        )
-        return [self._to_job(row) for row in cursor]
-
-    def upsert_jobs(self, jobs: list[Job]) -> int:
-        if not jobs:
-            return 0
-
-        now_iso = utc_now_iso()
-        for job in jobs:
-            self.collection.update_one(
-                {"job_id": job.id},
+    def _upsert_operations(self, jobs: list[Job]) -> list[UpdateOne]:
+        now = utc_now()
+        return [
+            UpdateOne(
+                {"user_id": job.user_id, "job_id": job.id},
                 {
-                    "$set": self._to_doc(job, now_iso=now_iso),
-                    "$setOnInsert": {"created_at": now_iso},
+                    "$set": self._to_doc(job, now=now),
+                    "$setOnInsert": {"created_at": now},
                 },
                 upsert=True,
             )
-        return len(jobs)
+            for job in dedupe_last(jobs, key=lambda job: (job.user_id, job.id))
+        ]
+
+
+class JobRepository(_JobDocuments):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        mongodb: MongoDB | None = None,
+        collection_name: str = "jobs",
+        collection=None,
+        client_registry: MongoClientRegistry | None = None,
+        bulk_batch_size: int = 500,
+    ) -> None:
+        self.bulk_batch_size = max(1, int(bulk_batch_size))
+        self.mongodb = mongodb or MongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+
+    def page_jobs(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[Job], str | None]:
+        rows, next_cursor = find_page(
+            self.collection,
+            query=user_scope(user_id),
+            sort_field="created_at",
+            id_field="job_id",
+            limit=limit,
+            cursor=cursor,
+        )
+        return [self._to_job(row) for row in rows], next_cursor
+
+    def list_jobs(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> list[Job]:
+        return self.page_jobs(limit=limit, cursor=cursor, user_id=user_id)[0]
+
+    def page_job_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[Mapping], str | None]:
+        # Rows are undecoded BSON limited to `fields` (plus the created_at/job_id cursor keys).
+        return find_page(
+            raw_view(self.collection),
+            query=user_scope(user_id),
+            sort_field="created_at",
+            id_field="job_id",
+            limit=limit,
+            cursor=cursor,
+            projection=field_projection(fields, "created_at", "job_id"),
+        )
+
+    def list_job_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> list[Mapping]:
+        return self.page_job_fields(fields, limit=limit, cursor=cursor, user_id=user_id)[0]
+
+    def bulk_upsert_jobs(self, jobs: list[Job]) -> BulkUpsertResult:
+        if not jobs:
+            return BulkUpsertResult()
+        return bulk_upsert(
+            self.collection,
+            self._upsert_operations(jobs),
+            batch_size=self.bulk_batch_size,
+        )
+
+    def upsert_jobs(self, jobs: list[Job]) -> int:
+        return self.bulk_upsert_jobs(jobs).affected
 
     def replace_jobs(self, jobs: list[Job]) -> int:
         return self.upsert_jobs(jobs)
+
+
+class AsyncJobRepository(_JobDocuments):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        mongodb: AsyncMongoDB | None = None,
+        collection_name: str = "jobs",
+        collection=None,
+        client_registry: AsyncMongoClientRegistry | None = None,
+        bulk_batch_size: int = 500,
+    ) -> None:
+        self.bulk_batch_size = max(1, int(bulk_batch_size))
+        self.mongodb = mongodb or AsyncMongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+
+    async def page_jobs(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[Job], str | None]:
+        rows, next_cursor = await async_find_page(
+            self.collection,
+            query=user_scope(user_id),
+            sort_field="created_at",
+            id_field="job_id",
+            limit=limit,
+            cursor=cursor,
+        )
+        return [self._to_job(row) for row in rows], next_cursor
+
+    async def list_jobs(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> list[Job]:
+        return (await self.page_jobs(limit=limit, cursor=cursor, user_id=user_id))[0]
+
+    async def page_job_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[Mapping], str | None]:
+        return await async_find_page(
+            raw_view(self.collection),
+            query=user_scope(user_id),
+            sort_field="created_at",
+            id_field="job_id",
+            limit=limit,
+            cursor=cursor,
+            projection=field_projection(fields, "created_at", "job_id"),
+        )
+
+    async def list_job_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> list[Mapping]:
+        page = await self.page_job_fields(fields, limit=limit, cursor=cursor, user_id=user_id)
+        return page[0]
+
+    async def bulk_upsert_jobs(self, jobs: list[Job]) -> BulkUpsertResult:
+        if not jobs:
+            return BulkUpsertResult()
+        return await async_bulk_upsert(
+            self.collection,
+            self._upsert_operations(jobs),
+            batch_size=self.bulk_batch_size,
+        )
+
+    async def upsert_jobs(self, jobs: list[Job]) -> int:
+        return (await self.bulk_upsert_jobs(jobs)).affected
+
+    async def replace_jobs(self, jobs: list[Job]) -> int:
+        return await self.upsert_jobs(jobs)
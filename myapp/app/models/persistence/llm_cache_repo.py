@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from app.models.persistence.db import MongoClientRegistry, MongoDB
+from app.utils.time import as_utc, utc_now
+
+
+class _LLMCacheDocuments:
+    INDEXES = [
+        {"keys": [("cache_key", 1)], "options": {"unique": True, "name": "uq_cache_key"}},
+        # Mongo's TTL monitor deletes rows once expires_at has passed.
+        {
+            "keys": [("expires_at", 1)],
+            "options": {"expireAfterSeconds": 0, "name": "ttl_expires_at"},
+        },
+        {"keys": [("created_at", 1)], "options": {"name": "idx_created_at_asc"}},
+    ]
+    DATE_FIELDS = ("expires_at", "created_at")
+
+    def build_entry(
+        self,
+        cache_key: str,
+        call_site: str,
+        text: str,
+        expires_at: datetime,
+    ) -> dict:
+        return {
+            "cache_key": cache_key,
+            "call_site": call_site,
+            "text": text,
+            "expires_at": as_utc(expires_at),
+            "created_at": utc_now(),
+        }
+
+
+class LLMCacheRepository(_LLMCacheDocuments):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        mongodb: MongoDB | None = None,
+        collection_name: str = "llm_cache",
+        collection=None,
+        client_registry: MongoClientRegistry | None = None,
+    ) -> None:
+        self.mongodb = mongodb or MongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+
+    def get_entry(self, cache_key: str, now: datetime | None = None) -> dict | None:
+        # The TTL monitor runs about once a minute, so expiry is also checked on read.
+        return self.collection.find_one(
+            {"cache_key": cache_key, "expires_at": {"$gt": now or utc_now()}},
+            {"_id": 0, "text": 1, "expires_at": 1},
+        )
+
+    def put_entry(self, cache_key: str, call_site: str, text: str, expires_at: datetime) -> None:
+        row = self.build_entry(cache_key, call_site, text, expires_at)
+        self.collection.replace_one({"cache_key": cache_key}, row, upsert=True)
+
+    def prune(self, max_entries: int, now: datetime | None = None) -> int:
+        excess = self.collection.estimated_document_count() - max(0, int(max_entries))
+        if excess <= 0:
+            return 0
+        oldest = self.collection.find({}, {"_id": 1}).sort([("created_at", 1)]).limit(excess)
+        ids = [row["_id"] for row in oldest]
+        if not ids:
+            return 0
+        return self.collection.delete_many({"_id": {"$in": ids}}).deleted_count
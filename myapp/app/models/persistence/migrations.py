@@ -0,0 +1,289 @@
+from abc import ABC, abstractmethod
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.models.persistence.db import MongoClientRegistry, MongoDB
+from app.models.persistence.sqlite_db import SqliteCollection, encode_date
+from app.utils.time import as_utc, utc_now
+
+CHECKPOINT_COLLECTION = "migrations"
+_DUPLICATE_KEY = 11000
+
+
+class _BatchedMigration(ABC):
+    """Rewrites the rows `_convert` picks out of a collection, one batch at a time.
+
+    Progress is checkpointed after every batch, so an interrupted run resumes after the
+    last converted row instead of rescanning the collection.
+    """
+
+    def __init__(self, name: str, checkpoint_id: str) -> None:
+        self.name = name
+        self.checkpoint_id = checkpoint_id
+
+    @abstractmethod
+    def _convert(self, row: dict) -> tuple[dict, bool]:
+        ...
+
+    @abstractmethod
+    def _load_checkpoint(self) -> dict | None:
+        ...
+
+    @abstractmethod
+    def _save_checkpoint(self, state: dict) -> None:
+        ...
+
+    @abstractmethod
+    def _clear_checkpoint(self) -> None:
+        ...
+
+    @abstractmethod
+    def _next_batch(self, last_id: object, batch_size: int) -> list[tuple[object, dict]]:
+        ...
+
+    @abstractmethod
+    def _apply(self, updates: list[tuple[object, dict]]) -> int:
+        """Writes the updates and returns how many of them were applied."""
+
+    def run(
+        self,
+        batch_size: int = 500,
+        max_batches: int | None = None,
+        restart: bool = False,
+    ) -> dict:
+        if restart:
+            self._clear_checkpoint()
+        state = self._load_checkpoint() or {
+            "last_id": None,
+            "converted": 0,
+            "skipped": 0,
+            "done": False,
+        }
+        size = max(1, int(batch_size))
+        batches = 0
+        while not state["done"] and (max_batches is None or batches < max_batches):
+            rows = self._next_batch(state.get("last_id"), size)
+            updates = []
+            for row_id, row in rows:
+                changes, unconvertible = self._convert(row)
+                if changes:
+                    updates.append((row_id, changes))
+                state["skipped"] += int(unconvertible)
+            applied = self._apply(updates) if updates else 0
+            state["converted"] += applied
+            state["skipped"] += len(updates) - applied
+            if rows:
+                state["last_id"] = rows[-1][0]
+            state["done"] = len(rows) < size
+            state["updated_at"] = utc_now()
+            self._save_checkpoint(state)
+            batches += 1
+        return {
+            "converted": state["converted"],
+            "skipped": state["skipped"],
+            "done": state["done"],
+        }
+
+
+class _MongoCheckpoints:
+    checkpoint_id: str
+
+    def _load_checkpoint(self) -> dict | None:
+        return self.checkpoints.find_one({"_id": self.checkpoint_id}, {"_id": 0})
+
+    def _save_checkpoint(self, state: dict) -> None:
+        self.checkpoints.replace_one({"_id": self.checkpoint_id}, state, upsert=True)
+
+    def _clear_checkpoint(self) -> None:
+        self.checkpoints.delete_one({"_id": self.checkpoint_id})
+
+
+class _SqliteCheckpoints:
+    checkpoint_id: str
+    checkpoints: SqliteCollection
+
+    def _load_checkpoint(self) -> dict | None:
+        state = self.checkpoints.get(self.checkpoint_id)
+        if state is not None:
+            state.pop("_id", None)
+        return state
+
+    def _save_checkpoint(self, state: dict) -> None:
+        self.checkpoints.upsert_many([({"_id": self.checkpoint_id, **state}, {})])
+
+    def _clear_checkpoint(self) -> None:
+        self.checkpoints.delete_keys([self.checkpoint_id])
+
+
+class _IsoDateMigration(_BatchedMigration):
+    """Rewrites legacy ISO-8601 string timestamps as native dates.
+
+    Strings that do not parse are left untouched and counted as skipped.
+    """
+
+    def __init__(self, name: str, fields: tuple[str, ...]) -> None:
+        super().__init__(name, f"iso_dates:{name}")
+        self.fields = tuple(fields)
+
+    def _convert(self, row: dict) -> tuple[dict, bool]:
+        changes: dict = {}
+        unparsable = False
+        for field in self.fields:
+            value = row.get(field)
+            if not isinstance(value, str):
+                continue
+            if not value.strip():
+                changes[field] = None
+                continue
+            parsed = as_utc(value)
+            if parsed is None:
+                unparsable = True
+            else:
+                changes[field] = parsed
+        return changes, unparsable
+
+
+class _UserIdBackfill(_BatchedMigration):
+    """Assigns rows written before user partitioning to one user.
+
+    A row whose (user_id, id) pair is already taken by a newer row is left untouched
+    and counted as skipped.
+    """
+
+    def __init__(self, name: str, user_id: str) -> None:
+        super().__init__(name, f"user_id:{name}")
+        self.user_id = user_id
+
+    def _convert(self, row: dict) -> tuple[dict, bool]:
+        if row.get("user_id"):
+            return {}, False
+        return {"user_id": self.user_id}, False
+
+
+class IsoDateMigration(_MongoCheckpoints, _IsoDateMigration):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        collection_name: str,
+        fields: tuple[str, ...],
+        mongodb: MongoDB | None = None,
+        collection=None,
+        checkpoints=None,
+        client_registry: MongoClientRegistry | None = None,
+    ) -> None:
+        super().__init__(collection_name, fields)
+        self.mongodb = mongodb or MongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+        self.checkpoints = (
+            self.mongodb.database[CHECKPOINT_COLLECTION] if checkpoints is None else checkpoints
+        )
+
+    def _next_batch(self, last_id: object, batch_size: int) -> list[tuple[object, dict]]:
+        # Only string-typed values match, so migrated rows fall out of the scan; walking
+        # _id keeps rows with unparsable strings from being re-read on every batch.
+        query: dict = {"$or": [{field: {"$type": "string"}} for field in self.fields]}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        projection = {field: 1 for field in self.fields}
+        rows = self.collection.find(query, projection).sort([("_id", 1)]).limit(batch_size)
+        return [(row["_id"], row) for row in rows]
+
+    def _apply(self, updates: list[tuple[object, dict]]) -> int:
+        self.collection.bulk_write(
+            [UpdateOne({"_id": row_id}, {"$set": changes}) for row_id, changes in updates],
+            ordered=False,
+        )
+        return len(updates)
+
+
+class SqliteIsoDateMigration(_SqliteCheckpoints, _IsoDateMigration):
+    def __init__(self, collection: SqliteCollection, fields: tuple[str, ...]) -> None:
+        super().__init__(collection.name, fields)
+        self.collection = collection
+        self.checkpoints = SqliteCollection(collection.database, CHECKPOINT_COLLECTION, "_id")
+
+    def _convert(self, row: dict) -> tuple[dict, bool]:
+        changes, unparsable = super()._convert(row)
+        # Rows written before the fixed-width format compare out of order; values that
+        # are already normalized are left alone so reruns write nothing.
+        unchanged = {
+            field
+            for field, value in changes.items()
+            if value is not None and encode_date(value) == row[field]
+        }
+        return {field: changes[field] for field in changes if field not in unchanged}, unparsable
+
+    def _next_batch(self, last_id: object, batch_size: int) -> list[tuple[object, dict]]:
+        return self.collection.scan(after=last_id, limit=batch_size)
+
+    def _apply(self, updates: list[tuple[object, dict]]) -> int:
+        self.collection.patch_many(updates)
+        return len(updates)
+
+
+class UserIdBackfill(_MongoCheckpoints, _UserIdBackfill):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        collection_name: str,
+        user_id: str,
+        mongodb: MongoDB | None = None,
+        collection=None,
+        checkpoints=None,
+        client_registry: MongoClientRegistry | None = None,
+    ) -> None:
+        super().__init__(collection_name, user_id)
+        self.mongodb = mongodb or MongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+        self.checkpoints = (
+            self.mongodb.database[CHECKPOINT_COLLECTION] if checkpoints is None else checkpoints
+        )
+
+    def _next_batch(self, last_id: object, batch_size: int) -> list[tuple[object, dict]]:
+        # $in [None, ""] matches a missing, null or empty user_id. Rows that could not be
+        # assigned keep matching, so the scan walks _id rather than restarting each batch.
+        query: dict = {"user_id": {"$in": [None, ""]}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        rows = self.collection.find(query, {"user_id": 1}).sort([("_id", 1)]).limit(batch_size)
+        return [(row["_id"], row) for row in rows]
+
+    def _apply(self, updates: list[tuple[object, dict]]) -> int:
+        try:
+            self.collection.bulk_write(
+                [UpdateOne({"_id": row_id}, {"$set": changes}) for row_id, changes in updates],
+                ordered=False,
+            )
+        except BulkWriteError as exc:
+            errors = exc.details.get("writeErrors", [])
+            if any(error.get("code") != _DUPLICATE_KEY for error in errors):
+                raise
+            return len(updates) - len(errors)
+        return len(updates)
+
+
+class SqliteUserIdBackfill(_SqliteCheckpoints, _UserIdBackfill):
+    def __init__(self, collection: SqliteCollection, user_id: str) -> None:
+        super().__init__(collection.name, user_id)
+        self.collection = collection
+        self.checkpoints = SqliteCollection(collection.database, CHECKPOINT_COLLECTION, "_id")
+
+    def _next_batch(self, last_id: object, batch_size: int) -> list[tuple[object, dict]]:
+        return self.collection.scan(after=last_id, limit=batch_size)
+
+    def _apply(self, updates: list[tuple[object, dict]]) -> int:
+        # user_id is part of the row key, so assigned rows also move to their scoped key.
+        return self.collection.rekey_many(updates)
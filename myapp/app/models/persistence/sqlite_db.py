@@ -0,0 +1,419 @@
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+from app.models.persistence.db import BulkUpsertResult
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.time import as_utc, utc_now
+
+_FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+KEY_SEPARATOR = "\x1f"
+# Fixed-width UTC text, so json_extract comparisons and ORDER BY sort chronologically.
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def encode_date(value: datetime) -> str:
+    return value.astimezone(UTC).strftime(DATE_FORMAT)
+
+
+def _encode(value: object) -> object:
+    return encode_date(value) if isinstance(value, datetime) else value
+
+
+def _encode_params(params: tuple | list) -> tuple:
+    return tuple(_encode(value) for value in params)
+
+
+def _dumps(value: object) -> str:
+    return json.dumps(
+        value,
+        default=lambda item: encode_date(item) if isinstance(item, datetime) else str(item),
+        separators=(",", ":"),
+    )
+
+
+def json_field(field: str) -> str:
+    if not _FIELD_PATTERN.match(field):
+        raise ValueError(f"Invalid field name: {field}")
+    return f"json_extract(doc, '$.{field}')"
+
+
+def json_select(fields) -> str:
+    # A json_object of only these fields, so SQLite never hands back the full document.
+    pairs = ", ".join(f"'{field}', {json_field(field)}" for field in dict.fromkeys(fields))
+    return f"json_object({pairs})"
+
+
+class SqliteDatabase:
+    def __init__(self, path: str | Path, busy_timeout_ms: int = 5000) -> None:
+        self.path = str(path)
+        self.busy_timeout_ms = max(0, int(busy_timeout_ms))
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        self._local.conn = conn
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+class SqliteCollection:
+    def __init__(
+        self,
+        database: SqliteDatabase,
+        name: str,
+        key_field: str | tuple[str, ...],
+        indexes: list[dict] | None = None,
+        retired_indexes: list[str] | None = None,
+        date_fields: tuple[str, ...] = (),
+    ) -> None:
+        if not _FIELD_PATTERN.match(name):
+            raise ValueError(f"Invalid collection name: {name}")
+        self.database = database
+        self.name = name
+        self.key_fields = (key_field,) if isinstance(key_field, str) else tuple(key_field)
+        self.date_fields = tuple(date_fields)
+        self._create(indexes or [], retired_indexes or [])
+
+    def key_of(self, key: str | tuple) -> str:
+        if isinstance(key, tuple):
+            return KEY_SEPARATOR.join(str(part) for part in key)
+        return str(key)
+
+    def doc_key(self, doc: dict) -> str:
+        if len(self.key_fields) == 1:
+            return str(doc[self.key_fields[0]])
+        return KEY_SEPARATOR.join(str(doc.get(field) or "") for field in self.key_fields)
+
+    def _create(self, indexes: list[dict], retired_indexes: list[str]) -> None:
+        conn = self.database.connection()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.name} (key TEXT PRIMARY KEY, doc TEXT NOT NULL)"
+        )
+        for index_name in retired_indexes:
+            if not _FIELD_PATTERN.match(index_name):
+                raise ValueError(f"Invalid index name: {index_name}")
+            conn.execute(f"DROP INDEX IF EXISTS {self.name}__{index_name}")
+        for spec in indexes:
+            keys = spec.get("keys", [])
+            options = spec.get("options", {})
+            if not keys or keys == [(field, 1) for field in self.key_fields]:
+                continue
+            columns = ", ".join(
+                f"{json_field(field)} {'DESC' if direction == -1 else 'ASC'}"
+                for field, direction in keys
+            )
+            unique = "UNIQUE " if options.get("unique") else ""
+            where = ""
+            if options.get("sparse"):
+                where = " WHERE " + " AND ".join(
+                    f"{json_field(field)} IS NOT NULL" for field, _ in keys
+                )
+            elif options.get("partialFilterExpression"):
+                where = " WHERE " + " AND ".join(
+                    f"{json_field(field)} IS NOT NULL"
+                    for field in options["partialFilterExpression"]
+                )
+            conn.execute(
+                f"CREATE {unique}INDEX IF NOT EXISTS {self.name}__{options['name']} "
+                f"ON {self.name} ({columns}){where}"
+            )
+
+    def _load(self, text: str) -> dict:
+        doc = json.loads(text)
+        for field in self.date_fields:
+            if isinstance(doc.get(field), str):
+                doc[field] = as_utc(doc[field])
+        return doc
+
+    def _rows(self, cursor: sqlite3.Cursor) -> list[dict]:
+        return [self._load(row["doc"]) for row in cursor]
+
+    def get(self, key: str | tuple) -> dict | None:
+        row = self.database.connection().execute(
+            f"SELECT doc FROM {self.name} WHERE key = ?", (self.key_of(key),)
+        ).fetchone()
+        return self._load(row["doc"]) if row else None
+
+    def find(
+        self,
+        where: str = "",
+        params: tuple = (),
+        order_by: list[tuple[str, int]] | None = None,
+        limit: int | None = None,
+        select: str = "doc",
+    ) -> list[dict]:
+        sql = f"SELECT {select} AS doc FROM {self.name}"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by:
+            sql += " ORDER BY " + ", ".join(
+                f"{json_field(field)} {'DESC' if direction == -1 else 'ASC'}"
+                for field, direction in order_by
+            )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._rows(self.database.connection().execute(sql, _encode_params(params)))
+
+    def page(
+        self,
+        where: str,
+        params: tuple,
+        sort_field: str,
+        id_field: str,
+        limit: int,
+        cursor: str | None = None,
+        direction: int = -1,
+        select: str = "doc",
+    ) -> tuple[list[dict], str | None]:
+        size = max(1, int(limit))
+        clauses = [where] if where else []
+        values = list(params)
+        after = decode_cursor(cursor)
+        if after is not None:
+            sort_value, unique_id = after
+            op = "<" if direction == -1 else ">"
+            sort_expr, id_expr = json_field(sort_field), json_field(id_field)
+            clauses.append(f"({sort_expr} {op} ? OR ({sort_expr} = ? AND {id_expr} {op} ?))")
+            values.extend([sort_value, sort_value, unique_id])
+        rows = self.find(
+            " AND ".join(clauses),
+            tuple(values),
+            order_by=[(sort_field, direction), (id_field, direction)],
+            limit=size + 1,
+            select=select,
+        )
+        if len(rows) <= size:
+            return rows, None
+        last = rows[size - 1]
+        return rows[:size], encode_cursor(last.get(sort_field), str(last.get(id_field, "")))
+
+    def scan(self, after: str | None = None, limit: int = 500) -> list[tuple[str, dict]]:
+        # Raw documents in key order; date fields are returned exactly as stored.
+        sql = f"SELECT key, doc FROM {self.name}"
+        params: tuple = ()
+        if after is not None:
+            sql += " WHERE key > ?"
+            params = (after,)
+        sql += f" ORDER BY key LIMIT {max(1, int(limit))}"
+        return [
+            (row["key"], json.loads(row["doc"]))
+            for row in self.database.connection().execute(sql, params)
+        ]
+
+    def insert_many(self, docs: list[dict]) -> None:
+        with self.database.transaction() as conn:
+            conn.executemany(
+                f"INSERT INTO {self.name} (key, doc) VALUES (?, ?)",
+                [(self.doc_key(doc), _dumps(doc)) for doc in docs],
+            )
+
+    def upsert_many(
+        self,
+        rows: list[tuple[dict, dict]],
+        batch_size: int = 500,
+    ) -> BulkUpsertResult:
+        # rows are (set_fields, set_on_insert) pairs, mirroring Mongo's $set / $setOnInsert.
+        result = BulkUpsertResult()
+        size = max(1, int(batch_size))
+        for start in range(0, len(rows), size):
+            batch = rows[start : start + size]
+            keys = [self.doc_key(fields) for fields, _ in batch]
+            with self.database.transaction() as conn:
+                placeholders = ", ".join("?" for _ in keys)
+                existing = {
+                    row["key"]
+                    for row in conn.execute(
+                        f"SELECT key FROM {self.name} WHERE key IN ({placeholders})", keys
+                    )
+                }
+                cursor = conn.executemany(
+                    f"INSERT INTO {self.name} (key, doc) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET doc = json_patch(doc, excluded.doc) "
+                    "WHERE json_patch(doc, excluded.doc) IS NOT doc",
+                    [
+                        (
+                            key,
+                            _dumps(fields if key in existing else {**on_insert, **fields}),
+                        )
+                        for key, (fields, on_insert) in zip(keys, batch)
+                    ],
+                )
+            inserted = len(set(keys) - existing)
+            result.inserted += inserted
+            result.matched += len(existing)
+            result.modified += max(0, cursor.rowcount - inserted)
+        return result
+
+    def patch(self, key: str | tuple, fields: dict) -> dict | None:
+        with self.database.transaction() as conn:
+            row = conn.execute(
+                f"UPDATE {self.name} SET doc = json_patch(doc, ?) WHERE key = ? RETURNING doc",
+                (_dumps(fields), self.key_of(key)),
+            ).fetchone()
+        return self._load(row["doc"]) if row else None
+
+    def patch_many(self, patches: list[tuple[str | tuple, dict]]) -> None:
+        with self.database.transaction() as conn:
+            conn.executemany(
+                f"UPDATE {self.name} SET doc = json_patch(doc, ?) WHERE key = ?",
+                [(_dumps(fields), self.key_of(key)) for key, fields in patches],
+            )
+
+    def rekey_many(self, patches: list[tuple[str | tuple, dict]]) -> int:
+        # patch_many for patches that touch key fields. A row whose new key is already
+        # taken is left where it is; returns the number of rows patched.
+        patched = 0
+        with self.database.transaction() as conn:
+            for key, fields in patches:
+                row = conn.execute(
+                    f"SELECT doc FROM {self.name} WHERE key = ?", (self.key_of(key),)
+                ).fetchone()
+                if row is None:
+                    continue
+                patched += conn.execute(
+                    f"UPDATE OR IGNORE {self.name} SET key = ?, doc = json_patch(doc, ?) "
+                    "WHERE key = ?",
+                    (
+                        self.doc_key({**json.loads(row["doc"]), **fields}),
+                        _dumps(fields),
+                        self.key_of(key),
+                    ),
+                ).rowcount
+        return patched
+
+    def replace_many(self, docs: list[dict]) -> None:
+        with self.database.transaction() as conn:
+            conn.executemany(
+                f"UPDATE {self.name} SET doc = ? WHERE key = ?",
+                [(_dumps(doc), self.doc_key(doc)) for doc in docs],
+            )
+
+    def delete_keys(self, keys: list[str | tuple]) -> int:
+        if not keys:
+            return 0
+        with self.database.transaction() as conn:
+            cursor = conn.executemany(
+                f"DELETE FROM {self.name} WHERE key = ?", [(self.key_of(key),) for key in keys]
+            )
+        return cursor.rowcount
+
+    def move_to(
+        self,
+        target: "SqliteCollection",
+        where: str,
+        params: tuple,
+        order_by: list[tuple[str, int]],
+        limit: int,
+        stamp: dict,
+    ) -> int:
+        order = ", ".join(
+            f"{json_field(field)} {'DESC' if direction == -1 else 'ASC'}"
+            for field, direction in order_by
+        )
+        selected = (
+            f"SELECT key FROM {self.name} WHERE {where} ORDER BY {order} LIMIT {int(limit)}"
+        )
+        with self.database.transaction() as conn:
+            keys = [row["key"] for row in conn.execute(selected, _encode_params(params))]
+            if not keys:
+                return 0
+            placeholders = ", ".join("?" for _ in keys)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {target.name} (key, doc) "
+                f"SELECT key, json_patch(doc, ?) FROM {self.name} WHERE key IN ({placeholders})",
+                (_dumps(stamp), *keys),
+            )
+            return conn.execute(
+                f"DELETE FROM {self.name} WHERE key IN ({placeholders})", keys
+            ).rowcount
+
+    def delete_all(self, where: str = "", params: tuple = ()) -> int:
+        sql = f"DELETE FROM {self.name}"
+        if where:
+            sql += f" WHERE {where}"
+        with self.database.transaction() as conn:
+            return conn.execute(sql, _encode_params(params)).rowcount
+
+
+class SqliteBlobStore:
+    def __init__(self, database: SqliteDatabase, table: str = "blobs") -> None:
+        if not _FIELD_PATTERN.match(table):
+            raise ValueError(f"Invalid table name: {table}")
+        self.database = database
+        self.table = table
+        self.database.connection().execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "file_id TEXT PRIMARY KEY, filename TEXT, content_type TEXT, "
+            "metadata TEXT, length INTEGER, created_at TEXT, data BLOB NOT NULL)"
+        )
+
+    def put(
+        self,
+        data: bytes,
+        filename: str,
+        content_type: str,
+        metadata: dict | None = None,
+    ) -> str:
+        file_id = uuid.uuid4().hex
+        with self.database.transaction() as conn:
+            conn.execute(
+                f"INSERT INTO {self.table} "
+                "(file_id, filename, content_type, metadata, length, created_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file_id,
+                    filename,
+                    content_type,
+                    _dumps(metadata or {}),
+                    len(data),
+                    encode_date(utc_now()),
+                    sqlite3.Binary(data),
+                ),
+            )
+        return file_id
+
+    def get(self, file_id: str) -> bytes:
+        row = self.database.connection().execute(
+            f"SELECT data FROM {self.table} WHERE file_id = ?", (file_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"File not found: {file_id}")
+        return bytes(row["data"])
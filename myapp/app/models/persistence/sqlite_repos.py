@@ -0,0 +1,565 @@
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+
+from app.models.domain.job import Job
+from app.models.domain.task import Task
+from app.models.persistence.archive import ArchivePolicy
+from app.models.persistence.assistant_repo import _ConversationDocuments
+from app.models.persistence.calendar_event_repo import _CalendarEventDocuments
+from app.models.persistence.db import BulkUpsertResult, dedupe_last
+from app.models.persistence.document_repo import _DocumentDocuments
+from app.models.persistence.job_repo import _JobDocuments
+from app.models.persistence.llm_cache_repo import _LLMCacheDocuments
+from app.models.persistence.sqlite_db import (
+    SqliteBlobStore,
+    SqliteCollection,
+    SqliteDatabase,
+    json_field,
+    json_select,
+)
+from app.models.persistence.task_repo import _TaskDocuments
+from app.utils.time import utc_now
+
+
+def _user_where(user_id: str | None) -> tuple[str, tuple]:
+    if user_id is None:
+        return "", ()
+    return f"{json_field('user_id')} = ?", (user_id,)
+
+
+class SqliteJobRepository(_JobDocuments):
+    def __init__(
+        self,
+        database: SqliteDatabase,
+        collection_name: str = "jobs",
+        bulk_batch_size: int = 500,
+    ) -> None:
+        self.bulk_batch_size = max(1, int(bulk_batch_size))
+        self.collection = SqliteCollection(
+            database,
+            collection_name,
+            ("user_id", "job_id"),
+            self.INDEXES,
+            retired_indexes=self.RETIRED_INDEXES,
+            date_fields=self.DATE_FIELDS,
+        )
+
+    def page_jobs(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[Job], str | None]:
+        where, params = _user_where(user_id)
+        rows, next_cursor = self.collection.page(
+            where, params, sort_field="created_at", id_field="job_id", limit=limit, cursor=cursor
+        )
+        return [self._to_job(row) for row in rows], next_cursor
+
+    def list_jobs(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> list[Job]:
+        return self.page_jobs(limit=limit, cursor=cursor, user_id=user_id)[0]
+
+    def page_job_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[Mapping], str | None]:
+        where, params = _user_where(user_id)
+        return self.collection.page(
+            where,
+            params,
+            sort_field="created_at",
+            id_field="job_id",
+            limit=limit,
+            cursor=cursor,
+            select=json_select(("created_at", "job_id", *fields)),
+        )
+
+    def list_job_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> list[Mapping]:
+        return self.page_job_fields(fields, limit=limit, cursor=cursor, user_id=user_id)[0]
+
+    def bulk_upsert_jobs(self, jobs: list[Job]) -> BulkUpsertResult:
+        if not jobs:
+            return BulkUpsertResult()
+        now = utc_now()
+        rows = [
+            (self._to_doc(job, now=now), {"created_at": now})
+            for job in dedupe_last(jobs, key=lambda job: (job.user_id, job.id))
+        ]
+        return self.collection.upsert_many(rows, batch_size=self.bulk_batch_size)
+
+    def upsert_jobs(self, jobs: list[Job]) -> int:
+        return self.bulk_upsert_jobs(jobs).affected
+
+    def replace_jobs(self, jobs: list[Job]) -> int:
+        return self.upsert_jobs(jobs)
+
+
+class SqliteTaskRepository(_TaskDocuments):
+    def __init__(
+        self,
+        database: SqliteDatabase,
+        collection_name: str = "tasks",
+        bulk_batch_size: int = 500,
+    ) -> None:
+        self.bulk_batch_size = max(1, int(bulk_batch_size))
+        self.collection = SqliteCollection(
+            database,
+            collection_name,
+            ("user_id", "task_id"),
+            self.INDEXES,
+            retired_indexes=self.RETIRED_INDEXES,
+            date_fields=self.DATE_FIELDS,
+        )
+
+    def _list_where(self, user_id: str | None, active_only: bool) -> tuple[str, tuple]:
+        where, params = _user_where(user_id)
+        if active_only:
+            clauses = [where] if where else []
+            clauses.append(f"{json_field('completed')} IS NOT 1")
+            where = " AND ".join(clauses)
+        return where, params
+
+    def page_tasks(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> tuple[list[Task], str | None]:
+        where, params = self._list_where(user_id, active_only)
+        rows, next_cursor = self.collection.page(
+            where, params, sort_field="created_at", id_field="task_id", limit=limit, cursor=cursor
+        )
+        return [self._to_task(row) for row in rows], next_cursor
+
+    def list_tasks(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> list[Task]:
+        return self.page_tasks(
+            limit=limit, cursor=cursor, user_id=user_id, active_only=active_only
+        )[0]
+
+    def page_task_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> tuple[list[Mapping], str | None]:
+        where, params = self._list_where(user_id, active_only)
+        return self.collection.page(
+            where,
+            params,
+            sort_field="created_at",
+            id_field="task_id",
+            limit=limit,
+            cursor=cursor,
+            select=json_select(("created_at", "task_id", *fields)),
+        )
+
+    def list_task_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> list[Mapping]:
+        return self.page_task_fields(
+            fields, limit=limit, cursor=cursor, user_id=user_id, active_only=active_only
+        )[0]
+
+    def _task_key(self, task_id: str, user_id: str | None) -> tuple | None:
+        if user_id is not None:
+            return (user_id, task_id)
+        rows = self.collection.find(
+            f"{json_field('task_id')} = ?",
+            (task_id,),
+            limit=1,
+            select=f"json_object('user_id', {json_field('user_id')})",
+        )
+        return (rows[0].get("user_id") or "", task_id) if rows else None
+
+    def get_task(self, task_id: str, user_id: str | None = None) -> Task | None:
+        key = self._task_key(task_id, user_id)
+        row = self.collection.get(key) if key else None
+        return self._to_task(row) if row else None
+
+    def patch_task(
+        self, task_id: str, changes: dict, user_id: str | None = None
+    ) -> Task | None:
+        key = self._task_key(task_id, user_id)
+        row = self.collection.patch(key, self._patch_doc(changes)) if key else None
+        return self._to_task(row) if row else None
+
+    def bulk_upsert_tasks(self, tasks: list[Task]) -> BulkUpsertResult:
+        if not tasks:
+            return BulkUpsertResult()
+        now = utc_now()
+        rows = [
+            (self._to_doc(task, now=now), {"created_at": now})
+            for task in dedupe_last(tasks, key=lambda task: (task.user_id, task.id))
+        ]
+        return self.collection.upsert_many(rows, batch_size=self.bulk_batch_size)
+
+    def upsert_tasks(self, tasks: list[Task]) -> int:
+        return self.bulk_upsert_tasks(tasks).affected
+
+    def replace_tasks(self, tasks: list[Task]) -> int:
+        return self.upsert_tasks(tasks)
+
+
+class SqliteCalendarEventRepository(_CalendarEventDocuments):
+    def __init__(
+        self,
+        database: SqliteDatabase,
+        collection_name: str = "calendar_events",
+        bulk_batch_size: int = 500,
+    ) -> None:
+        self.bulk_batch_size = max(1, int(bulk_batch_size))
+        self.collection = SqliteCollection(
+            database,
+            collection_name,
+            ("user_id", "event_id"),
+            self.INDEXES,
+            retired_indexes=self.RETIRED_INDEXES,
+            date_fields=self.DATE_FIELDS,
+        )
+
+    def _range_where(
+        self,
+        start_at: datetime | str | None,
+        end_at: datetime | str | None,
+        user_id: str | None = None,
+    ) -> tuple[str, tuple]:
+        where, scope = _user_where(user_id)
+        clauses: list[str] = [where] if where else []
+        params: list[object] = list(scope)
+        lower, upper = self._bound(start_at, "start_at"), self._bound(end_at, "end_at")
+        if lower:
+            clauses.append(f"{json_field('start_at')} >= ?")
+            params.append(lower)
+        if upper:
+            clauses.append(f"{json_field('start_at')} <= ?")
+            params.append(upper)
+        return " AND ".join(clauses), tuple(params)
+
+    def page_events(
+        self,
+        start_at: datetime | str | None = None,
+        end_at: datetime | str | None = None,
+        limit: int = 500,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        where, params = self._range_where(start_at, end_at, user_id)
+        return self.collection.page(
+            where,
+            params,
+            sort_field="start_at",
+            id_field="event_id",
+            limit=limit,
+            cursor=cursor,
+            direction=1,
+        )
+
+    def list_events(
+        self,
+        start_at: datetime | str | None = None,
+        end_at: datetime | str | None = None,
+        limit: int = 500,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> list[dict]:
+        return self.page_events(
+            start_at=start_at, end_at=end_at, limit=limit, cursor=cursor, user_id=user_id
+        )[0]
+
+    def sync_events(self, events: list[dict], user_id: str | None = None) -> dict:
+        where, params = _user_where(user_id)
+        pairs = ", ".join(
+            f"'{field}', {json_field(field)}" for field in ("user_id", "event_id", "content_hash")
+        )
+        rows = self.collection.find(where, params, select=f"json_object({pairs})")
+        inserts, updates, stale_keys, result = self._diff_events(
+            events, self._stored_hashes(rows), user_id
+        )
+        # Inserts go through upsert_many too, in case a concurrent sync wrote them first.
+        rows = [self._split_created_at(doc) for doc in inserts]
+        rows.extend((doc, {}) for doc in updates)
+        if rows:
+            self.collection.upsert_many(rows, self.bulk_batch_size)
+        self.collection.delete_keys(stale_keys)
+        return result
+
+    def replace_events(
+        self, events: list[dict], mode: str = "diff", user_id: str | None = None
+    ) -> int:
+        if mode == "diff":
+            result = self.sync_events(events, user_id=user_id)
+            return result["inserted"] + result["updated"] + result["deleted"]
+
+        self.collection.delete_all(*_user_where(user_id))
+        if not events:
+            return 0
+
+        self.collection.insert_many(self._stamp_full_replace(events, user_id))
+        return len(events)
+
+    def bulk_upsert_events(self, events: list[dict]) -> BulkUpsertResult:
+        if not events:
+            return BulkUpsertResult()
+        now = utc_now()
+        rows = []
+        for event in dedupe_last(self._stamp_user(events, None), key=self._event_key):
+            event["content_hash"] = self._content_hash(event)
+            event["updated_at"] = now
+            rows.append((event, {"created_at": now}))
+        return self.collection.upsert_many(rows, batch_size=self.bulk_batch_size)
+
+    def upsert_events(self, events: list[dict]) -> int:
+        return self.bulk_upsert_events(events).affected
+
+
+class SqliteDocumentRepository(_DocumentDocuments):
+    def __init__(
+        self,
+        database: SqliteDatabase,
+        collection_name: str = "documents",
+        blob_store: SqliteBlobStore | None = None,
+    ) -> None:
+        self.collection = SqliteCollection(
+            database, collection_name, "doc_id", self.INDEXES, date_fields=self.DATE_FIELDS
+        )
+        self.fs = blob_store or SqliteBlobStore(database)
+
+    def _summary_select(self) -> str:
+        fields = [field for field, included in self._SUMMARY_PROJECTION.items() if included]
+        pairs = ", ".join(f"'{field}', {json_field(field)}" for field in fields)
+        return f"json_object({pairs})"
+
+    def create_document(self, metadata: dict, file_bytes: bytes) -> dict:
+        file_id = self.fs.put(
+            file_bytes,
+            filename=metadata["filename"],
+            content_type=metadata.get("content_type", "application/pdf"),
+            metadata={"doc_id": metadata["doc_id"]},
+        )
+        row = self._to_row(metadata, file_id)
+        self.collection.insert_many([row])
+        return row
+
+    def page_documents(
+        self,
+        doc_type: str,
+        user_id: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return self.collection.page(
+            f"{json_field('user_id')} = ? AND {json_field('doc_type')} = ?",
+            (user_id, doc_type),
+            sort_field="created_at",
+            id_field="doc_id",
+            limit=limit,
+            cursor=cursor,
+            select=self._summary_select(),
+        )
+
+    def list_documents(
+        self,
+        doc_type: str,
+        user_id: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> list[dict]:
+        return self.page_documents(doc_type, user_id, limit=limit, cursor=cursor)[0]
+
+    def get_document(self, doc_id: str) -> dict | None:
+        return self.collection.get(doc_id)
+
+    def get_document_text(self, doc_id: str) -> str | None:
+        rows = self.collection.find(
+            "key = ?",
+            (doc_id,),
+            select=f"json_object('extracted_text', {json_field('extracted_text')})",
+        )
+        return str(rows[0].get("extracted_text") or "") if rows else None
+
+    def read_file_bytes(self, file_id: str) -> bytes:
+        return self.fs.get(file_id)
+
+
+class SqliteAssistantConversationRepository(_ConversationDocuments):
+    def __init__(
+        self,
+        database: SqliteDatabase,
+        collection_name: str = "assistant_conversations",
+    ) -> None:
+        self.collection = SqliteCollection(
+            database, collection_name, "message_id", self.INDEXES, date_fields=self.DATE_FIELDS
+        )
+
+    def add_message(
+        self,
+        conversation_id: str,
+        role: str,
+        text: str,
+        context_page: str,
+    ) -> str:
+        row = self.build_message(conversation_id, role, text, context_page)
+        self.collection.insert_many([row])
+        return row["message_id"]
+
+    def append_turn(self, messages: list[dict]) -> list[str]:
+        if not messages:
+            return []
+        self.collection.insert_many(messages)
+        return [row["message_id"] for row in messages]
+
+    def page_messages(
+        self,
+        conversation_id: str,
+        limit: int = 12,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        rows, next_cursor = self.collection.page(
+            f"{json_field('conversation_id')} = ?",
+            (conversation_id,),
+            sort_field="created_at",
+            id_field="message_id",
+            limit=limit,
+            cursor=cursor,
+        )
+        rows.reverse()
+        return rows, next_cursor
+
+    def list_messages(
+        self,
+        conversation_id: str,
+        limit: int = 12,
+        cursor: str | None = None,
+    ) -> list[dict]:
+        return self.page_messages(conversation_id, limit=limit, cursor=cursor)[0]
+
+
+class SqliteLLMCacheRepository(_LLMCacheDocuments):
+    def __init__(self, database: SqliteDatabase, collection_name: str = "llm_cache") -> None:
+        self.collection = SqliteCollection(
+            database, collection_name, "cache_key", self.INDEXES, date_fields=self.DATE_FIELDS
+        )
+
+    def get_entry(self, cache_key: str, now: datetime | None = None) -> dict | None:
+        row = self.collection.get(cache_key)
+        if row is None or row.get("expires_at") is None:
+            return None
+        if row["expires_at"] <= (now or utc_now()):
+            return None
+        return {"text": row.get("text"), "expires_at": row["expires_at"]}
+
+    def put_entry(self, cache_key: str, call_site: str, text: str, expires_at: datetime) -> None:
+        row = self.build_entry(cache_key, call_site, text, expires_at)
+        self.collection.upsert_many([(row, {})])
+
+    def prune(self, max_entries: int, now: datetime | None = None) -> int:
+        # SQLite has no TTL monitor, so expired rows are dropped here as well.
+        expired = self.collection.delete_all(
+            f"{json_field('expires_at')} <= ?", (now or utc_now(),)
+        )
+        newest_first = (
+            f"SELECT key FROM {self.collection.name} "
+            f"ORDER BY {json_field('created_at')} DESC LIMIT -1 OFFSET ?"
+        )
+        overflow = self.collection.delete_all(
+            f"key IN ({newest_first})", (max(0, int(max_entries)),)
+        )
+        return expired + overflow
+
+
+class SqliteArchiveRepository:
+    def __init__(
+        self,
+        database: SqliteDatabase,
+        policy: ArchivePolicy,
+        key_field: str | tuple[str, ...],
+    ) -> None:
+        self.policy = policy
+        self.collection = SqliteCollection(
+            database, policy.name, key_field, date_fields=policy.date_fields
+        )
+        self.archive_collection = SqliteCollection(
+            database,
+            policy.archive_name,
+            key_field,
+            policy.archive_indexes(),
+            date_fields=(*policy.date_fields, "archived_at"),
+        )
+
+    def _aged_where(self, now: datetime | None = None) -> tuple[str, tuple]:
+        clauses = [f"{json_field(field)} = ?" for field in self.policy.match]
+        # Stored dates are UTC text beginning with a digit; the lower bound keeps rows with a
+        # missing or blank age field in the hot tier.
+        age = json_field(self.policy.age_field)
+        clauses.append(f"{age} >= '0' AND {age} < ?")
+        return " AND ".join(clauses), (*self.policy.match.values(), self.policy.cutoff(now))
+
+    def archive_batch(self, batch_size: int = 500, now: datetime | None = None) -> int:
+        where, params = self._aged_where(now)
+        return self.collection.move_to(
+            self.archive_collection,
+            where,
+            params,
+            order_by=[(self.policy.age_field, 1), (self.policy.id_field, 1)],
+            limit=max(1, int(batch_size)),
+            stamp={"archived_at": utc_now()},
+        )
+
+    def archive(
+        self,
+        batch_size: int = 500,
+        max_batches: int = 20,
+        now: datetime | None = None,
+    ) -> int:
+        if not self.policy.enabled:
+            return 0
+        moved = 0
+        for _ in range(max(1, int(max_batches))):
+            count = self.archive_batch(batch_size=batch_size, now=now)
+            moved += count
+            if count < batch_size:
+                break
+        return moved
+
+    def page_archived(
+        self,
+        scope: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return self.archive_collection.page(
+            f"{json_field(self.policy.scope_field)} = ?",
+            (scope,),
+            sort_field="archived_at",
+            id_field=self.policy.id_field,
+            limit=limit,
+            cursor=cursor,
+        )
@@ -1,11 +1,36 @@
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+
+from pymongo import ReturnDocument, UpdateOne
+
 from app.models.domain.task import Task
-from app.models.persistence.db import MongoDB
-from app.utils.time import utc_now_iso
+from app.models.persistence.async_db import (
+    AsyncMongoClientRegistry,
+    AsyncMongoDB,
+    async_bulk_upsert,
+    async_find_page,
+)
+from app.models.persistence.db import (
+    BulkUpsertResult,
+    MongoClientRegistry,
+    MongoDB,
+    bulk_upsert,
+    dedupe_last,
+    field_projection,
+    find_page,
+    raw_view,
+    user_scope,
+)
+from app.utils.time import as_utc, utc_now
 
 
-class TaskRepository:
-    _INDEXES = [
-        {"keys": [("task_id", 1)], "options": {"unique": True, "name": "uq_task_id"}},
+class _TaskDocuments:
+    INDEXES = [
+        {
+            "keys": [("user_id", 1), ("task_id", 1)],
+            "options": {"unique": True, "name": "uq_user_task_id"},
+        },
+        {"keys": [("task_id", 1)], "options": {"name": "idx_task_id_asc"}},
         {
             "keys": [("priority_score", 1)],
             "options": {"name": "idx_priority_score_asc"},
@@ -14,26 +39,21 @@ class TaskRepository:
         {"keys": [("completed", 1)], "options": {"name": "idx_completed_asc"}},
         {"keys": [("created_at", 1)], "options": {"name": "idx_created_at_asc"}},
         {"keys": [("updated_at", 1)], "options": {"name": "idx_updated_at_asc"}},
+        {
+            "keys": [("created_at", -1), ("task_id", -1)],
+            "options": {"name": "idx_created_at_task_id_desc"},
+        },
+        {
+            "keys": [("user_id", 1), ("created_at", -1), ("task_id", -1)],
+            "options": {"name": "idx_user_created_at_task_id_desc"},
+        },
+        {
+            "keys": [("user_id", 1), ("completed", 1), ("created_at", -1), ("task_id", -1)],
+            "options": {"name": "idx_user_completed_created_at_task_id_desc"},
+        },
     ]
-
-    def __init__(
-        self,
-        mongo_uri: str,
-        db_name: str,
-        mongodb: MongoDB | None = None,
-        collection_name: str = "tasks",
-        collection=None,
-    ) -> None:
-        self.mongodb = mongodb or MongoDB(
-            mongo_uri=mongo_uri,
-            db_name=db_name,
-            collection_name=collection_name,
-        )
-        if collection is None:
-            self.mongodb.ensure_indexes(self._INDEXES)
-            self.collection = self.mongodb.collection
-        else:
-            self.collection = collection
+    RETIRED_INDEXES = ["uq_task_id"]
+    DATE_FIELDS = ("due_at", "created_at", "updated_at")
 
     def _as_int(self, value: object, default: int = 0) -> int:
         try:
@@ -54,9 +74,16 @@ class TaskRepository:
                 return False
         return bool(value)
 
-    def _to_doc(self, task: Task, now_iso: str) -> dict:
+    def _list_query(self, user_id: str | None, active_only: bool) -> dict:
+        query = user_scope(user_id)
+        if active_only:
+            query["completed"] = {"$ne": True}
+        return query
+
+    def _to_doc(self, task: Task, now: datetime) -> dict:
         return {
             "task_id": task.id,
+            "user_id": task.user_id,
             "title": task.title,
             "module": task.module,
             "due_at": task.due_at,
@@ -66,7 +93,7 @@ class TaskRepository:
             "priority_band": task.priority_band,
             "completed": self._as_bool(task.completed),
             "notes": task.notes,
-            "updated_at": now_iso,
+            "updated_at": now,
         }
 
     def _to_task(self, row: dict) -> Task:
@@ -81,31 +108,258 @@ class TaskRepository:
             priority_band=row.get("priority_band", "low"),
             completed=self._as_bool(row.get("completed", False)),
             notes=row.get("notes", ""),
+            user_id=row.get("user_id") or "",
         )
 
-    def list_tasks(self, limit: int = 200) -> list[Task]:
-        cursor = (
-            self.collection.find({}, {"_id": 0})
-            .sort("created_at", -1)
-            .limit(max(1, int(limit)))
-        )
-        return [self._to_task(row) for row in cursor]
-
-    def upsert_tasks(self, tasks: list[Task]) -> int:
-        if not tasks:
-            return 0
+    def _patch_doc(self, changes: dict) -> dict:
+        doc: dict = {}
+        for field in ["title", "module", "notes"]:
+            if field in changes:
+                doc[field] = changes[field]
+        if "due_at" in changes:
+            doc["due_at"] = as_utc(changes["due_at"])
+        for field in ["module_weight_percent", "estimated_hours", "priority_score"]:
+            if field in changes:
+                doc[field] = self._as_int(changes[field], default=0)
+        if "completed" in changes:
+            doc["completed"] = self._as_bool(changes["completed"])
+        if "priority_band" in changes:
+            doc["priority_band"] = changes["priority_band"]
+        doc["updated_at"] = utc_now()
+        return doc
 
-        now_iso = utc_now_iso()
-        for task in tasks:
-            self.collection.update_one(
-                {"task_id": task.id},
+    def _upsert_operations(self, tasks: list[Task]) -> list[UpdateOne]:
+        now = utc_now()
+        return [
+            UpdateOne(
+                {"user_id": task.user_id, "task_id": task.id},
                 {
-                    "$set": self._to_doc(task, now_iso=now_iso),
-                    "$setOnInsert": {"created_at": now_iso},
+                    "$set": self._to_doc(task, now=now),
+                    "$setOnInsert": {"created_at": now},
                 },
                 upsert=True,
             )
-        return len(tasks)
+            for task in dedupe_last(tasks, key=lambda task: (task.user_id, task.id))
+        ]
+
+
+class TaskRepository(_TaskDocuments):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        mongodb: MongoDB | None = None,
+        collection_name: str = "tasks",
+        collection=None,
+        client_registry: MongoClientRegistry | None = None,
+        bulk_batch_size: int = 500,
+    ) -> None:
+        self.bulk_batch_size = max(1, int(bulk_batch_size))
+        self.mongodb = mongodb or MongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+
+    def page_tasks(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> tuple[list[Task], str | None]:
+        rows, next_cursor = find_page(
+            self.collection,
+            query=self._list_query(user_id, active_only),
+            sort_field="created_at",
+            id_field="task_id",
+            limit=limit,
+            cursor=cursor,
+        )
+        return [self._to_task(row) for row in rows], next_cursor
+
+    def list_tasks(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> list[Task]:
+        return self.page_tasks(
+            limit=limit, cursor=cursor, user_id=user_id, active_only=active_only
+        )[0]
+
+    def page_task_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> tuple[list[Mapping], str | None]:
+        # Rows are undecoded BSON limited to `fields` (plus the created_at/task_id cursor keys).
+        return find_page(
+            raw_view(self.collection),
+            query=self._list_query(user_id, active_only),
+            sort_field="created_at",
+            id_field="task_id",
+            limit=limit,
+            cursor=cursor,
+            projection=field_projection(fields, "created_at", "task_id"),
+        )
+
+    def list_task_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> list[Mapping]:
+        return self.page_task_fields(
+            fields, limit=limit, cursor=cursor, user_id=user_id, active_only=active_only
+        )[0]
+
+    def get_task(self, task_id: str, user_id: str | None = None) -> Task | None:
+        row = self.collection.find_one({"task_id": task_id, **user_scope(user_id)}, {"_id": 0})
+        return self._to_task(row) if row else None
+
+    def patch_task(
+        self, task_id: str, changes: dict, user_id: str | None = None
+    ) -> Task | None:
+        row = self.collection.find_one_and_update(
+            {"task_id": task_id, **user_scope(user_id)},
+            {"$set": self._patch_doc(changes)},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._to_task(row) if row else None
+
+    def bulk_upsert_tasks(self, tasks: list[Task]) -> BulkUpsertResult:
+        if not tasks:
+            return BulkUpsertResult()
+        return bulk_upsert(
+            self.collection,
+            self._upsert_operations(tasks),
+            batch_size=self.bulk_batch_size,
+        )
+
+    def upsert_tasks(self, tasks: list[Task]) -> int:
+        return self.bulk_upsert_tasks(tasks).affected
 
     def replace_tasks(self, tasks: list[Task]) -> int:
         return self.upsert_tasks(tasks)
+
+
+class AsyncTaskRepository(_TaskDocuments):
+    def __init__(
+        self,
+        mongo_uri: str,
+        db_name: str,
+        mongodb: AsyncMongoDB | None = None,
+        collection_name: str = "tasks",
+        collection=None,
+        client_registry: AsyncMongoClientRegistry | None = None,
+        bulk_batch_size: int = 500,
+    ) -> None:
+        self.bulk_batch_size = max(1, int(bulk_batch_size))
+        self.mongodb = mongodb or AsyncMongoDB(
+            mongo_uri=mongo_uri,
+            db_name=db_name,
+            collection_name=collection_name,
+            client_registry=client_registry,
+        )
+        self.collection = self.mongodb.collection if collection is None else collection
+
+    async def page_tasks(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> tuple[list[Task], str | None]:
+        rows, next_cursor = await async_find_page(
+            self.collection,
+            query=self._list_query(user_id, active_only),
+            sort_field="created_at",
+            id_field="task_id",
+            limit=limit,
+            cursor=cursor,
+        )
+        return [self._to_task(row) for row in rows], next_cursor
+
+    async def list_tasks(
+        self,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> list[Task]:
+        page = await self.page_tasks(
+            limit=limit, cursor=cursor, user_id=user_id, active_only=active_only
+        )
+        return page[0]
+
+    async def page_task_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> tuple[list[Mapping], str | None]:
+        return await async_find_page(
+            raw_view(self.collection),
+            query=self._list_query(user_id, active_only),
+            sort_field="created_at",
+            id_field="task_id",
+            limit=limit,
+            cursor=cursor,
+            projection=field_projection(fields, "created_at", "task_id"),
+        )
+
+    async def list_task_fields(
+        self,
+        fields: Sequence[str],
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+        active_only: bool = False,
+    ) -> list[Mapping]:
+        page = await self.page_task_fields(
+            fields, limit=limit, cursor=cursor, user_id=user_id, active_only=active_only
+        )
+        return page[0]
+
+    async def get_task(self, task_id: str, user_id: str | None = None) -> Task | None:
+        query = {"task_id": task_id, **user_scope(user_id)}
+        row = await self.collection.find_one(query, {"_id": 0})
+        return self._to_task(row) if row else None
+
+    async def patch_task(
+        self, task_id: str, changes: dict, user_id: str | None = None
+    ) -> Task | None:
+        row = await self.collection.find_one_and_update(
+            {"task_id": task_id, **user_scope(user_id)},
+            {"$set": self._patch_doc(changes)},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._to_task(row) if row else None
+
+    async def bulk_upsert_tasks(self, tasks: list[Task]) -> BulkUpsertResult:
+        if not tasks:
+            return BulkUpsertResult()
+        return await async_bulk_upsert(
+            self.collection,
+            self._upsert_operations(tasks),
+            batch_size=self.bulk_batch_size,
+        )
+
+    async def upsert_tasks(self, tasks: list[Task]) -> int:
+        return (await self.bulk_upsert_tasks(tasks)).affected
+
+    async def replace_tasks(self, tasks: list[Task]) -> int:
+        return await self.upsert_tasks(tasks)
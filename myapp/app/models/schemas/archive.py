@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class ArchiveListResponse(BaseModel):
+    archive: str
+    count: int
+    items: list[dict]
+    next_cursor: str | None = None
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
@@ -11,7 +13,7 @@ class DocumentUploadRequest(BaseModel):
     user_id: str = ""
 
 
-class DocumentSchema(BaseModel):
+class DocumentSummarySchema(BaseModel):
     doc_id: str
     doc_type: str
     user_id: str
@@ -22,16 +24,20 @@ class DocumentSchema(BaseModel):
     module: str | None = None
     report_type: str | None = None
     pages: int = 0
-    extracted_text: str = ""
     summary: str = ""
     highlights: list[str] = Field(default_factory=list)
-    created_at: str | None = None
-    updated_at: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+class DocumentSchema(DocumentSummarySchema):
+    extracted_text: str = ""
 
 
 class DocumentListResponse(BaseModel):
     count: int
-    documents: list[DocumentSchema]
+    documents: list[DocumentSummarySchema]
+    next_cursor: str | None = None
 
 
 class DocumentUploadResponse(BaseModel):
@@ -42,3 +48,11 @@ class DocumentDownloadResponse(BaseModel):
     filename: str
     content_type: str
     data_base64: str
+
+
+class DocumentTextResponse(BaseModel):
+    doc_id: str
+    start: int
+    end: int
+    total_length: int
+    text: str
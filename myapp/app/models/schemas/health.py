@@ -12,3 +12,132 @@ class HealthResponse(BaseModel):
 class UiPageResponse(BaseModel):
     page: str
     title: str
+
+
+class MongoPoolStats(BaseModel):
+    checkouts: int
+    checkout_failures: int
+    avg_wait_ms: float
+    max_wait_ms: float
+    open_connections: int
+
+
+class MongoPoolResponse(BaseModel):
+    clients: int
+    max_pool_size: int
+    min_pool_size: int
+    max_idle_time_ms: int | None = None
+    wait_queue_timeout_ms: int | None = None
+    pools: list[MongoPoolStats]
+
+
+class RepoCacheStats(BaseModel):
+    entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+    ttl_seconds: float
+    max_entries: int
+
+
+class RepoCacheResponse(BaseModel):
+    enabled: bool
+    caches: dict[str, RepoCacheStats]
+
+
+class LLMCallSiteStats(BaseModel):
+    calls: int
+    errors: int
+    retries: int
+    timeouts: int
+    coalesced: int = 0
+    short_circuited: int = 0
+    in_flight: int
+    concurrency_limit: int
+    avg_latency_ms: float
+    max_latency_ms: float
+    avg_prompt_tokens: float = 0.0
+    max_prompt_tokens: int = 0
+    last_error: str | None = None
+
+
+class LLMCacheSiteStats(BaseModel):
+    memory_hits: int
+    store_hits: int
+    misses: int
+    writes: int
+    hit_ratio: float
+
+
+class LLMCacheStats(BaseModel):
+    entries: int
+    bytes: int
+    evictions: int
+    store_enabled: bool
+    store_errors: int
+    ttl_seconds: float
+    max_entries: int
+    max_bytes: int
+    call_sites: dict[str, LLMCacheSiteStats]
+
+
+class LLMCoalescingStats(BaseModel):
+    in_flight: int
+    leaders: int
+    coalesced: int
+
+
+class LLMBreakerStats(BaseModel):
+    state: str
+    recent_calls: int
+    recent_failure_ratio: float
+    failure_ratio: float
+    times_opened: int
+    rejected: int
+    open_seconds: float
+
+
+class LLMPromptSiteStats(BaseModel):
+    budget_tokens: int
+    prompts: int
+    avg_tokens: float
+    max_tokens: int
+    trimmed: int
+    trimmed_tokens: int
+    over_budget: int
+
+
+class LLMPromptStats(BaseModel):
+    default_tokens: int
+    call_sites: dict[str, LLMPromptSiteStats]
+
+
+class LLMGatewayResponse(BaseModel):
+    live: bool
+    max_concurrency: int
+    per_site_concurrency: int
+    timeout_seconds: float
+    latency_budgets: dict[str, float] = {}
+    max_retries: int
+    call_sites: dict[str, LLMCallSiteStats]
+    coalescing: LLMCoalescingStats | None = None
+    cached_sites: list[str] = []
+    cache: LLMCacheStats | None = None
+    breaker: LLMBreakerStats | None = None
+    prompts: LLMPromptStats | None = None
+
+
+class LLMBatchingResponse(BaseModel):
+    enabled: bool
+    window_ms: float = 0.0
+    max_batch_items: int = 0
+    max_batch_requests: int = 0
+    batches: int = 0
+    requests: int = 0
+    items: int = 0
+    full_batches: int = 0
+    avg_requests_per_batch: float = 0.0
+    max_requests_per_batch: int = 0
+    calls_saved: int = 0
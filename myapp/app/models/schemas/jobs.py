@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
@@ -11,7 +13,7 @@ class JobSchema(BaseModel):
     job_id: str
     title: str
     module: str
-    due_at: str | None = None
+    due_at: datetime | None = None
     module_weight_percent: int
     estimated_hours: int
     notes: str = ""
@@ -19,13 +21,14 @@ class JobSchema(BaseModel):
     location: str | None = None
     source_url: str | None = None
     match_score: int | None = None
-    discovered_at: str | None = None
+    discovered_at: datetime | None = None
 
 
 class JobsListResponse(BaseModel):
     count: int
     jobs: list[JobSchema]
     last_refreshed_at: str | None = None
+    next_cursor: str | None = None
 
 
 class JobDiscoveryResponse(BaseModel):
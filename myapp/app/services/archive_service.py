@@ -0,0 +1,56 @@
+import asyncio
+
+from app.models.persistence.archive import ArchiveRepository
+from app.models.persistence.cache import RepositoryCache
+
+
+class ArchiveService:
+    def __init__(
+        self,
+        archive_repos: dict[str, ArchiveRepository],
+        batch_size: int = 500,
+        max_batches: int = 20,
+        caches: dict[str, RepositoryCache] | None = None,
+    ) -> None:
+        self.archive_repos = archive_repos
+        # Archiving deletes from the hot collections behind the cached repos' backs, so
+        # the matching read cache is cleared whenever a run moves rows.
+        self.caches = caches or {}
+        self.batch_size = max(1, int(batch_size))
+        self.max_batches = max(1, int(max_batches))
+
+    def _repo(self, name: str) -> ArchiveRepository:
+        repo = self.archive_repos.get(name)
+        if repo is None:
+            raise ValueError(f"Unknown archive: {name}")
+        return repo
+
+    def run(self, names: list[str] | None = None) -> dict[str, int]:
+        moved: dict[str, int] = {}
+        for name in names or list(self.archive_repos):
+            moved[name] = self._repo(name).archive(
+                batch_size=self.batch_size,
+                max_batches=self.max_batches,
+            )
+            cache = self.caches.get(name)
+            if moved[name] and cache is not None:
+                cache.invalidate()
+        return moved
+
+    def page_archived(
+        self,
+        name: str,
+        scope: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return self._repo(name).page_archived(scope, limit=limit, cursor=cursor)
+
+    async def page_archived_async(
+        self,
+        name: str,
+        scope: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return await asyncio.to_thread(self.page_archived, name, scope, limit, cursor)
@@ -1,8 +1,23 @@
-from google import genai
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterator
 
 from app.models.persistence.assistant_repo import AssistantConversationRepository
 from app.models.persistence.job_repo import JobRepository
 from app.models.persistence.task_repo import TaskRepository
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.prompt_budget import PromptSection
+from app.utils.time import as_utc, to_iso_z
+
+CHAT_PROMPT = (
+    "You are Beacon, a concise student assistant.\n"
+    "Current page: {context_page}\n\n"
+    "Use this context to answer helpfully and briefly.\n\n"
+    "{snapshot}\n\n"
+    "Conversation history:\n"
+    "{history}\n\n"
+    "Latest user message: {message}"
+)
 
 
 class AssistantService:
@@ -14,50 +29,58 @@ class AssistantService:
         conversation_repo: AssistantConversationRepository,
         job_repo: JobRepository,
         task_repo: TaskRepository,
+        history_limit: int = 8,
+        history_cache_size: int = 256,
+        gateway: LLMGateway | None = None,
+        default_user_id: str = "demo-user",
     ) -> None:
         self.model = model
-        self.enable_live = bool(enable_live and api_key.strip())
-        self.client = genai.Client(api_key=api_key) if self.enable_live else None
+        self.gateway = gateway or LLMGateway(api_key=api_key, enable_live=enable_live)
+        self.enable_live = self.gateway.enable_live
         self.conversation_repo = conversation_repo
         self.job_repo = job_repo
         self.task_repo = task_repo
+        self.default_user_id = default_user_id
+        self.history_limit = max(1, int(history_limit))
+        self.history_cache_size = max(1, int(history_cache_size))
+        self._history_tails: OrderedDict[str, deque] = OrderedDict()
+        self._history_lock = threading.Lock()
 
     def _generate_text(self, prompt: str) -> str:
-        if self.client is None:
-            raise ValueError("Live Gemini is disabled")
+        return self.gateway.generate_text(
+            prompt,
+            model=self.model,
+            call_site="assistant",
+            temperature=0.3,
+        )
 
-        response = self.client.models.generate_content(
+    def _stream_text(self, prompt: str) -> Iterator[str]:
+        return self.gateway.stream_text(
+            prompt,
             model=self.model,
-            contents=prompt,
-            config={"temperature": 0.3},
+            call_site="assistant",
+            temperature=0.3,
+        )
+
+    def _context_snapshot(self, user_id: str) -> str:
+        tasks = self.task_repo.list_task_fields(
+            ("title", "due_at", "completed"), limit=5, user_id=user_id
+        )
+        jobs = self.job_repo.list_job_fields(
+            ("title", "module", "due_at"), limit=5, user_id=user_id
         )
-        text = getattr(response, "text", None)
-        if isinstance(text, str) and text.strip():
-            return text.strip()
-
-        candidates = getattr(response, "candidates", None) or []
-        for candidate in candidates:
-            content = getattr(candidate, "content", None)
-            parts = getattr(content, "parts", None) or []
-            for part in parts:
-                value = getattr(part, "text", None)
-                if isinstance(value, str) and value.strip():
-                    return value.strip()
-        raise ValueError("Gemini response did not include text")
-
-    def _context_snapshot(self) -> str:
-        tasks = self.task_repo.list_tasks(limit=5)
-        jobs = self.job_repo.list_jobs(limit=5)
 
         task_lines = [
-            f"- {task.title} | due={task.due_at or 'n/a'} | completed={bool(task.completed)}"
+            f"- {task.get('title', '')} | due={to_iso_z(as_utc(task.get('due_at'))) or 'n/a'}"
+            f" | completed={bool(task.get('completed'))}"
             for task in tasks
         ]
         if not task_lines:
             task_lines = ["- No tasks yet"]
 
         job_lines = [
-            f"- {job.title} | module={job.module} | due={job.due_at or 'n/a'}"
+            f"- {job.get('title', '')} | module={job.get('module')}"
+            f" | due={to_iso_z(as_utc(job.get('due_at'))) or 'n/a'}"
             for job in jobs
         ]
         if not job_lines:
@@ -70,8 +93,33 @@ class AssistantService:
             + "\n".join(job_lines)
         )
 
-    def _history_text(self, conversation_id: str) -> str:
-        history = self.conversation_repo.list_messages(conversation_id=conversation_id, limit=8)
+    def _history_tail(self, conversation_id: str) -> list[dict]:
+        with self._history_lock:
+            tail = self._history_tails.get(conversation_id)
+            if tail is not None:
+                self._history_tails.move_to_end(conversation_id)
+                return list(tail)
+
+        rows = self.conversation_repo.list_messages(
+            conversation_id=conversation_id,
+            limit=self.history_limit,
+        )
+        with self._history_lock:
+            tail = self._history_tails.setdefault(
+                conversation_id, deque(rows, maxlen=self.history_limit)
+            )
+            self._history_tails.move_to_end(conversation_id)
+            while len(self._history_tails) > self.history_cache_size:
+                self._history_tails.popitem(last=False)
+            return list(tail)
+
+    def _remember_turn(self, conversation_id: str, messages: list[dict]) -> None:
+        with self._history_lock:
+            tail = self._history_tails.get(conversation_id)
+            if tail is not None:
+                tail.extend(messages)
+
+    def _history_text(self, history: list[dict]) -> str:
         if not history:
             return "No prior messages."
         return "\n".join([f"{row['role']}: {row['text']}" for row in history])
@@ -82,40 +130,108 @@ class AssistantService:
             "I can still help with scheduling, documents, jobs, and study planning once Gemini is enabled."
         )
 
-    def chat(self, conversation_id: str, message: str, context_page: str) -> dict:
-        self.conversation_repo.add_message(
+    def _prepare_turn(
+        self,
+        conversation_id: str,
+        message: str,
+        context_page: str,
+        user_id: str | None = None,
+    ) -> tuple[dict, str]:
+        user_row = self.conversation_repo.build_message(
             conversation_id=conversation_id,
             role="user",
             text=message,
             context_page=context_page,
         )
-
-        prompt = (
-            "You are Beacon, a concise student assistant.\n"
-            f"Current page: {context_page}\n\n"
-            "Use this context to answer helpfully and briefly.\n\n"
-            f"{self._context_snapshot()}\n\n"
-            "Conversation history:\n"
-            f"{self._history_text(conversation_id)}\n\n"
-            f"Latest user message: {message}"
+        history = (self._history_tail(conversation_id) + [user_row])[-self.history_limit :]
+
+        # Older history goes first when the prompt is over budget, then the snapshot.
+        prompt = self.gateway.prompts.compose(
+            "assistant",
+            CHAT_PROMPT,
+            PromptSection("context_page", context_page),
+            PromptSection(
+                "snapshot",
+                self._context_snapshot(user_id or self.default_user_id),
+                priority=1,
+                min_tokens=60,
+            ),
+            PromptSection("history", self._history_text(history), priority=0, keep="tail"),
+            PromptSection("message", message),
         )
+        return user_row, prompt
 
-        fallback = False
-        try:
-            reply = self._generate_text(prompt)
-        except Exception:
-            reply = self._fallback_reply(message=message, context_page=context_page)
-            fallback = True
+    def _persist(self, conversation_id: str, rows: list[dict]) -> None:
+        self.conversation_repo.append_turn(rows)
+        self._remember_turn(conversation_id, rows)
 
-        self.conversation_repo.add_message(
+    def _finish_turn(
+        self,
+        conversation_id: str,
+        user_row: dict,
+        reply: str,
+        fallback: bool,
+        context_page: str,
+    ) -> dict:
+        assistant_row = self.conversation_repo.build_message(
             conversation_id=conversation_id,
             role="assistant",
             text=reply,
             context_page=context_page,
         )
+        self._persist(conversation_id, [user_row, assistant_row])
         return {
             "conversation_id": conversation_id,
             "reply": reply,
             "model": self.model,
             "fallback": fallback,
         }
+
+    def chat(
+        self,
+        conversation_id: str,
+        message: str,
+        context_page: str,
+        user_id: str | None = None,
+    ) -> dict:
+        user_row, prompt = self._prepare_turn(conversation_id, message, context_page, user_id)
+
+        fallback = False
+        reply = None
+        try:
+            reply = self._generate_text(prompt)
+        except Exception:
+            reply = self._fallback_reply(message=message, context_page=context_page)
+            fallback = True
+        finally:
+            # Without a reply the turn is never written together; keep the user's message.
+            if reply is None:
+                self._persist(conversation_id, [user_row])
+        return self._finish_turn(conversation_id, user_row, reply, fallback, context_page)
+
+    def stream_chat(
+        self,
+        conversation_id: str,
+        message: str,
+        context_page: str,
+        user_id: str | None = None,
+    ) -> Iterator[tuple[str, dict]]:
+        user_row, prompt = self._prepare_turn(conversation_id, message, context_page, user_id)
+
+        fallback = False
+        reply = None
+        chunks: list[str] = []
+        try:
+            for chunk in self._stream_text(prompt):
+                chunks.append(chunk)
+                yield "token", {"text": chunk}
+            reply = "".join(chunks).strip()
+        except Exception:
+            reply = self._fallback_reply(message=message, context_page=context_page)
+            fallback = True
+        finally:
+            # A client that disconnects mid-stream closes this generator (GeneratorExit),
+            # so the reply never completes; the user's message is still recorded.
+            if reply is None:
+                self._persist(conversation_id, [user_row])
+        yield "final", self._finish_turn(conversation_id, user_row, reply, fallback, context_page)
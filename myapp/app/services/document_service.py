@@ -1,12 +1,14 @@
+import asyncio
 import base64
 from io import BytesIO
 from typing import Any
 from datetime import UTC, datetime
 
-from google import genai
 from pypdf import PdfReader
 
-from app.models.persistence.document_repo import DocumentRepository
+from app.models.persistence.document_repo import AsyncDocumentRepository, DocumentRepository
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.prompt_budget import PromptSection
 from app.utils.hashing import sha256_text
 
 
@@ -19,13 +21,16 @@ class DocumentService:
         model: str,
         api_key: str,
         enable_live: bool,
+        async_document_repo: AsyncDocumentRepository | None = None,
+        gateway: LLMGateway | None = None,
     ) -> None:
         self.document_repo = document_repo
+        self.async_document_repo = async_document_repo
         self.default_user_id = default_user_id
         self.max_upload_bytes = max(1, int(max_upload_mb)) * 1024 * 1024
         self.model = model
-        self.enable_live = bool(enable_live and api_key.strip())
-        self.client = genai.Client(api_key=api_key) if self.enable_live else None
+        self.gateway = gateway or LLMGateway(api_key=api_key, enable_live=enable_live)
+        self.enable_live = self.gateway.enable_live
 
     def _decode_pdf_bytes(self, data_base64: str, filename: str, content_type: str) -> bytes:
         if content_type.lower() != "application/pdf" and not filename.lower().endswith(".pdf"):
@@ -53,42 +58,31 @@ class DocumentService:
             text = "No extractable text found in PDF."
         return text[:12000], len(reader.pages)
 
-    def _generate_text(self, prompt: str) -> str:
-        if self.client is None:
-            raise ValueError("Live Gemini is disabled")
-
-        response = self.client.models.generate_content(
+    def _generate_text(self, prompt: str, call_site: str = "documents") -> str:
+        return self.gateway.generate_text(
+            prompt,
             model=self.model,
-            contents=prompt,
-            config={"temperature": 0.2},
+            call_site=call_site,
+            temperature=0.2,
         )
-        text = getattr(response, "text", None)
-        if isinstance(text, str) and text.strip():
-            return text.strip()
-
-        candidates = getattr(response, "candidates", None) or []
-        for candidate in candidates:
-            content = getattr(candidate, "content", None)
-            parts = getattr(content, "parts", None) or []
-            for part in parts:
-                value = getattr(part, "text", None)
-                if isinstance(value, str) and value.strip():
-                    return value.strip()
-        raise ValueError("Gemini response did not include text")
 
     def _lecture_summary(self, title: str, module: str, extracted_text: str) -> str:
         if not self.enable_live:
             snippet = extracted_text[:280].replace("\n", " ").strip()
             return f"{module}: {title}. Preview: {snippet}"
 
-        prompt = (
+        prompt = self.gateway.prompts.compose(
+            "documents.summary",
             "Summarize these lecture notes in 3 concise bullets for a student.\n"
-            f"Module: {module}\n"
-            f"Title: {title}\n"
-            f"Content:\n{extracted_text[:8000]}"
+            "Module: {module}\n"
+            "Title: {title}\n"
+            "Content:\n{content}",
+            PromptSection("module", module),
+            PromptSection("title", title),
+            PromptSection("content", extracted_text, priority=0),
         )
         try:
-            return self._generate_text(prompt)
+            return self._generate_text(prompt, call_site="documents.summary")
         except Exception:
             snippet = extracted_text[:280].replace("\n", " ").strip()
             return f"{module}: {title}. Preview: {snippet}"
@@ -98,15 +92,19 @@ class DocumentService:
             lines = [line.strip() for line in extracted_text.splitlines() if line.strip()]
             return lines[:3] if lines else [f"Uploaded report: {title} ({report_type})"]
 
-        prompt = (
+        prompt = self.gateway.prompts.compose(
+            "documents.highlights",
             "Extract 3 short highlights from this academic report. "
             "Return plain lines only, no markdown.\n"
-            f"Report type: {report_type}\n"
-            f"Title: {title}\n"
-            f"Content:\n{extracted_text[:8000]}"
+            "Report type: {report_type}\n"
+            "Title: {title}\n"
+            "Content:\n{content}",
+            PromptSection("report_type", report_type),
+            PromptSection("title", title),
+            PromptSection("content", extracted_text, priority=0),
         )
         try:
-            text = self._generate_text(prompt)
+            text = self._generate_text(prompt, call_site="documents.highlights")
             highlights = [line.strip("- \t") for line in text.splitlines() if line.strip()]
             return highlights[:3] if highlights else [f"Uploaded report: {title} ({report_type})"]
         except Exception:
@@ -177,6 +175,36 @@ class DocumentService:
         }
         return self.document_repo.create_document(metadata=metadata, file_bytes=file_bytes)
 
+    def page_documents(
+        self,
+        doc_type: str,
+        user_id: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return self.document_repo.page_documents(
+            doc_type=doc_type,
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    async def page_documents_async(
+        self,
+        doc_type: str,
+        user_id: str,
+        limit: int = 200,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        if self.async_document_repo is None:
+            return await asyncio.to_thread(self.page_documents, doc_type, user_id, limit, cursor)
+        return await self.async_document_repo.page_documents(
+            doc_type=doc_type,
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor,
+        )
+
     def list_lecture_notes(self, user_id: str) -> list[dict]:
         return self.document_repo.list_documents(doc_type="lecture_note", user_id=user_id)
 
@@ -193,3 +221,43 @@ class DocumentService:
             "content_type": row.get("content_type", "application/pdf"),
             "data_base64": base64.b64encode(file_bytes).decode("utf-8"),
         }
+
+    async def download_document_async(self, doc_id: str) -> dict:
+        if self.async_document_repo is None:
+            return await asyncio.to_thread(self.download_document, doc_id)
+
+        row = await self.async_document_repo.get_document(doc_id)
+        if row is None:
+            raise ValueError(f"Document not found: {doc_id}")
+        file_bytes = await self.async_document_repo.read_file_bytes(row["file_id"])
+        return {
+            "filename": row["filename"],
+            "content_type": row.get("content_type", "application/pdf"),
+            "data_base64": base64.b64encode(file_bytes).decode("utf-8"),
+        }
+
+    def _slice_text(self, doc_id: str, text: str | None, start: int, end: int | None) -> dict:
+        if text is None:
+            raise ValueError(f"Document not found: {doc_id}")
+        total = len(text)
+        stop = total if end is None else min(int(end), total)
+        begin = min(max(0, int(start)), stop)
+        return {
+            "doc_id": doc_id,
+            "start": begin,
+            "end": stop,
+            "total_length": total,
+            "text": text[begin:stop],
+        }
+
+    def get_document_text(self, doc_id: str, start: int = 0, end: int | None = None) -> dict:
+        text = self.document_repo.get_document_text(doc_id)
+        return self._slice_text(doc_id, text, start, end)
+
+    async def get_document_text_async(
+        self, doc_id: str, start: int = 0, end: int | None = None
+    ) -> dict:
+        if self.async_document_repo is None:
+            return await asyncio.to_thread(self.get_document_text, doc_id, start, end)
+        text = await self.async_document_repo.get_document_text(doc_id)
+        return self._slice_text(doc_id, text, start, end)
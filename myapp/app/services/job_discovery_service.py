@@ -1,3 +1,4 @@
+import asyncio
 import json
 import re
 import ssl
@@ -6,11 +7,12 @@ from typing import Any
 from urllib.parse import urlencode
 from urllib.request import urlopen
 
-from google import genai
-
 from app.models.domain.job import Job
-from app.models.persistence.job_repo import JobRepository
+from app.models.persistence.job_repo import AsyncJobRepository, JobRepository
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.prompt_budget import PromptSection
 from app.utils.hashing import sha256_text
+from app.utils.time import utc_now
 
 
 class JobDiscoveryService:
@@ -21,11 +23,16 @@ class JobDiscoveryService:
         gemini_api_key: str,
         enable_live: bool,
         serpapi_key: str,
+        default_user_id: str = "demo-user",
+        gateway: LLMGateway | None = None,
+        async_job_repo: AsyncJobRepository | None = None,
     ) -> None:
         self.job_repo = job_repo
+        self.async_job_repo = async_job_repo
+        self.default_user_id = default_user_id
         self.model = model
-        self.enable_live = bool(enable_live and gemini_api_key.strip())
-        self.client = genai.Client(api_key=gemini_api_key) if self.enable_live else None
+        self.gateway = gateway or LLMGateway(api_key=gemini_api_key, enable_live=enable_live)
+        self.enable_live = self.gateway.enable_live
         self.serpapi_key = serpapi_key.strip()
         self.last_refreshed_at: str | None = None
 
@@ -38,27 +45,12 @@ class JobDiscoveryService:
             return ssl.create_default_context()
 
     def _generate_text(self, prompt: str) -> str:
-        if self.client is None:
-            raise ValueError("Live Gemini is disabled")
-
-        response = self.client.models.generate_content(
+        return self.gateway.generate_text(
+            prompt,
             model=self.model,
-            contents=prompt,
-            config={"temperature": 0.2},
+            call_site="jobs",
+            temperature=0.2,
         )
-        text = getattr(response, "text", None)
-        if isinstance(text, str) and text.strip():
-            return text.strip()
-
-        candidates = getattr(response, "candidates", None) or []
-        for candidate in candidates:
-            content = getattr(candidate, "content", None)
-            parts = getattr(content, "parts", None) or []
-            for part in parts:
-                value = getattr(part, "text", None)
-                if isinstance(value, str) and value.strip():
-                    return value.strip()
-        raise ValueError("Gemini response did not include text")
 
     def _extract_json(self, text: str) -> Any:
         cleaned = text.strip()
@@ -149,15 +141,19 @@ class JobDiscoveryService:
                 for item in rows
             ]
         )
-        prompt = (
+        prompt = self.gateway.prompts.compose(
+            "jobs",
             "Normalize these LinkedIn job search results to JSON array.\n"
             "Each item must include fields: title, company, location, source_url, notes, "
             "module, due_at, module_weight_percent, estimated_hours, match_score.\n"
-            f"User query: {query}\n"
-            f"Location: {location}\n"
+            "User query: {query}\n"
+            "Location: {location}\n"
             "module should usually be 'Career'.\n"
             "due_at must be ISO8601 UTC with Z suffix.\n"
-            f"Results:\n{sources}"
+            "Results:\n{sources}",
+            PromptSection("query", query),
+            PromptSection("location", location),
+            PromptSection("sources", sources, priority=0),
         )
         try:
             raw = self._generate_text(prompt)
@@ -189,13 +185,12 @@ class JobDiscoveryService:
         except Exception:
             return self._fallback_jobs(rows=rows, location=location)
 
-    def _to_job(self, row: dict, position: int) -> Job:
+    def _to_job(self, row: dict, position: int, user_id: str) -> Job:
         source_url = str(row.get("source_url") or "")
         title = str(row.get("title") or f"Job {position}")
         job_id = f"job-{sha256_text(source_url or title)[:16]}"
 
         due_at = str(row.get("due_at") or "").strip() or None
-        discovered_at = datetime.now(UTC).isoformat().replace("+00:00", "Z")
         return Job(
             id=job_id,
             title=title,
@@ -208,15 +203,24 @@ class JobDiscoveryService:
             location=str(row.get("location") or ""),
             source_url=source_url or None,
             match_score=max(0, min(100, int(row.get("match_score") or 75))),
-            discovered_at=discovered_at,
+            discovered_at=utc_now(),
+            user_id=user_id,
         )
 
-    def discover(self, query: str, location: str, limit: int) -> dict:
+    def discover(
+        self, query: str, location: str, limit: int, user_id: str | None = None
+    ) -> dict:
+        user_id = user_id or self.default_user_id
         serp_rows = self._search_serpapi(query=query, location=location, limit=limit)
         normalized = self._normalize_with_gemini(rows=serp_rows, query=query, location=location)
 
-        existing_ids = {job.id for job in self.job_repo.list_jobs(limit=5000)}
-        jobs = [self._to_job(item, index) for index, item in enumerate(normalized, start=1)]
+        existing_ids = {
+            row["job_id"]
+            for row in self.job_repo.list_job_fields(("job_id",), limit=5000, user_id=user_id)
+        }
+        jobs = [
+            self._to_job(item, index, user_id) for index, item in enumerate(normalized, start=1)
+        ]
 
         added = sum(1 for job in jobs if job.id not in existing_ids)
         updated = len(jobs) - added
@@ -229,7 +233,10 @@ class JobDiscoveryService:
             "jobs_added": added,
             "jobs_updated": updated,
             "sources": [row.get("source_url", "") for row in serp_rows if row.get("source_url")],
-            "jobs": [self._job_to_schema(job) for job in self.job_repo.list_jobs(limit=max(limit, 50))[:limit]],
+            "jobs": [
+                self._job_to_schema(job)
+                for job in self.job_repo.list_jobs(limit=max(limit, 50), user_id=user_id)[:limit]
+            ],
             "last_refreshed_at": self.last_refreshed_at,
         }
 
@@ -249,34 +256,68 @@ class JobDiscoveryService:
             "discovered_at": job.discovered_at,
         }
 
-    def list_jobs(self, auto_refresh: bool = True) -> dict:
-        now = datetime.now(UTC)
-        should_refresh = False
-        if auto_refresh:
-            if self.last_refreshed_at is None:
-                should_refresh = True
-            else:
-                try:
-                    parsed = datetime.fromisoformat(self.last_refreshed_at.replace("Z", "+00:00"))
-                    should_refresh = (now - parsed) >= timedelta(hours=24)
-                except Exception:
-                    should_refresh = True
+    def _refresh_due(self, auto_refresh: bool, cursor: str | None, now: datetime) -> bool:
+        if not auto_refresh or cursor is not None or not self.serpapi_key:
+            return False
+        if self.last_refreshed_at is None:
+            return True
+        try:
+            parsed = datetime.fromisoformat(self.last_refreshed_at.replace("Z", "+00:00"))
+            return (now - parsed) >= timedelta(hours=24)
+        except Exception:
+            return True
 
-        if should_refresh and self.serpapi_key:
-            try:
-                self.discover(
-                    query="software engineer internship",
-                    location="London",
-                    limit=10,
-                )
-            except Exception:
-                pass
+    def _auto_refresh(self, user_id: str) -> None:
+        try:
+            self.discover(
+                query="software engineer internship",
+                location="London",
+                limit=10,
+                user_id=user_id,
+            )
+        except Exception:
+            pass
 
-        jobs = self.job_repo.list_jobs(limit=200)
+    def _jobs_payload(self, jobs: list[Job], next_cursor: str | None, now: datetime) -> dict:
         if self.last_refreshed_at is None:
             self.last_refreshed_at = now.isoformat().replace("+00:00", "Z")
         return {
             "count": len(jobs),
             "jobs": [self._job_to_schema(job) for job in jobs],
             "last_refreshed_at": self.last_refreshed_at,
+            "next_cursor": next_cursor,
         }
+
+    def list_jobs(
+        self,
+        auto_refresh: bool = True,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> dict:
+        user_id = user_id or self.default_user_id
+        now = datetime.now(UTC)
+        if self._refresh_due(auto_refresh, cursor, now):
+            self._auto_refresh(user_id)
+        jobs, next_cursor = self.job_repo.page_jobs(limit=limit, cursor=cursor, user_id=user_id)
+        return self._jobs_payload(jobs, next_cursor, now)
+
+    async def list_jobs_async(
+        self,
+        auto_refresh: bool = True,
+        limit: int = 200,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> dict:
+        if self.async_job_repo is None:
+            return await asyncio.to_thread(self.list_jobs, auto_refresh, limit, cursor, user_id)
+        user_id = user_id or self.default_user_id
+        now = datetime.now(UTC)
+        if self._refresh_due(auto_refresh, cursor, now):
+            # Discovery calls SerpAPI and the LLM synchronously and writes through the
+            # cached job repo, so it runs on a worker thread.
+            await asyncio.to_thread(self._auto_refresh, user_id)
+        jobs, next_cursor = await self.async_job_repo.page_jobs(
+            limit=limit, cursor=cursor, user_id=user_id
+        )
+        return self._jobs_payload(jobs, next_cursor, now)
@@ -0,0 +1,101 @@
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.items: list[tuple[list[dict], Future]] = []
+        self.size = 0
+        self.closed = threading.Event()
+
+
+class MicroBatcher:
+    """Merges requests that arrive within a short window into one batched call.
+
+    The first request for a key opens a batch and waits up to ``window_seconds`` (or
+    until the batch reaches ``max_batch_items`` items or ``max_batch_requests``
+    requests), then runs ``run_batch`` once for everyone. ``run_batch`` receives the
+    item lists in arrival order and must return one result per request. A result that
+    is an exception is raised for that request only; if ``run_batch`` itself raises,
+    every request in the batch gets that error.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[Hashable, list[list[dict]]], list],
+        window_seconds: float = 0.02,
+        max_batch_items: int = 50,
+        max_batch_requests: int = 16,
+    ) -> None:
+        self.run_batch = run_batch
+        self.window_seconds = max(0.0, float(window_seconds))
+        self.max_batch_items = max(1, int(max_batch_items))
+        self.max_batch_requests = max(1, int(max_batch_requests))
+        self._open: dict[Hashable, _Batch] = {}
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._items = 0
+        self._full_batches = 0
+        self._max_requests_seen = 0
+
+    def submit(self, key: Hashable, items: list[dict]):
+        future: Future = Future()
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = _Batch()
+                self._open[key] = batch
+            batch.items.append((items, future))
+            batch.size += len(items)
+            if batch.size >= self.max_batch_items or len(batch.items) >= self.max_batch_requests:
+                del self._open[key]
+                batch.closed.set()
+
+        if leader:
+            full = batch.closed.wait(self.window_seconds)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            self._flush(key, batch, full)
+        return future.result()
+
+    def _flush(self, key: Hashable, batch: _Batch, full: bool) -> None:
+        with self._lock:
+            self._batches += 1
+            self._requests += len(batch.items)
+            self._items += batch.size
+            self._full_batches += int(full)
+            self._max_requests_seen = max(self._max_requests_seen, len(batch.items))
+        try:
+            results = self.run_batch(key, [items for items, _ in batch.items])
+            if len(results) != len(batch.items):
+                raise ValueError("Batched call returned the wrong number of results")
+        except Exception as exc:
+            for _, future in batch.items:
+                future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch.items, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "window_ms": round(self.window_seconds * 1000, 3),
+                "max_batch_items": self.max_batch_items,
+                "max_batch_requests": self.max_batch_requests,
+                "batches": self._batches,
+                "requests": self._requests,
+                "items": self._items,
+                "full_batches": self._full_batches,
+                "avg_requests_per_batch": (
+                    round(self._requests / self._batches, 3) if self._batches else 0.0
+                ),
+                "max_requests_per_batch": self._max_requests_seen,
+                "calls_saved": self._requests - self._batches,
+            }
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops live LLM calls while too many recent ones failed or ran slow.
+
+    The last ``window`` outcomes are kept; once at least ``min_calls`` are recorded and
+    the share of bad ones reaches ``failure_ratio`` the breaker opens and ``allow``
+    returns False for ``open_seconds``. It then lets ``half_open_probes`` calls through:
+    a good probe closes the breaker with a fresh window, a bad one re-opens it.
+    Every ``allow()`` that returns True must be followed by exactly one ``record``.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_ratio: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window = max(1, int(window))
+        self.min_calls = max(1, min(int(min_calls), self.window))
+        self.failure_ratio = min(1.0, max(0.0, float(failure_ratio)))
+        self.open_seconds = max(0.0, float(open_seconds))
+        self.half_open_probes = max(1, int(half_open_probes))
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=self.window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._rejected = 0
+
+    def _refresh(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._opened += 1
+        self._outcomes.clear()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record(self, bad: bool) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if bad:
+                    self._open()
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+            if self._state == OPEN:
+                # A call admitted before the breaker opened; its outcome is stale.
+                return
+            self._outcomes.append(bool(bad))
+            if len(self._outcomes) >= self.min_calls:
+                failures = sum(self._outcomes)
+                if failures / len(self._outcomes) >= self.failure_ratio:
+                    self._open()
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refresh()
+            recent = len(self._outcomes)
+            return {
+                "state": self._state,
+                "recent_calls": recent,
+                "recent_failure_ratio": round(sum(self._outcomes) / recent, 4) if recent else 0.0,
+                "failure_ratio": self.failure_ratio,
+                "times_opened": self._opened,
+                "rejected": self._rejected,
+                "open_seconds": self.open_seconds,
+            }
@@ -0,0 +1,361 @@
+import json
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.utils.hashing import sha256_text
+from app.utils.time import to_iso_z, utc_now
+
+PROMPT_FAMILIES = ("priority", "integrity", "evaluation", "career", "jobs", "text")
+
+_ERROR_STATUS = {
+    400: "INVALID_ARGUMENT",
+    404: "NOT_FOUND",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+}
+_ROUTE = re.compile(
+    r"^/[^/]+/models/(?P<model>[^:/]+):(?P<method>generateContent|streamGenerateContent)$"
+)
+_TASKS = re.compile(r"['\"]id['\"]:\s*['\"](?P<id>[^'\"]+)['\"]")
+_KEYWORDS = {
+    "technical_skills": ("python", "java", "sql", "machine learning", "data analysis", "rest api"),
+    "tools_technologies": ("git", "docker", "kubernetes", "aws", "react", "fastapi"),
+    "cognitive_skills": ("problem solving", "analytical", "critical thinking"),
+    "behavioural_traits": ("teamwork", "communication", "ownership", "leadership"),
+}
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Turn ``fixed:MS``, ``uniform:MIN:MAX``, ``exp:MEAN`` or ``lognormal:MEDIAN:SIGMA``
+    (all in milliseconds) into a sampler returning seconds."""
+    kind, _, rest = (spec or "fixed:0").strip().partition(":")
+    try:
+        args = [float(part) for part in rest.split(":") if part]
+        if kind == "fixed" and len(args) == 1:
+            return lambda rng: args[0] / 1000
+        if kind == "uniform" and len(args) == 2:
+            return lambda rng: rng.uniform(args[0], args[1]) / 1000
+        if kind == "exp" and len(args) == 1 and args[0] > 0:
+            return lambda rng: rng.expovariate(1 / args[0]) / 1000
+        if kind == "lognormal" and len(args) == 2 and args[0] > 0:
+            median = args[0]
+            return lambda rng: median * rng.lognormvariate(0.0, args[1]) / 1000
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+def classify_prompt(prompt: str) -> str:
+    if '"rated_tasks"' in prompt:
+        return "priority"
+    if "academic integrity officer" in prompt:
+        return "integrity"
+    if "Student answer:" in prompt and '"score"' in prompt:
+        return "evaluation"
+    if "Job Description:" in prompt:
+        return "career"
+    if "Normalize these LinkedIn job search results" in prompt:
+        return "jobs"
+    return "text"
+
+
+def _section(prompt: str, label: str) -> str:
+    _, _, rest = prompt.partition(label)
+    return rest.strip()
+
+
+def _stable_int(value: str, low: int, high: int) -> int:
+    return low + int(sha256_text(value)[:8], 16) % (high - low + 1)
+
+
+def _band(score: int) -> str:
+    if score >= 85:
+        return "critical"
+    if score >= 65:
+        return "high"
+    if score >= 35:
+        return "medium"
+    return "low"
+
+
+def _priority_reply(prompt: str) -> str:
+    ids = [match.group("id") for match in _TASKS.finditer(_section(prompt, "Tasks:"))]
+    rated = []
+    for task_id in ids:
+        score = _stable_int(task_id, 5, 99)
+        rated.append(
+            {
+                "id": task_id,
+                "priority_score": score,
+                "priority_band": _band(score),
+                "reason": "Fake rating",
+            }
+        )
+    return json.dumps({"summary": f"Rated {len(rated)} tasks", "rated_tasks": rated})
+
+
+def _integrity_reply(prompt: str) -> str:
+    query = _section(prompt, "Query:").split("\n", 1)[0].lower()
+    flagged = re.search(
+        r"\b(write|complete|solve) (my|this|the)\b|\bgive me the (answer|solution)\b", query
+    )
+    return "VIOLATION" if flagged else "ACCEPTABLE"
+
+
+def _evaluation_reply(prompt: str) -> str:
+    answer = _section(prompt, "Student answer:").split("Reference material", 1)[0]
+    score = min(95, 35 + len(answer.split()) // 2)
+    return json.dumps(
+        {
+            "score": score,
+            "comments": "The answer addresses the question; add a concrete example.",
+            "strengths": ["Direct response to the question"],
+            "improvements": ["Add an example", "Define key terms"],
+        }
+    )
+
+
+def _career_reply(prompt: str) -> str:
+    text = _section(prompt, "Job Description:").lower()
+    payload: dict = {
+        key: [word for word in words if word in text] for key, words in _KEYWORDS.items()
+    }
+    payload["experience_level"] = "Senior" if "senior" in text else "Entry level"
+    return json.dumps(payload)
+
+
+def _jobs_reply(prompt: str) -> str:
+    due_at = to_iso_z(utc_now() + timedelta(days=30))
+    jobs = []
+    for line in _section(prompt, "Results:").splitlines():
+        fields = dict(
+            part.strip().split("=", 1) for part in line.lstrip("- ").split(" | ") if "=" in part
+        )
+        if not fields.get("title"):
+            continue
+        jobs.append(
+            {
+                "title": fields["title"],
+                "company": "Example Ltd",
+                "location": "London",
+                "source_url": fields.get("url", ""),
+                "notes": fields.get("snippet", "")[:200],
+                "module": "Career",
+                "due_at": due_at,
+                "module_weight_percent": 20,
+                "estimated_hours": 3,
+                "match_score": _stable_int(fields["title"], 40, 95),
+            }
+        )
+    return json.dumps(jobs)
+
+
+def _text_reply(prompt: str) -> str:
+    if "Socratic" in prompt or "ONE question" in prompt:
+        return "What assumption does your answer rely on, and how would you test it?"
+    if "highlights" in prompt or "Summarize" in prompt:
+        return "- Key idea one\n- Key idea two\n- Key idea three"
+    return (
+        "Here is a short plan: finish the task with the nearest deadline first, "
+        "block two focused hours for it today, then review your notes for the next "
+        "module and set a reminder to check progress tomorrow morning."
+    )
+
+
+_REPLIES = {
+    "priority": _priority_reply,
+    "integrity": _integrity_reply,
+    "evaluation": _evaluation_reply,
+    "career": _career_reply,
+    "jobs": _jobs_reply,
+    "text": _text_reply,
+}
+
+
+def fake_reply(prompt: str) -> tuple[str, str]:
+    family = classify_prompt(prompt)
+    return family, _REPLIES[family](prompt)
+
+
+@dataclass
+class FakeGeminiConfig:
+    latency: str = "fixed:0"
+    family_latency: Mapping[str, str] = field(default_factory=dict)
+    error_rate: float = 0.0
+    error_status: int = 503
+    chunk_words: int = 6
+    chunk_delay: str = "fixed:0"
+    seed: int | None = None
+
+
+class FakeGeminiServer:
+    """Local stand-in for the Gemini REST API used by ``google-genai``.
+
+    Serves ``generateContent`` and ``streamGenerateContent?alt=sse`` for any model,
+    answering each prompt family with output the services accept. Latency is sampled
+    per request (per family if ``family_latency`` lists it), ``error_rate`` of requests
+    get ``error_status`` with a Gemini-style error body, and streams are split into
+    ``chunk_words``-word chunks separated by ``chunk_delay``. Point the app at it with
+    ``GEMINI_BASE_URL``; ``GET /stats`` returns request counts.
+    """
+
+    def __init__(
+        self, config: FakeGeminiConfig | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        self.config = config or FakeGeminiConfig()
+        self._latency = parse_latency(self.config.latency)
+        self._family_latency = {
+            family: parse_latency(spec) for family, spec in self.config.family_latency.items()
+        }
+        self._chunk_delay = parse_latency(self.config.chunk_delay)
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "streams": 0, "errors": 0}
+        self._families = dict.fromkeys(PROMPT_FAMILIES, 0)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGeminiServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counts, "families": dict(self._families)}
+
+    def _sample(self, sampler: Callable[[random.Random], float]) -> float:
+        with self._lock:
+            return max(0.0, sampler(self._rng))
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.config.error_rate
+
+    def _plan(self, prompt: str, stream: bool) -> tuple[str, str, float, bool]:
+        family, text = fake_reply(prompt)
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["streams"] += int(stream)
+            self._families[family] += 1
+        delay = self._sample(self._family_latency.get(family, self._latency))
+        failed = self._should_fail()
+        if failed:
+            with self._lock:
+                self._counts["errors"] += 1
+        return family, text, delay, failed
+
+    def _chunks(self, text: str) -> list[str]:
+        words = re.findall(r"\S+\s*", text)
+        size = max(1, int(self.config.chunk_words))
+        chunks = ["".join(words[index : index + size]) for index in range(0, len(words), size)]
+        return chunks or [text]
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args) -> None:
+                return
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if self.path.rstrip("/") == "/stats":
+                    self._send_json(200, server.stats())
+                else:
+                    self._send_json(404, _error(404, "Not found"))
+
+            def do_POST(self) -> None:
+                route = _ROUTE.match(self.path.split("?", 1)[0])
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    body = None
+                if route is None or not isinstance(body, dict):
+                    self._send_json(400, _error(400, "Bad request"))
+                    return
+
+                prompt = "\n".join(
+                    part.get("text", "")
+                    for content in body.get("contents") or []
+                    for part in (content.get("parts") or [])
+                    if isinstance(part, dict)
+                )
+                model = route.group("model")
+                stream = route.group("method") == "streamGenerateContent"
+                _, text, delay, failed = server._plan(prompt, stream)
+                time.sleep(delay)
+                if failed:
+                    status = int(server.config.error_status)
+                    self._send_json(status, _error(status, "Injected failure"))
+                    return
+                if not stream:
+                    self._send_json(200, _response(text, model, prompt, final=True))
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                chunks = server._chunks(text)
+                for index, chunk in enumerate(chunks):
+                    if index:
+                        time.sleep(server._sample(server._chunk_delay))
+                    payload = _response(chunk, model, prompt, final=index == len(chunks) - 1)
+                    self.wfile.write(f"data: {json.dumps(payload)}\r\n\r\n".encode("utf-8"))
+                    self.wfile.flush()
+
+        return Handler
+
+
+def _error(status: int, message: str) -> dict:
+    label = _ERROR_STATUS.get(status, "UNKNOWN")
+    return {"error": {"code": status, "message": message, "status": label}}
+
+
+def _response(text: str, model: str, prompt: str, final: bool) -> dict:
+    candidate: dict = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+    if final:
+        candidate["finishReason"] = "STOP"
+    prompt_tokens = max(1, len(prompt) // 4)
+    output_tokens = max(1, len(text) // 4)
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens,
+        },
+        "modelVersion": model,
+    }
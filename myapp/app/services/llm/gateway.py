@@ -0,0 +1,492 @@
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any
+
+import httpx
+from google import genai
+from google.genai import errors as genai_errors
+
+from app.services.llm.circuit_breaker import CircuitBreaker
+from app.services.llm.prompt_budget import PromptBudget, estimate_tokens
+from app.services.llm.response_cache import LLMResponseCache, response_cache_key
+from app.services.llm.single_flight import SingleFlight
+
+
+class LLMUnavailableError(ValueError):
+    pass
+
+
+class LLMTimeoutError(TimeoutError):
+    pass
+
+
+class LLMCircuitOpenError(LLMUnavailableError):
+    pass
+
+
+def extract_response_text(response: Any) -> str:
+    text = getattr(response, "text", None)
+    if isinstance(text, str) and text.strip():
+        return text.strip()
+
+    candidates = getattr(response, "candidates", None) or []
+    for candidate in candidates:
+        content = getattr(candidate, "content", None)
+        parts = getattr(content, "parts", None) or []
+        for part in parts:
+            value = getattr(part, "text", None)
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+    raise ValueError("Gemini response did not contain text output")
+
+
+def _is_timeout(exc: Exception) -> bool:
+    return isinstance(exc, (TimeoutError, httpx.TimeoutException))
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, genai_errors.APIError):
+        code = int(getattr(exc, "code", 0) or 0)
+        return code in {408, 429} or code >= 500
+    return _is_timeout(exc) or isinstance(exc, (ConnectionError, httpx.TransportError))
+
+
+class _CallSiteMetrics:
+    def __init__(self, limit: int) -> None:
+        self.semaphore = threading.BoundedSemaphore(limit)
+        self.limit = limit
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.coalesced = 0
+        self.short_circuited = 0
+        self.in_flight = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.total_prompt_tokens = 0
+        self.max_prompt_tokens = 0
+        self.last_error: str | None = None
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "coalesced": self.coalesced,
+            "short_circuited": self.short_circuited,
+            "in_flight": self.in_flight,
+            "concurrency_limit": self.limit,
+            "avg_latency_ms": round(self.total_latency_ms / self.calls, 3) if self.calls else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 3),
+            "avg_prompt_tokens": (
+                round(self.total_prompt_tokens / self.calls, 1) if self.calls else 0.0
+            ),
+            "max_prompt_tokens": self.max_prompt_tokens,
+            "last_error": self.last_error,
+        }
+
+
+class _SlotLease:
+    """One admitted call's concurrency slot, freed exactly once.
+
+    A call abandoned at its deadline hands the lease to its future, so the slot stays
+    taken until the worker thread is actually free again.
+    """
+
+    def __init__(self, release: Callable[[], None]) -> None:
+        self._release = release
+        self.held = True
+
+    def hand_off(self, future: Future) -> None:
+        self.held = False
+        future.add_done_callback(lambda _future: self._release())
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self._release()
+
+
+class LLMGateway:
+    """Single entry point for Gemini text generation.
+
+    Every service shares one client and one global concurrency limit; each call site
+    also gets its own limit so a burst from one endpoint cannot starve the others.
+    Transient failures (timeouts, 429s, 5xx) are retried with full-jitter backoff.
+    Call sites listed in ``cache_sites`` are served from ``cache`` when the same model,
+    prompt, temperature and schema were answered before. With ``coalesce`` on, identical
+    requests that arrive while one is already in flight wait for it instead of calling
+    Gemini again.
+
+    ``latency_budgets`` overrides ``timeout_seconds`` per call site. A call that misses
+    its budget raises ``LLMTimeoutError`` at the deadline even if Gemini is still
+    working, so callers can answer with their heuristic fallback straight away; the
+    abandoned request keeps its concurrency slot until it returns. With a
+    ``breaker``, calls are refused with ``LLMCircuitOpenError`` while too many recent
+    calls failed transiently or took longer than ``slow_call_seconds``. ``prompts`` is
+    the shared ``PromptBudget`` services use to fit prompts to a per-site token budget.
+    ``base_url`` points the client at another Gemini-compatible endpoint, such as the
+    local stand-in in ``app/services/llm/fake_gemini.py``.
+    """
+
+    def __init__(
+        self,
+        api_key: str = "",
+        enable_live: bool = False,
+        max_concurrency: int = 8,
+        per_site_concurrency: int = 4,
+        timeout_seconds: float = 30.0,
+        max_retries: int = 2,
+        backoff_base_seconds: float = 0.25,
+        backoff_max_seconds: float = 4.0,
+        client: Any | None = None,
+        base_url: str = "",
+        cache: LLMResponseCache | None = None,
+        cache_sites: Iterable[str] = (),
+        coalesce: bool = True,
+        latency_budgets: Mapping[str, float] | None = None,
+        breaker: CircuitBreaker | None = None,
+        slow_call_seconds: float | None = None,
+        prompt_budget: PromptBudget | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        self.enable_live = bool(enable_live and (api_key.strip() or client is not None))
+        if self.enable_live and client is None:
+            http_options = {"base_url": base_url} if base_url else None
+            client = genai.Client(api_key=api_key, http_options=http_options)
+        self.client = client if self.enable_live else None
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.per_site_concurrency = max(1, min(int(per_site_concurrency), self.max_concurrency))
+        self.timeout_seconds = max(0.001, float(timeout_seconds))
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base_seconds = max(0.0, float(backoff_base_seconds))
+        self.backoff_max_seconds = max(self.backoff_base_seconds, float(backoff_max_seconds))
+        self.cache = cache
+        self.cache_sites = frozenset(cache_sites) if cache is not None else frozenset()
+        self.single_flight = SingleFlight() if coalesce else None
+        self.latency_budgets = {
+            site: max(0.001, float(seconds)) for site, seconds in (latency_budgets or {}).items()
+        }
+        self.breaker = breaker
+        self.slow_call_seconds = slow_call_seconds
+        self.prompts = prompt_budget or PromptBudget()
+        # Calls run on these workers so a caller can stop waiting at its deadline. A call
+        # holds its global slot until its worker is done, so admission never outruns them.
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="llm-call"
+        )
+        self._sleep = sleep
+        self._jitter = jitter
+        self._global = threading.BoundedSemaphore(self.max_concurrency)
+        self._sites: dict[str, _CallSiteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _site(self, call_site: str) -> _CallSiteMetrics:
+        site = self._sites.get(call_site)
+        if site is not None:
+            return site
+        with self._lock:
+            site = self._sites.get(call_site)
+            if site is None:
+                site = _CallSiteMetrics(self.per_site_concurrency)
+                self._sites[call_site] = site
+            return site
+
+    def _timeout_for(self, call_site: str, timeout_seconds: float | None) -> float:
+        if timeout_seconds is not None:
+            return float(timeout_seconds)
+        return self.latency_budgets.get(call_site, self.timeout_seconds)
+
+    def _admit(self, site: _CallSiteMetrics, call_site: str) -> None:
+        if self.breaker is None or self.breaker.allow():
+            return
+        with self._lock:
+            site.short_circuited += 1
+        raise LLMCircuitOpenError(f"Circuit open; skipping live call for {call_site}")
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * (2**attempt))
+        return ceiling * self._jitter()
+
+    def _acquire(self, semaphore: threading.BoundedSemaphore, deadline: float, label: str) -> None:
+        if not semaphore.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise LLMTimeoutError(f"Timed out waiting for a {label} LLM slot")
+
+    def _call(self, model: str, prompt: str, temperature: float, timeout_ms: int) -> str:
+        response = self.client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config={
+                "temperature": float(temperature),
+                "http_options": {"timeout": timeout_ms},
+            },
+        )
+        return extract_response_text(response)
+
+    def _call_within(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float,
+        remaining_ms: int,
+        call_site: str,
+        timeout: float,
+        lease: _SlotLease,
+    ) -> str:
+        future = self._executor.submit(self._call, model, prompt, temperature, remaining_ms)
+        # wait() rather than result(timeout=...): a TimeoutError raised by the call itself
+        # is the same class as the futures timeout and must stay retryable.
+        done, _ = wait([future], timeout=remaining_ms / 1000)
+        if done:
+            return future.result()
+        # The abandoned request finishes on its worker and its result is discarded; its
+        # slot is released only then, so later calls never queue behind it.
+        if not future.cancel():
+            lease.hand_off(future)
+        raise LLMTimeoutError(f"LLM call for {call_site} missed its {timeout}s budget")
+
+    def _call_stream(
+        self, model: str, prompt: str, temperature: float, timeout_ms: int
+    ) -> Iterator[str]:
+        stream = self.client.models.generate_content_stream(
+            model=model,
+            contents=prompt,
+            config={
+                "temperature": float(temperature),
+                "http_options": {"timeout": timeout_ms},
+            },
+        )
+        for chunk in stream:
+            text = getattr(chunk, "text", None)
+            if isinstance(text, str) and text:
+                yield text
+
+    def generate_text(
+        self,
+        prompt: str,
+        model: str,
+        call_site: str,
+        temperature: float = 0.2,
+        timeout_seconds: float | None = None,
+        schema: str = "",
+    ) -> str:
+        if self.client is None:
+            raise LLMUnavailableError("Live Gemini is disabled or GEMINI_API_KEY is missing")
+
+        cacheable = call_site in self.cache_sites
+        key = response_cache_key(model, prompt, temperature, schema)
+        if cacheable:
+            cached = self.cache.get(key, call_site)
+            if cached is not None:
+                return cached
+
+        def load() -> str:
+            text = self._generate(prompt, model, call_site, temperature, timeout_seconds)
+            if cacheable:
+                self.cache.put(key, call_site, text)
+            return text
+
+        if self.single_flight is None:
+            return load()
+        wait = self._timeout_for(call_site, timeout_seconds)
+        text, shared = self.single_flight.do(key, load, timeout=wait)
+        if shared:
+            site = self._site(call_site)
+            with self._lock:
+                site.coalesced += 1
+        return text
+
+    def _release(self, site: _CallSiteMetrics) -> None:
+        with self._lock:
+            site.in_flight -= 1
+        self._global.release()
+        site.semaphore.release()
+
+    @contextmanager
+    def _slot(
+        self, site: _CallSiteMetrics, call_site: str, deadline: float
+    ) -> Iterator[_SlotLease]:
+        self._acquire(site.semaphore, deadline, call_site)
+        try:
+            self._acquire(self._global, deadline, "global")
+        except BaseException:
+            site.semaphore.release()
+            raise
+        with self._lock:
+            site.in_flight += 1
+        lease = _SlotLease(lambda: self._release(site))
+        try:
+            yield lease
+        finally:
+            lease.release()
+
+    def _remaining_ms(self, deadline: float, call_site: str, timeout: float) -> int:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            raise LLMTimeoutError(f"LLM call for {call_site} exceeded {timeout}s")
+        return remaining_ms
+
+    def _retry_delay(self, exc: Exception, attempt: int, deadline: float) -> float | None:
+        if attempt >= self.max_retries or not _is_retryable(exc):
+            return None
+        delay = self._backoff(attempt)
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def _generate(
+        self,
+        prompt: str,
+        model: str,
+        call_site: str,
+        temperature: float,
+        timeout_seconds: float | None,
+    ) -> str:
+        site = self._site(call_site)
+        timeout = self._timeout_for(call_site, timeout_seconds)
+        self._admit(site, call_site)
+        started = time.monotonic()
+        deadline = started + timeout
+        error: Exception | None = None
+        attempt = 0
+        try:
+            with self._slot(site, call_site, deadline) as lease:
+                while True:
+                    remaining_ms = self._remaining_ms(deadline, call_site, timeout)
+                    try:
+                        return self._call_within(
+                            model, prompt, temperature, remaining_ms, call_site, timeout, lease
+                        )
+                    except Exception as exc:
+                        delay = self._retry_delay(exc, attempt, deadline) if lease.held else None
+                        if delay is None:
+                            raise
+                        attempt += 1
+                        self._sleep(delay)
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self._record(site, started, attempt, error, prompt)
+
+    def stream_text(
+        self,
+        prompt: str,
+        model: str,
+        call_site: str,
+        temperature: float = 0.2,
+        timeout_seconds: float | None = None,
+        schema: str = "",
+    ) -> Iterator[str]:
+        """Yield the completion in chunks as Gemini produces them.
+
+        The call holds its concurrency slots until the stream is exhausted or closed.
+        Failures are retried only before the first chunk; after that the caller has
+        already forwarded text, so the error is raised as is. Streams are never
+        coalesced, but cached call sites replay a cached answer as a single chunk and
+        store the joined text once the stream completes.
+        """
+        if self.client is None:
+            raise LLMUnavailableError("Live Gemini is disabled or GEMINI_API_KEY is missing")
+
+        cacheable = call_site in self.cache_sites
+        key = response_cache_key(model, prompt, temperature, schema)
+        if cacheable:
+            cached = self.cache.get(key, call_site)
+            if cached is not None:
+                yield cached
+                return
+
+        site = self._site(call_site)
+        timeout = self._timeout_for(call_site, timeout_seconds)
+        self._admit(site, call_site)
+        started = time.monotonic()
+        deadline = started + timeout
+        error: Exception | None = None
+        attempt = 0
+        chunks: list[str] = []
+        try:
+            with self._slot(site, call_site, deadline):
+                while True:
+                    remaining_ms = self._remaining_ms(deadline, call_site, timeout)
+                    try:
+                        for chunk in self._call_stream(model, prompt, temperature, remaining_ms):
+                            chunks.append(chunk)
+                            yield chunk
+                        break
+                    except Exception as exc:
+                        delay = None if chunks else self._retry_delay(exc, attempt, deadline)
+                        if delay is None:
+                            raise
+                        attempt += 1
+                        self._sleep(delay)
+            text = "".join(chunks).strip()
+            if not text:
+                raise ValueError("Gemini stream did not contain text output")
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self._record(site, started, attempt, error, prompt, timed=False)
+        if cacheable:
+            self.cache.put(key, call_site, text)
+
+    def _record(
+        self,
+        site: _CallSiteMetrics,
+        started: float,
+        retries: int,
+        error: Exception | None,
+        prompt: str,
+        timed: bool = True,
+    ) -> None:
+        latency_ms = (time.monotonic() - started) * 1000.0
+        prompt_tokens = estimate_tokens(prompt)
+        if self.breaker is not None:
+            # Streams run as long as the answer is, so only their errors count.
+            slow = (
+                timed
+                and self.slow_call_seconds is not None
+                and latency_ms >= self.slow_call_seconds * 1000.0
+            )
+            self.breaker.record(slow or (error is not None and _is_retryable(error)))
+        with self._lock:
+            site.calls += 1
+            site.retries += retries
+            site.total_latency_ms += latency_ms
+            site.max_latency_ms = max(site.max_latency_ms, latency_ms)
+            site.total_prompt_tokens += prompt_tokens
+            site.max_prompt_tokens = max(site.max_prompt_tokens, prompt_tokens)
+            if error is not None:
+                site.errors += 1
+                site.timeouts += int(_is_timeout(error))
+                site.last_error = f"{type(error).__name__}: {error}"[:200]
+
+    def close(self) -> None:
+        # Abandoned calls are not waited for; queued ones are dropped.
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            sites = {name: site.stats() for name, site in sorted(self._sites.items())}
+        return {
+            "live": self.client is not None,
+            "max_concurrency": self.max_concurrency,
+            "per_site_concurrency": self.per_site_concurrency,
+            "timeout_seconds": self.timeout_seconds,
+            "latency_budgets": dict(sorted(self.latency_budgets.items())),
+            "max_retries": self.max_retries,
+            "call_sites": sites,
+            "coalescing": self.single_flight.stats() if self.single_flight is not None else None,
+            "cached_sites": sorted(self.cache_sites),
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "breaker": self.breaker.stats() if self.breaker is not None else None,
+            "prompts": self.prompts.stats(),
+        }
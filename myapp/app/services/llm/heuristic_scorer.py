@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.utils.time import as_utc
+
+NO_DUE_DATE_DAYS = 999
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROS_PER_DAY = 86_400 * 1_000_000
+_BAND_EDGES = np.array([45, 70, 85])
+_BANDS = ("low", "medium", "high", "critical")
+
+
+def score_band(score: int) -> str:
+    if score >= 85:
+        return "critical"
+    if score >= 70:
+        return "high"
+    if score >= 45:
+        return "medium"
+    return "low"
+
+
+@dataclass(frozen=True)
+class HeuristicWeights:
+    urgency: float = 0.55
+    module: float = 0.35
+    effort: float = 0.10
+
+
+def heuristic_task_id(task: dict) -> str:
+    return str(task.get("id", task.get("title", "task")))
+
+
+def _epoch_micros(value: object) -> int | None:
+    if not value:
+        return None
+    parsed = as_utc(value)
+    if parsed is None:
+        return None
+    return (parsed - _EPOCH) // timedelta(microseconds=1)
+
+
+class HeuristicScorer:
+    """Scores tasks for priority without an LLM, as array operations over the batch.
+
+    Due dates are parsed once into an epoch array; urgency, module and effort scores
+    are computed for every task together. Each component is clamped to 0-100:
+    urgency loses 8 points per day left, module weight counts double and each estimated
+    hour is worth 9. The component scores are combined with ``weights`` and rounded
+    half-to-even. ``rate`` returns rows sorted by score, keeping input order among equal
+    scores, and only builds rows for the ``top_k`` it returns.
+    """
+
+    def __init__(self, weights: HeuristicWeights | None = None) -> None:
+        self.weights = weights or HeuristicWeights()
+
+    def scores(self, tasks: list[dict], now: datetime | None = None) -> dict[str, np.ndarray]:
+        count = len(tasks)
+        now_micros = ((now or datetime.now(timezone.utc)) - _EPOCH) // timedelta(microseconds=1)
+        # Tasks share due dates (a module's deadlines, sync batches), so each distinct
+        # value is parsed once.
+        parsed: dict = {}
+        due = []
+        for task in tasks:
+            value = task.get("due_at")
+            try:
+                due.append(parsed[value])
+            except KeyError:
+                due.append(parsed.setdefault(value, _epoch_micros(value)))
+            except TypeError:
+                due.append(_epoch_micros(value))
+        has_due = np.fromiter((value is not None for value in due), dtype=bool, count=count)
+        due_micros = np.fromiter((value or 0 for value in due), dtype=np.int64, count=count)
+        days_left = np.where(
+            has_due, (due_micros - now_micros) // _MICROS_PER_DAY, NO_DUE_DATE_DAYS
+        )
+
+        module_weight = np.fromiter(
+            (int(task.get("module_weight_percent", 0)) for task in tasks), dtype=np.int64, count=count
+        )
+        hours = np.fromiter(
+            (int(task.get("estimated_hours", 0)) for task in tasks), dtype=np.int64, count=count
+        )
+
+        urgency = np.clip(100 - days_left * 8, 0, 100)
+        module = np.clip(module_weight * 2, 0, 100)
+        effort = np.clip(hours * 9, 0, 100)
+        combined = (
+            urgency * self.weights.urgency
+            + module * self.weights.module
+            + effort * self.weights.effort
+        )
+        return {
+            "urgency": urgency,
+            "module": module,
+            "effort": effort,
+            "score": np.rint(combined).astype(np.int64),
+        }
+
+    def top_indices(self, score: np.ndarray, top_k: int | None = None) -> np.ndarray:
+        count = len(score)
+        # Highest score first, then input order; the key is unique so partitioning
+        # picks exactly the rows a stable descending sort would.
+        key = -score * count + np.arange(count, dtype=np.int64)
+        if top_k is not None and 0 <= top_k < count:
+            if top_k == 0:
+                return np.empty(0, dtype=np.int64)
+            key_subset = np.argpartition(key, top_k - 1)[:top_k]
+            return key_subset[np.argsort(key[key_subset])]
+        return np.argsort(key)
+
+    def rate(
+        self, tasks: list[dict], top_k: int | None = None, now: datetime | None = None
+    ) -> list[dict]:
+        if not tasks:
+            return []
+        arrays = self.scores(tasks, now=now)
+        order = self.top_indices(arrays["score"], top_k)
+        bands = np.searchsorted(_BAND_EDGES, arrays["score"], side="right").tolist()
+        urgency = arrays["urgency"].tolist()
+        module = arrays["module"].tolist()
+        effort = arrays["effort"].tolist()
+        score = arrays["score"].tolist()
+
+        return [
+            {
+                "id": heuristic_task_id(tasks[index]),
+                "title": str(tasks[index].get("title", "Untitled Task")),
+                "priority_score": score[index],
+                "priority_band": _BANDS[bands[index]],
+                "reason": f"Urgency={urgency[index]}, Module={module[index]}, Effort={effort[index]}",
+            }
+            for index in order.tolist()
+        ]
@@ -0,0 +1,145 @@
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+CHARS_PER_TOKEN = 4
+TRIM_MARKER = "[...]"
+_SITE_COUNTERS = ("prompts", "total_tokens", "max_tokens", "trimmed", "trimmed_tokens", "over_budget")
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly 4 characters per token for English prose; word-dense text (short words,
+    # code, ids) tokenizes worse, so never estimate below 4 tokens per 3 words.
+    if not text:
+        return 0
+    by_chars = -(-len(text) // CHARS_PER_TOKEN)
+    by_words = -(-len(text.split()) * 4 // 3)
+    return max(by_chars, by_words)
+
+
+@dataclass
+class PromptSection:
+    """One ``{name}`` slot of a prompt template.
+
+    Sections without a ``priority`` are always kept whole. The others are trimmed
+    lowest priority first, down to ``min_tokens``; ``keep="head"`` keeps the start
+    (documents, reference text) and ``keep="tail"`` keeps the most recent lines
+    (conversation history).
+    """
+
+    name: str
+    text: str
+    priority: int | None = None
+    keep: str = "head"
+    min_tokens: int = 0
+
+
+def _trim_head(text: str, max_tokens: int) -> str:
+    limit = max_tokens * CHARS_PER_TOKEN
+    while limit > 0:
+        cut = text[:limit]
+        boundary = max(cut.rfind("\n"), cut.rfind(" "))
+        if boundary > limit // 2:
+            cut = cut[:boundary]
+        cut = cut.rstrip() + f"\n{TRIM_MARKER}"
+        if estimate_tokens(cut) <= max_tokens:
+            return cut
+        limit = int(limit * 0.9)
+    return ""
+
+
+def _trim_tail(text: str, max_tokens: int) -> str:
+    lines = text.splitlines()
+    while lines:
+        kept = f"{TRIM_MARKER}\n" + "\n".join(lines)
+        if estimate_tokens(kept) <= max_tokens:
+            return kept
+        if len(lines) == 1:
+            # A single oversized line: keep its end.
+            limit = max(0, max_tokens - 2) * CHARS_PER_TOKEN
+            return f"{TRIM_MARKER} {lines[0][-limit:]}" if limit else ""
+        lines.pop(0)
+    return ""
+
+
+def trim_to_tokens(text: str, max_tokens: int, keep: str = "head") -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    return _trim_tail(text, max_tokens) if keep == "tail" else _trim_head(text, max_tokens)
+
+
+class PromptBudget:
+    """Fits prompts into a per-call-site token budget and records their sizes.
+
+    ``compose`` fills a ``str.format`` template from ``PromptSection``s. When the
+    estimate exceeds the call site's budget, trimmable sections are cut in priority
+    order until it fits. If the untrimmable part alone is over budget, the prompt is
+    sent anyway and counted under ``over_budget``.
+    """
+
+    def __init__(self, budgets: Mapping[str, int] | None = None, default_tokens: int = 6000) -> None:
+        self.budgets = {site: max(1, int(tokens)) for site, tokens in (budgets or {}).items()}
+        self.default_tokens = max(1, int(default_tokens))
+        self._sites: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def budget_for(self, call_site: str) -> int:
+        return self.budgets.get(call_site, self.default_tokens)
+
+    def compose(self, call_site: str, template: str, *sections: PromptSection) -> str:
+        budget = self.budget_for(call_site)
+        values = {section.name: section.text for section in sections}
+        sizes = {section.name: estimate_tokens(section.text) for section in sections}
+        overhead = estimate_tokens(template.format(**{name: "" for name in values}))
+        overflow = overhead + sum(sizes.values()) - budget
+
+        trimmed = 0
+        trimmable = sorted(
+            (section for section in sections if section.priority is not None),
+            key=lambda section: section.priority,
+        )
+        for section in trimmable:
+            if overflow <= 0:
+                break
+            size = sizes[section.name]
+            target = max(section.min_tokens, size - overflow)
+            if target >= size:
+                continue
+            values[section.name] = trim_to_tokens(section.text, target, section.keep)
+            saved = size - estimate_tokens(values[section.name])
+            overflow -= saved
+            trimmed += saved
+
+        prompt = template.format(**values)
+        self._record(call_site, estimate_tokens(prompt), trimmed, overflow > 0)
+        return prompt
+
+    def _record(self, call_site: str, tokens: int, trimmed: int, over_budget: bool) -> None:
+        with self._lock:
+            site = self._sites.get(call_site)
+            if site is None:
+                site = self._sites[call_site] = dict.fromkeys(_SITE_COUNTERS, 0)
+            site["prompts"] += 1
+            site["total_tokens"] += tokens
+            site["max_tokens"] = max(site["max_tokens"], tokens)
+            site["trimmed"] += int(trimmed > 0)
+            site["trimmed_tokens"] += trimmed
+            site["over_budget"] += int(over_budget)
+
+    def stats(self) -> dict:
+        with self._lock:
+            sites = {
+                name: {
+                    "budget_tokens": self.budget_for(name),
+                    "prompts": site["prompts"],
+                    "avg_tokens": round(site["total_tokens"] / site["prompts"], 1),
+                    "max_tokens": site["max_tokens"],
+                    "trimmed": site["trimmed"],
+                    "trimmed_tokens": site["trimmed_tokens"],
+                    "over_budget": site["over_budget"],
+                }
+                for name, site in sorted(self._sites.items())
+            }
+        return {"default_tokens": self.default_tokens, "call_sites": sites}
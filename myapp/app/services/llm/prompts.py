@@ -20,3 +20,10 @@ def build_priority_prompt(tasks: list[dict], custom_prompt: str = "") -> str:
         "}\n\n"
         f"Tasks:\n{tasks}\n"
     )
+
+
+def build_batched_priority_prompt(tasks: list[dict], custom_prompt: str = "") -> str:
+    return build_priority_prompt(tasks=tasks, custom_prompt=custom_prompt) + (
+        "\nThese tasks come from several separate requests and their ids look like "
+        "r<N>:<id>. Rate each task on its own merits and copy every id back exactly.\n"
+    )
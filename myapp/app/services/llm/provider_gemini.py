@@ -1,32 +1,45 @@
 import json
 import re
+from collections.abc import Hashable
 from typing import Any
 
-from google import genai
-
-from app.services.llm.prompts import build_priority_prompt
-from app.utils.time import days_until
+from app.services.llm.batching import MicroBatcher
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.heuristic_scorer import HeuristicScorer, heuristic_task_id, score_band
+from app.services.llm.prompts import build_batched_priority_prompt, build_priority_prompt
 
 
 class GeminiProvider:
-    def __init__(self, model: str, api_key: str = "", enable_live: bool = False) -> None:
+    CALL_SITE = "llm.rate"
+
+    def __init__(
+        self,
+        model: str,
+        api_key: str = "",
+        enable_live: bool = False,
+        gateway: LLMGateway | None = None,
+        batch_window_ms: int = 0,
+        max_batch_tasks: int = 50,
+        max_batch_requests: int = 16,
+        heuristic: HeuristicScorer | None = None,
+    ) -> None:
         self.model = model
-        self.api_key = api_key
-        self.enable_live = enable_live
-        self.client = (
-            genai.Client(api_key=api_key)
-            if enable_live and bool(api_key.strip())
+        self.heuristic = heuristic or HeuristicScorer()
+        self.gateway = gateway or LLMGateway(api_key=api_key, enable_live=enable_live)
+        self.enable_live = self.gateway.enable_live
+        self.batcher = (
+            MicroBatcher(
+                self._rate_batch,
+                window_seconds=batch_window_ms / 1000,
+                max_batch_items=max_batch_tasks,
+                max_batch_requests=max_batch_requests,
+            )
+            if batch_window_ms > 0
             else None
         )
 
     def _score_band(self, score: int) -> str:
-        if score >= 85:
-            return "critical"
-        if score >= 70:
-            return "high"
-        if score >= 45:
-            return "medium"
-        return "low"
+        return score_band(score)
 
     def _clamp_score(self, value: Any) -> int:
         try:
@@ -35,44 +48,8 @@ class GeminiProvider:
             parsed = 0
         return max(0, min(100, parsed))
 
-    def _heuristic_rate(self, tasks: list[dict]) -> list[dict]:
-        rated = []
-        for task in tasks:
-            days_left = days_until(task.get("due_at"))
-            urgency = max(0, min(100, 100 - (days_left * 8)))
-            module_score = max(
-                0, min(100, int(task.get("module_weight_percent", 0)) * 2)
-            )
-            effort_score = max(0, min(100, int(task.get("estimated_hours", 0)) * 9))
-            score = round((urgency * 0.55) + (module_score * 0.35) + (effort_score * 0.10))
-
-            rated.append(
-                {
-                    "id": str(task.get("id", task.get("title", "task"))),
-                    "title": str(task.get("title", "Untitled Task")),
-                    "priority_score": score,
-                    "priority_band": self._score_band(score),
-                    "reason": f"Urgency={urgency}, Module={module_score}, Effort={effort_score}",
-                }
-            )
-
-        rated.sort(key=lambda item: item["priority_score"], reverse=True)
-        return rated
-
-    def _extract_response_text(self, response: Any) -> str:
-        text = getattr(response, "text", None)
-        if isinstance(text, str) and text.strip():
-            return text.strip()
-
-        candidates = getattr(response, "candidates", None) or []
-        for candidate in candidates:
-            content = getattr(candidate, "content", None)
-            parts = getattr(content, "parts", None) or []
-            for part in parts:
-                value = getattr(part, "text", None)
-                if isinstance(value, str) and value.strip():
-                    return value.strip()
-        raise ValueError("Gemini response did not contain text output")
+    def _heuristic_rate(self, tasks: list[dict], top_k: int | None = None) -> list[dict]:
+        return self.heuristic.rate(tasks, top_k=top_k)
 
     def _parse_json_from_text(self, text: str) -> Any:
         cleaned = text.strip()
@@ -90,7 +67,7 @@ class GeminiProvider:
             raise ValueError("Gemini output is not valid JSON")
         return json.loads(match.group(1))
 
-    def _normalize_rated_tasks(self, payload: Any, tasks: list[dict]) -> dict:
+    def _rated_items(self, payload: Any) -> list:
         if isinstance(payload, list):
             payload = {"rated_tasks": payload}
         if not isinstance(payload, dict):
@@ -106,6 +83,12 @@ class GeminiProvider:
             raw_items = [raw_items]
         if not isinstance(raw_items, list):
             raw_items = []
+        return raw_items
+
+    def _normalize_rated_tasks(self, payload: Any, tasks: list[dict]) -> dict:
+        raw_items = self._rated_items(payload)
+        if isinstance(payload, list):
+            payload = {"rated_tasks": payload}
 
         source_tasks = {
             str(item.get("id", f"task-{idx}")): item
@@ -147,10 +130,9 @@ class GeminiProvider:
             )
             used_ids.add(task_id)
 
-        fallback_entries = self._heuristic_rate(tasks)
-        for row in fallback_entries:
-            if row["id"] not in used_ids:
-                normalized.append(row)
+        unrated = [task for task in tasks if heuristic_task_id(task) not in used_ids]
+        heuristic_rows = self._heuristic_rate(unrated)
+        normalized.extend(heuristic_rows)
 
         normalized.sort(key=lambda item: item["priority_score"], reverse=True)
         summary = str(
@@ -158,21 +140,69 @@ class GeminiProvider:
             or payload.get("message")
             or f"Prioritized {len(normalized)} tasks"
         )
-        return {"summary": summary, "rated_tasks": normalized}
+        return {
+            "summary": summary,
+            "rated_tasks": normalized,
+            # Tasks the model skipped carry heuristic scores, not model ratings.
+            "heuristic_ids": [row["id"] for row in heuristic_rows],
+        }
 
     def _call_live_model(self, prompt: str, temperature: float) -> dict:
-        if self.client is None:
-            raise ValueError("Live Gemini is disabled or GEMINI_API_KEY is missing")
-
-        response = self.client.models.generate_content(
+        text = self.gateway.generate_text(
+            prompt,
             model=self.model,
-            contents=prompt,
-            config={"temperature": float(temperature)},
+            call_site=self.CALL_SITE,
+            temperature=temperature,
+            schema="rated_tasks",
         )
-        text = self._extract_response_text(response)
         payload = self._parse_json_from_text(text)
         return payload if isinstance(payload, dict) else {"rated_tasks": payload}
 
+    def _rate_batch(self, key: Hashable, task_groups: list[list[dict]]) -> list:
+        custom_prompt, temperature = key
+        if len(task_groups) == 1:
+            prompt = build_priority_prompt(tasks=task_groups[0], custom_prompt=custom_prompt)
+            return [self._call_live_model(prompt=prompt, temperature=temperature)]
+
+        merged = [
+            {**task, "id": f"r{group}:{task.get('id', f'task-{position}')}"}
+            for group, tasks in enumerate(task_groups)
+            for position, task in enumerate(tasks, start=1)
+        ]
+        prompt = build_batched_priority_prompt(tasks=merged, custom_prompt=custom_prompt)
+        payload = self._call_live_model(prompt=prompt, temperature=temperature)
+
+        split: list[list[dict]] = [[] for _ in task_groups]
+        for item in self._rated_items(payload):
+            if not isinstance(item, dict):
+                continue
+            raw_id = str(item.get("id") or item.get("task_id") or item.get("taskId") or "")
+            prefix, _, task_id = raw_id.partition(":")
+            if not task_id or prefix[:1] != "r" or not prefix[1:].isdigit():
+                continue
+            group = int(prefix[1:])
+            if group < len(split):
+                split[group].append({**item, "id": task_id})
+        # The batch summary covers other callers' tasks, so each caller gets its own
+        # default summary instead; callers the model skipped fall back to heuristics.
+        return [
+            {"rated_tasks": items}
+            if items
+            else ValueError("Batched Gemini response did not rate these tasks")
+            for items in split
+        ]
+
+    def _live_payload(self, tasks: list[dict], custom_prompt: str, temperature: float) -> dict:
+        if self.batcher is None or not self.enable_live:
+            prompt = build_priority_prompt(tasks=tasks, custom_prompt=custom_prompt)
+            return self._call_live_model(prompt=prompt, temperature=temperature)
+        return self.batcher.submit((custom_prompt, float(temperature)), tasks)
+
+    def batch_stats(self) -> dict:
+        if self.batcher is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.batcher.stats()}
+
     def rate_tasks(
         self,
         tasks: list[dict],
@@ -186,24 +216,26 @@ class GeminiProvider:
                 "fallback": True,
                 "summary": "No tasks were provided",
                 "rated_tasks": [],
+                "heuristic_ids": [],
                 "fallback_reason": "NO_TASKS",
                 "prompt_used": custom_prompt,
                 "temperature": temperature,
             }
 
-        prompt = build_priority_prompt(tasks=tasks, custom_prompt=custom_prompt)
         fallback = False
         fallback_reason = None
 
         try:
-            live_payload = self._call_live_model(prompt=prompt, temperature=temperature)
+            live_payload = self._live_payload(tasks, custom_prompt, temperature)
             normalized = self._normalize_rated_tasks(payload=live_payload, tasks=tasks)
         except Exception as exc:
             fallback = True
             fallback_reason = str(exc)
+            rated = self._heuristic_rate(tasks)
             normalized = {
                 "summary": "Heuristic fallback mode used",
-                "rated_tasks": self._heuristic_rate(tasks),
+                "rated_tasks": rated,
+                "heuristic_ids": [row["id"] for row in rated],
             }
 
         return {
@@ -212,6 +244,7 @@ class GeminiProvider:
             "fallback": fallback,
             "summary": normalized["summary"],
             "rated_tasks": normalized["rated_tasks"],
+            "heuristic_ids": normalized["heuristic_ids"],
             "fallback_reason": fallback_reason,
             "prompt_used": custom_prompt,
             "temperature": temperature,
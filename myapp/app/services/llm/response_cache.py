@@ -0,0 +1,154 @@
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from app.utils.hashing import sha256_text
+from app.utils.time import utc_now
+
+
+def response_cache_key(model: str, prompt: str, temperature: float, schema: str = "") -> str:
+    payload = [model, f"{float(temperature):.4f}", schema, prompt]
+    return sha256_text(json.dumps(payload, separators=(",", ":")))
+
+
+class _SiteCounters:
+    def __init__(self) -> None:
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.store_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LLMResponseCache:
+    """Content-addressed cache of LLM text responses.
+
+    An in-process LRU bounded by entry count and total bytes sits in front of an optional
+    persistent store (``LLMCacheRepository`` or ``SqliteLLMCacheRepository``). Store hits
+    are promoted into memory for their remaining TTL. Store failures are counted and
+    treated as misses, so a cache outage never fails the underlying call.
+    """
+
+    def __init__(
+        self,
+        store=None,
+        ttl_seconds: float = 86400,
+        max_entries: int = 512,
+        max_bytes: int = 16 * 1024 * 1024,
+        store_max_entries: int = 20000,
+        prune_every: int = 200,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
+        self.store_max_entries = max(0, int(store_max_entries))
+        self.store = store if self.store_max_entries > 0 else None
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.prune_every = max(1, int(prune_every))
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[datetime, str, int]] = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._store_errors = 0
+        self._store_writes = 0
+        self._sites: dict[str, _SiteCounters] = {}
+        self._lock = threading.Lock()
+
+    def _site(self, call_site: str) -> _SiteCounters:
+        site = self._sites.get(call_site)
+        if site is None:
+            site = self._sites.setdefault(call_site, _SiteCounters())
+        return site
+
+    def _remember(self, key: str, text: str, expires_at: datetime) -> None:
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (expires_at, text, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def get(self, key: str, call_site: str) -> str | None:
+        now = self._clock()
+        with self._lock:
+            site = self._site(call_site)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                site.memory_hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self._bytes -= entry[2]
+
+        row = None
+        if self.store is not None:
+            try:
+                row = self.store.get_entry(key, now=now)
+            except Exception:
+                with self._lock:
+                    self._store_errors += 1
+        if row is None or not isinstance(row.get("text"), str):
+            with self._lock:
+                site.misses += 1
+            return None
+
+        self._remember(key, row["text"], row["expires_at"])
+        with self._lock:
+            site.store_hits += 1
+        return row["text"]
+
+    def put(self, key: str, call_site: str, text: str) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = self._clock() + timedelta(seconds=self.ttl_seconds)
+        self._remember(key, text, expires_at)
+        with self._lock:
+            self._site(call_site).writes += 1
+        if self.store is None:
+            return
+        try:
+            self.store.put_entry(key, call_site, text, expires_at)
+            with self._lock:
+                self._store_writes += 1
+                should_prune = self._store_writes % self.prune_every == 0
+            if should_prune:
+                self.store.prune(self.store_max_entries, now=self._clock())
+        except Exception:
+            with self._lock:
+                self._store_errors += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self._evictions,
+                "store_enabled": self.store is not None,
+                "store_errors": self._store_errors,
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "call_sites": {
+                    name: site.stats() for name, site in sorted(self._sites.items())
+                },
+            }
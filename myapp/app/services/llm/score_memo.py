@@ -0,0 +1,87 @@
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from app.utils.hashing import sha256_text
+from app.utils.time import as_utc, utc_now
+
+RANKING_FIELDS = (
+    "title",
+    "module",
+    "due_at",
+    "module_weight_percent",
+    "estimated_hours",
+    "notes",
+)
+
+
+def decay_bucket(due_at: object, now: datetime | None = None) -> str:
+    # Urgency moves every day close to the deadline and barely at all months out, so
+    # buckets are daily for two weeks, weekly up to two months, then a single bucket.
+    due = as_utc(due_at)
+    if due is None:
+        return "none"
+    days = int((due - (now or utc_now())).total_seconds() // 86400)
+    if days < 0:
+        return "overdue"
+    if days <= 14:
+        return f"d{days}"
+    if days <= 60:
+        return f"w{days // 7}"
+    return "later"
+
+
+def ranking_fingerprint(task: dict, now: datetime | None = None) -> str:
+    fields = [task.get(field) for field in RANKING_FIELDS]
+    payload = json.dumps([fields, decay_bucket(task.get("due_at"), now)], default=str)
+    return sha256_text(payload)
+
+
+class TaskScoreMemo:
+    """Remembers each task's last LLM priority score with the fingerprint it was rated at.
+
+    A lookup only hits while the task's ranking fields and decay bucket are unchanged,
+    so edited tasks and tasks crossing a bucket boundary are re-rated.
+    """
+
+    def __init__(self, max_entries: int = 5000) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def lookup(self, fingerprints: dict[str, str]) -> dict[str, int]:
+        scores: dict[str, int] = {}
+        with self._lock:
+            for task_id, fingerprint in fingerprints.items():
+                entry = self._entries.get(task_id)
+                if entry is not None and entry[0] == fingerprint:
+                    self._entries.move_to_end(task_id)
+                    scores[task_id] = entry[1]
+            self._hits += len(scores)
+            self._misses += len(fingerprints) - len(scores)
+        return scores
+
+    def store(self, scores: dict[str, tuple[str, int]]) -> None:
+        with self._lock:
+            for task_id, entry in scores.items():
+                self._entries[task_id] = entry
+                self._entries.move_to_end(task_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "max_entries": self.max_entries,
+            }
@@ -0,0 +1,61 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the loader; callers that arrive while it is still
+    running wait on the same future and receive its result or re-raise its error. The
+    key is released as soon as the loader finishes, so nothing is cached here.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._leaders = 0
+        self._coalesced = 0
+
+    def do(
+        self,
+        key: str,
+        loader: Callable[[], T],
+        timeout: float | None = None,
+    ) -> tuple[T, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+        if not leader:
+            # Raises TimeoutError if this waiter's own deadline passes first; the
+            # leader keeps running for everyone else.
+            return future.result(timeout=timeout), True
+
+        try:
+            value = loader()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            return value, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+            }
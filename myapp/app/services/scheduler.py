@@ -1,11 +1,17 @@
+import asyncio
 from datetime import UTC, datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from app.models.domain.task import Task
-from app.models.persistence.calendar_event_repo import CalendarEventRepository
-from app.models.persistence.task_repo import TaskRepository
+from app.models.persistence.calendar_event_repo import (
+    AsyncCalendarEventRepository,
+    CalendarEventRepository,
+)
+from app.models.persistence.task_repo import AsyncTaskRepository, TaskRepository
 from app.services.llm.provider_gemini import GeminiProvider
+from app.services.llm.score_memo import TaskScoreMemo, ranking_fingerprint
 from app.utils.hashing import sha256_text
+from app.utils.time import as_utc, to_iso_z, utc_now
 
 
 class SchedulerService:
@@ -15,30 +21,25 @@ class SchedulerService:
         event_repo: CalendarEventRepository,
         llm_provider: GeminiProvider,
         schedule_timezone: str = "Europe/London",
+        async_event_repo: AsyncCalendarEventRepository | None = None,
+        default_user_id: str = "demo-user",
+        score_memo: TaskScoreMemo | None = None,
+        async_task_repo: AsyncTaskRepository | None = None,
     ) -> None:
         self.task_repo = task_repo
         self.event_repo = event_repo
+        self.async_event_repo = async_event_repo
+        self.async_task_repo = async_task_repo
         self.llm_provider = llm_provider
         self.timezone = ZoneInfo(schedule_timezone)
+        self.default_user_id = default_user_id
+        self.score_memo = score_memo
 
-    def _parse_iso(self, value: str | None) -> datetime | None:
-        if not value:
-            return None
-        raw = str(value).strip()
-        if not raw:
-            return None
-        if raw.endswith("Z"):
-            raw = raw.replace("Z", "+00:00")
-        try:
-            parsed = datetime.fromisoformat(raw)
-        except ValueError:
-            return None
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=UTC)
-        return parsed
-
-    def _to_utc_iso(self, value: datetime) -> str:
-        return value.astimezone(UTC).isoformat().replace("+00:00", "Z")
+    def _user(self, user_id: str | None) -> str:
+        return user_id or self.default_user_id
+
+    def _parse_iso(self, value: datetime | str | None) -> datetime | None:
+        return as_utc(value)
 
     def _round_up_30(self, dt: datetime) -> datetime:
         if dt.minute in {0, 30} and dt.second == 0 and dt.microsecond == 0:
@@ -63,28 +64,58 @@ class SchedulerService:
                 microsecond=0,
             )
 
+    def _rank_payload(self, task: Task) -> dict:
+        return {
+            "id": task.id,
+            "title": task.title,
+            "module": task.module or task.subject or "General",
+            "due_at": to_iso_z(task.due_at),
+            "module_weight_percent": int(task.module_weight_percent),
+            "estimated_hours": int(task.estimated_hours or 1),
+            "notes": task.notes,
+        }
+
     def _rank_tasks(self, tasks: list[Task]) -> list[Task]:
         if not tasks:
             return []
 
-        payload = [
-            {
-                "id": task.id,
-                "title": task.title,
-                "module": task.module or task.subject or "General",
-                "due_at": task.due_at,
-                "module_weight_percent": int(task.module_weight_percent),
-                "estimated_hours": int(task.estimated_hours or 1),
-                "notes": task.notes,
+        payload = {task.id: self._rank_payload(task) for task in tasks}
+        rated: dict[str, int] = {}
+        memo_keys = {f"{task.user_id}:{task.id}": task.id for task in tasks}
+        fingerprints: dict[str, str] = {}
+        if self.score_memo is not None:
+            now = utc_now()
+            fingerprints = {
+                key: ranking_fingerprint(payload[task_id], now)
+                for key, task_id in memo_keys.items()
+            }
+            rated = {
+                memo_keys[key]: score
+                for key, score in self.score_memo.lookup(fingerprints).items()
             }
-            for task in tasks
-        ]
-        llm_output = self.llm_provider.rate_tasks(tasks=payload)
-        rated = {
-            str(item.get("id")): int(item.get("priority_score", 0))
-            for item in llm_output.get("rated_tasks", [])
-            if isinstance(item, dict)
-        }
+
+        # Only new or changed tasks go to the LLM; unchanged ones keep their memoized score.
+        stale = [row for task_id, row in payload.items() if task_id not in rated]
+        if stale:
+            llm_output = self.llm_provider.rate_tasks(tasks=stale)
+            fresh = {
+                str(item.get("id")): int(item.get("priority_score", 0))
+                for item in llm_output.get("rated_tasks", [])
+                if isinstance(item, dict)
+            }
+            fresh = {task_id: score for task_id, score in fresh.items() if task_id in payload}
+            rated.update(fresh)
+            # Heuristic scores (a full fallback, or tasks the model skipped) are not
+            # memoized, so those tasks get a live rating later.
+            heuristic = set(llm_output.get("heuristic_ids", []))
+            if self.score_memo is not None and not llm_output.get("fallback"):
+                self.score_memo.store(
+                    {
+                        key: (fingerprints[key], fresh[task_id])
+                        for key, task_id in memo_keys.items()
+                        if task_id in fresh and task_id not in heuristic
+                    }
+                )
 
         def sort_key(task: Task) -> tuple[int, datetime]:
             due = self._parse_iso(task.due_at) or datetime.max.replace(tzinfo=UTC)
@@ -94,7 +125,7 @@ class SchedulerService:
 
         return sorted(tasks, key=sort_key)
 
-    def _build_events_for_tasks(self, tasks: list[Task]) -> list[dict]:
+    def _build_events_for_tasks(self, tasks: list[Task], user_id: str) -> list[dict]:
         if not tasks:
             return []
 
@@ -118,10 +149,11 @@ class SchedulerService:
             events.append(
                 {
                     "event_id": f"evt-{task.id}",
+                    "user_id": user_id,
                     "task_id": task.id,
                     "title": task.title,
-                    "start_at": self._to_utc_iso(start_local),
-                    "end_at": self._to_utc_iso(end_local),
+                    "start_at": start_local.astimezone(UTC),
+                    "end_at": end_local.astimezone(UTC),
                     "source": "ai_scheduler",
                     "status": "scheduled",
                 }
@@ -131,18 +163,63 @@ class SchedulerService:
         events.sort(key=lambda row: row["start_at"])
         return events
 
-    def list_events(self, start_at: str | None = None, end_at: str | None = None) -> list[dict]:
-        return self.event_repo.list_events(start_at=start_at, end_at=end_at)
+    def list_events(
+        self,
+        start_at: datetime | str | None = None,
+        end_at: datetime | str | None = None,
+        user_id: str | None = None,
+    ) -> list[dict]:
+        return self.event_repo.list_events(
+            start_at=start_at, end_at=end_at, user_id=self._user(user_id)
+        )
+
+    def page_events(
+        self,
+        start_at: datetime | str | None = None,
+        end_at: datetime | str | None = None,
+        limit: int = 500,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return self.event_repo.page_events(
+            start_at=start_at,
+            end_at=end_at,
+            limit=limit,
+            cursor=cursor,
+            user_id=self._user(user_id),
+        )
+
+    async def page_events_async(
+        self,
+        start_at: datetime | str | None = None,
+        end_at: datetime | str | None = None,
+        limit: int = 500,
+        cursor: str | None = None,
+        user_id: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        if self.async_event_repo is None:
+            return await asyncio.to_thread(
+                self.page_events, start_at, end_at, limit, cursor, user_id
+            )
+        return await self.async_event_repo.page_events(
+            start_at=start_at,
+            end_at=end_at,
+            limit=limit,
+            cursor=cursor,
+            user_id=self._user(user_id),
+        )
 
     def add_task(
         self,
         title: str,
         module: str,
-        due_at: str | None,
+        due_at: datetime | str | None,
         module_weight_percent: int,
         estimated_hours: int,
         notes: str,
+        user_id: str | None = None,
     ) -> tuple[Task, list[dict]]:
+        user_id = self._user(user_id)
         now_iso = datetime.now(UTC).isoformat().replace("+00:00", "Z")
         task_id = f"task-{sha256_text(f'{title}|{now_iso}')[:12]}"
         task = Task(
@@ -154,35 +231,40 @@ class SchedulerService:
             estimated_hours=estimated_hours,
             notes=notes,
             completed=False,
+            user_id=user_id,
         )
         self.task_repo.upsert_tasks([task])
-        events = self.reschedule()
+        events = self.reschedule(user_id=user_id)
         return task, events
 
-    def patch_task(self, task_id: str, patch: dict) -> tuple[Task, list[dict]]:
-        tasks = self.task_repo.list_tasks(limit=1000)
-        target = next((task for task in tasks if task.id == task_id), None)
+    def patch_task(
+        self, task_id: str, patch: dict, user_id: str | None = None
+    ) -> tuple[Task, list[dict]]:
+        user_id = self._user(user_id)
+        changes = {
+            field: patch[field]
+            for field in [
+                "title",
+                "module",
+                "due_at",
+                "module_weight_percent",
+                "estimated_hours",
+                "notes",
+                "completed",
+            ]
+            if field in patch and patch[field] is not None
+        }
+        if changes:
+            target = self.task_repo.patch_task(task_id, changes, user_id=user_id)
+        else:
+            target = self.task_repo.get_task(task_id, user_id=user_id)
         if target is None:
             raise ValueError(f"Task not found: {task_id}")
 
-        for field in [
-            "title",
-            "module",
-            "due_at",
-            "module_weight_percent",
-            "estimated_hours",
-            "notes",
-            "completed",
-        ]:
-            if field in patch and patch[field] is not None:
-                setattr(target, field, patch[field])
-
-        self.task_repo.upsert_tasks([target])
-        events = self.reschedule()
+        events = self.reschedule(user_id=user_id)
         return target, events
 
-    def reschedule(self) -> list[dict]:
-        tasks = self.task_repo.list_tasks(limit=1000)
+    def _active_tasks(self, tasks: list[Task]) -> list[Task]:
         # Defensive filtering for legacy/bad rows in Mongo so reschedule does not fail hard.
         seen_ids: set[str] = set()
         active: list[Task] = []
@@ -194,7 +276,26 @@ class SchedulerService:
             if bool(getattr(task, "completed", False)):
                 continue
             active.append(task)
-        ranked = self._rank_tasks(active)
-        events = self._build_events_for_tasks(ranked)
-        self.event_repo.replace_events(events)
+        return active
+
+    def _schedule(self, tasks: list[Task], user_id: str) -> list[dict]:
+        ranked = self._rank_tasks(self._active_tasks(tasks))
+        events = self._build_events_for_tasks(ranked, user_id)
+        self.event_repo.replace_events(events, user_id=user_id)
         return events
+
+    def reschedule(self, user_id: str | None = None) -> list[dict]:
+        user_id = self._user(user_id)
+        tasks = self.task_repo.list_tasks(limit=1000, user_id=user_id, active_only=True)
+        return self._schedule(tasks, user_id)
+
+    async def reschedule_async(self, user_id: str | None = None) -> list[dict]:
+        if self.async_task_repo is None:
+            return await asyncio.to_thread(self.reschedule, user_id)
+        user_id = self._user(user_id)
+        tasks = await self.async_task_repo.list_tasks(
+            limit=1000, user_id=user_id, active_only=True
+        )
+        # Ranking may call the LLM, and events are written through the cached event repo,
+        # so both stay on a worker thread.
+        return await asyncio.to_thread(self._schedule, tasks, user_id)
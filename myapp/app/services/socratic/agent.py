@@ -1,10 +1,11 @@
 import json
 import re
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
-from google import genai
-
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.prompt_budget import PromptSection
 from app.services.socratic.chunker import (
     chunk_by_paragraphs,
     chunk_by_sentences,
@@ -105,42 +106,46 @@ class SocraticAgentService:
         api_key: str = "",
         enable_live: bool = False,
         prompt_dir: Path | None = None,
+        gateway: LLMGateway | None = None,
     ) -> None:
         self.model = model
-        self.api_key = api_key
-        self.enable_live = bool(enable_live and api_key.strip())
-        self.client = genai.Client(api_key=api_key) if self.enable_live else None
+        self.gateway = gateway or LLMGateway(api_key=api_key, enable_live=enable_live)
+        self.enable_live = self.gateway.enable_live
         self.prompt_dir = prompt_dir or (Path(__file__).resolve().parent / "prompts")
 
     def _load_prompt(self, name: str) -> str:
         path = self.prompt_dir / name
         return path.read_text(encoding="utf-8")
 
-    def _extract_response_text(self, response: Any) -> str:
-        text = getattr(response, "text", None)
-        if isinstance(text, str) and text.strip():
-            return text.strip()
-
-        candidates = getattr(response, "candidates", None) or []
-        for candidate in candidates:
-            content = getattr(candidate, "content", None)
-            parts = getattr(content, "parts", None) or []
-            for part in parts:
-                value = getattr(part, "text", None)
-                if isinstance(value, str) and value.strip():
-                    return value.strip()
-        raise ValueError("Gemini response did not contain text output")
-
-    def _generate_text(self, prompt: str, temperature: float) -> str:
-        if self.client is None:
-            raise ValueError("Live Gemini is disabled")
-
-        response = self.client.models.generate_content(
+    def _generate_text(
+        self,
+        prompt: str,
+        temperature: float,
+        call_site: str = "socratic",
+        schema: str = "",
+    ) -> str:
+        return self.gateway.generate_text(
+            prompt,
+            model=self.model,
+            call_site=call_site,
+            temperature=temperature,
+            schema=schema,
+        )
+
+    def _stream_text(
+        self,
+        prompt: str,
+        temperature: float,
+        call_site: str = "socratic",
+        schema: str = "",
+    ) -> Iterator[str]:
+        return self.gateway.stream_text(
+            prompt,
             model=self.model,
-            contents=prompt,
-            config={"temperature": float(temperature)},
+            call_site=call_site,
+            temperature=temperature,
+            schema=schema,
         )
-        return self._extract_response_text(response)
 
     def _matches_red_flag(self, query: str) -> bool:
         for pattern in self._RED_FLAG_PATTERNS:
@@ -166,7 +171,9 @@ Respond with ONLY one label:
 ACCEPTABLE
 VIOLATION
 """
-        result = self._generate_text(prompt=prompt, temperature=0.1).strip().upper()
+        result = self._generate_text(
+            prompt=prompt, temperature=0.1, call_site="socratic.integrity"
+        ).strip().upper()
         if "VIOLATION" in result:
             return {
                 "is_acceptable": False,
@@ -287,38 +294,15 @@ VIOLATION
     def _build_answer_evaluation_prompt(
         self, topic: str, question: str, answer: str, reference_text: str | None
     ) -> str:
-        reference = (reference_text or "").strip()
-        if reference:
-            reference = reference[:6000]
-        else:
-            reference = "None"
-
-        return f"""You are a strict but fair university tutor.
-Evaluate the student's answer against the question and topic.
-Score from 0 to 100.
-Give concise, actionable comments.
-Do not include markdown.
-
-Topic:
-{topic}
-
-Question:
-{question}
-
-Student answer:
-{answer}
-
-Reference material (optional):
-{reference}
-
-Return ONLY valid JSON with this schema:
-{{
-  "score": 0,
-  "comments": "One short paragraph of feedback.",
-  "strengths": ["bullet 1", "bullet 2"],
-  "improvements": ["bullet 1", "bullet 2"]
-}}
-"""
+        # Reference material is trimmed first, then an overlong answer.
+        return self.gateway.prompts.compose(
+            "socratic.evaluate",
+            self._load_prompt("answer_evaluation.txt"),
+            PromptSection("topic", topic),
+            PromptSection("question", question),
+            PromptSection("answer", answer, priority=1, min_tokens=400),
+            PromptSection("reference", (reference_text or "").strip() or "None", priority=0),
+        )
 
     def _normalize_answer_evaluation(self, payload: dict, fallback: bool) -> dict:
         score = self._clamp_score(payload.get("score", 0))
@@ -363,19 +347,16 @@ Return ONLY valid JSON with this schema:
             raise ValueError(f"No text could be extracted from PDF: {path}")
         return text
 
-    def socratic_viva(
-        self,
-        topic: str,
-        previous_answer: str | None = None,
-        student_query: str | None = None,
-    ) -> dict:
+    def _viva_integrity(
+        self, topic: str, student_query: str | None
+    ) -> tuple[dict | None, dict | None]:
         integrity = (
             self.check_academic_integrity(student_query)
             if student_query and student_query.strip()
             else None
         )
         if integrity and not integrity["is_acceptable"]:
-            return {
+            refusal = {
                 "question": (
                     "I cannot complete assignments for you. "
                     f"Instead, what have you already tried on '{topic}'?"
@@ -383,20 +364,72 @@ Return ONLY valid JSON with this schema:
                 "fallback": True,
                 "integrity": integrity,
             }
+            return integrity, refusal
+        return integrity, None
 
+    def _viva_prompt(
+        self, topic: str, previous_answer: str | None, material: str = ""
+    ) -> str:
         prompt_template = self._load_prompt("socratic_viva.txt")
-        prompt = prompt_template.format(
-            topic=topic,
-            previous_answer=previous_answer or "No prior response.",
-        )
+        sections = [
+            PromptSection("topic", topic),
+            PromptSection(
+                "previous_answer", previous_answer or "No prior response.", priority=1, min_tokens=300
+            ),
+        ]
+        if material:
+            prompt_template = prompt_template.replace(
+                "{topic}", "{topic}\n\nReference material:\n{material}", 1
+            )
+            sections.append(PromptSection("material", material, priority=0))
+        return self.gateway.prompts.compose("socratic.question", prompt_template, *sections)
+
+    def socratic_viva(
+        self,
+        topic: str,
+        previous_answer: str | None = None,
+        student_query: str | None = None,
+    ) -> dict:
+        integrity, refusal = self._viva_integrity(topic, student_query)
+        if refusal is not None:
+            return refusal
+
+        prompt = self._viva_prompt(topic, previous_answer)
 
         try:
-            question = self._generate_text(prompt=prompt, temperature=0.4)
+            question = self._generate_text(
+                prompt=prompt, temperature=0.4, call_site="socratic.question"
+            )
             return {"question": question, "fallback": False, "integrity": integrity}
         except Exception:
             question = self._fallback_socratic_question(topic=topic, previous_answer=previous_answer)
             return {"question": question, "fallback": True, "integrity": integrity}
 
+    def stream_socratic_viva(
+        self,
+        topic: str,
+        previous_answer: str | None = None,
+        student_query: str | None = None,
+    ) -> Iterator[tuple[str, dict]]:
+        integrity, refusal = self._viva_integrity(topic, student_query)
+        if refusal is not None:
+            yield "final", refusal
+            return
+
+        prompt = self._viva_prompt(topic, previous_answer)
+        chunks: list[str] = []
+        try:
+            for chunk in self._stream_text(
+                prompt=prompt, temperature=0.4, call_site="socratic.question"
+            ):
+                chunks.append(chunk)
+                yield "token", {"text": chunk}
+            question = "".join(chunks).strip()
+            yield "final", {"question": question, "fallback": False, "integrity": integrity}
+        except Exception:
+            question = self._fallback_socratic_question(topic=topic, previous_answer=previous_answer)
+            yield "final", {"question": question, "fallback": True, "integrity": integrity}
+
     def socratic_viva_from_pdf(
         self,
         pdf_path: str | Path,
@@ -405,20 +438,9 @@ Return ONLY valid JSON with this schema:
         student_query: str | None = None,
         max_context_chars: int = 12000,
     ) -> dict:
-        integrity = (
-            self.check_academic_integrity(student_query)
-            if student_query and student_query.strip()
-            else None
-        )
-        if integrity and not integrity["is_acceptable"]:
-            return {
-                "question": (
-                    "I cannot complete assignments for you. "
-                    f"Instead, what have you already tried on '{topic}'?"
-                ),
-                "fallback": True,
-                "integrity": integrity,
-            }
+        integrity, refusal = self._viva_integrity(topic, student_query)
+        if refusal is not None:
+            return refusal
 
         pdf_text = self._read_pdf_text(pdf_path)
         pdf_chunks = chunk_text(text=pdf_text, max_chunk_size=4000, overlap=200)
@@ -426,15 +448,12 @@ Return ONLY valid JSON with this schema:
         if max_context_chars > 0:
             material = material[:max_context_chars]
 
-        prompt_template = self._load_prompt("socratic_viva.txt")
-        scoped_topic = f"{topic}\n\nReference material:\n{material}"
-        prompt = prompt_template.format(
-            topic=scoped_topic,
-            previous_answer=previous_answer or "No prior response.",
-        )
+        prompt = self._viva_prompt(topic, previous_answer, material=material)
 
         try:
-            question = self._generate_text(prompt=prompt, temperature=0.4)
+            question = self._generate_text(
+                prompt=prompt, temperature=0.4, call_site="socratic.question"
+            )
             return {"question": question, "fallback": False, "integrity": integrity}
         except Exception:
             question = self._fallback_socratic_question(topic=topic, previous_answer=previous_answer)
@@ -461,7 +480,12 @@ Return ONLY valid JSON with this schema:
             reference_text=reference_text,
         )
         try:
-            raw_text = self._generate_text(prompt=prompt, temperature=0.2)
+            raw_text = self._generate_text(
+                prompt=prompt,
+                temperature=0.2,
+                call_site="socratic.evaluate",
+                schema="answer_evaluation",
+            )
             parsed_json = self._extract_json_safely(raw_text)
             if not isinstance(parsed_json, dict):
                 raise ValueError("Model output must be a JSON object")
@@ -473,6 +497,49 @@ Return ONLY valid JSON with this schema:
                 answer=answer,
             )
 
+    def stream_evaluate_answer(
+        self,
+        topic: str,
+        question: str,
+        answer: str,
+        reference_text: str | None = None,
+    ) -> Iterator[tuple[str, dict]]:
+        if not self.enable_live:
+            yield "final", self._heuristic_answer_evaluation(
+                topic=topic,
+                question=question,
+                answer=answer,
+            )
+            return
+
+        prompt = self._build_answer_evaluation_prompt(
+            topic=topic,
+            question=question,
+            answer=answer,
+            reference_text=reference_text,
+        )
+        chunks: list[str] = []
+        try:
+            for chunk in self._stream_text(
+                prompt=prompt,
+                temperature=0.2,
+                call_site="socratic.evaluate",
+                schema="answer_evaluation",
+            ):
+                chunks.append(chunk)
+                yield "token", {"text": chunk}
+            parsed_json = self._extract_json_safely("".join(chunks))
+            if not isinstance(parsed_json, dict):
+                raise ValueError("Model output must be a JSON object")
+            result = self._normalize_answer_evaluation(parsed_json, fallback=False)
+        except Exception:
+            result = self._heuristic_answer_evaluation(
+                topic=topic,
+                question=question,
+                answer=answer,
+            )
+        yield "final", result
+
     def _extract_json_safely(self, text: str) -> dict:
         cleaned = text.strip()
         try:
@@ -553,14 +620,22 @@ Return ONLY valid JSON with this schema:
         }
 
     def analyze_career_match(self, job_text: str) -> dict:
-        prompt_template = self._load_prompt("career_analysis.txt")
-        prompt = prompt_template.format(job_text=job_text)
-
         if not self.enable_live:
             return self._heuristic_career_analysis(job_text=job_text)
 
+        prompt = self.gateway.prompts.compose(
+            "socratic.career",
+            self._load_prompt("career_analysis.txt"),
+            PromptSection("job_text", job_text, priority=0),
+        )
+
         try:
-            raw_text = self._generate_text(prompt=prompt, temperature=0.2)
+            raw_text = self._generate_text(
+                prompt=prompt,
+                temperature=0.2,
+                call_site="socratic.career",
+                schema="career_analysis",
+            )
             parsed_json = self._extract_json_safely(raw_text)
             self._validate_career_schema(parsed_json)
             parsed_json["technical_skills"] = self._normalize_text_list(
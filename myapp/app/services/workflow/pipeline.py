@@ -15,13 +15,18 @@ class WorkflowPipeline:
         job_repo: JobRepository,
         task_repo: TaskRepository,
         llm_provider: GeminiProvider,
+        default_user_id: str = "demo-user",
     ) -> None:
         self.job_repo = job_repo
         self.task_repo = task_repo
         self.llm_provider = llm_provider
+        self.default_user_id = default_user_id
         self.http_scraper = HttpScraper()
         self.browser_scraper = BrowserScraper()
 
+    def _user(self, user_id: str | None) -> str:
+        return user_id or self.default_user_id
+
     def run_scrape(self, source_url: str, mode: str, raw_html: str = "") -> dict:
         scraper = self.browser_scraper if mode == "browser" else self.http_scraper
         source, html = scraper.scrape(source_url=source_url, raw_html=raw_html)
@@ -35,7 +40,8 @@ class WorkflowPipeline:
             "hash": sha256_text(html),
         }
 
-    def persist_assignments(self, assignments: list[dict]) -> int:
+    def persist_assignments(self, assignments: list[dict], user_id: str | None = None) -> int:
+        user_id = self._user(user_id)
         jobs = [
             Job(
                 id=f"job-{index}",
@@ -45,6 +51,7 @@ class WorkflowPipeline:
                 module_weight_percent=int(item.get("module_weight_percent", 0)),
                 estimated_hours=int(item.get("estimated_hours", 0)),
                 notes=item.get("notes", ""),
+                user_id=user_id,
             )
             for index, item in enumerate(assignments, start=1)
         ]
@@ -78,7 +85,10 @@ class WorkflowPipeline:
             parsed = 1
         return max(1, min(100, parsed))
 
-    def persist_ranked_tasks(self, llm_output: dict, source_tasks: list[dict]) -> int:
+    def persist_ranked_tasks(
+        self, llm_output: dict, source_tasks: list[dict], user_id: str | None = None
+    ) -> int:
+        user_id = self._user(user_id)
         rated_tasks = llm_output.get("rated_tasks", [])
         if not isinstance(rated_tasks, list):
             return 0
@@ -108,17 +118,28 @@ class WorkflowPipeline:
                     subject=subject,
                     deadline=deadline,
                     priority=priority,
+                    user_id=user_id,
                 )
             )
 
         return self.task_repo.upsert_tasks(tasks)
 
-    def run(self, source_url: str, raw_html: str, scrape_mode: str, custom_prompt: str = "") -> dict:
+    def run(
+        self,
+        source_url: str,
+        raw_html: str,
+        scrape_mode: str,
+        custom_prompt: str = "",
+        user_id: str | None = None,
+    ) -> dict:
+        user_id = self._user(user_id)
         scrape_output = self.run_scrape(source_url=source_url, mode=scrape_mode, raw_html=raw_html)
-        persisted_jobs = self.persist_assignments(scrape_output["assignments"])
+        persisted_jobs = self.persist_assignments(scrape_output["assignments"], user_id=user_id)
         llm_tasks = self._build_llm_tasks(scrape_output["assignments"])
         llm_output = self.llm_provider.rate_tasks(tasks=llm_tasks, custom_prompt=custom_prompt)
-        persisted_tasks = self.persist_ranked_tasks(llm_output=llm_output, source_tasks=llm_tasks)
+        persisted_tasks = self.persist_ranked_tasks(
+            llm_output=llm_output, source_tasks=llm_tasks, user_id=user_id
+        )
 
         return {
             "scrape": scrape_output,
@@ -0,0 +1,50 @@
+import base64
+import json
+from datetime import datetime
+
+
+
+def encode_cursor(sort_value: object, unique_id: str) -> str:
+    # Tag datetimes so the decoded bound compares as a date, not as its string form.
+    if isinstance(sort_value, datetime):
+        sort_value = {"$date": sort_value.isoformat()}
+    raw = json.dumps([sort_value, unique_id], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+
+def decode_cursor(token: str | None) -> tuple[object, str] | None:
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        sort_value, unique_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+    if not isinstance(unique_id, str):
+        raise ValueError("Invalid pagination cursor")
+    if isinstance(sort_value, dict):
+        try:
+            sort_value = datetime.fromisoformat(sort_value["$date"])
+        except Exception as exc:
+            raise ValueError("Invalid pagination cursor") from exc
+    return sort_value, unique_id
+
+
+
+def keyset_filter(
+    sort_field: str,
+    id_field: str,
+    cursor: tuple[object, str] | None,
+    direction: int = -1,
+) -> dict:
+    if cursor is None:
+        return {}
+    sort_value, unique_id = cursor
+    op = "$lt" if direction < 0 else "$gt"
+    return {
+        "$or": [
+            {sort_field: {op: sort_value}},
+            {sort_field: sort_value, id_field: {op: unique_id}},
+        ]
+    }
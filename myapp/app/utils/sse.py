@@ -0,0 +1,20 @@
+import json
+from collections.abc import Iterable, Iterator
+
+from pydantic import BaseModel
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def sse_stream(
+    events: Iterable[tuple[str, dict]], final_model: type[BaseModel]
+) -> Iterator[str]:
+    # The final payload goes through the JSON endpoint's response model so both shapes match.
+    for event, data in events:
+        if event == "final":
+            data = final_model(**data).model_dump(mode="json")
+        yield format_sse_event(event, data)
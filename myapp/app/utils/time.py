@@ -2,8 +2,13 @@ from datetime import datetime, timezone
 
 
 
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+
 def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return utc_now().isoformat()
 
 
 
@@ -22,11 +27,31 @@ def parse_iso(value: str | None) -> datetime | None:
 
 
 
-def days_until(iso_date: str | None) -> int:
-    if not iso_date:
+def as_utc(value: object) -> datetime | None:
+    # Stored values are already datetimes; only legacy rows and request input need parsing.
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    if isinstance(value, str):
+        parsed = parse_iso(value.strip())
+        return parsed.astimezone(timezone.utc) if parsed else None
+    return None
+
+
+
+def to_iso_z(value: datetime | None) -> str | None:
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+
+def days_until(value: datetime | str | None) -> int:
+    if not value:
         return 999
 
-    parsed = parse_iso(iso_date)
+    parsed = as_utc(value)
     if parsed is None:
         return 999
 
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.config import Settings
+from app.core.dependencies import get_archive_service, get_cached_settings
+from app.models.schemas.archive import ArchiveListResponse
+from app.services.archive_service import ArchiveService
+
+router = APIRouter(prefix="/archive", tags=["archive"])
+
+
+async def _page_archived(
+    service: ArchiveService,
+    name: str,
+    scope: str,
+    limit: int,
+    cursor: str | None,
+) -> ArchiveListResponse:
+    try:
+        items, next_cursor = await service.page_archived_async(
+            name=name,
+            scope=scope,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return ArchiveListResponse(
+        archive=name,
+        count=len(items),
+        items=items,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/tasks", response_model=ArchiveListResponse)
+async def list_archived_tasks(
+    user_id: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+    settings: Settings = Depends(get_cached_settings),
+    service: ArchiveService = Depends(get_archive_service),
+) -> ArchiveListResponse:
+    return await _page_archived(
+        service, "tasks", user_id or settings.default_user_id, limit, cursor
+    )
+
+
+@router.get("/jobs", response_model=ArchiveListResponse)
+async def list_archived_jobs(
+    user_id: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+    settings: Settings = Depends(get_cached_settings),
+    service: ArchiveService = Depends(get_archive_service),
+) -> ArchiveListResponse:
+    return await _page_archived(
+        service, "jobs", user_id or settings.default_user_id, limit, cursor
+    )
+
+
+@router.get("/conversations/{conversation_id}", response_model=ArchiveListResponse)
+async def list_archived_messages(
+    conversation_id: str,
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+    service: ArchiveService = Depends(get_archive_service),
+) -> ArchiveListResponse:
+    return await _page_archived(
+        service, "assistant_conversations", conversation_id, limit, cursor
+    )
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from app.core.dependencies import get_assistant_service
 from app.models.schemas.assistant import AssistantChatRequest, AssistantChatResponse
 from app.services.assistant_service import AssistantService
+from app.utils.sse import SSE_HEADERS, sse_stream
 
 router = APIRouter(prefix="/assistant", tags=["assistant"])
 
@@ -10,11 +12,32 @@ router = APIRouter(prefix="/assistant", tags=["assistant"])
 @router.post("/chat", response_model=AssistantChatResponse)
 def chat(
     request: AssistantChatRequest,
+    user_id: str | None = Query(default=None),
     service: AssistantService = Depends(get_assistant_service),
 ) -> AssistantChatResponse:
     payload = service.chat(
         conversation_id=request.conversation_id,
         message=request.message,
         context_page=request.context_page,
+        user_id=user_id,
     )
     return AssistantChatResponse(**payload)
+
+
+@router.post("/chat/stream")
+def stream_chat(
+    request: AssistantChatRequest,
+    user_id: str | None = Query(default=None),
+    service: AssistantService = Depends(get_assistant_service),
+) -> StreamingResponse:
+    events = service.stream_chat(
+        conversation_id=request.conversation_id,
+        message=request.message,
+        context_page=request.context_page,
+        user_id=user_id,
+    )
+    return StreamingResponse(
+        sse_stream(events, AssistantChatResponse),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -5,6 +5,7 @@ from app.core.config import Settings
 from app.models.schemas.documents import (
     DocumentDownloadResponse,
     DocumentListResponse,
+    DocumentTextResponse,
     DocumentUploadRequest,
     DocumentUploadResponse,
 )
@@ -37,33 +38,80 @@ def upload_academic_reports(
     return DocumentUploadResponse(document=row)
 
 
+async def _page_documents(
+    service: DocumentService,
+    doc_type: str,
+    user_id: str,
+    limit: int,
+    cursor: str | None,
+) -> DocumentListResponse:
+    try:
+        rows, next_cursor = await service.page_documents_async(
+            doc_type=doc_type,
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return DocumentListResponse(count=len(rows), documents=rows, next_cursor=next_cursor)
+
+
 @router.get("/lecture-notes", response_model=DocumentListResponse)
-def list_lecture_notes(
+async def list_lecture_notes(
     user_id: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
     settings: Settings = Depends(get_cached_settings),
     service: DocumentService = Depends(get_document_service),
 ) -> DocumentListResponse:
-    rows = service.list_lecture_notes(user_id=user_id or settings.default_user_id)
-    return DocumentListResponse(count=len(rows), documents=rows)
+    return await _page_documents(
+        service,
+        doc_type="lecture_note",
+        user_id=user_id or settings.default_user_id,
+        limit=limit,
+        cursor=cursor,
+    )
 
 
 @router.get("/academic-reports", response_model=DocumentListResponse)
-def list_academic_reports(
+async def list_academic_reports(
     user_id: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
     settings: Settings = Depends(get_cached_settings),
     service: DocumentService = Depends(get_document_service),
 ) -> DocumentListResponse:
-    rows = service.list_academic_reports(user_id=user_id or settings.default_user_id)
-    return DocumentListResponse(count=len(rows), documents=rows)
+    return await _page_documents(
+        service,
+        doc_type="academic_report",
+        user_id=user_id or settings.default_user_id,
+        limit=limit,
+        cursor=cursor,
+    )
 
 
 @router.get("/{doc_id}/download", response_model=DocumentDownloadResponse)
-def download_document(
+async def download_document(
     doc_id: str,
     service: DocumentService = Depends(get_document_service),
 ) -> DocumentDownloadResponse:
     try:
-        payload = service.download_document(doc_id)
+        payload = await service.download_document_async(doc_id)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     return DocumentDownloadResponse(**payload)
+
+
+@router.get("/{doc_id}/text", response_model=DocumentTextResponse)
+async def get_document_text(
+    doc_id: str,
+    start: int = Query(default=0, ge=0),
+    end: int | None = Query(default=None, ge=0),
+    service: DocumentService = Depends(get_document_service),
+) -> DocumentTextResponse:
+    try:
+        payload = await service.get_document_text_async(doc_id, start=start, end=end)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return DocumentTextResponse(**payload)
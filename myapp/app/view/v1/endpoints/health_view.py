@@ -2,8 +2,24 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import HTMLResponse
 
 from app.core.config import Settings
-from app.core.dependencies import get_cached_settings
-from app.models.schemas.health import HealthResponse
+from app.core.dependencies import (
+    get_cached_settings,
+    get_llm_gateway,
+    get_llm_provider,
+    get_mongo_client_registry,
+    get_repo_cache_registry,
+)
+from app.models.persistence.cache import RepositoryCacheRegistry
+from app.models.persistence.db import MongoClientRegistry
+from app.models.schemas.health import (
+    HealthResponse,
+    LLMBatchingResponse,
+    LLMGatewayResponse,
+    MongoPoolResponse,
+    RepoCacheResponse,
+)
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.provider_gemini import GeminiProvider
 from app.viewmodels.health_vm import build_health_response, build_ui_shell, get_ui_page
 
 router = APIRouter(prefix="/health", tags=["health"])
@@ -14,6 +30,31 @@ def health(settings: Settings = Depends(get_cached_settings)) -> HealthResponse:
     return build_health_response(settings)
 
 
+@router.get("/mongo-pool", response_model=MongoPoolResponse)
+def mongo_pool(
+    registry: MongoClientRegistry = Depends(get_mongo_client_registry),
+) -> MongoPoolResponse:
+    return MongoPoolResponse(**registry.stats())
+
+
+@router.get("/repo-cache", response_model=RepoCacheResponse)
+def repo_cache(
+    settings: Settings = Depends(get_cached_settings),
+    registry: RepositoryCacheRegistry = Depends(get_repo_cache_registry),
+) -> RepoCacheResponse:
+    return RepoCacheResponse(enabled=settings.repo_cache_enabled, caches=registry.stats())
+
+
+@router.get("/llm", response_model=LLMGatewayResponse)
+def llm_gateway(gateway: LLMGateway = Depends(get_llm_gateway)) -> LLMGatewayResponse:
+    return LLMGatewayResponse(**gateway.stats())
+
+
+@router.get("/llm-batching", response_model=LLMBatchingResponse)
+def llm_batching(provider: GeminiProvider = Depends(get_llm_provider)) -> LLMBatchingResponse:
+    return LLMBatchingResponse(**provider.batch_stats())
+
+
 @router.get("/ui", response_class=HTMLResponse)
 def ui_shell() -> str:
     return build_ui_shell()
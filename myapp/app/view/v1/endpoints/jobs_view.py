@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.core.dependencies import get_job_discovery_service
 from app.models.schemas.jobs import (
@@ -14,6 +14,7 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
 @router.post("/discover", response_model=JobDiscoveryResponse)
 def discover_jobs(
     request: JobDiscoveryRequest,
+    user_id: str | None = Query(default=None),
     service: JobDiscoveryService = Depends(get_job_discovery_service),
 ) -> JobDiscoveryResponse:
     try:
@@ -21,6 +22,7 @@ def discover_jobs(
             query=request.query,
             location=request.location,
             limit=request.limit,
+            user_id=user_id,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -30,16 +32,25 @@ def discover_jobs(
 
 
 @router.get("", response_model=JobsListResponse)
-def list_jobs(
+async def list_jobs(
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+    user_id: str | None = Query(default=None),
     service: JobDiscoveryService = Depends(get_job_discovery_service),
 ) -> JobsListResponse:
-    payload = service.list_jobs(auto_refresh=True)
+    try:
+        payload = await service.list_jobs_async(
+            auto_refresh=True, limit=limit, cursor=cursor, user_id=user_id
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return JobsListResponse(**payload)
 
 
 @router.post("/refresh", response_model=JobDiscoveryResponse)
 def refresh_jobs(
     request: JobDiscoveryRequest,
+    user_id: str | None = Query(default=None),
     service: JobDiscoveryService = Depends(get_job_discovery_service),
 ) -> JobDiscoveryResponse:
     try:
@@ -47,6 +58,7 @@ def refresh_jobs(
             query=request.query,
             location=request.location,
             limit=request.limit,
+            user_id=user_id,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
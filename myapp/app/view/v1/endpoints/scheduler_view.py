@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.core.dependencies import get_scheduler_service
 from app.models.schemas.scheduler import (
@@ -14,18 +14,31 @@ router = APIRouter(prefix="/scheduler", tags=["scheduler"])
 
 
 @router.get("/events", response_model=SchedulerEventsResponse)
-def list_events(
+async def list_events(
     start: str | None = None,
     end: str | None = None,
+    limit: int = Query(default=500, ge=1, le=1000),
+    cursor: str | None = Query(default=None),
+    user_id: str | None = Query(default=None),
     service: SchedulerService = Depends(get_scheduler_service),
 ) -> SchedulerEventsResponse:
-    events = service.list_events(start_at=start, end_at=end)
-    return SchedulerEventsResponse(count=len(events), events=events)
+    try:
+        events, next_cursor = await service.page_events_async(
+            start_at=start,
+            end_at=end,
+            limit=limit,
+            cursor=cursor,
+            user_id=user_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return SchedulerEventsResponse(count=len(events), events=events, next_cursor=next_cursor)
 
 
 @router.post("/tasks", response_model=SchedulerTaskResponse)
 def add_task(
     request: SchedulerTaskCreateRequest,
+    user_id: str | None = Query(default=None),
     service: SchedulerService = Depends(get_scheduler_service),
 ) -> SchedulerTaskResponse:
     task, events = service.add_task(
@@ -35,6 +48,7 @@ def add_task(
         module_weight_percent=request.module_weight_percent,
         estimated_hours=request.estimated_hours,
         notes=request.notes,
+        user_id=user_id,
     )
     return SchedulerTaskResponse(
         task_id=task.id,
@@ -51,10 +65,13 @@ def add_task(
 def patch_task(
     task_id: str,
     request: SchedulerTaskPatchRequest,
+    user_id: str | None = Query(default=None),
     service: SchedulerService = Depends(get_scheduler_service),
 ) -> SchedulerTaskResponse:
     try:
-        task, events = service.patch_task(task_id=task_id, patch=request.model_dump())
+        task, events = service.patch_task(
+            task_id=task_id, patch=request.model_dump(), user_id=user_id
+        )
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
@@ -70,8 +87,9 @@ def patch_task(
 
 
 @router.post("/reschedule", response_model=SchedulerRescheduleResponse)
-def reschedule(
+async def reschedule(
+    user_id: str | None = Query(default=None),
     service: SchedulerService = Depends(get_scheduler_service),
 ) -> SchedulerRescheduleResponse:
-    events = service.reschedule()
+    events = await service.reschedule_async(user_id=user_id)
     return SchedulerRescheduleResponse(rescheduled_count=len(events), events=events)
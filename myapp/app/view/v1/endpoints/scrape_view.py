@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from app.core.dependencies import get_workflow_pipeline
 from app.models.schemas.scrape import ScrapeRequest, ScrapeResponse
@@ -11,6 +11,7 @@ router = APIRouter(prefix="/scrape", tags=["scrape"])
 @router.post("", response_model=ScrapeResponse)
 def scrape(
     request: ScrapeRequest,
+    user_id: str | None = Query(default=None),
     pipeline: WorkflowPipeline = Depends(get_workflow_pipeline),
 ) -> ScrapeResponse:
     payload = pipeline.run_scrape(
@@ -18,5 +19,5 @@ def scrape(
         mode=request.mode,
         raw_html=request.raw_html,
     )
-    pipeline.persist_assignments(payload.get("assignments", []))
+    pipeline.persist_assignments(payload.get("assignments", []), user_id=user_id)
     return build_scrape_response(payload)
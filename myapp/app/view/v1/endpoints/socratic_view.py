@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.core.dependencies import get_socratic_agent, get_voice_service
 from app.models.schemas.socratic import (
@@ -17,6 +18,7 @@ from app.models.schemas.socratic import (
 )
 from app.services.socratic.agent import SocraticAgentService
 from app.services.socratic.voice import ElevenLabsVoiceService
+from app.utils.sse import SSE_HEADERS, sse_stream
 
 router = APIRouter(prefix="/socratic", tags=["socratic"])
 
@@ -34,6 +36,23 @@ def generate_question(
     return SocraticQuestionResponse(**payload)
 
 
+@router.post("/question/stream")
+def stream_question(
+    request: SocraticQuestionRequest,
+    agent: SocraticAgentService = Depends(get_socratic_agent),
+) -> StreamingResponse:
+    events = agent.stream_socratic_viva(
+        topic=request.topic,
+        previous_answer=request.previous_answer,
+        student_query=request.student_query,
+    )
+    return StreamingResponse(
+        sse_stream(events, SocraticQuestionResponse),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.post("/evaluate-answer", response_model=AnswerEvaluationResponse)
 def evaluate_answer(
     request: AnswerEvaluationRequest,
@@ -48,6 +67,24 @@ def evaluate_answer(
     return AnswerEvaluationResponse(**payload)
 
 
+@router.post("/evaluate-answer/stream")
+def stream_evaluate_answer(
+    request: AnswerEvaluationRequest,
+    agent: SocraticAgentService = Depends(get_socratic_agent),
+) -> StreamingResponse:
+    events = agent.stream_evaluate_answer(
+        topic=request.topic,
+        question=request.question,
+        answer=request.answer,
+        reference_text=request.reference_text,
+    )
+    return StreamingResponse(
+        sse_stream(events, AnswerEvaluationResponse),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.post("/integrity-check", response_model=IntegrityCheckResponse)
 def integrity_check(
     request: IntegrityCheckRequest,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from app.core.dependencies import get_workflow_pipeline
 from app.models.schemas.workflow import WorkflowRequest, WorkflowResponse
@@ -11,6 +11,7 @@ router = APIRouter(prefix="/workflow", tags=["workflow"])
 @router.post("/run", response_model=WorkflowResponse)
 def run_workflow(
     request: WorkflowRequest,
+    user_id: str | None = Query(default=None),
     pipeline: WorkflowPipeline = Depends(get_workflow_pipeline),
 ) -> WorkflowResponse:
     payload = pipeline.run(
@@ -18,5 +19,6 @@ def run_workflow(
         raw_html=request.raw_html,
         scrape_mode=request.scrape_mode,
         custom_prompt=request.custom_prompt,
+        user_id=user_id,
     )
     return build_workflow_response(payload)
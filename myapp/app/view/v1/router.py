@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.view.v1.endpoints.archive_view import router as archive_router
 from app.view.v1.endpoints.assistant_view import router as assistant_router
 from app.view.v1.endpoints.documents_view import router as documents_router
 from app.view.v1.endpoints.health_view import router as health_router
@@ -20,3 +21,4 @@ router.include_router(scheduler_router)
 router.include_router(documents_router)
 router.include_router(assistant_router)
 router.include_router(jobs_router)
+router.include_router(archive_router)
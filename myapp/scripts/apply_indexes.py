@@ -0,0 +1,26 @@
+import argparse
+import json
+
+from app.core.dependencies import get_index_manager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply declared Mongo indexes offline.")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the index diff")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Drop and recreate indexes whose definition changed",
+    )
+    args = parser.parse_args()
+
+    manager = get_index_manager()
+    if args.dry_run:
+        plans = manager.plan()
+    else:
+        plans = manager.apply(allow_rebuild=args.rebuild)
+    print(json.dumps([plan.summary() for plan in plans], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import json
+
+from app.core.dependencies import get_user_id_backfills
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Assign tasks, jobs and events without a user_id to DEFAULT_USER_ID."
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        help="Backfill only this collection (repeatable)",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--max-batches",
+        type=int,
+        default=None,
+        help="Stop after this many batches per collection; rerun to resume",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore saved checkpoints and rescan from the beginning",
+    )
+    args = parser.parse_args()
+
+    backfills = get_user_id_backfills()
+    unknown = sorted(set(args.only or []) - set(backfills))
+    if unknown:
+        parser.error(f"unknown collection(s): {', '.join(unknown)}")
+
+    results = {
+        name: backfill.run(
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+            restart=args.restart,
+        )
+        for name, backfill in backfills.items()
+        if not args.only or name in args.only
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
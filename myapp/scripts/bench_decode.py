@@ -0,0 +1,100 @@
+import argparse
+import json
+import time
+from datetime import UTC, datetime, timedelta
+
+import bson
+from bson.raw_bson import RawBSONDocument
+
+from app.models.persistence.db import RAW_CODEC_OPTIONS
+from app.models.persistence.job_repo import JobRepository
+
+
+def _job_doc(index: int, now: datetime) -> dict:
+    return {
+        "_id": bson.ObjectId(),
+        "job_id": f"job-{index:06d}",
+        "user_id": "bench-user",
+        "title": f"Software Engineer Intern {index}",
+        "module": "Career",
+        "due_at": now + timedelta(days=index % 60),
+        "module_weight_percent": 30,
+        "estimated_hours": 4,
+        "notes": "Responsibilities and requirements copied from the listing. " * 12,
+        "company": f"Company {index % 97}",
+        "location": "London",
+        "source_url": f"https://jobs.example.com/{index}",
+        "match_score": index % 100,
+        "discovered_at": now,
+        "created_at": now - timedelta(seconds=index),
+        "updated_at": now,
+    }
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare full dict decoding + Job coercion against projected raw BSON reads."
+    )
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--fields",
+        default="job_id,title,due_at",
+        help="Comma-separated fields the projected read touches",
+    )
+    args = parser.parse_args()
+
+    now = datetime.now(UTC)
+    fields = tuple(field for field in args.fields.split(",") if field)
+    docs = [_job_doc(index, now) for index in range(args.rows)]
+    # What the server sends back: whole documents for list_jobs, and only the projected
+    # fields (plus the created_at/job_id cursor keys) for list_job_fields.
+    full = [bson.encode(doc) for doc in docs]
+    keep = ("created_at", "job_id", *fields)
+    projected = [bson.encode({field: doc[field] for field in keep}) for doc in docs]
+    repo = JobRepository.__new__(JobRepository)
+
+    def decode_full() -> None:
+        for raw in full:
+            repo._to_job(bson.decode(raw, RAW_CODEC_OPTIONS.with_options(document_class=dict)))
+
+    def decode_projected() -> None:
+        for raw in projected:
+            row = RawBSONDocument(raw, RAW_CODEC_OPTIONS)
+            for field in fields:
+                row.get(field)
+
+    def decode_untouched() -> None:
+        for raw in projected:
+            RawBSONDocument(raw, RAW_CODEC_OPTIONS)
+
+    full_ms = _best_ms(decode_full, args.repeat)
+    projected_ms = _best_ms(decode_projected, args.repeat)
+    print(
+        json.dumps(
+            {
+                "rows": args.rows,
+                "fields": list(fields),
+                "bytes_full": sum(len(raw) for raw in full),
+                "bytes_projected": sum(len(raw) for raw in projected),
+                "full_decode_to_job_ms": full_ms,
+                "projected_raw_ms": projected_ms,
+                "raw_untouched_ms": _best_ms(decode_untouched, args.repeat),
+                "speedup": round(full_ms / projected_ms, 1) if projected_ms else None,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
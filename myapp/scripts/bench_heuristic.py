@@ -0,0 +1,91 @@
+import argparse
+import json
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from app.services.llm.heuristic_scorer import HeuristicScorer, score_band
+from app.utils.time import days_until, to_iso_z
+
+
+def _task(index: int, now: datetime, rng: random.Random) -> dict:
+    due = now + timedelta(hours=rng.randint(-72, 24 * 40))
+    return {
+        "id": f"task-{index:06d}",
+        "title": f"Coursework {index}",
+        "due_at": to_iso_z(due) if rng.random() > 0.1 else None,
+        "module_weight_percent": rng.randint(0, 60),
+        "estimated_hours": rng.randint(0, 14),
+    }
+
+
+def loop_rate(tasks: list[dict]) -> list[dict]:
+    # The per-task formula the vectorized scorer replaced, kept as the reference.
+    rated = []
+    for task in tasks:
+        days_left = days_until(task.get("due_at"))
+        urgency = max(0, min(100, 100 - (days_left * 8)))
+        module_score = max(0, min(100, int(task.get("module_weight_percent", 0)) * 2))
+        effort_score = max(0, min(100, int(task.get("estimated_hours", 0)) * 9))
+        score = round((urgency * 0.55) + (module_score * 0.35) + (effort_score * 0.10))
+        rated.append(
+            {
+                "id": str(task.get("id", task.get("title", "task"))),
+                "title": str(task.get("title", "Untitled Task")),
+                "priority_score": score,
+                "priority_band": score_band(score),
+                "reason": f"Urgency={urgency}, Module={module_score}, Effort={effort_score}",
+            }
+        )
+    rated.sort(key=lambda item: item["priority_score"], reverse=True)
+    return rated
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the per-task heuristic priority loop with the NumPy batch scorer."
+    )
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime.now(UTC)
+    tasks = [_task(index, now, rng) for index in range(args.tasks)]
+    scorer = HeuristicScorer()
+
+    reference = loop_rate(tasks)
+    loop_ms = _best_ms(lambda: loop_rate(tasks), args.repeat)
+    batch_ms = _best_ms(lambda: scorer.rate(tasks), args.repeat)
+    top_k_ms = _best_ms(lambda: scorer.rate(tasks, top_k=args.top_k), args.repeat)
+    print(
+        json.dumps(
+            {
+                "tasks": args.tasks,
+                "top_k": args.top_k,
+                "identical": scorer.rate(tasks) == reference,
+                "top_k_identical": scorer.rate(tasks, top_k=args.top_k) == reference[: args.top_k],
+                "loop_ms": loop_ms,
+                "numpy_all_ms": batch_ms,
+                "numpy_top_k_ms": top_k_ms,
+                "speedup_all": round(loop_ms / batch_ms, 1) if batch_ms else None,
+                "speedup_top_k": round(loop_ms / top_k_ms, 1) if top_k_ms else None,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
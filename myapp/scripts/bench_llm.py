@@ -0,0 +1,124 @@
+import argparse
+import dataclasses
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import get_settings
+from app.core.dependencies import build_llm_gateway
+from app.services.llm.fake_gemini import FakeGeminiServer
+from app.services.llm.provider_gemini import GeminiProvider
+from app.services.socratic.agent import SocraticAgentService
+from scripts.fake_gemini import add_fake_arguments, config_from_args
+
+WORKLOADS = ("priority", "question", "evaluation", "career", "stream")
+
+
+def _percentile(values: list[float], share: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(share * len(ordered)))], 2)
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "p50": _percentile(values, 0.5),
+        "p95": _percentile(values, 0.95),
+        "p99": _percentile(values, 0.99),
+        "max": round(max(values), 2) if values else 0.0,
+    }
+
+
+def _request(workload: str, index: int, provider: GeminiProvider, agent: SocraticAgentService):
+    # Each request differs so coalescing does not hide the network path.
+    topic = f"Recursion in Python, variant {index}"
+    if workload == "priority":
+        tasks = [
+            {"id": f"t{index}-{n}", "title": f"Task {n}", "module": "Math", "due_at": None}
+            for n in range(5)
+        ]
+        return provider.rate_tasks(tasks)["fallback"], None
+    if workload == "question":
+        return agent.socratic_viva(topic=topic)["fallback"], None
+    if workload == "evaluation":
+        result = agent.evaluate_answer(topic, "What is a base case?", f"It stops recursion {index}.")
+        return result["fallback"], None
+    if workload == "career":
+        result = agent.analyze_career_match(f"Graduate Python developer {index}, SQL and Docker.")
+        return result["fallback"], None
+
+    started = time.perf_counter()
+    first_token = None
+    for event, data in agent.stream_socratic_viva(topic=topic):
+        if event == "token" and first_token is None:
+            first_token = (time.perf_counter() - started) * 1000
+        if event == "final":
+            return data["fallback"], first_token
+    return True, first_token
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the live LLM path (client, retries, timeouts) offline."
+    )
+    parser.add_argument("--workload", choices=WORKLOADS, default="evaluation")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--base-url", default="", help="Use a running fake instead of starting one in-process"
+    )
+    add_fake_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = FakeGeminiServer(config_from_args(args)).start()
+        base_url = server.base_url
+
+    settings = get_settings()
+    settings = dataclasses.replace(
+        settings,
+        enable_live_llm=True,
+        gemini_api_key=settings.gemini_api_key or "offline-benchmark",
+        gemini_base_url=base_url,
+    )
+    # No response cache: every request should reach the endpoint.
+    gateway = build_llm_gateway(settings)
+    provider = GeminiProvider(model=settings.llm_model, gateway=gateway)
+    agent = SocraticAgentService(model=settings.llm_model, gateway=gateway)
+
+    def timed(index: int) -> tuple[float, bool, float | None]:
+        started = time.perf_counter()
+        fallback, first_token = _request(args.workload, index, provider, agent)
+        return (time.perf_counter() - started) * 1000, fallback, first_token
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        results = list(pool.map(timed, range(max(1, args.requests))))
+    wall = time.perf_counter() - started
+
+    latencies = [latency for latency, _, _ in results]
+    first_tokens = [first for _, _, first in results if first is not None]
+    gateway_stats = gateway.stats()
+    report = {
+        "workload": args.workload,
+        "requests": len(results),
+        "concurrency": args.concurrency,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(results) / wall, 2) if wall else 0.0,
+        "latency_ms": _summary(latencies),
+        "first_token_ms": _summary(first_tokens) if first_tokens else None,
+        "fallbacks": sum(1 for _, fallback, _ in results if fallback),
+        "call_sites": gateway_stats["call_sites"],
+        "breaker": gateway_stats["breaker"],
+        "server": server.stats() if server is not None else None,
+    }
+    if server is not None:
+        server.stop()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+
+from app.services.llm.fake_gemini import PROMPT_FAMILIES, FakeGeminiConfig, FakeGeminiServer
+
+LATENCY_HELP = "fixed:MS, uniform:MIN:MAX, exp:MEAN or lognormal:MEDIAN:SIGMA (milliseconds)"
+
+
+def add_fake_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", default="lognormal:600:0.5", help=LATENCY_HELP)
+    parser.add_argument(
+        "--family-latency",
+        action="append",
+        default=[],
+        metavar="FAMILY=SPEC",
+        help=f"Latency for one prompt family ({', '.join(PROMPT_FAMILIES)}); repeatable",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of failed requests")
+    parser.add_argument("--error-status", type=int, default=503, choices=[429, 500, 503])
+    parser.add_argument("--chunk-words", type=int, default=6, help="Words per streamed chunk")
+    parser.add_argument("--chunk-delay", default="fixed:40", help=f"Between chunks: {LATENCY_HELP}")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> FakeGeminiConfig:
+    family_latency: dict[str, str] = {}
+    for item in args.family_latency:
+        family, _, spec = item.partition("=")
+        if family not in PROMPT_FAMILIES or not spec:
+            raise SystemExit(f"Invalid --family-latency {item!r}")
+        family_latency[family] = spec
+    return FakeGeminiConfig(
+        latency=args.latency,
+        family_latency=family_latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        chunk_words=args.chunk_words,
+        chunk_delay=args.chunk_delay,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve a local Gemini stand-in; point the app at it with GEMINI_BASE_URL."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_fake_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(config_from_args(args), host=args.host, port=args.port)
+    print(f"Fake Gemini listening on {server.base_url} (GET /stats for counts)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
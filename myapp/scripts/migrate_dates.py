@@ -0,0 +1,48 @@
+import argparse
+import json
+
+from app.core.dependencies import get_date_migrations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert legacy ISO-8601 string timestamps to native dates, resumably."
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        help="Migrate only this collection (repeatable)",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--max-batches",
+        type=int,
+        default=None,
+        help="Stop after this many batches per collection; rerun to resume",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore saved checkpoints and rescan from the beginning",
+    )
+    args = parser.parse_args()
+
+    migrations = get_date_migrations()
+    unknown = sorted(set(args.only or []) - set(migrations))
+    if unknown:
+        parser.error(f"unknown collection(s): {', '.join(unknown)}")
+
+    results = {
+        name: migration.run(
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+            restart=args.restart,
+        )
+        for name, migration in migrations.items()
+        if not args.only or name in args.only
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import argparse
+import json
+
+from app.core.dependencies import get_archive_service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move aged tasks, jobs and conversation messages to *_archive collections."
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=["tasks", "jobs", "assistant_conversations"],
+        help="Archive only this collection (repeatable)",
+    )
+    args = parser.parse_args()
+
+    print(json.dumps(get_archive_service().run(args.only), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,13 @@ import os
 
 import pytest
 
-from app.core.dependencies import get_job_repo, get_task_repo, get_workflow_pipeline
+from app.core.dependencies import (
+    get_async_job_repo,
+    get_async_task_repo,
+    get_job_repo,
+    get_task_repo,
+    get_workflow_pipeline,
+)
 from app.main import app
 from app.models.domain.job import Job
 from app.models.domain.task import Task
@@ -53,6 +59,34 @@ class InMemoryTaskRepo:
         return values[: max(1, int(limit))]
 
 
+class InMemoryAsyncJobRepo:
+    def __init__(self, repo: InMemoryJobRepo) -> None:
+        self._repo = repo
+
+    async def upsert_jobs(self, jobs: list[Job]) -> int:
+        return self._repo.upsert_jobs(jobs)
+
+    async def replace_jobs(self, jobs: list[Job]) -> int:
+        return self._repo.replace_jobs(jobs)
+
+    async def list_jobs(self, limit: int = 200) -> list[Job]:
+        return self._repo.list_jobs(limit=limit)
+
+
+class InMemoryAsyncTaskRepo:
+    def __init__(self, repo: InMemoryTaskRepo) -> None:
+        self._repo = repo
+
+    async def upsert_tasks(self, tasks: list[Task]) -> int:
+        return self._repo.upsert_tasks(tasks)
+
+    async def replace_tasks(self, tasks: list[Task]) -> int:
+        return self._repo.replace_tasks(tasks)
+
+    async def list_tasks(self, limit: int = 200) -> list[Task]:
+        return self._repo.list_tasks(limit=limit)
+
+
 @pytest.fixture(autouse=True)
 def override_runtime_dependencies():
     repo = InMemoryJobRepo()
@@ -62,6 +96,8 @@ def override_runtime_dependencies():
 
     app.dependency_overrides[get_job_repo] = lambda: repo
     app.dependency_overrides[get_task_repo] = lambda: task_repo
+    app.dependency_overrides[get_async_job_repo] = lambda: InMemoryAsyncJobRepo(repo)
+    app.dependency_overrides[get_async_task_repo] = lambda: InMemoryAsyncTaskRepo(task_repo)
     app.dependency_overrides[get_workflow_pipeline] = lambda: pipeline
     yield
     app.dependency_overrides.clear()
@@ -0,0 +1,190 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from app.models.domain.job import Job
+from app.models.domain.task import Task
+from app.models.persistence.archive import ArchiveRepository, default_archive_policies
+from app.models.persistence.cache import (
+    JOB_READ_METHODS,
+    JOB_WRITE_METHODS,
+    CachedRepository,
+    RepositoryCacheRegistry,
+)
+from app.models.persistence.sqlite_db import SqliteDatabase
+from app.models.persistence.sqlite_repos import (
+    SqliteArchiveRepository,
+    SqliteJobRepository,
+    SqliteTaskRepository,
+)
+from app.services.archive_service import ArchiveService
+
+NOW = datetime(2026, 6, 1, tzinfo=UTC)
+
+
+class _FakeCursor:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+
+    def sort(self, keys: list):
+        for field, order in reversed(keys):
+            self.rows.sort(key=lambda row: str(row.get(field) or ""), reverse=order == -1)
+        return self
+
+    def limit(self, value: int):
+        self.rows = self.rows[:value]
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+def _matches(row: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        value = row.get(field)
+        if field == "_id" and isinstance(condition, dict):
+            if value not in condition["$in"]:
+                return False
+        elif isinstance(condition, dict):
+            # Mongo only compares a date bound against date values.
+            if not (isinstance(value, datetime) and value < condition["$lt"]):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class _FakeCollection:
+    def __init__(self, rows: list[dict] | None = None) -> None:
+        self.docs = {row["_id"]: dict(row) for row in rows or []}
+        self.bulk_calls = 0
+
+    def find(self, query: dict, _projection: dict | None = None):
+        return _FakeCursor([dict(row) for row in self.docs.values() if _matches(row, query)])
+
+    def bulk_write(self, operations: list, ordered: bool = True) -> None:
+        self.bulk_calls += 1
+        for operation in operations:
+            self.docs[operation._filter["_id"]] = dict(operation._doc)
+
+    def delete_many(self, query: dict):
+        doomed = [key for key, row in self.docs.items() if _matches(row, query)]
+        for key in doomed:
+            del self.docs[key]
+        return SimpleNamespace(deleted_count=len(doomed))
+
+
+def _task_row(index: int, completed: bool, updated_at: datetime | str) -> dict:
+    return {
+        "_id": f"oid-{index}",
+        "task_id": f"task-{index}",
+        "user_id": "user-a",
+        "completed": completed,
+        "updated_at": updated_at,
+    }
+
+
+def test_archive_moves_only_aged_rows_in_bounded_batches() -> None:
+    hot = _FakeCollection(
+        [
+            _task_row(1, True, datetime(2026, 1, 1, tzinfo=UTC)),
+            _task_row(2, True, datetime(2026, 1, 2, tzinfo=UTC)),
+            _task_row(3, True, datetime(2026, 1, 3, tzinfo=UTC)),
+            _task_row(4, False, datetime(2026, 1, 1, tzinfo=UTC)),
+            _task_row(5, True, datetime(2026, 5, 30, tzinfo=UTC)),
+            _task_row(6, True, ""),
+        ]
+    )
+    archive = _FakeCollection()
+    repo = ArchiveRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_tasks_test",
+        policy=default_archive_policies(task_days=30)["tasks"],
+        mongodb=SimpleNamespace(collection=hot, database={}),
+        archive_collection=archive,
+    )
+
+    assert repo.archive(batch_size=2, max_batches=1, now=NOW) == 2
+    assert set(archive.docs) == {"oid-1", "oid-2"}
+
+    assert repo.archive(batch_size=2, now=NOW) == 1
+    assert set(hot.docs) == {"oid-4", "oid-5", "oid-6"}
+    assert archive.bulk_calls == 2
+    assert all(isinstance(row["archived_at"], datetime) for row in archive.docs.values())
+
+
+def test_sqlite_archive_round_trip(tmp_path) -> None:
+    database = SqliteDatabase(tmp_path / "beacon.sqlite3")
+    try:
+        tasks = SqliteTaskRepository(database)
+        tasks.upsert_tasks(
+            [
+                Task(id="task-1", title="Done", completed=True, user_id="user-a"),
+                Task(id="task-2", title="Open", user_id="user-a"),
+            ]
+        )
+        policy = default_archive_policies(task_days=1)["tasks"]
+        repo = SqliteArchiveRepository(database, policy, ("user_id", "task_id"))
+
+        assert repo.archive(now=NOW) == 0
+        later = datetime(2100, 1, 1, tzinfo=UTC)
+        assert repo.archive(now=later) == 1
+
+        assert [task.id for task in tasks.list_tasks(user_id="user-a")] == ["task-2"]
+        archived, cursor = repo.page_archived("user-a")
+        assert cursor is None
+        assert [row["task_id"] for row in archived] == ["task-1"]
+        assert isinstance(archived[0]["archived_at"], datetime)
+        assert isinstance(archived[0]["updated_at"], datetime)
+        assert [task.id for task in tasks.list_tasks(user_id="user-a", active_only=True)] == [
+            "task-2"
+        ]
+    finally:
+        database.close_all()
+
+
+def _job(job_id: str, due_at: datetime) -> Job:
+    return Job(
+        id=job_id,
+        title=job_id,
+        module="Career",
+        due_at=due_at,
+        module_weight_percent=30,
+        estimated_hours=4,
+        user_id="user-a",
+    )
+
+
+def test_archive_run_clears_the_cached_reads_of_the_rows_it_moved(tmp_path) -> None:
+    database = SqliteDatabase(tmp_path / "beacon.sqlite3")
+    try:
+        registry = RepositoryCacheRegistry(ttl_seconds=60)
+        jobs = CachedRepository(
+            SqliteJobRepository(database),
+            cache=registry.cache("jobs"),
+            read_methods=JOB_READ_METHODS,
+            write_methods=JOB_WRITE_METHODS,
+        )
+        jobs.upsert_jobs(
+            [
+                _job("job-expired", datetime(2020, 1, 1, tzinfo=UTC)),
+                _job("job-open", datetime(2100, 1, 1, tzinfo=UTC)),
+            ]
+        )
+        assert sorted(job.id for job in jobs.list_jobs(user_id="user-a")) == [
+            "job-expired",
+            "job-open",
+        ]
+        policy = default_archive_policies(job_days=14)["jobs"]
+        service = ArchiveService(
+            {"jobs": SqliteArchiveRepository(database, policy, ("user_id", "job_id"))},
+            caches={"jobs": registry.cache("jobs")},
+        )
+
+        assert service.run() == {"jobs": 1}
+        assert [job.id for job in jobs.list_jobs(user_id="user-a")] == ["job-open"]
+
+        invalidations = registry.cache("jobs").stats()["invalidations"]
+        assert service.run() == {"jobs": 0}
+        assert registry.cache("jobs").stats()["invalidations"] == invalidations
+    finally:
+        database.close_all()
@@ -0,0 +1,115 @@
+from app.models.persistence.assistant_repo import _ConversationDocuments
+from app.services.assistant_service import AssistantService
+
+
+class _FakeConversationRepo(_ConversationDocuments):
+    def __init__(self) -> None:
+        self.rows: list[dict] = []
+        self.list_calls = 0
+        self.insert_batches: list[int] = []
+
+    def list_messages(self, conversation_id: str, limit: int = 12) -> list[dict]:
+        self.list_calls += 1
+        rows = [row for row in self.rows if row["conversation_id"] == conversation_id]
+        return rows[-limit:]
+
+    def append_turn(self, messages: list[dict]) -> list[str]:
+        self.insert_batches.append(len(messages))
+        self.rows.extend(dict(row) for row in messages)
+        return [row["message_id"] for row in messages]
+
+
+class _EmptyRepo:
+    def __init__(self) -> None:
+        self.user_ids: list[str | None] = []
+
+    def list_task_fields(self, fields, limit: int = 200, user_id: str | None = None) -> list:
+        self.user_ids.append(user_id)
+        return []
+
+    def list_job_fields(self, fields, limit: int = 200, user_id: str | None = None) -> list:
+        self.user_ids.append(user_id)
+        return []
+
+
+def test_chat_writes_one_batch_per_turn_and_serves_history_from_tail() -> None:
+    repo = _FakeConversationRepo()
+    service = AssistantService(
+        model="gemini-test",
+        api_key="",
+        enable_live=False,
+        conversation_repo=repo,
+        job_repo=_EmptyRepo(),
+        task_repo=_EmptyRepo(),
+        history_limit=3,
+    )
+    prompts: list[str] = []
+
+    def fake_generate(prompt: str) -> str:
+        prompts.append(prompt)
+        return f"reply {len(prompts)}"
+
+    service._generate_text = fake_generate
+
+    service.chat("conv-1", "first", "dashboard")
+    service.chat("conv-1", "second", "dashboard")
+
+    assert repo.list_calls == 1
+    assert repo.insert_batches == [2, 2]
+    assert [row["role"] for row in repo.rows] == ["user", "assistant", "user", "assistant"]
+    history = prompts[1].split("Conversation history:\n")[1].split("\n\n")[0]
+    assert history.splitlines() == ["user: first", "assistant: reply 1", "user: second"]
+
+
+def _service(repo: _FakeConversationRepo, data_repo: _EmptyRepo | None = None) -> AssistantService:
+    data_repo = data_repo or _EmptyRepo()
+    return AssistantService(
+        model="gemini-test",
+        api_key="",
+        enable_live=False,
+        conversation_repo=repo,
+        job_repo=data_repo,
+        task_repo=data_repo,
+        default_user_id="user-default",
+    )
+
+
+def test_context_snapshot_reads_only_the_callers_tasks_and_jobs() -> None:
+    data_repo = _EmptyRepo()
+    service = _service(_FakeConversationRepo(), data_repo)
+    service._generate_text = lambda prompt: "ok"
+
+    service.chat("conv-1", "what is due?", "dashboard", user_id="user-a")
+    service.chat("conv-2", "and now?", "dashboard")
+
+    assert data_repo.user_ids == ["user-a", "user-a", "user-default", "user-default"]
+
+
+def test_user_message_is_kept_when_the_stream_is_abandoned() -> None:
+    repo = _FakeConversationRepo()
+    service = _service(repo)
+    service._stream_text = lambda prompt: iter(["Hel", "lo"])
+
+    events = service.stream_chat("conv-1", "are you there?", "dashboard")
+    assert next(events) == ("token", {"text": "Hel"})
+    events.close()
+
+    assert [(row["role"], row["text"]) for row in repo.rows] == [("user", "are you there?")]
+    assert service._history_tail("conv-1")[-1]["text"] == "are you there?"
+
+
+def test_user_message_is_kept_when_the_reply_is_interrupted() -> None:
+    repo = _FakeConversationRepo()
+    service = _service(repo)
+
+    def interrupted(prompt: str) -> str:
+        raise KeyboardInterrupt
+
+    service._generate_text = interrupted
+    try:
+        service.chat("conv-1", "plan my week", "dashboard")
+    except KeyboardInterrupt:
+        pass
+
+    assert [row["role"] for row in repo.rows] == ["user"]
+    assert repo.insert_batches == [1]
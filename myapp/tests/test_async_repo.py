@@ -0,0 +1,195 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_job_discovery_service
+from app.main import app
+from app.models.persistence.async_db import AsyncMongoClientRegistry
+from app.models.persistence.calendar_event_repo import (
+    AsyncCalendarEventRepository,
+    CalendarEventRepository,
+)
+from app.models.persistence.db import MongoClientRegistry
+from app.models.persistence.job_repo import AsyncJobRepository, JobRepository
+from app.models.persistence.task_repo import AsyncTaskRepository, TaskRepository
+from app.services.job_discovery_service import JobDiscoveryService
+from app.services.llm.provider_gemini import GeminiProvider
+from app.services.scheduler import SchedulerService
+from tests.test_user_scoping import _job, _repo, _ScopedCollection, _task
+
+
+class _AsyncFakeCursor:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+
+    def sort(self, keys: list):
+        for field, order in reversed(keys):
+            self.rows.sort(key=lambda row: row.get(field) or "", reverse=order == -1)
+        return self
+
+    def limit(self, value: int):
+        self.rows = self.rows[:value]
+        return self
+
+    async def to_list(self, length=None):
+        return list(self.rows)
+
+
+class _AsyncFakeCollection:
+    def __init__(self) -> None:
+        self.docs: dict[tuple[str, str], dict] = {}
+
+    async def bulk_write(self, operations: list, ordered: bool = True):
+        for operation in operations:
+            query = operation._filter
+            key = (query["user_id"], query["event_id"])
+            existing = self.docs.get(key)
+            if existing is None:
+                existing = self.docs[key] = dict(operation._doc.get("$setOnInsert", {}))
+            existing.update(operation._doc["$set"])
+        return SimpleNamespace(
+            inserted_count=0, upserted_count=len(operations), matched_count=0, modified_count=0
+        )
+
+    def find(self, query: dict, _projection: dict):
+        user_id = query.get("user_id") or query.get("$and", [{}])[0].get("user_id")
+        rows = [dict(row) for (owner, _), row in self.docs.items() if owner == user_id]
+        return _AsyncFakeCursor(rows)
+
+
+def test_async_event_repo_syncs_and_pages_one_users_events() -> None:
+    collection = _AsyncFakeCollection()
+    repo = AsyncCalendarEventRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_test",
+        collection=collection,
+        client_registry=AsyncMongoClientRegistry(),
+    )
+    events = [
+        {"event_id": f"evt-{index}", "task_id": f"task-{index}", "start_at": f"2026-03-0{index + 1}"}
+        for index in range(3)
+    ]
+
+    async def run():
+        await repo.sync_events(events, user_id="user-a")
+        await repo.sync_events(events[:1], user_id="user-b")
+        return await repo.page_events(limit=2, user_id="user-a")
+
+    page, next_cursor = asyncio.run(run())
+    assert [event["event_id"] for event in page] == ["evt-0", "evt-1"]
+    assert next_cursor is not None
+    assert len(collection.docs) == 4
+
+
+def test_async_registry_is_closed_with_aclose_all() -> None:
+    registry = AsyncMongoClientRegistry(max_pool_size=3)
+    client = registry.get("mongodb://localhost:27017")
+
+    assert registry.get("mongodb://localhost:27017") is client
+    assert not isinstance(registry, MongoClientRegistry)
+    assert not hasattr(registry, "close_all")
+
+    asyncio.run(registry.aclose_all())
+    assert registry.stats()["clients"] == 0
+
+
+class _AsyncScopedCursor:
+    def __init__(self, cursor) -> None:
+        self.cursor = cursor
+
+    def sort(self, keys: list):
+        self.cursor.sort(keys)
+        return self
+
+    def limit(self, value: int):
+        self.cursor.limit(value)
+        return self
+
+    async def to_list(self, length=None):
+        return list(self.cursor)
+
+
+class _AsyncScopedCollection:
+    """Serves the async driver API from a query-evaluating sync fake."""
+
+    def __init__(self, collection: _ScopedCollection) -> None:
+        self.sync = collection
+
+    def with_options(self, codec_options):
+        return self
+
+    def find(self, query: dict, projection: dict | None = None):
+        return _AsyncScopedCursor(self.sync.find(query, projection))
+
+    async def find_one(self, query: dict, projection: dict | None = None):
+        return self.sync.find_one(query, projection)
+
+    async def bulk_write(self, operations: list, ordered: bool = True):
+        return self.sync.bulk_write(operations, ordered=ordered)
+
+
+def _walk(fetch_page) -> list[tuple[list[str], str | None]]:
+    pages, cursor = [], None
+    while True:
+        rows, cursor = fetch_page(cursor)
+        pages.append(([row.id for row in rows], cursor))
+        if cursor is None:
+            return pages
+
+
+def test_async_job_repo_pages_exactly_like_the_sync_repo() -> None:
+    collection = _ScopedCollection()
+    repo = _repo(JobRepository, collection)
+    async_repo = _repo(AsyncJobRepository, _AsyncScopedCollection(collection))
+    jobs = [_job(f"job-{index}", "user-a", "Role") for index in range(5)]
+    asyncio.run(async_repo.upsert_jobs(jobs[:3]))
+    repo.upsert_jobs(jobs[3:])
+
+    sync_pages = _walk(lambda cursor: repo.page_jobs(limit=2, cursor=cursor, user_id="user-a"))
+    async_pages = _walk(
+        lambda cursor: asyncio.run(async_repo.page_jobs(limit=2, cursor=cursor, user_id="user-a"))
+    )
+
+    assert async_pages == sync_pages
+    assert sorted(job_id for ids, _ in sync_pages for job_id in ids) == [
+        f"job-{index}" for index in range(5)
+    ]
+
+
+def test_list_jobs_route_reads_through_the_async_job_repo() -> None:
+    collection = _ScopedCollection()
+    _repo(JobRepository, collection).upsert_jobs([_job("job-1", "demo-user", "Analyst")])
+    service = JobDiscoveryService(
+        job_repo=SimpleNamespace(),
+        async_job_repo=_repo(AsyncJobRepository, _AsyncScopedCollection(collection)),
+        model="gemini-test",
+        gemini_api_key="test",
+        enable_live=False,
+        serpapi_key="",
+    )
+    app.dependency_overrides[get_job_discovery_service] = lambda: service
+
+    response = TestClient(app).get("/api/v1/jobs")
+
+    assert response.status_code == 200
+    assert [job["title"] for job in response.json()["jobs"]] == ["Analyst"]
+
+
+def test_reschedule_reads_active_tasks_through_the_async_task_repo() -> None:
+    tasks = _ScopedCollection()
+    _repo(TaskRepository, tasks).upsert_tasks(
+        [_task("task-a", "user-a", "Essay"), _task("task-b", "user-b", "Lab")]
+    )
+    events = _ScopedCollection()
+    service = SchedulerService(
+        task_repo=SimpleNamespace(),
+        async_task_repo=_repo(AsyncTaskRepository, _AsyncScopedCollection(tasks)),
+        event_repo=_repo(CalendarEventRepository, events),
+        llm_provider=GeminiProvider(model="gemini-test", api_key="test", enable_live=False),
+    )
+
+    scheduled = asyncio.run(service.reschedule_async(user_id="user-a"))
+
+    assert [event["task_id"] for event in scheduled] == ["task-a"]
+    assert events.owners() == ["user-a"]
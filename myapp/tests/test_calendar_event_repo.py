@@ -0,0 +1,106 @@
+from datetime import UTC, datetime
+
+from pymongo import DeleteMany, InsertOne, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.models.persistence.calendar_event_repo import CalendarEventRepository
+
+
+class _FakeCollection:
+    def __init__(self) -> None:
+        self.docs: dict[str, dict] = {}
+        self.bulk_calls: list[list] = []
+        self.delete_all_calls = 0
+
+    def find(self, _query: dict, _projection: dict):
+        return [dict(row) for row in self.docs.values()]
+
+    def delete_many(self, _query: dict) -> None:
+        self.delete_all_calls += 1
+        self.docs.clear()
+
+    def bulk_write(self, operations: list, ordered: bool = True) -> None:
+        self.bulk_calls.append(operations)
+        for operation in operations:
+            if isinstance(operation, InsertOne):
+                if operation._doc["event_id"] in self.docs:
+                    raise DuplicateKeyError("E11000 duplicate key error")
+                self.docs[operation._doc["event_id"]] = dict(operation._doc)
+            elif isinstance(operation, UpdateOne):
+                event_id = operation._filter["event_id"]
+                if event_id not in self.docs:
+                    if not operation._upsert:
+                        continue
+                    self.docs[event_id] = dict(operation._doc.get("$setOnInsert", {}))
+                self.docs[event_id].update(operation._doc["$set"])
+            elif isinstance(operation, DeleteMany):
+                for event_id in operation._filter["event_id"]["$in"]:
+                    self.docs.pop(event_id, None)
+
+
+def _event(task_id: str, start_at: str) -> dict:
+    return {
+        "event_id": f"evt-{task_id}",
+        "task_id": task_id,
+        "title": f"Study {task_id}",
+        "start_at": start_at,
+        "end_at": start_at,
+        "source": "ai_scheduler",
+        "status": "scheduled",
+    }
+
+
+def test_replace_events_applies_only_the_diff_in_one_bulk_call() -> None:
+    fake_collection = _FakeCollection()
+    repo = CalendarEventRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_tasks_test",
+        collection=fake_collection,
+    )
+
+    first = [
+        _event("task-1", "2026-02-22T10:00:00Z"),
+        _event("task-2", "2026-02-22T12:00:00Z"),
+        _event("task-3", "2026-02-22T14:00:00Z"),
+    ]
+    assert repo.replace_events(first) == 3
+    created_at = fake_collection.docs["evt-task-1"]["created_at"]
+
+    second = [
+        _event("task-1", "2026-02-22T10:00:00Z"),
+        _event("task-2", "2026-02-22T13:00:00Z"),
+        _event("task-4", "2026-02-22T16:00:00Z"),
+    ]
+    result = repo.sync_events(second)
+
+    assert result == {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+    assert len(fake_collection.bulk_calls) == 2
+    assert fake_collection.delete_all_calls == 0
+    assert set(fake_collection.docs) == {"evt-task-1", "evt-task-2", "evt-task-4"}
+    assert fake_collection.docs["evt-task-2"]["start_at"] == datetime(2026, 2, 22, 13, tzinfo=UTC)
+    assert fake_collection.docs["evt-task-1"]["created_at"] == created_at
+
+    assert repo.replace_events(second) == 0
+    assert len(fake_collection.bulk_calls) == 2
+
+
+def test_concurrent_syncs_that_both_see_an_event_as_new_do_not_conflict() -> None:
+    fake_collection = _FakeCollection()
+    repo = CalendarEventRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_tasks_test",
+        collection=fake_collection,
+    )
+    events = [_event("task-1", "2026-02-22T10:00:00Z")]
+
+    # Both reschedules read the stored hashes before either writes.
+    first, _ = repo._diff_operations(events, {}, user_id="user-a")
+    second, result = repo._diff_operations(events, {}, user_id="user-a")
+    fake_collection.bulk_write(first, ordered=True)
+    created_at = fake_collection.docs["evt-task-1"]["created_at"]
+    fake_collection.bulk_write(second, ordered=True)
+
+    assert result["inserted"] == 1
+    assert set(fake_collection.docs) == {"evt-task-1"}
+    assert fake_collection.docs["evt-task-1"]["created_at"] == created_at
+    assert fake_collection.docs["evt-task-1"]["user_id"] == "user-a"
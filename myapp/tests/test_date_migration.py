@@ -0,0 +1,242 @@
+import json
+from datetime import UTC, datetime
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.models.domain.task import Task
+from app.models.persistence.migrations import (
+    IsoDateMigration,
+    SqliteIsoDateMigration,
+    SqliteUserIdBackfill,
+    UserIdBackfill,
+    _IsoDateMigration,
+)
+from app.models.persistence.sqlite_db import SqliteDatabase
+from app.models.persistence.sqlite_repos import SqliteTaskRepository
+
+
+class _FakeCursor:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+
+    def sort(self, keys: list):
+        for field, order in reversed(keys):
+            self.rows.sort(key=lambda row: row[field], reverse=order == -1)
+        return self
+
+    def limit(self, value: int):
+        self.rows = self.rows[:value]
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+def _matches(row: dict, query: dict) -> bool:
+    if "_id" in query and not row["_id"] > query["_id"]["$gt"]:
+        return False
+    return any(isinstance(row.get(field), str) for part in query["$or"] for field in part)
+
+
+class _FakeCollection:
+    def __init__(self, rows: list[dict] | None = None) -> None:
+        self.docs = {row["_id"]: dict(row) for row in rows or []}
+        self.bulk_calls = 0
+
+    def find(self, query: dict, _projection: dict | None = None):
+        return _FakeCursor([dict(row) for row in self.docs.values() if _matches(row, query)])
+
+    def bulk_write(self, operations: list, ordered: bool = True) -> None:
+        self.bulk_calls += 1
+        for operation in operations:
+            self.docs[operation._filter["_id"]].update(operation._doc["$set"])
+
+    def find_one(self, query: dict, _projection: dict | None = None):
+        row = self.docs.get(query["_id"])
+        return {key: value for key, value in row.items() if key != "_id"} if row else None
+
+    def replace_one(self, query: dict, doc: dict, upsert: bool = False) -> None:
+        self.docs[query["_id"]] = {"_id": query["_id"], **doc}
+
+    def delete_one(self, query: dict) -> None:
+        self.docs.pop(query["_id"], None)
+
+
+class _FakeTaskCollection(_FakeCollection):
+    """Rejects a second (user_id, task_id) pair like uq_user_task_id."""
+
+    def find(self, query: dict, _projection: dict | None = None):
+        after = query.get("_id", {}).get("$gt")
+        return _FakeCursor(
+            [
+                dict(row)
+                for row in self.docs.values()
+                if row.get("user_id") in query["user_id"]["$in"]
+                and (after is None or row["_id"] > after)
+            ]
+        )
+
+    def bulk_write(self, operations: list, ordered: bool = True) -> None:
+        self.bulk_calls += 1
+        errors = []
+        for index, operation in enumerate(operations):
+            row = self.docs[operation._filter["_id"]]
+            updated = {**row, **operation._doc["$set"]}
+            if any(
+                other["_id"] != row["_id"]
+                and other.get("user_id") == updated["user_id"]
+                and other["task_id"] == updated["task_id"]
+                for other in self.docs.values()
+            ):
+                errors.append({"index": index, "code": 11000, "errmsg": "E11000"})
+                continue
+            row.update(operation._doc["$set"])
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+def test_iso_date_migration_converts_in_resumable_batches() -> None:
+    tasks = _FakeCollection(
+        [
+            {"_id": 1, "due_at": "2026-03-01T09:00:00Z", "created_at": "2026-01-01T00:00:00+00:00"},
+            {"_id": 2, "due_at": "", "created_at": "2026-01-02T00:00:00+00:00"},
+            {"_id": 3, "due_at": "next tuesday"},
+            {"_id": 4, "due_at": datetime(2026, 4, 1, tzinfo=UTC)},
+            {"_id": 5, "due_at": "2026-05-01T12:30:00+01:00"},
+        ]
+    )
+    checkpoints = _FakeCollection()
+    migration = IsoDateMigration(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_tasks_test",
+        collection_name="tasks",
+        fields=("due_at", "created_at"),
+        mongodb=object(),
+        collection=tasks,
+        checkpoints=checkpoints,
+    )
+
+    assert migration.run(batch_size=2, max_batches=1) == {
+        "converted": 2,
+        "skipped": 0,
+        "done": False,
+    }
+    assert tasks.docs[1]["due_at"] == datetime(2026, 3, 1, 9, tzinfo=UTC)
+    assert tasks.docs[2]["due_at"] is None
+    assert tasks.docs[5]["due_at"] == "2026-05-01T12:30:00+01:00"
+
+    assert migration.run(batch_size=2) == {"converted": 3, "skipped": 1, "done": True}
+    assert tasks.docs[3]["due_at"] == "next tuesday"
+    assert tasks.docs[5]["due_at"] == datetime(2026, 5, 1, 11, 30, tzinfo=UTC)
+    assert tasks.bulk_calls == 2
+
+    assert migration.run(batch_size=2)["done"]
+    assert tasks.bulk_calls == 2
+    assert migration.run(batch_size=2, restart=True) == {
+        "converted": 0,
+        "skipped": 1,
+        "done": True,
+    }
+
+
+def test_sqlite_migration_normalizes_legacy_strings(tmp_path) -> None:
+    database = SqliteDatabase(tmp_path / "beacon.sqlite3")
+    try:
+        repo = SqliteTaskRepository(database)
+        repo.upsert_tasks(
+            [
+                Task(id="task-1", title="Essay", due_at="2026-03-01T09:00:00Z", user_id="a"),
+                Task(id="task-2", title="Lab", due_at="2026-03-02T09:00:00Z", user_id="a"),
+            ]
+        )
+        legacy = json.dumps({"due_at": "2026-02-01T10:00:00+01:00", "updated_at": ""})
+        database.connection().execute(
+            "UPDATE tasks SET doc = json_patch(doc, ?) WHERE key = ?", (legacy, "a\x1ftask-2")
+        )
+
+        migration = SqliteIsoDateMigration(repo.collection, repo.DATE_FIELDS)
+        assert migration.run(batch_size=1) == {"converted": 1, "skipped": 0, "done": True}
+
+        due = [task.due_at for task in repo.list_tasks(user_id="a")]
+        assert datetime(2026, 2, 1, 9, tzinfo=UTC) in due
+        raw = repo.collection.scan()
+        assert raw[1][1]["due_at"] == "2026-02-01T09:00:00.000000Z"
+        assert migration.run(restart=True)["converted"] == 0
+    finally:
+        database.close_all()
+
+
+def test_user_id_backfill_assigns_unscoped_rows_in_resumable_batches() -> None:
+    tasks = _FakeTaskCollection(
+        [
+            {"_id": 1, "task_id": "task-1"},
+            {"_id": 2, "task_id": "task-2", "user_id": None},
+            {"_id": 3, "task_id": "task-3", "user_id": "user-b"},
+            {"_id": 4, "task_id": "task-4", "user_id": ""},
+            {"_id": 5, "task_id": "task-1", "user_id": "demo-user"},
+        ]
+    )
+    backfill = UserIdBackfill(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_tasks_test",
+        collection_name="tasks",
+        user_id="demo-user",
+        mongodb=object(),
+        collection=tasks,
+        checkpoints=_FakeCollection(),
+    )
+
+    # Row 1 clashes with the scoped copy of task-1 written after the upgrade.
+    assert backfill.run(batch_size=2, max_batches=1) == {
+        "converted": 1,
+        "skipped": 1,
+        "done": False,
+    }
+    assert "user_id" not in tasks.docs[1]
+    assert tasks.docs[2]["user_id"] == "demo-user"
+
+    assert backfill.run(batch_size=2) == {"converted": 2, "skipped": 1, "done": True}
+    assert tasks.docs[3]["user_id"] == "user-b"
+    assert tasks.docs[4]["user_id"] == "demo-user"
+    assert tasks.bulk_calls == 2
+
+
+def test_sqlite_user_id_backfill_moves_legacy_rows_to_scoped_keys(tmp_path) -> None:
+    database = SqliteDatabase(tmp_path / "beacon.sqlite3")
+    try:
+        repo = SqliteTaskRepository(database)
+        repo.upsert_tasks([Task(id="task-2", title="Lab (new)", user_id="demo-user")])
+        # Rows from before user partitioning are keyed by task_id alone.
+        database.connection().executemany(
+            "INSERT INTO tasks (key, doc) VALUES (?, ?)",
+            [
+                (task_id, json.dumps({"task_id": task_id, "title": title}))
+                for task_id, title in [("task-1", "Essay"), ("task-2", "Lab")]
+            ],
+        )
+        assert repo.get_task("task-1", user_id="demo-user") is None
+
+        backfill = SqliteUserIdBackfill(repo.collection, "demo-user")
+        assert backfill.run(batch_size=1) == {"converted": 1, "skipped": 1, "done": True}
+
+        task = repo.get_task("task-1", user_id="demo-user")
+        assert task is not None and task.user_id == "demo-user"
+        assert repo.get_task("task-2", user_id="demo-user").title == "Lab (new)"
+        assert sorted(key for key, _ in repo.collection.scan()) == [
+            "demo-user\x1ftask-1",
+            "demo-user\x1ftask-2",
+            "task-2",
+        ]
+        assert backfill.run(restart=True) == {"converted": 0, "skipped": 1, "done": True}
+    finally:
+        database.close_all()
+
+
+def test_incomplete_migration_subclass_fails_when_created() -> None:
+    class _NoStorage(_IsoDateMigration):
+        def _next_batch(self, last_id: object, batch_size: int) -> list[tuple[object, dict]]:
+            return []
+
+    with pytest.raises(TypeError):
+        _NoStorage("tasks", ("due_at",))
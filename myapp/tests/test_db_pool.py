@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_mongo_client_registry
+from app.main import app
+from app.models.persistence.db import MongoClientRegistry, MongoDB, PoolWaitListener
+
+
+client = TestClient(app)
+
+
+def test_registry_shares_one_client_per_uri() -> None:
+    registry = MongoClientRegistry(max_pool_size=5, wait_queue_timeout_ms=250)
+    jobs = MongoDB("mongodb://localhost:27017", "beacon_test", "jobs", client_registry=registry)
+    tasks = MongoDB("mongodb://localhost:27017", "beacon_tasks_test", "tasks", client_registry=registry)
+
+    assert jobs.client is tasks.client
+    assert registry.stats()["clients"] == 1
+    assert jobs.client.options.pool_options.max_pool_size == 5
+    registry.close_all()
+    assert registry.stats()["clients"] == 0
+
+
+def test_pool_listener_tracks_checkout_wait_times() -> None:
+    listener = PoolWaitListener()
+    listener.connection_checked_out(SimpleNamespace(duration=0.004))
+    listener.connection_checked_out(SimpleNamespace(duration=0.010))
+    listener.connection_check_out_failed(SimpleNamespace(duration=0.250))
+
+    stats = listener.stats()
+    assert stats["checkouts"] == 2
+    assert stats["checkout_failures"] == 1
+    assert stats["max_wait_ms"] == 250.0
+    assert stats["avg_wait_ms"] == round(264.0 / 3, 3)
+
+
+def test_mongo_pool_endpoint_reports_registry_stats() -> None:
+    registry = MongoClientRegistry(max_pool_size=7)
+    app.dependency_overrides[get_mongo_client_registry] = lambda: registry
+
+    response = client.get("/api/v1/health/mongo-pool")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["max_pool_size"] == 7
+    assert body["pools"] == []
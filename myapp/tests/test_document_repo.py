@@ -0,0 +1,88 @@
+from app.models.persistence.db import MongoClientRegistry
+from app.models.persistence.document_repo import DocumentRepository
+from app.services.document_service import DocumentService
+
+
+class _FakeCursor:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+
+    def sort(self, _keys):
+        return self
+
+    def limit(self, value: int):
+        self.rows = self.rows[:value]
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class _FakeCollection:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.projections: list[dict] = []
+
+    def _project(self, row: dict, projection: dict) -> dict:
+        included = {key for key, value in projection.items() if value and key != "_id"}
+        return {key: value for key, value in row.items() if key in included}
+
+    def find(self, _query: dict, projection: dict):
+        self.projections.append(projection)
+        return _FakeCursor([self._project(row, projection) for row in self.rows])
+
+    def find_one(self, query: dict, projection: dict):
+        self.projections.append(projection)
+        for row in self.rows:
+            if row["doc_id"] == query["doc_id"]:
+                return self._project(row, projection)
+        return None
+
+
+def _build_repo(rows: list[dict]) -> tuple[DocumentRepository, _FakeCollection, MongoClientRegistry]:
+    collection = _FakeCollection(rows)
+    registry = MongoClientRegistry()
+    repo = DocumentRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_docs_test",
+        collection=collection,
+        client_registry=registry,
+    )
+    return repo, collection, registry
+
+
+def test_document_listing_omits_extracted_text_and_text_endpoint_slices() -> None:
+    row = {
+        "doc_id": "doc-1",
+        "doc_type": "lecture_note",
+        "user_id": "user-1",
+        "title": "Week 1",
+        "filename": "week1.pdf",
+        "content_type": "application/pdf",
+        "file_id": "abc",
+        "pages": 3,
+        "summary": "Intro",
+        "extracted_text": "0123456789",
+        "created_at": "2026-01-01T00:00:00Z",
+    }
+    repo, collection, registry = _build_repo([row])
+    try:
+        rows = repo.list_documents("lecture_note", "user-1")
+        assert rows[0]["title"] == "Week 1"
+        assert "extracted_text" not in rows[0]
+
+        service = DocumentService(
+            document_repo=repo,
+            default_user_id="user-1",
+            max_upload_mb=5,
+            model="gemini-test",
+            api_key="",
+            enable_live=False,
+        )
+        payload = service.get_document_text("doc-1", start=2, end=6)
+        assert payload["text"] == "2345"
+        assert payload["total_length"] == 10
+        assert service.get_document_text("doc-1", start=8)["text"] == "89"
+        assert collection.projections[-1] == {"_id": 0, "doc_id": 1, "extracted_text": 1}
+    finally:
+        registry.close_all()
@@ -0,0 +1,106 @@
+import random
+import time
+
+import pytest
+
+from app.services.llm.fake_gemini import (
+    FakeGeminiConfig,
+    FakeGeminiServer,
+    classify_prompt,
+    parse_latency,
+)
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.provider_gemini import GeminiProvider
+from app.services.socratic.agent import SocraticAgentService
+
+
+@pytest.fixture
+def fake_server():
+    servers: list[FakeGeminiServer] = []
+
+    def start(**config) -> FakeGeminiServer:
+        server = FakeGeminiServer(FakeGeminiConfig(seed=7, **config)).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def _gateway(server: FakeGeminiServer, **kwargs) -> LLMGateway:
+    return LLMGateway(api_key="fake", enable_live=True, base_url=server.base_url, **kwargs)
+
+
+def test_real_client_gets_schema_valid_replies_per_family(fake_server) -> None:
+    server = fake_server()
+    gateway = _gateway(server)
+    provider = GeminiProvider(model="gemini-1.5-pro", gateway=gateway)
+    agent = SocraticAgentService(model="gemini-1.5-pro", gateway=gateway)
+    tasks = [
+        {"id": "essay", "title": "Essay", "module": "History", "due_at": "2026-03-01T09:00:00Z"},
+        {"id": "lab", "title": "Lab", "module": "Physics", "due_at": "2026-03-02T09:00:00Z"},
+    ]
+
+    rated = provider.rate_tasks(tasks)
+    evaluation = agent.evaluate_answer("Recursion", "What is a base case?", "It stops the calls.")
+    career = agent.analyze_career_match("Graduate role using Python, SQL and Docker.")
+    integrity = agent.check_academic_integrity("Can you explain how recursion unwinds?")
+    question = agent.socratic_viva(topic="Recursion")
+
+    assert rated["fallback"] is False
+    assert {task["id"] for task in rated["rated_tasks"]} == {"essay", "lab"}
+    assert evaluation["fallback"] is False and 0 <= evaluation["score"] <= 100
+    assert career["fallback"] is False and "python" in career["technical_skills"]
+    assert integrity["is_acceptable"] is True
+    assert question["fallback"] is False and question["question"].endswith("?")
+    families = server.stats()["families"]
+    assert families["priority"] == 1 and families["evaluation"] == 1 and families["career"] == 1
+
+
+def test_streams_arrive_in_configured_chunks(fake_server) -> None:
+    server = fake_server(chunk_words=2)
+    gateway = _gateway(server)
+
+    chunks = list(gateway.stream_text("Say something", model="m", call_site="assistant"))
+
+    assert len(chunks) > 5
+    assert "".join(chunks).startswith("Here is a short plan")
+    assert server.stats()["streams"] == 1
+
+
+def test_injected_errors_exercise_retries_then_fallback(fake_server) -> None:
+    server = fake_server(error_rate=1.0, error_status=503)
+    gateway = _gateway(server, max_retries=1, backoff_base_seconds=0.0)
+    agent = SocraticAgentService(model="m", gateway=gateway)
+
+    result = agent.evaluate_answer("Recursion", "Why?", "Because.")
+
+    assert result["fallback"] is True
+    assert server.stats()["errors"] == 2
+    site = gateway.stats()["call_sites"]["socratic.evaluate"]
+    assert site["retries"] == 1 and site["errors"] == 1
+
+
+def test_slow_responses_hit_the_latency_budget(fake_server) -> None:
+    server = fake_server(latency="fixed:800")
+    gateway = _gateway(server, latency_budgets={"socratic.question": 0.1}, max_retries=0)
+    agent = SocraticAgentService(model="m", gateway=gateway)
+
+    started = time.monotonic()
+    result = agent.socratic_viva(topic="Recursion")
+
+    assert result["fallback"] is True
+    assert time.monotonic() - started < 0.6
+    assert gateway.stats()["call_sites"]["socratic.question"]["timeouts"] == 1
+
+
+def test_latency_specs_and_prompt_families() -> None:
+    rng = random.Random(1)
+    assert parse_latency("fixed:250")(rng) == 0.25
+    assert 0.1 <= parse_latency("uniform:100:200")(rng) <= 0.2
+    assert parse_latency("lognormal:300:0.4")(rng) > 0
+    with pytest.raises(ValueError):
+        parse_latency("gaussian:1")
+    assert classify_prompt("academic integrity officer ... Query: x") == "integrity"
+    assert classify_prompt("Summarize these lecture notes") == "text"
@@ -0,0 +1,118 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.services.llm.heuristic_scorer import HeuristicScorer, HeuristicWeights, score_band
+from app.services.llm.provider_gemini import GeminiProvider
+from app.utils.time import as_utc
+
+NOW = datetime(2026, 3, 2, 9, 30, tzinfo=UTC)
+
+
+def _loop_rate(tasks: list[dict], now: datetime, weights=(0.55, 0.35, 0.10)) -> list[dict]:
+    # The per-task formula the provider used before scoring moved to NumPy.
+    rated = []
+    for task in tasks:
+        # days_until() with a pinned clock.
+        due = as_utc(task.get("due_at")) if task.get("due_at") else None
+        days_left = int((due - now).total_seconds() // 86400) if due else 999
+        urgency = max(0, min(100, 100 - (days_left * 8)))
+        module_score = max(0, min(100, int(task.get("module_weight_percent", 0)) * 2))
+        effort_score = max(0, min(100, int(task.get("estimated_hours", 0)) * 9))
+        score = round(
+            (urgency * weights[0]) + (module_score * weights[1]) + (effort_score * weights[2])
+        )
+        rated.append(
+            {
+                "id": str(task.get("id", task.get("title", "task"))),
+                "title": str(task.get("title", "Untitled Task")),
+                "priority_score": score,
+                "priority_band": score_band(score),
+                "reason": f"Urgency={urgency}, Module={module_score}, Effort={effort_score}",
+            }
+        )
+    rated.sort(key=lambda item: item["priority_score"], reverse=True)
+    return rated
+
+
+def _random_tasks(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    tasks = []
+    for index in range(count):
+        due = NOW + timedelta(minutes=rng.randint(-5 * 1440, 30 * 1440))
+        task = {
+            "id": f"t{index}",
+            "title": f"Task {index}",
+            "module_weight_percent": rng.choice([0, 5, 10, 20, 35, 60, "15"]),
+            "estimated_hours": rng.choice([0, 1, 2, 3.7, 5, 12]),
+        }
+        roll = rng.random()
+        if roll < 0.4:
+            task["due_at"] = due.isoformat().replace("+00:00", "Z")
+        elif roll < 0.8:
+            task["due_at"] = due
+        elif roll < 0.9:
+            task["due_at"] = None
+        tasks.append(task)
+    return tasks
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_matches_per_task_formula(seed: int) -> None:
+    tasks = _random_tasks(400, seed)
+    assert HeuristicScorer().rate(tasks, now=NOW) == _loop_rate(tasks, NOW)
+
+
+def test_top_k_is_the_sorted_prefix_with_ties_in_input_order() -> None:
+    tasks = _random_tasks(300, 9)
+    expected = _loop_rate(tasks, NOW)
+    scorer = HeuristicScorer()
+
+    for top_k in (0, 1, 7, 50, 299, 300, 1000):
+        assert scorer.rate(tasks, top_k=top_k, now=NOW) == expected[:top_k]
+
+    tied = [{"id": f"same-{index}", "module_weight_percent": 10} for index in range(6)]
+    assert [row["id"] for row in scorer.rate(tied, top_k=3, now=NOW)] == [
+        "same-0",
+        "same-1",
+        "same-2",
+    ]
+
+
+def test_custom_weights_and_edge_values() -> None:
+    tasks = [
+        {"title": "Overdue", "due_at": NOW - timedelta(days=3), "estimated_hours": 1},
+        {"title": "Heavy module", "module_weight_percent": 80},
+        {"title": "Bad date", "due_at": "not a date", "estimated_hours": 20},
+        {"due_at": "2026-03-04T09:30:00"},
+    ]
+    weights = HeuristicWeights(urgency=0.2, module=0.7, effort=0.1)
+    rated = HeuristicScorer(weights).rate(tasks, now=NOW)
+
+    assert rated == _loop_rate(tasks, NOW, weights=(0.2, 0.7, 0.1))
+    assert [row["title"] for row in rated] == ["Heavy module", "Overdue", "Untitled Task", "Bad date"]
+    assert [row["priority_score"] for row in rated] == [70, 21, 17, 10]
+    assert HeuristicScorer().rate([], now=NOW) == []
+
+
+def test_invalid_numbers_raise_like_the_loop() -> None:
+    with pytest.raises(ValueError):
+        HeuristicScorer().rate([{"estimated_hours": "a few"}], now=NOW)
+
+
+def test_provider_fills_unrated_tasks_with_heuristic_scores() -> None:
+    provider = GeminiProvider(model="test-model")
+    tasks = [
+        {"id": "a", "title": "A", "module_weight_percent": 50},
+        {"id": "b", "title": "B", "module_weight_percent": 10},
+    ]
+
+    normalized = provider._normalize_rated_tasks(
+        {"rated_tasks": [{"id": "b", "priority_score": 99}]}, tasks
+    )
+
+    assert [row["id"] for row in normalized["rated_tasks"]] == ["b", "a"]
+    assert normalized["rated_tasks"][1]["reason"] == "Urgency=0, Module=100, Effort=0"
+    assert normalized["heuristic_ids"] == ["a"]
+    assert provider._heuristic_rate(tasks, top_k=1)[0]["id"] == "a"
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+import time
+from dataclasses import replace
+from types import SimpleNamespace
+
+import app.main as main
+from app.models.persistence.indexes import IndexManager, diff_indexes
+from app.models.persistence.job_repo import JobRepository
+from app.models.persistence.llm_cache_repo import LLMCacheRepository
+
+
+class _FakeIndexCollection:
+    def __init__(self, existing: list[dict]) -> None:
+        self.existing = existing
+        self.list_calls = 0
+        self.created: list[list[str]] = []
+        self.dropped: list[str] = []
+
+    def list_indexes(self):
+        self.list_calls += 1
+        return iter(self.existing)
+
+    def create_indexes(self, models: list) -> None:
+        self.created.append([model.document["name"] for model in models])
+
+    def drop_index(self, name: str) -> None:
+        self.dropped.append(name)
+
+
+class _FakeRegistry:
+    def __init__(self, collection: _FakeIndexCollection) -> None:
+        self.collection = collection
+
+    def get(self, _mongo_uri: str):
+        return {"beacon_test": {"jobs": self.collection}}
+
+
+def test_diff_indexes_only_reports_missing_or_changed_specs() -> None:
+    existing = [
+        {"name": "_id_", "key": {"_id": 1}},
+        {"name": "uq_user_job_id", "key": {"user_id": 1, "job_id": 1}, "unique": True},
+        {"name": "idx_created_at_asc", "key": {"created_at": -1}},
+        {"name": "legacy_discovered_at", "key": {"discovered_at": 1}},
+    ]
+    create, rebuild, satisfied = diff_indexes(existing, JobRepository.INDEXES)
+
+    assert [spec["options"]["name"] for spec in rebuild] == ["idx_created_at_asc"]
+    assert "uq_user_job_id" in satisfied
+    assert "idx_discovered_at_asc" in satisfied
+    assert [spec["options"]["name"] for spec in create] == [
+        "idx_job_id_asc",
+        "uq_user_source_url",
+        "idx_updated_at_asc",
+        "idx_created_at_job_id_desc",
+        "idx_user_created_at_job_id_desc",
+    ]
+
+
+def test_index_manager_lists_once_and_creates_in_one_call() -> None:
+    collection = _FakeIndexCollection(
+        [{"name": "uq_job_id", "key": {"job_id": 1}, "unique": True}]
+    )
+    manager = IndexManager(
+        mongo_uri="mongodb://localhost:27017",
+        client_registry=_FakeRegistry(collection),
+    )
+    manager.register("beacon_test", "jobs", JobRepository.INDEXES, JobRepository.RETIRED_INDEXES)
+
+    plans = manager.apply()
+    assert collection.list_calls == 1
+    assert len(collection.created) == 1
+    assert "uq_job_id" not in collection.created[0]
+    # The retired global unique index must not satisfy the non-unique job_id lookup index.
+    assert "idx_job_id_asc" in collection.created[0]
+    assert collection.dropped == ["uq_job_id"]
+    assert plans[0].changed
+    assert plans[0].summary()["drop"] == ["uq_job_id"]
+
+
+def test_same_keys_with_other_options_are_rebuilt_not_satisfied() -> None:
+    # A plain index on expires_at must not stand in for the TTL index.
+    collection = _FakeIndexCollection(
+        [
+            {"name": "_id_", "key": {"_id": 1}},
+            {"name": "expires_at_1", "key": {"expires_at": 1}},
+        ]
+    )
+    manager = IndexManager(
+        mongo_uri="mongodb://localhost:27017",
+        client_registry=_FakeRegistry(collection),
+    )
+    manager.register("beacon_test", "jobs", LLMCacheRepository.INDEXES)
+
+    plan = manager.plan()[0]
+    assert plan.summary()["rebuild"] == ["ttl_expires_at"]
+    assert "ttl_expires_at" not in plan.satisfied
+
+    manager.apply(allow_rebuild=False)
+    assert collection.dropped == []
+
+    manager.apply(allow_rebuild=True)
+    assert collection.dropped == ["expires_at_1"]
+    assert "ttl_expires_at" in collection.created[-1]
+
+
+def test_apply_stops_between_collections_once_asked() -> None:
+    collection = _FakeIndexCollection([])
+    manager = IndexManager(
+        mongo_uri="mongodb://localhost:27017",
+        client_registry=_FakeRegistry(collection),
+    )
+    manager.register("beacon_test", "jobs", JobRepository.INDEXES)
+    stop = threading.Event()
+    stop.set()
+
+    manager.apply(stop=stop)
+    assert collection.created == []
+
+
+def test_drop_retired_only_drops_retired_indexes() -> None:
+    collection = _FakeIndexCollection(
+        [
+            {"name": "_id_", "key": {"_id": 1}},
+            {"name": "uq_job_id", "key": {"job_id": 1}, "unique": True},
+            {"name": "uq_user_job_id", "key": {"user_id": 1, "job_id": 1}, "unique": True},
+        ]
+    )
+    manager = IndexManager(
+        mongo_uri="mongodb://localhost:27017",
+        client_registry=_FakeRegistry(collection),
+    )
+    manager.register("beacon_test", "jobs", JobRepository.INDEXES, JobRepository.RETIRED_INDEXES)
+
+    assert manager.drop_retired() == {"beacon_test.jobs": ["uq_job_id"]}
+    assert collection.dropped == ["uq_job_id"]
+    assert collection.created == []
+
+
+def test_startup_backfills_and_drops_retired_indexes_before_serving(monkeypatch) -> None:
+    events: list[str] = []
+
+    def slow_sync(stop: threading.Event) -> None:
+        time.sleep(0.05)
+        events.append("synced")
+
+    class _Registry:
+        def close_all(self) -> None:
+            events.append("closed")
+
+    class _AsyncRegistry:
+        async def aclose_all(self) -> None:
+            events.append("async closed")
+
+    settings = replace(
+        main.settings,
+        storage_backend="mongo",
+        mongo_uri="mongodb://localhost:27017",
+        gemini_api_key="test",
+        mongo_index_sync_on_startup=True,
+    )
+    monkeypatch.setattr(main, "settings", settings)
+    monkeypatch.setattr(main, "_backfill_user_ids", lambda: events.append("backfilled"))
+    monkeypatch.setattr(main, "_drop_retired_indexes", lambda: events.append("dropped"))
+    monkeypatch.setattr(main, "_sync_indexes", slow_sync)
+    monkeypatch.setattr(
+        main, "get_llm_gateway", lambda: SimpleNamespace(close=lambda: events.append("llm closed"))
+    )
+    monkeypatch.setattr(main, "get_mongo_client_registry", lambda: _Registry())
+    monkeypatch.setattr(main, "get_async_mongo_client_registry", lambda: _AsyncRegistry())
+
+    async def run() -> None:
+        async with main.lifespan(main.app):
+            events.append("serving")
+
+    asyncio.run(run())
+    # Shutdown still waits for the background index build before closing the clients.
+    assert events == [
+        "backfilled",
+        "dropped",
+        "serving",
+        "llm closed",
+        "synced",
+        "closed",
+        "async closed",
+    ]
@@ -26,6 +26,14 @@ class FakeSchedulerService:
             }
         ]
 
+    def page_events(self, start_at=None, end_at=None, limit=500, cursor=None, user_id=None):
+        return self.list_events(start_at=start_at, end_at=end_at), None
+
+    async def page_events_async(
+        self, start_at=None, end_at=None, limit=500, cursor=None, user_id=None
+    ):
+        return self.page_events(start_at=start_at, end_at=end_at, limit=limit, cursor=cursor)
+
     def add_task(self, **kwargs):
         task = type(
             "Task",
@@ -41,7 +49,7 @@ class FakeSchedulerService:
         )
         return task, self.list_events()
 
-    def patch_task(self, task_id, patch):
+    def patch_task(self, task_id, patch, user_id=None):
         task = type(
             "Task",
             (),
@@ -56,7 +64,7 @@ class FakeSchedulerService:
         )
         return task, self.list_events()
 
-    def reschedule(self):
+    def reschedule(self, user_id=None):
         return self.list_events()
 
 
@@ -101,6 +109,14 @@ class FakeDocumentService:
     def list_academic_reports(self, user_id):
         return [self.upload_academic_report({"filename": "report.pdf", "title": "Report"})]
 
+    def page_documents(self, doc_type, user_id, limit=200, cursor=None):
+        if doc_type == "lecture_note":
+            return self.list_lecture_notes(user_id), None
+        return self.list_academic_reports(user_id), None
+
+    async def page_documents_async(self, doc_type, user_id, limit=200, cursor=None):
+        return self.page_documents(doc_type, user_id, limit=limit, cursor=cursor)
+
     def download_document(self, doc_id):
         return {
             "filename": "file.pdf",
@@ -108,9 +124,12 @@ class FakeDocumentService:
             "data_base64": "ZmFrZQ==",
         }
 
+    async def download_document_async(self, doc_id):
+        return self.download_document(doc_id)
+
 
 class FakeAssistantService:
-    def chat(self, conversation_id, message, context_page):
+    def chat(self, conversation_id, message, context_page, user_id=None):
         return {
             "conversation_id": conversation_id,
             "reply": f"Echo: {message}",
@@ -120,7 +139,7 @@ class FakeAssistantService:
 
 
 class FakeJobDiscoveryService:
-    def discover(self, query, location, limit):
+    def discover(self, query, location, limit, user_id=None):
         return {
             "query": query,
             "location": location,
@@ -146,12 +165,13 @@ class FakeJobDiscoveryService:
             "last_refreshed_at": "2026-02-22T00:00:00Z",
         }
 
-    def list_jobs(self, auto_refresh=True):
+    def list_jobs(self, auto_refresh=True, limit=200, cursor=None, user_id=None):
         payload = self.discover("software engineer internship", "London", 10)
         return {
             "count": len(payload["jobs"]),
             "jobs": payload["jobs"],
             "last_refreshed_at": payload["last_refreshed_at"],
+            "next_cursor": None,
         }
 
 
@@ -217,3 +237,13 @@ def test_jobs_discover_endpoint() -> None:
     assert body["jobs_added"] == 1
     assert len(body["jobs"]) == 1
     app.dependency_overrides.pop(get_job_discovery_service, None)
+
+
+def test_scheduler_events_endpoint_returns_next_cursor() -> None:
+    app.dependency_overrides[get_scheduler_service] = lambda: FakeSchedulerService()
+    response = client.get("/api/v1/scheduler/events", params={"limit": 10})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 1
+    assert body["next_cursor"] is None
+    app.dependency_overrides.pop(get_scheduler_service, None)
@@ -1,3 +1,10 @@
+from types import SimpleNamespace
+
+import bson
+import pytest
+from bson.raw_bson import RawBSONDocument
+from pymongo.errors import BulkWriteError
+
 from app.models.domain.job import Job
 from app.models.persistence.job_repo import JobRepository
 
@@ -6,9 +13,10 @@ class _FakeCursor:
     def __init__(self, rows: list[dict]) -> None:
         self.rows = rows
 
-    def sort(self, key: str, direction: int):
-        reverse = direction == -1
-        self.rows.sort(key=lambda row: row.get(key, ""), reverse=reverse)
+    def sort(self, key, direction: int = 1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field, order in reversed(keys):
+            self.rows.sort(key=lambda row: row.get(field) or "", reverse=order == -1)
         return self
 
     def limit(self, value: int):
@@ -34,10 +42,53 @@ class _FakeCollection:
         existing.update(update.get("$set", {}))
         self.docs[job_id] = existing
 
+    def bulk_write(self, operations: list, ordered: bool = True):
+        inserted = matched = modified = 0
+        for operation in operations:
+            query = operation._filter
+            update = operation._doc
+            existing = self.docs.get(query["job_id"])
+            before = dict(existing) if existing is not None else None
+            self.update_one(query, update, upsert=operation._upsert)
+            if before is None:
+                inserted += 1
+            else:
+                matched += 1
+                if self.docs[query["job_id"]] != before:
+                    modified += 1
+        return SimpleNamespace(
+            inserted_count=0,
+            upserted_count=inserted,
+            matched_count=matched,
+            modified_count=modified,
+        )
+
     def find(self, _query: dict, _projection: dict):
         rows = [dict(row) for row in self.docs.values()]
         return _FakeCursor(rows)
 
+    def with_options(self, codec_options):
+        return _FakeRawView(self, codec_options)
+
+
+class _FakeRawView:
+    def __init__(self, collection: _FakeCollection, codec_options) -> None:
+        self.collection = collection
+        self.codec_options = codec_options
+        self.projections: list[dict] = []
+
+    def find(self, _query: dict, projection: dict):
+        self.projections.append(projection)
+        fields = [field for field, included in projection.items() if included]
+        rows = [
+            RawBSONDocument(
+                bson.encode({field: row[field] for field in fields if field in row}),
+                self.codec_options,
+            )
+            for row in self.collection.docs.values()
+        ]
+        return _FakeCursor(rows)
+
 
 
 def test_job_repo_upsert_and_list_are_deterministic() -> None:
@@ -85,3 +136,140 @@ def test_job_repo_upsert_and_list_are_deterministic() -> None:
     assert len(by_id) == 2
     assert by_id["job-1"].title == "Math Updated"
     assert by_id["job-1"].module_weight_percent == 45
+
+
+def test_job_repo_bulk_upsert_batches_and_reports_real_counts() -> None:
+    fake_collection = _FakeCollection()
+    batches: list[int] = []
+    original_bulk_write = fake_collection.bulk_write
+
+    def tracking_bulk_write(operations: list, ordered: bool = True):
+        assert ordered is False
+        batches.append(len(operations))
+        return original_bulk_write(operations, ordered=ordered)
+
+    fake_collection.bulk_write = tracking_bulk_write
+    repo = JobRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_test",
+        collection=fake_collection,
+        bulk_batch_size=2,
+    )
+
+    jobs = [
+        Job(
+            id=f"job-{index}",
+            title=f"Role {index}",
+            module="Career",
+            due_at=None,
+            module_weight_percent=30,
+            estimated_hours=4,
+        )
+        for index in range(5)
+    ]
+    first = repo.bulk_upsert_jobs(jobs)
+    assert batches == [2, 2, 1]
+    assert (first.inserted, first.matched) == (5, 0)
+
+    changed = Job(
+        id="job-0",
+        title="Role 0 (updated)",
+        module="Career",
+        due_at=None,
+        module_weight_percent=30,
+        estimated_hours=4,
+    )
+    second = repo.bulk_upsert_jobs([jobs[1], changed, changed])
+    assert (second.inserted, second.matched) == (0, 2)
+    assert fake_collection.docs["job-0"]["title"] == "Role 0 (updated)"
+
+
+
+def test_job_repo_bulk_upsert_reports_partial_writes_of_a_failed_batch() -> None:
+    fake_collection = _FakeCollection()
+    original_bulk_write = fake_collection.bulk_write
+
+    def failing_bulk_write(operations: list, ordered: bool = True):
+        if fake_collection.docs:
+            original_bulk_write(operations[:1], ordered=ordered)
+            raise BulkWriteError(
+                {
+                    "nInserted": 0,
+                    "nUpserted": 1,
+                    "nMatched": 0,
+                    "nModified": 0,
+                    "writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}],
+                }
+            )
+        return original_bulk_write(operations, ordered=ordered)
+
+    fake_collection.bulk_write = failing_bulk_write
+    repo = JobRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_test",
+        collection=fake_collection,
+        bulk_batch_size=2,
+    )
+    jobs = [
+        Job(
+            id=f"job-{index}",
+            title=f"Role {index}",
+            module="Career",
+            due_at=None,
+            module_weight_percent=30,
+            estimated_hours=4,
+        )
+        for index in range(4)
+    ]
+
+    with pytest.raises(BulkWriteError) as raised:
+        repo.bulk_upsert_jobs(jobs)
+
+    result = raised.value.upsert_result
+    assert (result.inserted, result.matched, result.modified) == (3, 0, 0)
+    assert sorted(fake_collection.docs) == ["job-0", "job-1", "job-2"]
+
+def test_job_field_reads_return_projected_raw_documents() -> None:
+    fake_collection = _FakeCollection()
+    views: list[_FakeRawView] = []
+    original_with_options = fake_collection.with_options
+
+    def tracking_with_options(codec_options):
+        views.append(original_with_options(codec_options))
+        return views[-1]
+
+    fake_collection.with_options = tracking_with_options
+    repo = JobRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_test",
+        collection=fake_collection,
+    )
+    repo.upsert_jobs(
+        [
+            Job(
+                id=f"job-{index}",
+                title=f"Role {index}",
+                module="Career",
+                due_at="2026-03-01T09:00:00Z",
+                module_weight_percent=30,
+                estimated_hours=4,
+                notes="long description " * 50,
+            )
+            for index in range(3)
+        ]
+    )
+
+    rows, cursor = repo.page_job_fields(("title", "due_at"), limit=2)
+
+    assert views[0].projections == [
+        {"_id": 0, "created_at": 1, "job_id": 1, "title": 1, "due_at": 1}
+    ]
+    assert cursor is not None
+    assert all(isinstance(row, RawBSONDocument) for row in rows)
+    assert set(rows[0]) == {"created_at", "job_id", "title", "due_at"}
+    assert rows[0]["due_at"].tzinfo is not None
+    assert {row["job_id"] for row in repo.list_job_fields(("job_id",))} == {
+        "job-0",
+        "job-1",
+        "job-2",
+    }
@@ -0,0 +1,115 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+from app.models.persistence.sqlite_db import SqliteDatabase
+from app.models.persistence.sqlite_repos import SqliteLLMCacheRepository
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.response_cache import LLMResponseCache, response_cache_key
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = datetime(2026, 6, 1, tzinfo=UTC)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class _CountingModels:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate_content(self, model: str, contents: str, config: dict):
+        self.calls += 1
+        return SimpleNamespace(text=f"answer {self.calls}")
+
+
+class _BrokenStore:
+    def get_entry(self, cache_key, now=None):
+        raise ConnectionError("mongo is down")
+
+    def put_entry(self, cache_key, call_site, text, expires_at):
+        raise ConnectionError("mongo is down")
+
+
+def test_cache_key_covers_model_temperature_and_schema() -> None:
+    base = response_cache_key("gemini", "prompt", 0.1, "career")
+    assert base == response_cache_key("gemini", "prompt", 0.10000001, "career")
+    assert base != response_cache_key("gemini", "prompt", 0.2, "career")
+    assert base != response_cache_key("gemini", "prompt", 0.1, "")
+    assert base != response_cache_key("other", "prompt", 0.1, "career")
+
+
+def test_memory_tier_evicts_by_count_bytes_and_ttl() -> None:
+    clock = _Clock()
+    cache = LLMResponseCache(ttl_seconds=60, max_entries=2, max_bytes=10, clock=clock)
+
+    cache.put("a", "site", "aaaa")
+    cache.put("b", "site", "bbbb")
+    assert cache.get("a", "site") == "aaaa"
+    cache.put("c", "site", "cccc")
+    # "b" was least recently used; 12 bytes would also exceed the byte cap.
+    assert cache.get("b", "site") is None
+    assert cache.stats()["bytes"] == 8
+
+    clock.now += timedelta(seconds=61)
+    assert cache.get("a", "site") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["call_sites"]["site"]["memory_hits"] == 1
+    assert stats["call_sites"]["site"]["misses"] == 2
+
+
+def test_gateway_serves_opted_in_sites_from_cache() -> None:
+    models = _CountingModels()
+    gateway = LLMGateway(
+        enable_live=True,
+        client=SimpleNamespace(models=models),
+        cache=LLMResponseCache(),
+        cache_sites=["socratic.integrity"],
+    )
+
+    first = gateway.generate_text("q", model="m", call_site="socratic.integrity", temperature=0.1)
+    second = gateway.generate_text("q", model="m", call_site="socratic.integrity", temperature=0.1)
+    assert first == second == "answer 1"
+    gateway.generate_text("q", model="m", call_site="socratic.integrity", temperature=0.4)
+    gateway.generate_text("q", model="m", call_site="socratic.question", temperature=0.1)
+    gateway.generate_text("q", model="m", call_site="socratic.question", temperature=0.1)
+    assert models.calls == 4
+
+    stats = gateway.stats()
+    assert stats["cached_sites"] == ["socratic.integrity"]
+    assert stats["call_sites"]["socratic.integrity"]["calls"] == 2
+    assert stats["cache"]["call_sites"]["socratic.integrity"]["hit_ratio"] == round(1 / 3, 4)
+    assert "socratic.question" not in stats["cache"]["call_sites"]
+
+
+def test_sqlite_store_is_shared_across_processes_and_pruned(tmp_path) -> None:
+    database = SqliteDatabase(tmp_path / "beacon.sqlite3")
+    try:
+        store = SqliteLLMCacheRepository(database)
+        clock = _Clock()
+        warm = LLMResponseCache(store=store, ttl_seconds=60, clock=clock)
+        warm.put("k1", "documents.highlights", "one")
+        warm.put("k2", "documents.highlights", "two")
+
+        cold = LLMResponseCache(store=store, ttl_seconds=60, clock=clock)
+        assert cold.get("k1", "documents.highlights") == "one"
+        assert cold.get("k1", "documents.highlights") == "one"
+        site = cold.stats()["call_sites"]["documents.highlights"]
+        assert (site["store_hits"], site["memory_hits"]) == (1, 1)
+
+        assert store.get_entry("k2", now=clock.now + timedelta(seconds=61)) is None
+        assert store.prune(max_entries=1, now=clock.now) == 1
+        assert store.prune(max_entries=1, now=clock.now + timedelta(seconds=61)) == 1
+        assert store.collection.find() == []
+    finally:
+        database.close_all()
+
+
+def test_store_failures_degrade_to_misses() -> None:
+    cache = LLMResponseCache(store=_BrokenStore())
+    cache.put("k", "site", "value")
+    assert cache.get("k", "site") == "value"
+    assert cache.get("other", "site") is None
+    assert cache.stats()["store_errors"] == 2
@@ -0,0 +1,143 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from google.genai import errors as genai_errors
+
+from app.core.dependencies import get_llm_gateway
+from app.main import app
+from app.services.llm.gateway import LLMGateway, LLMTimeoutError, LLMUnavailableError
+from app.services.llm.provider_gemini import GeminiProvider
+from app.services.socratic.agent import SocraticAgentService
+
+
+client = TestClient(app)
+
+
+class _FakeModels:
+    def __init__(self, outcomes: list) -> None:
+        self.outcomes = outcomes
+        self.calls: list[dict] = []
+
+    def generate_content(self, model: str, contents: str, config: dict):
+        self.calls.append({"model": model, "contents": contents, "config": config})
+        outcome = self.outcomes.pop(0)
+        if callable(outcome):
+            outcome = outcome()
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(text=outcome)
+
+
+def _gateway(outcomes: list, **kwargs) -> tuple[LLMGateway, _FakeModels, list[float]]:
+    models = _FakeModels(outcomes)
+    sleeps: list[float] = []
+    gateway = LLMGateway(
+        enable_live=True,
+        client=SimpleNamespace(models=models),
+        sleep=sleeps.append,
+        jitter=lambda: 0.5,
+        **kwargs,
+    )
+    return gateway, models, sleeps
+
+
+def _server_error() -> genai_errors.APIError:
+    return genai_errors.ServerError(503, {"error": {"message": "overloaded", "status": "UNAVAILABLE"}})
+
+
+def test_gateway_retries_transient_errors_with_jittered_backoff() -> None:
+    gateway, models, sleeps = _gateway(
+        [_server_error(), TimeoutError("read timed out"), "  ok  "],
+        backoff_base_seconds=0.2,
+    )
+
+    assert gateway.generate_text("hi", model="gemini-test", call_site="assistant") == "ok"
+    assert sleeps == [0.1, 0.2]
+    assert models.calls[0]["config"]["temperature"] == 0.2
+    assert 0 < models.calls[0]["config"]["http_options"]["timeout"] <= 30_000
+
+    stats = gateway.stats()["call_sites"]["assistant"]
+    assert stats["calls"] == 1
+    assert stats["retries"] == 2
+    assert stats["errors"] == 0
+
+
+def test_gateway_does_not_retry_client_errors_and_records_them() -> None:
+    bad_request = genai_errors.ClientError(400, {"error": {"message": "bad prompt"}})
+    gateway, models, sleeps = _gateway([bad_request, "unused"])
+
+    with pytest.raises(genai_errors.ClientError):
+        gateway.generate_text("hi", model="gemini-test", call_site="documents")
+
+    assert len(models.calls) == 1
+    assert sleeps == []
+    stats = gateway.stats()["call_sites"]["documents"]
+    assert stats["errors"] == 1
+    assert stats["last_error"].startswith("ClientError")
+
+
+def test_gateway_per_site_limit_times_out_waiting_callers() -> None:
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow() -> str:
+        started.set()
+        release.wait(2)
+        return "slow"
+
+    gateway, _, _ = _gateway([slow, "fast"], per_site_concurrency=1)
+    worker = threading.Thread(
+        target=gateway.generate_text, args=("a",), kwargs={"model": "m", "call_site": "jobs"}
+    )
+    worker.start()
+    started.wait(2)
+
+    with pytest.raises(LLMTimeoutError):
+        gateway.generate_text("b", model="m", call_site="jobs", timeout_seconds=0.05)
+    # A different call site still has its own slot.
+    assert gateway.generate_text("c", model="m", call_site="socratic") == "fast"
+
+    release.set()
+    worker.join(2)
+    stats = gateway.stats()["call_sites"]
+    assert stats["jobs"]["timeouts"] == 1
+    assert stats["jobs"]["calls"] == 2
+    assert stats["jobs"]["in_flight"] == 0
+
+
+def test_services_share_one_gateway() -> None:
+    gateway, models, _ = _gateway(['{"summary": "ranked", "rated_tasks": []}', "Why?"])
+    provider = GeminiProvider(model="gemini-test", gateway=gateway)
+    agent = SocraticAgentService(model="gemini-test", gateway=gateway)
+
+    assert provider.enable_live and agent.enable_live
+    assert provider._call_live_model("rank", temperature=0.1)["summary"] == "ranked"
+    assert agent._generate_text("ask", temperature=0.4) == "Why?"
+    assert [call["config"]["temperature"] for call in models.calls] == [0.1, 0.4]
+    assert set(gateway.stats()["call_sites"]) == {"llm.rate", "socratic"}
+
+
+def test_disabled_gateway_raises_without_client() -> None:
+    gateway = LLMGateway(api_key="", enable_live=True)
+    assert gateway.client is None
+    with pytest.raises(LLMUnavailableError):
+        gateway.generate_text("hi", model="m", call_site="assistant")
+
+
+def test_llm_health_endpoint_reports_gateway_stats() -> None:
+    gateway, _, _ = _gateway(["ok"], max_concurrency=3, per_site_concurrency=2)
+    gateway.generate_text("hi", model="m", call_site="assistant")
+    app.dependency_overrides[get_llm_gateway] = lambda: gateway
+    try:
+        response = client.get("/api/v1/health/llm")
+    finally:
+        app.dependency_overrides.pop(get_llm_gateway, None)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["live"] is True
+    assert body["max_concurrency"] == 3
+    assert body["call_sites"]["assistant"]["calls"] == 1
+    assert body["call_sites"]["assistant"]["concurrency_limit"] == 2
@@ -0,0 +1,169 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from google.genai import errors as genai_errors
+
+from app.core.config import DEFAULT_LLM_LATENCY_BUDGETS_MS, _parse_budgets
+from app.services.llm.circuit_breaker import CircuitBreaker
+from app.services.llm.gateway import LLMCircuitOpenError, LLMGateway
+from app.services.llm.provider_gemini import GeminiProvider
+from app.services.socratic.agent import SocraticAgentService
+
+
+class _Models:
+    def __init__(self, outcome) -> None:
+        self.outcome = outcome
+        self.release = threading.Event()
+        self.calls = 0
+
+    def generate_content(self, model: str, contents: str, config: dict):
+        self.calls += 1
+        if self.outcome == "hang":
+            self.release.wait(2)
+            return SimpleNamespace(text="too late")
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return SimpleNamespace(text=self.outcome)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _overloaded() -> genai_errors.APIError:
+    return genai_errors.ServerError(503, {"error": {"message": "overloaded"}})
+
+
+def test_missed_budget_returns_the_heuristic_without_waiting() -> None:
+    models = _Models("hang")
+    gateway = LLMGateway(
+        enable_live=True,
+        client=SimpleNamespace(models=models),
+        latency_budgets={"socratic.question": 0.05},
+    )
+    agent = SocraticAgentService(model="gemini-test", gateway=gateway)
+
+    started = time.monotonic()
+    result = agent.socratic_viva(topic="Recursion")
+    elapsed = time.monotonic() - started
+    models.release.set()
+
+    assert result["fallback"] is True
+    assert elapsed < 1.0
+    site = gateway.stats()["call_sites"]["socratic.question"]
+    assert site["timeouts"] == 1
+    assert gateway.stats()["latency_budgets"] == {"socratic.question": 0.05}
+
+
+def test_abandoned_call_keeps_its_slot_until_the_worker_is_free() -> None:
+    models = _Models("hang")
+    gateway = LLMGateway(
+        enable_live=True,
+        client=SimpleNamespace(models=models),
+        max_concurrency=1,
+        max_retries=0,
+        timeout_seconds=0.05,
+    )
+
+    with pytest.raises(TimeoutError):
+        gateway.generate_text("first", model="gemini-test", call_site="scheduler.rate")
+    assert gateway.stats()["call_sites"]["scheduler.rate"]["in_flight"] == 1
+
+    # The only worker is still busy, so the next call waits for admission rather than
+    # spending its budget queued behind the abandoned request.
+    with pytest.raises(TimeoutError, match="global LLM slot"):
+        gateway.generate_text("second", model="gemini-test", call_site="assistant")
+    assert models.calls == 1
+
+    models.outcome = "ok"
+    models.release.set()
+    deadline = time.monotonic() + 2
+    while gateway.stats()["call_sites"]["scheduler.rate"]["in_flight"] and (
+        time.monotonic() < deadline
+    ):
+        time.sleep(0.01)
+    assert gateway.generate_text("third", model="gemini-test", call_site="assistant") == "ok"
+    gateway.close()
+
+
+def test_breaker_opens_then_recovers_through_a_half_open_probe() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(window=4, min_calls=4, failure_ratio=0.5, open_seconds=10, clock=clock)
+
+    for bad in (False, True, False, True):
+        assert breaker.allow()
+        breaker.record(bad)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record(True)
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "closed"
+    assert breaker.stats()["times_opened"] == 2
+
+
+def test_open_breaker_skips_gemini_and_services_fall_back() -> None:
+    models = _Models(_overloaded())
+    gateway = LLMGateway(
+        enable_live=True,
+        client=SimpleNamespace(models=models),
+        max_retries=0,
+        breaker=CircuitBreaker(window=2, min_calls=2, open_seconds=60),
+    )
+    provider = GeminiProvider(model="gemini-test", gateway=gateway)
+    task = {"id": "a", "title": "Essay", "module": "History", "due_at": "2026-03-01T09:00:00Z"}
+
+    provider.rate_tasks([task])
+    provider.rate_tasks([task])
+    result = provider.rate_tasks([task])
+
+    assert models.calls == 2
+    assert result["fallback"] is True
+    assert "Circuit open" in result["fallback_reason"]
+    assert result["rated_tasks"][0]["id"] == "a"
+    stats = gateway.stats()
+    assert stats["breaker"]["state"] == "open"
+    assert stats["call_sites"]["llm.rate"]["short_circuited"] == 1
+    with pytest.raises(LLMCircuitOpenError):
+        gateway.generate_text("p", model="m", call_site="assistant")
+
+
+def test_client_errors_and_fast_calls_keep_the_breaker_closed() -> None:
+    bad_request = genai_errors.ClientError(400, {"error": {"message": "bad prompt"}})
+    models = _Models(bad_request)
+    gateway = LLMGateway(
+        enable_live=True,
+        client=SimpleNamespace(models=models),
+        breaker=CircuitBreaker(window=2, min_calls=2),
+        slow_call_seconds=5,
+    )
+
+    for _ in range(3):
+        with pytest.raises(genai_errors.ClientError):
+            gateway.generate_text("p", model="m", call_site="documents")
+
+    assert models.calls == 3
+    assert gateway.stats()["breaker"]["state"] == "closed"
+
+
+def test_budget_setting_overrides_individual_sites() -> None:
+    budgets = _parse_budgets("assistant=3000, jobs = 20000,broken", DEFAULT_LLM_LATENCY_BUDGETS_MS)
+
+    assert budgets["assistant"] == 3000
+    assert budgets["jobs"] == 20000
+    assert budgets["llm.rate"] == DEFAULT_LLM_LATENCY_BUDGETS_MS["llm.rate"]
+    assert "broken" not in budgets
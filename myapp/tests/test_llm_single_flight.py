@@ -0,0 +1,106 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.single_flight import SingleFlight
+
+
+class _BlockingModels:
+    def __init__(self, outcome) -> None:
+        self.outcome = outcome
+        self.release = threading.Event()
+        self.calls = 0
+
+    def generate_content(self, model: str, contents: str, config: dict):
+        self.calls += 1
+        self.release.wait(2)
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return SimpleNamespace(text=self.outcome)
+
+
+def _wait_for(predicate, seconds: float = 2.0) -> None:
+    deadline = time.monotonic() + seconds
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def _burst(gateway: LLMGateway, prompt: str, callers: int) -> tuple[list, list[threading.Thread]]:
+    results: list = [None] * callers
+
+    def call(index: int) -> None:
+        try:
+            results[index] = gateway.generate_text(prompt, model="m", call_site="jobs")
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(callers)]
+    for thread in threads:
+        thread.start()
+    return results, threads
+
+
+def test_identical_concurrent_requests_share_one_call() -> None:
+    models = _BlockingModels("normalized jobs")
+    gateway = LLMGateway(enable_live=True, client=SimpleNamespace(models=models))
+
+    results, threads = _burst(gateway, "refresh: python intern london", callers=5)
+    _wait_for(lambda: gateway.single_flight.stats()["coalesced"] == 4)
+    models.release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert results == ["normalized jobs"] * 5
+    assert models.calls == 1
+    stats = gateway.stats()
+    assert stats["call_sites"]["jobs"]["calls"] == 1
+    assert stats["call_sites"]["jobs"]["coalesced"] == 4
+    assert stats["coalescing"] == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+
+def test_waiters_receive_the_leaders_error() -> None:
+    models = _BlockingModels(ValueError("bad output"))
+    gateway = LLMGateway(enable_live=True, client=SimpleNamespace(models=models))
+
+    results, threads = _burst(gateway, "same prompt", callers=3)
+    _wait_for(lambda: gateway.single_flight.stats()["coalesced"] == 2)
+    models.release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert models.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    # The key is released, so the next request makes a fresh call.
+    models.outcome = "recovered"
+    assert gateway.generate_text("same prompt", model="m", call_site="jobs") == "recovered"
+    assert models.calls == 2
+
+
+def test_coalescing_can_be_disabled() -> None:
+    models = _BlockingModels("ok")
+    models.release.set()
+    gateway = LLMGateway(enable_live=True, client=SimpleNamespace(models=models), coalesce=False)
+
+    gateway.generate_text("p", model="m", call_site="jobs")
+    gateway.generate_text("p", model="m", call_site="jobs")
+    assert models.calls == 2
+    assert gateway.stats()["coalescing"] is None
+
+
+def test_waiter_gives_up_at_its_own_deadline() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=("k", lambda: release.wait(2)))
+    leader.start()
+    _wait_for(lambda: flight.stats()["in_flight"] == 1)
+
+    with pytest.raises(TimeoutError):
+        flight.do("k", lambda: "unused", timeout=0.01)
+    release.set()
+    leader.join(2)
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,94 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from app.models.persistence.job_repo import JobRepository
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def _matches(row: dict, query: dict) -> bool:
+    for key, expected in query.items():
+        if key == "$and":
+            if not all(_matches(row, part) for part in expected):
+                return False
+        elif key == "$or":
+            if not any(_matches(row, part) for part in expected):
+                return False
+        elif isinstance(expected, dict):
+            value = row.get(key)
+            if "$lt" in expected and not value < expected["$lt"]:
+                return False
+            if "$gt" in expected and not value > expected["$gt"]:
+                return False
+        elif row.get(key) != expected:
+            return False
+    return True
+
+
+class _FakeCursor:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+
+    def sort(self, keys: list, direction: int = 1):
+        for field, order in reversed(keys):
+            self.rows.sort(key=lambda row: row.get(field), reverse=order == -1)
+        return self
+
+    def limit(self, value: int):
+        self.rows = self.rows[:value]
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class _FakeCollection:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.queries: list[dict] = []
+
+    def find(self, query: dict, _projection: dict):
+        self.queries.append(query)
+        return _FakeCursor([dict(row) for row in self.rows if _matches(row, query)])
+
+
+def test_cursor_round_trips_and_rejects_garbage() -> None:
+    token = encode_cursor("2026-02-22T10:00:00+00:00", "job-7")
+    assert decode_cursor(token) == ("2026-02-22T10:00:00+00:00", "job-7")
+    moment = datetime(2026, 2, 22, 10, tzinfo=UTC)
+    assert decode_cursor(encode_cursor(moment, "job-7")) == (moment, "job-7")
+    assert decode_cursor(None) is None
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_page_jobs_walks_ties_on_sort_key_without_gaps() -> None:
+    rows = [
+        {
+            "job_id": f"job-{index:02d}",
+            "title": f"Role {index}",
+            "created_at": f"2026-02-{20 + index // 3:02d}T00:00:00+00:00",
+        }
+        for index in range(10)
+    ]
+    collection = _FakeCollection(rows)
+    repo = JobRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_test",
+        collection=collection,
+    )
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        jobs, cursor = repo.page_jobs(limit=4, cursor=cursor)
+        seen.extend(job.id for job in jobs)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == sorted((row["job_id"] for row in rows), reverse=True)
+    assert collection.queries[0] == {}
+    assert "$or" in collection.queries[1]
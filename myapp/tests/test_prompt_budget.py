@@ -0,0 +1,128 @@
+from types import SimpleNamespace
+
+from app.services.assistant_service import AssistantService
+from app.services.llm.gateway import LLMGateway
+from app.services.llm.prompt_budget import (
+    TRIM_MARKER,
+    PromptBudget,
+    PromptSection,
+    estimate_tokens,
+    trim_to_tokens,
+)
+from app.services.socratic.agent import SocraticAgentService
+
+
+class _Models:
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def generate_content(self, model: str, contents: str, config: dict):
+        self.prompts.append(contents)
+        return SimpleNamespace(text='{"score": 70, "comments": "ok"}')
+
+
+class _Repo:
+    def build_message(self, conversation_id, role, text, context_page) -> dict:
+        return {"conversation_id": conversation_id, "role": role, "text": text}
+
+    def list_messages(self, conversation_id: str, limit: int = 12) -> list[dict]:
+        return [
+            {"role": "user" if index % 2 else "assistant", "text": f"message {index} " + "x " * 300}
+            for index in range(limit)
+        ]
+
+    def append_turn(self, messages: list[dict]) -> list[str]:
+        return []
+
+    def list_task_fields(self, fields, limit: int = 200, user_id: str | None = None) -> list:
+        return []
+
+    def list_job_fields(self, fields, limit: int = 200, user_id: str | None = None) -> list:
+        return []
+
+
+def test_estimate_tracks_characters_and_dense_words() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * 400) == 100
+    assert estimate_tokens("a b c d e f") == 8
+
+
+def test_trim_keeps_the_head_or_the_latest_lines() -> None:
+    document = "\n".join(f"paragraph {index} " + "word " * 20 for index in range(50))
+    head = trim_to_tokens(document, 200)
+    assert head.startswith("paragraph 0") and head.endswith(TRIM_MARKER)
+    assert estimate_tokens(head) <= 200
+
+    history = "\n".join(f"user: turn {index}" for index in range(100))
+    tail = trim_to_tokens(history, 40, keep="tail")
+    assert tail.startswith(TRIM_MARKER) and tail.endswith("user: turn 99")
+    assert estimate_tokens(tail) <= 40
+
+
+def test_compose_trims_lowest_priority_first_and_records_sizes() -> None:
+    budget = PromptBudget({"docs": 300})
+    prompt = budget.compose(
+        "docs",
+        "Q: {question}\nNotes: {notes}\nSource: {source}",
+        PromptSection("question", "What is entropy?"),
+        PromptSection("notes", "short notes " * 20, priority=1),
+        PromptSection("source", "long source text " * 200, priority=0),
+    )
+
+    assert "short notes " * 20 in prompt
+    assert prompt.count("long source text") < 200
+    assert estimate_tokens(prompt) <= 300
+    stats = budget.stats()["call_sites"]["docs"]
+    assert stats["budget_tokens"] == 300
+    assert stats["trimmed"] == 1 and stats["trimmed_tokens"] > 0
+    assert stats["over_budget"] == 0
+
+
+def test_required_sections_are_never_cut() -> None:
+    budget = PromptBudget(default_tokens=10)
+    required = "must keep " * 50
+
+    prompt = budget.compose("x", "{required}", PromptSection("required", required))
+
+    assert prompt == required
+    assert budget.stats()["call_sites"]["x"]["over_budget"] == 1
+
+
+def test_evaluation_prompt_trims_reference_before_the_answer() -> None:
+    models = _Models()
+    gateway = LLMGateway(
+        enable_live=True,
+        client=SimpleNamespace(models=models),
+        prompt_budget=PromptBudget({"socratic.evaluate": 1200}),
+    )
+    agent = SocraticAgentService(model="gemini-test", gateway=gateway)
+    answer = "My answer explains the base case. " * 20
+
+    agent.evaluate_answer("Recursion", "Why a base case?", answer, reference_text="ref " * 5000)
+
+    prompt = models.prompts[0]
+    assert answer in prompt
+    assert TRIM_MARKER in prompt
+    assert estimate_tokens(prompt) <= 1200
+    site = gateway.stats()["call_sites"]["socratic.evaluate"]
+    assert 0 < site["max_prompt_tokens"] <= 1200
+
+
+def test_chat_drops_oldest_history_to_fit() -> None:
+    repo = _Repo()
+    gateway = LLMGateway(prompt_budget=PromptBudget({"assistant": 800}))
+    service = AssistantService(
+        model="gemini-test",
+        api_key="",
+        enable_live=False,
+        conversation_repo=repo,
+        job_repo=repo,
+        task_repo=repo,
+        gateway=gateway,
+    )
+
+    _, prompt = service._prepare_turn("c1", "What is due next?", "dashboard")
+
+    assert prompt.endswith("Latest user message: What is due next?")
+    assert "message 7" in prompt and "message 1 " not in prompt
+    assert estimate_tokens(prompt) <= 800
@@ -0,0 +1,117 @@
+import threading
+import time
+
+from app.services.llm.provider_gemini import GeminiProvider
+
+
+def _task(task_id: str, weight: int = 20) -> dict:
+    return {
+        "id": task_id,
+        "title": f"Task {task_id}",
+        "module": "Math",
+        "due_at": "2026-03-01T09:00:00Z",
+        "module_weight_percent": weight,
+        "estimated_hours": 2,
+        "notes": "",
+    }
+
+
+def _provider(monkeypatch, reply, requests: int = 3) -> tuple[GeminiProvider, list[str]]:
+    provider = GeminiProvider(
+        model="gemini-1.5-pro",
+        api_key="key",
+        enable_live=True,
+        batch_window_ms=2000,
+        max_batch_requests=requests,
+    )
+    prompts: list[str] = []
+
+    def fake_live_call(prompt: str, temperature: float):
+        prompts.append(prompt)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(provider, "_call_live_model", fake_live_call)
+    return provider, prompts
+
+
+def _rate_concurrently(provider: GeminiProvider, groups: list[list[dict]]) -> list[dict]:
+    results: list = [None] * len(groups)
+
+    def call(index: int) -> None:
+        results[index] = provider.rate_tasks(tasks=groups[index], temperature=0.2)
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(len(groups))]
+    for index, thread in enumerate(threads):
+        thread.start()
+        # Start the next caller only once this one has joined the open batch, so the
+        # request prefixes (r0, r1, ...) follow the group order.
+        deadline = time.monotonic() + 5
+        while index < len(threads) - 1 and time.monotonic() < deadline:
+            if sum(len(batch.items) for batch in provider.batcher._open.values()) > index:
+                break
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_requests_share_one_prompt_and_split_back(monkeypatch) -> None:
+    reply = {
+        "summary": "Ranked everything",
+        "rated_tasks": [
+            {"id": "r0:a", "title": "A", "priority_score": 91, "reason": "due soon"},
+            {"id": "r1:b", "title": "B", "priority_score": 40},
+            {"task_id": "r2:c", "title": "C", "priority_score": 75},
+            {"id": "r9:zz", "title": "stray", "priority_score": 10},
+        ],
+    }
+    provider, prompts = _provider(monkeypatch, reply)
+
+    results = _rate_concurrently(provider, [[_task("a")], [_task("b")], [_task("c")]])
+
+    assert len(prompts) == 1
+    assert all(f"'id': 'r{index}:" in prompts[0] for index in range(3))
+    assert [row["rated_tasks"][0]["id"] for row in results] == ["a", "b", "c"]
+    assert [row["rated_tasks"][0]["priority_score"] for row in results] == [91, 40, 75]
+    assert all(len(row["rated_tasks"]) == 1 and not row["fallback"] for row in results)
+    assert results[0]["summary"] == "Prioritized 1 tasks"
+
+    stats = provider.batch_stats()
+    assert stats["enabled"] is True
+    assert stats["batches"] == 1
+    assert stats["requests"] == 3
+    assert stats["calls_saved"] == 2
+    assert stats["full_batches"] == 1
+
+
+def test_callers_missing_from_batch_fall_back_individually(monkeypatch) -> None:
+    reply = {"rated_tasks": [{"id": "r0:a", "priority_score": 80}]}
+    provider, _ = _provider(monkeypatch, reply, requests=2)
+
+    first, second = _rate_concurrently(provider, [[_task("a")], [_task("b", weight=50)]])
+
+    assert first["fallback"] is False
+    assert second["fallback"] is True
+    assert "did not rate" in second["fallback_reason"]
+    assert second["rated_tasks"][0]["id"] == "b"
+
+
+def test_batch_failure_falls_back_for_every_caller(monkeypatch) -> None:
+    provider, _ = _provider(monkeypatch, RuntimeError("quota exceeded"), requests=2)
+
+    results = _rate_concurrently(provider, [[_task("a")], [_task("b")]])
+
+    assert all(row["fallback"] and row["fallback_reason"] == "quota exceeded" for row in results)
+
+
+def test_lone_request_keeps_the_plain_prompt(monkeypatch) -> None:
+    reply = {"rated_tasks": [{"id": "a", "priority_score": 70}]}
+    provider, prompts = _provider(monkeypatch, reply, requests=1)
+
+    result = provider.rate_tasks(tasks=[_task("a")])
+
+    assert result["fallback"] is False
+    assert "r0:" not in prompts[0]
+    assert provider.batch_stats()["avg_requests_per_batch"] == 1.0
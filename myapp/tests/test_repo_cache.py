@@ -0,0 +1,116 @@
+from app.models.persistence.cache import (
+    JOB_READ_METHODS,
+    JOB_WRITE_METHODS,
+    TASK_READ_METHODS,
+    TASK_WRITE_METHODS,
+    CachedRepository,
+    RepositoryCache,
+)
+from app.services.assistant_service import AssistantService
+
+
+class _CountingRepo:
+    def __init__(self) -> None:
+        self.rows = [{"task_id": "task-1", "title": "Essay"}]
+        self.reads = 0
+
+    def list_tasks(self, limit: int = 200) -> list[dict]:
+        self.reads += 1
+        return self.rows[:limit]
+
+    def upsert_tasks(self, rows: list[dict]) -> int:
+        self.rows.extend(rows)
+        return len(rows)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cached(repo: _CountingRepo, cache: RepositoryCache) -> CachedRepository:
+    return CachedRepository(
+        repo,
+        cache=cache,
+        read_methods={"list_tasks"},
+        write_methods={"upsert_tasks"},
+    )
+
+
+def test_cached_repository_hits_until_write_or_expiry() -> None:
+    clock = _Clock()
+    repo = _CountingRepo()
+    cache = RepositoryCache(ttl_seconds=5, max_entries=8, clock=clock)
+    cached = _cached(repo, cache)
+
+    first = cached.list_tasks(limit=10)
+    first[0]["title"] = "mutated by caller"
+    assert cached.list_tasks(limit=10)[0]["title"] == "Essay"
+    assert repo.reads == 1
+
+    cached.upsert_tasks([{"task_id": "task-2", "title": "Lab"}])
+    assert len(cached.list_tasks(limit=10)) == 2
+    assert repo.reads == 2
+
+    clock.now = 6.0
+    cached.list_tasks(limit=10)
+    assert repo.reads == 3
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 3, 1)
+
+
+def test_repository_cache_evicts_least_recently_used() -> None:
+    repo = _CountingRepo()
+    cache = RepositoryCache(ttl_seconds=60, max_entries=2)
+    cached = _cached(repo, cache)
+
+    cached.list_tasks(limit=1)
+    cached.list_tasks(limit=2)
+    cached.list_tasks(limit=1)
+    cached.list_tasks(limit=3)
+    assert cache.stats()["evictions"] == 1
+
+    cached.list_tasks(limit=1)
+    assert repo.reads == 3
+    cached.list_tasks(limit=2)
+    assert repo.reads == 4
+
+
+class _FieldRepo:
+    def __init__(self) -> None:
+        self.reads = 0
+
+    def list_task_fields(self, fields, limit: int = 200, user_id: str | None = None) -> list:
+        self.reads += 1
+        return [{"title": "Essay", "due_at": None, "completed": False}]
+
+    def list_job_fields(self, fields, limit: int = 200, user_id: str | None = None) -> list:
+        self.reads += 1
+        return [{"title": "Analyst", "module": "Career", "due_at": None}]
+
+
+def test_assistant_context_snapshot_is_served_from_the_repo_cache() -> None:
+    tasks, jobs = _FieldRepo(), _FieldRepo()
+    service = AssistantService(
+        model="gemini-test",
+        api_key="",
+        enable_live=False,
+        conversation_repo=None,
+        task_repo=CachedRepository(
+            tasks, RepositoryCache(ttl_seconds=60), TASK_READ_METHODS, TASK_WRITE_METHODS
+        ),
+        job_repo=CachedRepository(
+            jobs, RepositoryCache(ttl_seconds=60), JOB_READ_METHODS, JOB_WRITE_METHODS
+        ),
+    )
+
+    first = service._context_snapshot("user-a")
+    assert service._context_snapshot("user-a") == first
+    assert (tasks.reads, jobs.reads) == (1, 1)
+
+    service._context_snapshot("user-b")
+    assert (tasks.reads, jobs.reads) == (2, 2)
@@ -0,0 +1,112 @@
+from datetime import UTC, datetime, timedelta
+
+from app.models.domain.task import Task
+from app.services.llm.score_memo import TaskScoreMemo, decay_bucket, ranking_fingerprint
+from app.services.scheduler import SchedulerService
+from app.utils.time import utc_now
+
+DUE = utc_now() + timedelta(days=5, hours=12)
+
+
+class _FakeProvider:
+    def __init__(self, scores: dict[str, int]) -> None:
+        self.scores = scores
+        self.fallback = False
+        self.skipped: set[str] = set()
+        self.calls: list[list[str]] = []
+
+    def rate_tasks(self, tasks: list[dict], custom_prompt: str = "", temperature: float = 0.2):
+        self.calls.append([task["id"] for task in tasks])
+        return {
+            "fallback": self.fallback,
+            "rated_tasks": [
+                {"id": task["id"], "priority_score": self.scores.get(task["id"], 0)}
+                for task in tasks
+            ],
+            "heuristic_ids": [task["id"] for task in tasks if task["id"] in self.skipped],
+        }
+
+
+def _task(task_id: str, notes: str = "") -> Task:
+    return Task(
+        id=task_id,
+        title=f"Task {task_id}",
+        module="Math",
+        due_at=DUE,
+        module_weight_percent=20,
+        estimated_hours=2,
+        notes=notes,
+        user_id="user-a",
+    )
+
+
+def _service(provider: _FakeProvider, memo: TaskScoreMemo | None) -> SchedulerService:
+    return SchedulerService(
+        task_repo=None,
+        event_repo=None,
+        llm_provider=provider,
+        score_memo=memo,
+    )
+
+
+def test_only_new_or_changed_tasks_are_rerated() -> None:
+    provider = _FakeProvider({"a": 30, "b": 60, "c": 90, "d": 75})
+    memo = TaskScoreMemo()
+    service = _service(provider, memo)
+
+    ranked = service._rank_tasks([_task("a"), _task("b"), _task("c")])
+    assert [task.id for task in ranked] == ["c", "b", "a"]
+
+    provider.scores["b"] = 10
+    ranked = service._rank_tasks([_task("a"), _task("b", notes="now harder"), _task("c"), _task("d")])
+
+    assert provider.calls == [["a", "b", "c"], ["b", "d"]]
+    assert [task.id for task in ranked] == ["c", "d", "a", "b"]
+    assert [task.priority_score for task in ranked] == [90, 75, 30, 10]
+    assert memo.stats()["hits"] == 2
+
+
+def test_fallback_scores_are_not_memoized() -> None:
+    provider = _FakeProvider({"a": 50})
+    provider.fallback = True
+    service = _service(provider, TaskScoreMemo())
+
+    service._rank_tasks([_task("a")])
+    service._rank_tasks([_task("a")])
+
+    assert provider.calls == [["a"], ["a"]]
+
+
+def test_tasks_the_model_skipped_are_not_memoized() -> None:
+    provider = _FakeProvider({"a": 50, "b": 40})
+    provider.skipped = {"b"}
+    memo = TaskScoreMemo()
+    service = _service(provider, memo)
+
+    service._rank_tasks([_task("a"), _task("b")])
+    service._rank_tasks([_task("a"), _task("b")])
+
+    assert provider.calls == [["a", "b"], ["b"]]
+
+
+def test_without_memo_every_task_is_sent() -> None:
+    provider = _FakeProvider({"a": 50, "b": 40})
+    service = _service(provider, None)
+
+    service._rank_tasks([_task("a"), _task("b")])
+    service._rank_tasks([_task("a"), _task("b")])
+
+    assert provider.calls == [["a", "b"], ["a", "b"]]
+
+
+def test_fingerprint_changes_with_decay_bucket() -> None:
+    now = datetime(2026, 6, 1, tzinfo=UTC)
+    near = {"title": "Essay", "due_at": "2026-06-04T12:00:00Z"}
+    far = {"title": "Essay", "due_at": "2026-12-01T12:00:00Z"}
+
+    assert decay_bucket(near["due_at"], now) == "d3"
+    assert decay_bucket("2026-05-30T00:00:00Z", now) == "overdue"
+    assert decay_bucket(None, now) == "none"
+    assert ranking_fingerprint(near, now) != ranking_fingerprint(near, now + timedelta(days=1))
+    assert ranking_fingerprint(far, now) == ranking_fingerprint(far, now + timedelta(days=1))
+    assert ranking_fingerprint(near, now) != ranking_fingerprint({**near, "notes": "x"}, now)
@@ -0,0 +1,150 @@
+import asyncio
+from datetime import datetime
+
+from app.models.domain.job import Job
+from app.models.domain.task import Task
+from app.models.persistence.async_db import ThreadedAsyncRepository
+from app.models.persistence.sqlite_db import SqliteDatabase
+from app.models.persistence.sqlite_repos import (
+    SqliteAssistantConversationRepository,
+    SqliteCalendarEventRepository,
+    SqliteDocumentRepository,
+    SqliteJobRepository,
+    SqliteTaskRepository,
+)
+
+
+def _job(index: int, title: str | None = None) -> Job:
+    return Job(
+        id=f"job-{index}",
+        title=title or f"Role {index}",
+        module="Career",
+        due_at=None,
+        module_weight_percent=30,
+        estimated_hours=4,
+        source_url=f"https://example.com/{index}",
+    )
+
+
+def test_sqlite_job_and_task_repos_upsert_page_and_patch(tmp_path) -> None:
+    database = SqliteDatabase(tmp_path / "beacon.sqlite3")
+    try:
+        jobs = SqliteJobRepository(database, bulk_batch_size=2)
+        first = jobs.bulk_upsert_jobs([_job(index) for index in range(5)])
+        assert (first.inserted, first.matched) == (5, 0)
+        second = jobs.bulk_upsert_jobs([_job(0, title="Role 0 (updated)")])
+        assert (second.inserted, second.matched, second.modified) == (0, 1, 1)
+
+        seen: list[str] = []
+        page, cursor = jobs.page_jobs(limit=2)
+        seen.extend(job.id for job in page)
+        while cursor:
+            page, cursor = jobs.page_jobs(limit=2, cursor=cursor)
+            seen.extend(job.id for job in page)
+        assert sorted(seen) == [f"job-{index}" for index in range(5)]
+        assert {job.id: job.title for job in jobs.list_jobs()}["job-0"] == "Role 0 (updated)"
+        assert sorted(row["job_id"] for row in jobs.list_job_fields(("job_id",))) == [
+            f"job-{index}" for index in range(5)
+        ]
+
+        tasks = SqliteTaskRepository(database)
+        tasks.upsert_tasks([Task(id="task-1", title="Essay", module="History", notes="draft")])
+        patched = tasks.patch_task("task-1", {"completed": True, "estimated_hours": "3"})
+        assert patched is not None and patched.completed and patched.estimated_hours == 3
+        assert tasks.get_task("task-1").notes == "draft"
+        assert tasks.patch_task("missing", {"title": "x"}) is None
+        fields = tasks.list_task_fields(("title", "completed"))
+        assert set(fields[0]) == {"created_at", "task_id", "title", "completed"}
+        assert fields[0]["completed"] and isinstance(fields[0]["created_at"], datetime)
+        assert tasks.list_task_fields(("title",), active_only=True) == []
+
+        async_tasks = ThreadedAsyncRepository(tasks)
+        assert asyncio.run(async_tasks.get_task("task-1")).title == "Essay"
+    finally:
+        database.close_all()
+
+
+def test_sqlite_events_documents_and_conversations(tmp_path) -> None:
+    database = SqliteDatabase(tmp_path / "beacon.sqlite3")
+    try:
+        events = SqliteCalendarEventRepository(database)
+        base = [
+            {"event_id": f"evt-{index}", "task_id": "task-1", "start_at": f"2026-03-0{index}T09:00"}
+            for index in range(1, 4)
+        ]
+        assert events.sync_events(base)["inserted"] == 3
+        changed = [dict(base[0], title="moved"), base[1]]
+        assert events.sync_events(changed) == {
+            "inserted": 0,
+            "updated": 1,
+            "deleted": 1,
+            "unchanged": 1,
+        }
+        in_range = events.list_events(start_at="2026-03-02T00:00", end_at="2026-03-31T00:00")
+        assert [event["event_id"] for event in in_range] == ["evt-2"]
+
+        documents = SqliteDocumentRepository(database)
+        documents.create_document(
+            {
+                "doc_id": "doc-1",
+                "doc_type": "lecture_note",
+                "user_id": "user-1",
+                "title": "Week 1",
+                "filename": "week1.pdf",
+                "content_type": "application/pdf",
+                "highlights": ["a", "b"],
+                "extracted_text": "full text",
+            },
+            b"%PDF-1.4",
+        )
+        listed = documents.list_documents("lecture_note", "user-1")
+        assert "extracted_text" not in listed[0]
+        assert listed[0]["highlights"] == ["a", "b"]
+        assert documents.get_document_text("doc-1") == "full text"
+        assert documents.read_file_bytes(listed[0]["file_id"]) == b"%PDF-1.4"
+
+        conversations = SqliteAssistantConversationRepository(database)
+        turn = [
+            conversations.build_message(
+                "conv-1", "user", "hi", "home", created_at="2026-03-01T09:00:00+00:00"
+            ),
+            conversations.build_message(
+                "conv-1", "assistant", "hello", "home", created_at="2026-03-01T09:00:01+00:00"
+            ),
+        ]
+        conversations.append_turn(turn)
+        assert [row["text"] for row in conversations.list_messages("conv-1")] == ["hi", "hello"]
+    finally:
+        database.close_all()
+
+
+def test_sqlite_repos_partition_rows_by_user(tmp_path) -> None:
+    database = SqliteDatabase(tmp_path / "beacon.sqlite3")
+    try:
+        tasks = SqliteTaskRepository(database)
+        tasks.upsert_tasks(
+            [
+                Task(id="task-1", title="Essay", user_id="user-a"),
+                Task(id="task-1", title="Lab report", user_id="user-b"),
+                Task(id="task-2", title="Quiz", user_id="user-b"),
+            ]
+        )
+        assert [task.title for task in tasks.list_tasks(user_id="user-a")] == ["Essay"]
+        assert len(tasks.list_tasks(user_id="user-b")) == 2
+        assert len(tasks.list_tasks()) == 3
+        patched = tasks.patch_task("task-1", {"notes": "draft"}, user_id="user-b")
+        assert patched is not None and patched.title == "Lab report"
+        assert tasks.get_task("task-1", user_id="user-a").notes == ""
+        assert tasks.get_task("task-2", user_id="user-a") is None
+
+        events = SqliteCalendarEventRepository(database)
+        event = {"event_id": "evt-task-1", "task_id": "task-1", "start_at": "2026-03-01T09:00"}
+        events.replace_events([dict(event)], user_id="user-a")
+        events.replace_events([dict(event)], user_id="user-b")
+        assert events.sync_events([], user_id="user-b")["deleted"] == 1
+        remaining = events.list_events()
+        assert [(row["user_id"], row["event_id"]) for row in remaining] == [
+            ("user-a", "evt-task-1")
+        ]
+    finally:
+        database.close_all()
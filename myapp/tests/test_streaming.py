@@ -0,0 +1,152 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.dependencies import get_assistant_service, get_socratic_agent
+from app.main import app
+from app.models.persistence.assistant_repo import _ConversationDocuments
+from app.services.assistant_service import AssistantService
+from app.services.llm.gateway import LLMGateway
+from app.services.socratic.agent import SocraticAgentService
+
+client = TestClient(app)
+
+
+class _StreamingModels:
+    def __init__(self, chunks: list, fail_first: Exception | None = None) -> None:
+        self.chunks = chunks
+        self.fail_first = fail_first
+        self.calls = 0
+
+    def generate_content_stream(self, model: str, contents: str, config: dict):
+        self.calls += 1
+        if self.fail_first is not None and self.calls == 1:
+            raise self.fail_first
+        for chunk in self.chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield SimpleNamespace(text=chunk)
+
+
+class _ConversationRepo(_ConversationDocuments):
+    def __init__(self) -> None:
+        self.rows: list[dict] = []
+
+    def list_messages(self, conversation_id: str, limit: int = 12) -> list[dict]:
+        return [row for row in self.rows if row["conversation_id"] == conversation_id][-limit:]
+
+    def append_turn(self, messages: list[dict]) -> list[str]:
+        self.rows.extend(messages)
+        return [row["message_id"] for row in messages]
+
+
+class _EmptyRepo:
+    def list_task_fields(self, fields, limit: int = 200, user_id: str | None = None) -> list:
+        return []
+
+    def list_job_fields(self, fields, limit: int = 200, user_id: str | None = None) -> list:
+        return []
+
+
+def _gateway(models: _StreamingModels) -> LLMGateway:
+    return LLMGateway(
+        enable_live=True,
+        client=SimpleNamespace(models=models),
+        sleep=lambda _: None,
+        jitter=lambda: 0.0,
+    )
+
+
+def _events(response) -> list[tuple[str, dict]]:
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_gateway_streams_chunks_and_retries_before_first_token() -> None:
+    models = _StreamingModels(["Why ", "does it ", "recurse?"], fail_first=ConnectionError("reset"))
+    gateway = _gateway(models)
+
+    chunks = list(gateway.stream_text("p", model="m", call_site="socratic.question"))
+
+    assert chunks == ["Why ", "does it ", "recurse?"]
+    site = gateway.stats()["call_sites"]["socratic.question"]
+    assert (site["calls"], site["retries"], site["errors"], site["in_flight"]) == (1, 1, 0, 0)
+
+
+def test_gateway_does_not_retry_after_text_was_sent() -> None:
+    models = _StreamingModels(["partial", ConnectionError("dropped")])
+    gateway = _gateway(models)
+    received: list[str] = []
+
+    with pytest.raises(ConnectionError):
+        for chunk in gateway.stream_text("p", model="m", call_site="assistant"):
+            received.append(chunk)
+
+    assert received == ["partial"]
+    assert models.calls == 1
+    assert gateway.stats()["call_sites"]["assistant"]["errors"] == 1
+
+
+def test_question_stream_ends_with_the_json_payload() -> None:
+    agent = SocraticAgentService(
+        model="gemini-test", gateway=_gateway(_StreamingModels(["What is ", "a base case?"]))
+    )
+    app.dependency_overrides[get_socratic_agent] = lambda: agent
+    try:
+        response = client.post("/api/v1/socratic/question/stream", json={"topic": "Recursion"})
+    finally:
+        app.dependency_overrides.pop(get_socratic_agent, None)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response)
+    assert [event for event, _ in events] == ["token", "token", "final"]
+    assert events[-1][1] == {"question": "What is a base case?", "fallback": False, "integrity": None}
+
+
+def test_evaluate_stream_falls_back_to_one_event_when_offline() -> None:
+    payload = {
+        "topic": "Variables in Python",
+        "question": "What is a variable?",
+        "answer": "A named container for a value, for example x = 5.",
+    }
+
+    streamed = _events(client.post("/api/v1/socratic/evaluate-answer/stream", json=payload))
+    plain = client.post("/api/v1/socratic/evaluate-answer", json=payload).json()
+
+    assert streamed == [("final", plain)]
+    assert plain["fallback"] is True
+
+
+def test_chat_stream_persists_the_turn_after_the_last_token() -> None:
+    repo = _ConversationRepo()
+    service = AssistantService(
+        model="gemini-test",
+        api_key="",
+        enable_live=False,
+        conversation_repo=repo,
+        job_repo=_EmptyRepo(),
+        task_repo=_EmptyRepo(),
+        gateway=_gateway(_StreamingModels(["Start ", "with the essay."])),
+    )
+    app.dependency_overrides[get_assistant_service] = lambda: service
+    try:
+        response = client.post(
+            "/api/v1/assistant/chat/stream",
+            json={"conversation_id": "c1", "message": "What next?", "context_page": "dashboard"},
+        )
+    finally:
+        app.dependency_overrides.pop(get_assistant_service, None)
+
+    events = _events(response)
+    assert [data["text"] for event, data in events if event == "token"] == ["Start ", "with the essay."]
+    assert events[-1] == (
+        "final",
+        {"conversation_id": "c1", "reply": "Start with the essay.", "model": "gemini-test", "fallback": False},
+    )
+    assert [row["text"] for row in repo.rows] == ["What next?", "Start with the essay."]
@@ -1,3 +1,5 @@
+from types import SimpleNamespace
+
 from app.models.domain.task import Task
 from app.models.persistence.task_repo import TaskRepository
 
@@ -6,9 +8,10 @@ class _FakeCursor:
     def __init__(self, rows: list[dict]) -> None:
         self.rows = rows
 
-    def sort(self, key: str, direction: int):
-        reverse = direction == -1
-        self.rows.sort(key=lambda row: row.get(key, ""), reverse=reverse)
+    def sort(self, key, direction: int = 1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field, order in reversed(keys):
+            self.rows.sort(key=lambda row: row.get(field) or "", reverse=order == -1)
         return self
 
     def limit(self, value: int):
@@ -36,6 +39,27 @@ class _FakeCollection:
         existing.update(update.get("$set", {}))
         self.docs[task_id] = existing
 
+    def bulk_write(self, operations: list, ordered: bool = True):
+        inserted = matched = modified = 0
+        for operation in operations:
+            query = operation._filter
+            update = operation._doc
+            existing = self.docs.get(query["task_id"])
+            before = dict(existing) if existing is not None else None
+            self.update_one(query, update, upsert=operation._upsert)
+            if before is None:
+                inserted += 1
+            else:
+                matched += 1
+                if self.docs[query["task_id"]] != before:
+                    modified += 1
+        return SimpleNamespace(
+            inserted_count=0,
+            upserted_count=inserted,
+            matched_count=matched,
+            modified_count=modified,
+        )
+
     def find(self, _query: dict, _projection: dict):
         rows = [dict(row) for row in self.docs.values()]
         return _FakeCursor(rows)
@@ -81,3 +105,42 @@ def test_task_repo_upsert_and_list_are_deterministic() -> None:
     assert by_id["task-1"].title == "Math Homework Updated"
     assert by_id["task-1"].priority == 95
     assert by_id["task-1"].completed is False
+
+
+def test_task_repo_patch_sets_only_changed_fields() -> None:
+    fake_collection = _FakeCollection()
+    updates: list[dict] = []
+
+    def find_one(query: dict, _projection: dict):
+        row = fake_collection.docs.get(query["task_id"])
+        return dict(row) if row else None
+
+    def find_one_and_update(query: dict, update: dict, projection=None, return_document=None):
+        updates.append(update)
+        row = fake_collection.docs.get(query["task_id"])
+        if row is None:
+            return None
+        row.update(update["$set"])
+        return dict(row)
+
+    fake_collection.find_one = find_one
+    fake_collection.find_one_and_update = find_one_and_update
+    repo = TaskRepository(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_tasks_test",
+        collection=fake_collection,
+    )
+    repo.upsert_tasks(
+        [Task(id="task-1", title="Essay", module="History", estimated_hours=3, notes="draft")]
+    )
+
+    patched = repo.patch_task("task-1", {"completed": "true", "estimated_hours": "5"})
+    assert patched is not None
+    assert patched.completed is True
+    assert patched.estimated_hours == 5
+    assert patched.notes == "draft"
+    assert set(updates[0]["$set"]) == {"completed", "estimated_hours", "updated_at"}
+
+    assert repo.get_task("task-1").title == "Essay"
+    assert repo.get_task("missing") is None
+    assert repo.patch_task("missing", {"title": "x"}) is None
@@ -0,0 +1,279 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from pymongo import DeleteMany, UpdateOne
+
+from app.core.dependencies import get_scheduler_service, get_workflow_pipeline
+from app.main import app
+from app.models.domain.job import Job
+from app.models.domain.task import Task
+from app.models.persistence.calendar_event_repo import CalendarEventRepository
+from app.models.persistence.job_repo import JobRepository
+from app.models.persistence.task_repo import TaskRepository
+from app.services.llm.provider_gemini import GeminiProvider
+from app.services.scheduler import SchedulerService
+from app.services.workflow.pipeline import WorkflowPipeline
+from app.utils.time import utc_now
+
+_COMPARISONS = {
+    "$ne": lambda value, operand: value != operand,
+    "$in": lambda value, operand: value in operand,
+    "$gt": lambda value, operand: value is not None and value > operand,
+    "$gte": lambda value, operand: value is not None and value >= operand,
+    "$lt": lambda value, operand: value is not None and value < operand,
+    "$lte": lambda value, operand: value is not None and value <= operand,
+}
+
+
+def _matches(row: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(_matches(row, part) for part in condition):
+                return False
+        elif field == "$or":
+            if not any(_matches(row, part) for part in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(
+                _COMPARISONS[op](row.get(field), operand) for op, operand in condition.items()
+            ):
+                return False
+        elif row.get(field) != condition:
+            return False
+    return True
+
+
+class _FakeCursor:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+
+    def sort(self, keys: list):
+        for field, order in reversed(keys):
+            self.rows.sort(key=lambda row: row.get(field) or "", reverse=order == -1)
+        return self
+
+    def limit(self, value: int):
+        self.rows = self.rows[:value]
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class _ScopedCollection:
+    """Evaluates the repository queries and records every filter it was given."""
+
+    def __init__(self) -> None:
+        self.docs: list[dict] = []
+        self.queries: list[dict] = []
+
+    def _find(self, query: dict) -> list[dict]:
+        self.queries.append(query)
+        return [row for row in self.docs if _matches(row, query)]
+
+    def find(self, query: dict, _projection: dict | None = None):
+        return _FakeCursor([dict(row) for row in self._find(query)])
+
+    def find_one(self, query: dict, _projection: dict | None = None):
+        rows = self._find(query)
+        return dict(rows[0]) if rows else None
+
+    def find_one_and_update(self, query: dict, update: dict, **_options):
+        rows = self._find(query)
+        if not rows:
+            return None
+        rows[0].update(update["$set"])
+        return dict(rows[0])
+
+    def with_options(self, codec_options):
+        return self
+
+    def delete_many(self, query: dict) -> None:
+        matched = self._find(query)
+        self.docs = [row for row in self.docs if row not in matched]
+
+    def bulk_write(self, operations: list, ordered: bool = True):
+        upserted = matched = 0
+        for operation in operations:
+            if isinstance(operation, DeleteMany):
+                self.delete_many(operation._filter)
+                continue
+            rows = self._find(operation._filter)
+            if rows:
+                matched += 1
+                rows[0].update(operation._doc["$set"])
+            elif isinstance(operation, UpdateOne) and operation._upsert:
+                upserted += 1
+                self.docs.append(
+                    {
+                        **operation._filter,
+                        **operation._doc.get("$setOnInsert", {}),
+                        **operation._doc["$set"],
+                    }
+                )
+        return SimpleNamespace(
+            inserted_count=0,
+            upserted_count=upserted,
+            matched_count=matched,
+            modified_count=matched,
+        )
+
+    def owners(self) -> list[str]:
+        return sorted(row["user_id"] for row in self.docs)
+
+
+def _repo(repo_class, collection: _ScopedCollection):
+    return repo_class(
+        mongo_uri="mongodb://localhost:27017",
+        db_name="beacon_test",
+        collection=collection,
+    )
+
+
+def _task(task_id: str, user_id: str, title: str) -> Task:
+    return Task(
+        id=task_id,
+        title=title,
+        module="Math",
+        due_at=utc_now() + timedelta(days=3),
+        module_weight_percent=20,
+        estimated_hours=2,
+        user_id=user_id,
+    )
+
+
+def _job(job_id: str, user_id: str, title: str) -> Job:
+    return Job(
+        id=job_id,
+        title=title,
+        module="Career",
+        due_at=None,
+        module_weight_percent=30,
+        estimated_hours=4,
+        user_id=user_id,
+    )
+
+
+def test_task_repo_reads_and_patches_only_the_given_users_rows() -> None:
+    collection = _ScopedCollection()
+    repo = _repo(TaskRepository, collection)
+    repo.upsert_tasks([_task("task-1", "user-a", "Essay"), _task("task-1", "user-b", "Lab")])
+    repo.upsert_tasks([_task("task-1", "user-a", "Essay v2")])
+
+    assert [task.title for task in repo.list_tasks(user_id="user-a")] == ["Essay v2"]
+    assert repo.get_task("task-1", user_id="user-b").title == "Lab"
+    assert repo.patch_task("task-1", {"completed": True}, user_id="user-b").user_id == "user-b"
+    assert repo.list_tasks(user_id="user-a", active_only=True)[0].title == "Essay v2"
+    assert repo.list_tasks(user_id="user-b", active_only=True) == []
+    assert [row["title"] for row in repo.list_task_fields(("title",), user_id="user-b")] == [
+        "Lab"
+    ]
+    assert collection.owners() == ["user-a", "user-b"]
+
+
+def test_job_repo_keeps_the_same_job_id_apart_per_user() -> None:
+    collection = _ScopedCollection()
+    repo = _repo(JobRepository, collection)
+    repo.upsert_jobs([_job("job-1", "user-a", "Analyst"), _job("job-1", "user-b", "Engineer")])
+
+    assert [job.title for job in repo.list_jobs(user_id="user-b")] == ["Engineer"]
+    assert [row["title"] for row in repo.list_job_fields(("title",), user_id="user-a")] == [
+        "Analyst"
+    ]
+    assert collection.owners() == ["user-a", "user-b"]
+
+
+def test_event_sync_for_one_user_leaves_other_users_events_alone() -> None:
+    collection = _ScopedCollection()
+    repo = _repo(CalendarEventRepository, collection)
+    start = datetime(2026, 3, 2, 9, tzinfo=UTC)
+    event = {"event_id": "evt-1", "task_id": "task-1", "start_at": start, "end_at": start}
+    repo.sync_events([event], user_id="user-a")
+    repo.sync_events([event], user_id="user-b")
+
+    # An empty schedule for user-a deletes user-a's event only.
+    assert repo.sync_events([], user_id="user-a")["deleted"] == 1
+    assert collection.owners() == ["user-b"]
+    assert repo.list_events(user_id="user-a") == []
+    assert [row["event_id"] for row in repo.list_events(user_id="user-b")] == ["evt-1"]
+
+
+class _RecordingProvider:
+    def __init__(self) -> None:
+        self.rated: list[str] = []
+
+    def rate_tasks(self, tasks: list[dict], custom_prompt: str = "", temperature: float = 0.2):
+        self.rated.extend(task["id"] for task in tasks)
+        return {
+            "fallback": False,
+            "rated_tasks": [{"id": task["id"], "priority_score": 50} for task in tasks],
+        }
+
+
+def test_reschedule_reads_ranks_and_diffs_only_the_callers_rows() -> None:
+    tasks = _ScopedCollection()
+    events = _ScopedCollection()
+    task_repo = _repo(TaskRepository, tasks)
+    event_repo = _repo(CalendarEventRepository, events)
+    task_repo.upsert_tasks(
+        [
+            _task("task-a", "user-a", "Essay"),
+            _task("task-b", "user-b", "Lab"),
+            _task("task-a", "user-b", "Reading"),
+        ]
+    )
+    start = datetime(2026, 3, 2, 9, tzinfo=UTC)
+    event_repo.sync_events(
+        [{"event_id": "evt-task-b", "task_id": "task-b", "start_at": start, "end_at": start}],
+        user_id="user-b",
+    )
+    provider = _RecordingProvider()
+    service = SchedulerService(task_repo=task_repo, event_repo=event_repo, llm_provider=provider)
+    tasks.queries.clear()
+    events.queries.clear()
+
+    scheduled = service.reschedule(user_id="user-a")
+
+    assert provider.rated == ["task-a"]
+    assert [event["task_id"] for event in scheduled] == ["task-a"]
+    assert all(query.get("user_id") == "user-a" for query in tasks.queries + events.queries)
+    assert sorted((row["user_id"], row["event_id"]) for row in events.docs) == [
+        ("user-a", "evt-task-a"),
+        ("user-b", "evt-task-b"),
+    ]
+
+
+def test_workflow_tasks_are_rescheduled_for_the_default_user() -> None:
+    jobs = _ScopedCollection()
+    tasks = _ScopedCollection()
+    events = _ScopedCollection()
+    task_repo = _repo(TaskRepository, tasks)
+    provider = GeminiProvider(model="gemini-test", api_key="test", enable_live=False)
+    pipeline = WorkflowPipeline(
+        job_repo=_repo(JobRepository, jobs),
+        task_repo=task_repo,
+        llm_provider=provider,
+        default_user_id="demo-user",
+    )
+    scheduler = SchedulerService(
+        task_repo=task_repo,
+        event_repo=_repo(CalendarEventRepository, events),
+        llm_provider=provider,
+        default_user_id="demo-user",
+    )
+    app.dependency_overrides[get_workflow_pipeline] = lambda: pipeline
+    app.dependency_overrides[get_scheduler_service] = lambda: scheduler
+    client = TestClient(app)
+
+    workflow = client.post(
+        "/api/v1/workflow/run",
+        json={"raw_html": "<html><body><ul><li>Math Coursework</li></ul></body></html>"},
+    )
+    assert workflow.status_code == 200
+    assert workflow.json()["persisted_tasks"] == 1
+    assert jobs.owners() == tasks.owners() == ["demo-user"]
+
+    rescheduled = client.post("/api/v1/scheduler/reschedule")
+    assert rescheduled.status_code == 200
+    assert [event["task_id"] for event in rescheduled.json()["events"]] == ["task-1"]